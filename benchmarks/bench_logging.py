@@ -0,0 +1,156 @@
+"""
+Benchmark: latência do event loop com logging DEBUG sob carga
+
+Compara handlers de console/arquivo executados no loop (configuração antiga)
+com o QueueHandler/QueueListener usado pelo BotLogger.
+
+Cada modo roda com o disco normal e com um disco lento simulado (atraso por
+escrita), que é onde a escrita na thread do loop trava o bot.
+
+Uso: python benchmarks/bench_logging.py [--records 20000] [--burst 50] [--disk-delay 0.0005]
+"""
+
+import argparse
+import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import create_file_handler
+
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+
+
+class SlowStream:
+    """Stream que simula disco lento atrasando cada escrita"""
+
+    def __init__(self, stream, delay):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, data):
+        time.sleep(self.delay)
+        return self.stream.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def slow_down(handler, delay):
+    """Aplica o atraso de disco ao handler de arquivo"""
+    if delay:
+        handler.stream = SlowStream(handler.stream, delay)
+
+
+def build_sinks(directory):
+    """Cria handlers de console (descartado) e arquivo como no BotLogger"""
+    console_handler = logging.StreamHandler(open(os.devnull, 'w'))
+    console_handler.setLevel(logging.INFO)
+    file_handler = logging.FileHandler(os.path.join(directory, 'bench.log'), encoding='utf-8')
+    file_handler.setLevel(logging.DEBUG)
+    for handler in (console_handler, file_handler):
+        handler.setFormatter(logging.Formatter(FORMAT))
+    return console_handler, file_handler
+
+
+async def measure(logger, records, burst):
+    """Mede o atraso do loop enquanto outra task gera logs em rajadas"""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        interval = 0.001
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    async def producer():
+        for i in range(0, records, burst):
+            for j in range(burst):
+                logger.debug("Processando evento %d do usuário %d", i + j, 123456789)
+            await asyncio.sleep(0)
+        done.set()
+
+    start = time.perf_counter()
+    await asyncio.gather(ticker(), producer())
+    elapsed = time.perf_counter() - start
+
+    lags.sort()
+    return {
+        'p50': lags[len(lags) // 2] * 1000,
+        'p99': lags[int(len(lags) * 0.99)] * 1000,
+        'max': lags[-1] * 1000,
+        'elapsed': elapsed
+    }
+
+
+def run_inline(directory, records, burst, disk_delay):
+    """Antes: handlers executados na thread do loop"""
+    logger = logging.getLogger('bench.inline')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.handlers.clear()
+    console_handler, file_handler = build_sinks(directory)
+    slow_down(file_handler, disk_delay)
+    logger.addHandler(console_handler)
+    logger.addHandler(file_handler)
+    result = asyncio.run(measure(logger, records, burst))
+    for handler in logger.handlers:
+        handler.close()
+    return result
+
+
+def run_queued(directory, records, burst, disk_delay):
+    """Depois: o loop só enfileira; a escrita roda no QueueListener"""
+    logger = logging.getLogger('bench.queued')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.handlers.clear()
+
+    console_handler, _ = build_sinks(directory)
+    file_handler = create_file_handler(os.path.join(directory, 'bench_rotating.log'))
+    file_handler.setFormatter(logging.Formatter(FORMAT))
+    slow_down(file_handler, disk_delay)
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    result = asyncio.run(measure(logger, records, burst))
+    listener.stop()
+    console_handler.close()
+    file_handler.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--burst', type=int, default=50)
+    parser.add_argument('--disk-delay', type=float, default=0.0005, help="atraso simulado por escrita (s)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for disk_delay in (0, args.disk_delay):
+            disk = f"disco +{disk_delay * 1000:g}ms" if disk_delay else "disco normal"
+            results[f"inline (antes), {disk}"] = run_inline(directory, args.records, args.burst, disk_delay)
+            results[f"fila (depois), {disk}"] = run_queued(directory, args.records, args.burst, disk_delay)
+
+    print(f"{args.records} registros DEBUG em rajadas de {args.burst}")
+    print(f"{'modo':<36}{'p50 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}{'total (s)':>11}")
+    for name, result in results.items():
+        print(f"{name:<36}{result['p50']:>10.3f}{result['p99']:>10.3f}{result['max']:>10.3f}{result['elapsed']:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
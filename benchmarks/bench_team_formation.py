@@ -0,0 +1,114 @@
+"""
+Benchmark: formação automática de equipes com 1 mil e 10 mil participantes
+
+Mede o algoritmo vetorizado (guloso e guloso + busca local) e, para comparação, uma
+versão com laços em Python puro que calcula a compatibilidade par a par (só nos tamanhos
+em que ela termina em tempo razoável).
+
+Uso: python benchmarks/bench_team_formation.py [--sizes 1000 10000] [--naive-limit 2000] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.models import EscolaridadeEnum, ModalidadeEnum
+from database.participant_cache import ParticipanteInfo
+from matchmaking.skill_index import skill_tokens
+from matchmaking.team_formation import (
+    PESO_ESCOLARIDADE, PESO_HABILIDADES, PESO_REGIAO, form_teams, region_key, team_sizes
+)
+
+CIDADES = ["Uberlândia", "Uberaba", "Araguari", "Patos de Minas", "São Paulo", "Belo Horizonte", "Goiânia", "Brasília"]
+HABILIDADES = [
+    "python", "javascript", "react", "backend", "frontend", "design", "ux", "dados", "machine learning",
+    "estatística", "sql", "hardware", "arduino", "astronomia", "geologia", "pitch", "marketing", "video"
+]
+
+
+def make_participants(n, seed):
+    rng = random.Random(seed)
+    campos = dict.fromkeys(ParticipanteInfo._fields)
+    return [
+        ParticipanteInfo(**{
+            **campos,
+            'id': i,
+            'discord_user_id': 1000 + i,
+            'cidade': rng.choice(CIDADES),
+            'escolaridade': rng.choice(list(EscolaridadeEnum)),
+            'modalidade': rng.choice(list(ModalidadeEnum)),
+            'nome_equipe': f"Equipe {i}",
+            'descricao_habilidades': " ".join(rng.sample(HABILIDADES, rng.randint(2, 5))) if rng.random() < 0.85 else None
+        })
+        for i in range(n)
+    ]
+
+
+def naive_pair_score(a, b, tokens_a, tokens_b):
+    """Compatibilidade equivalente à do módulo, com conjuntos de palavras e laços em Python"""
+    if tokens_a and tokens_b:
+        cosseno = len(tokens_a & tokens_b) / (len(tokens_a) * len(tokens_b)) ** 0.5
+        complementar = 1 - cosseno
+    else:
+        complementar = 0.5
+    return (PESO_HABILIDADES * complementar
+            + PESO_REGIAO * (region_key(a.cidade) == region_key(b.cidade))
+            + PESO_ESCOLARIDADE * (a.escolaridade == b.escolaridade))
+
+
+def run_naive(participantes, max_size=6, min_size=3):
+    """Guloso em Python puro: matriz de compatibilidade completa por modalidade, sem busca local"""
+    inicio = time.perf_counter()
+    equipes = 0
+    for modalidade in ModalidadeEnum:
+        grupo = [p for p in participantes if p.modalidade == modalidade]
+        tokens = [set(skill_tokens(p.descricao_habilidades)) for p in grupo]
+        score = [[naive_pair_score(a, b, tokens[i], tokens[j]) if i != j else 0.0
+                  for j, b in enumerate(grupo)] for i, a in enumerate(grupo)]
+        livres = set(range(len(grupo)))
+        for tamanho in team_sizes(len(grupo), max_size, min_size):
+            membros = [min(livres)]
+            livres.discard(membros[0])
+            for _ in range(tamanho - 1):
+                escolhido = max(livres, key=lambda j: sum(score[m][j] for m in membros))
+                livres.discard(escolhido)
+                membros.append(escolhido)
+            equipes += 1
+    return time.perf_counter() - inicio, equipes
+
+
+def run_vectorized(participantes, max_rounds):
+    inicio = time.perf_counter()
+    formacao = form_teams(participantes, max_size=6, min_size=3, max_rounds=max_rounds)
+    duracao = time.perf_counter() - inicio
+    media = sum(formacao.scores) / len(formacao.scores) if formacao.scores else 0.0
+    return duracao, len(formacao.equipes), len(formacao.restantes), media
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--naive-limit', type=int, default=2000, help="maior tamanho medido na versão em Python puro")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'participantes':<15}{'modo':<30}{'tempo (s)':>10}{'equipes':>9}{'sobras':>8}{'score médio':>13}")
+    for n in args.sizes:
+        participantes = make_participants(n, args.seed)
+
+        duracao, equipes, sobras, media = run_vectorized(participantes, max_rounds=0)
+        print(f"{n:<15}{'numpy, só guloso':<30}{duracao:>10.3f}{equipes:>9}{sobras:>8}{media * 100:>12.1f}%")
+        duracao, equipes, sobras, media = run_vectorized(participantes, max_rounds=50)
+        print(f"{n:<15}{'numpy, guloso + busca local':<30}{duracao:>10.3f}{equipes:>9}{sobras:>8}{media * 100:>12.1f}%")
+
+        if n <= args.naive_limit:
+            duracao, equipes = run_naive(participantes)
+            print(f"{n:<15}{'python puro, só guloso':<30}{duracao:>10.3f}{equipes:>9}{'-':>8}{'-':>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,38 @@
 import discord
 from discord.ext import commands
 import asyncio
+import io
+import time
 import config
 from database.db import create_tables, DatabaseManager
-from views.mentoria_view import MentoriaRequestView
+from database.participant_cache import get_participant_cache
+from database.team_index import get_team_index
+from database.guild_settings import get_guild_settings, parse_setting_channel, primary_guild, SETTINGS
+from matchmaking.skill_index import get_skill_index
+from views.mentoria_view import MentoriaRequestView, SolicitacoesView
 from views.team_view import TeamRequestView
 from views.welcome_view import WelcomeView
+from views.team_search_view import TeamApplicationModal
 from handlers.mentoria_handler import MentoriaHandler
 from handlers.team_handler import TeamHandler
 from handlers.voice_handler import VoiceHandler
+from handlers.voice_activity_handler import VoiceActivityHandler
+from handlers.verification_store import VerificationStore
+from handlers.notification_outbox import NotificationOutbox
+from handlers.application_handler import ApplicationHandler
+from handlers.application_inbox import ApplicationInbox
+from handlers.availability_board import AvailabilityBoard, parse_modalidade
+from handlers.shard_monitor import ShardMonitor
 from utils.logger import get_logger, set_bot_instance
+from utils.log_context import ContextCommandTree, bind_command
+from utils.perf import TimedContext, elapsed_ms, record_latency, format_latency_report
+from utils.metrics import get_metrics
+from utils.metrics_server import start_metrics_server
+from utils.rest_telemetry import rest_subsystem, get_rest_telemetry
+from utils.loop_watchdog import LoopWatchdog
+from utils.sampling_profiler import profile_loop
+from utils.mailer import Mailer
+from utils.timers import TimerHeap
 
 # Configurações do bot
 intents = discord.Intents.default()
@@ -17,18 +40,61 @@ intents.message_content = True
 intents.guilds = True
 intents.members = True
 
-class MentoriaBot(commands.Bot):
+class MentoriaBot(commands.AutoShardedBot):
     def __init__(self):
         super().__init__(
             command_prefix='n!',
             intents=intents,
-            description="Bot para solicitações de mentoria"
+            shard_count=config.SHARD_COUNT,
+            shard_ids=config.SHARD_IDS,
+            description="Bot para solicitações de mentoria",
+            tree_cls=ContextCommandTree,
+            http_trace=get_rest_telemetry().trace_config
         )
         self.mentoria_handler = None
         self.team_handler = None
         self.voice_handler = None
+        self.voice_activity = None
+        self.metrics_runner = None
+        self.loop_watchdog = None
+        self.mailer = None
+        self.timers = TimerHeap()
+        self.verification_store = None
+        self.application_handler = None
+        self.application_inbox = None
+        self.availability_board = None
+        self.outbox = NotificationOutbox(self)
         self.logger = get_logger()
 
+        # Prontidão por shard: tarefas de startup de cada servidor rodam quando o shard dele conecta
+        self.shard_monitor = ShardMonitor(self)
+        self.shard_monitor.add_guild_job(self.setup_guild_channels_and_panels)
+        self.shard_monitor.add_guild_job(self.seed_voice_sessions)
+
+        # Contexto de log e latência por comando de prefixo
+        self.before_invoke(self.bind_command_context)
+        self.after_invoke(self.log_command_completion)
+
+    async def get_context(self, origin, *, cls=TimedContext):
+        """Usa o Context cronometrado (marca a primeira resposta do comando)"""
+        return await super().get_context(origin, cls=cls)
+
+    async def bind_command_context(self, ctx):
+        """Inicia o contexto de log do comando (guild, usuário, equipe, comando)"""
+        bind_command(ctx)
+
+    async def log_command_completion(self, ctx):
+        """Registra a conclusão de um comando de prefixo com a duração"""
+        self.logger.event('command_completed', "Comando n!%s concluído", ctx.command.qualified_name,
+                          failed=ctx.command_failed, duration_ms=elapsed_ms())
+        record_latency('prefix', ctx.command.qualified_name)
+
+    async def on_app_command_completion(self, interaction, command):
+        """Registra a conclusão de um comando slash com a duração"""
+        self.logger.event('app_command_completed', "Comando /%s concluído", command.qualified_name,
+                          duration_ms=elapsed_ms())
+        record_latency('slash', command.qualified_name)
+
     async def setup_hook(self):
         """Configurações iniciais do bot"""
         try:
@@ -39,13 +105,60 @@ class MentoriaBot(commands.Bot):
             # Criar tabelas do banco de dados
             create_tables()
             self.logger.info("Tabelas do banco de dados verificadas/criadas")
+
+            # Configurações por servidor (canais e categorias)
+            try:
+                await get_guild_settings().load()
+            except Exception as e:
+                self.logger.error("Erro ao carregar as configurações dos servidores", exc_info=e)
+            get_guild_settings().subscribe(self.on_setting_changed)
+
+            # Índice de nomes de equipes com vagas (autocomplete do /aplicar)
+            try:
+                await get_team_index().load()
+            except Exception as e:
+                self.logger.error("Erro ao carregar o índice de equipes", exc_info=e)
+
+            # Índice TF-IDF das habilidades das pessoas disponíveis (/recomendar)
+            try:
+                await get_skill_index().load()
+            except Exception as e:
+                self.logger.error("Erro ao carregar o índice de habilidades", exc_info=e)
             
             # Inicializar handlers
             self.mentoria_handler = MentoriaHandler(self)
             self.team_handler = TeamHandler(self)
             self.voice_handler = VoiceHandler(self)
+            self.voice_activity = VoiceActivityHandler(self)
+            self.verification_store = VerificationStore(self, self.timers)
+            self.application_handler = ApplicationHandler(self)
+            self.application_inbox = ApplicationInbox(self, self.application_handler)
+            self.availability_board = AvailabilityBoard(self)
             self.logger.info("Handlers inicializados")
 
+            # Timers (expiração de códigos, remoção de canais de verificação)
+            self.timers.start()
+
+            # Latência do gateway e taxa de eventos por shard
+            self.shard_monitor.start()
+
+            # Endpoint de métricas (Prometheus)
+            if config.METRICS_PORT:
+                self.metrics_runner = await start_metrics_server(config.METRICS_HOST, config.METRICS_PORT)
+
+            # Watchdog de travamentos do event loop
+            if config.LOOP_WATCHDOG_THRESHOLD:
+                self.loop_watchdog = LoopWatchdog(threshold=config.LOOP_WATCHDOG_THRESHOLD)
+                self.loop_watchdog.start()
+
+            # Entrega de DMs/notificações gravadas no outbox
+            self.outbox.start()
+
+            # Fila de envio de emails (None se o SMTP não estiver configurado)
+            self.mailer = Mailer.from_config()
+            if self.mailer:
+                self.mailer.start()
+
             # Adicionar views persistentes
             self.add_view(MentoriaRequestView())
             self.add_view(TeamRequestView())
@@ -70,6 +183,9 @@ class MentoriaBot(commands.Bot):
 
         # Configurar logger para Discord (agora que o bot está online)
         set_bot_instance(self)
+        guild = primary_guild(self)
+        if guild:
+            self.on_setting_changed(guild.id, 'canal_logs', get_guild_settings().get(guild.id, 'canal_logs'))
 
         # Sincronizar comandos slash
         try:
@@ -78,12 +194,26 @@ class MentoriaBot(commands.Bot):
         except Exception as e:
             self.logger.error('Erro ao sincronizar comandos slash', exc_info=e)
 
-        # Limpar canais e enviar painéis
-        await self.setup_channels_and_panels()
-
-        # Iniciar limpeza periódica de canais de voz
+        # Iniciar limpeza periódica de canais de voz e preencher o pool de canais
         if self.voice_handler:
             self.loop.create_task(self.periodic_voice_cleanup())
+            self.voice_handler.start_pool_refill()
+
+        # Iniciar a gravação periódica da atividade de voz (sessões abertas quando cada shard fica pronto)
+        if self.voice_activity:
+            self.loop.create_task(self.voice_activity.run_flush_loop())
+
+        # Restaurar códigos de verificação pendentes (e seus timers) após um restart
+        if self.verification_store:
+            await self.verification_store.restore()
+
+        # Registrar novamente os painéis de aplicações dos líderes
+        if self.application_inbox:
+            await self.application_inbox.restore()
+
+        # Recuperar os quadros de disponibilidade publicados
+        if self.availability_board:
+            await self.availability_board.restore()
 
     async def on_message(self, message):
         """Processa mensagens"""
@@ -108,6 +238,10 @@ class MentoriaBot(commands.Bot):
 
     async def on_voice_state_update(self, member, before, after):
         """Processa mudanças de estado de voz"""
+        # Contabilizar tempo em voz (antes do sistema de canais temporários, que pode mover o membro)
+        if self.voice_activity:
+            self.voice_activity.handle_voice_state_update(member, before, after)
+
         # Processar sistema de canais temporários
         if self.voice_handler:
             await self.voice_handler.handle_voice_state_update(member, before, after)
@@ -138,14 +272,14 @@ class MentoriaBot(commands.Bot):
         except Exception as e:
             self.logger.error(f"Erro ao processar entrada do membro {member.id}", exc_info=e)
 
+    @rest_subsystem('boas_vindas')
     async def send_welcome_message(self, member):
         """Envia mensagem de boas-vindas personalizada"""
         try:
-            welcome_channel_id = 1402431275859579064
-            welcome_channel = self.get_channel(welcome_channel_id)
+            welcome_channel = get_guild_settings().channel(member.guild, 'canal_boas_vindas')
 
             if not welcome_channel:
-                self.logger.warning(f"Canal de boas-vindas {welcome_channel_id} não encontrado")
+                self.logger.warning(f"Canal de boas-vindas {get_guild_settings().get(member.guild.id, 'canal_boas_vindas')} não encontrado")
                 return
 
             # Criar embed principal de boas-vindas
@@ -263,33 +397,65 @@ class MentoriaBot(commands.Bot):
     async def close(self):
         """Limpeza ao fechar o bot"""
         self.logger.info("Desconectando bot...")
+        if self.voice_activity:
+            await self.voice_activity.flush()
+        if self.metrics_runner:
+            await self.metrics_runner.cleanup()
+        if self.loop_watchdog:
+            self.loop_watchdog.stop()
+        self.shard_monitor.stop()
+        if self.mailer:
+            await self.mailer.stop()
+        await self.outbox.stop()
+        await self.timers.stop()
         await DatabaseManager.close_engine()
         await super().close()
 
 
     async def periodic_voice_cleanup(self):
-        """Limpeza periódica de canais de voz temporários"""
+        """Varredura periódica de segurança dos canais de voz temporários"""
         while not self.is_closed():
             try:
-                await asyncio.sleep(300)  # A cada 5 minutos
+                # A remoção normal é feita pelos timers do VoiceHandler; aqui é só uma rede de segurança
+                await asyncio.sleep(config.TEMP_VOICE_SWEEP_INTERVAL)
                 if self.voice_handler:
                     await self.voice_handler.cleanup_abandoned_channels()
             except Exception as e:
                 self.logger.error("Erro na limpeza periódica de canais de voz", exc_info=e)
                 await asyncio.sleep(60)  # Aguardar 1 minuto antes de tentar novamente
 
-    async def setup_channels_and_panels(self):
-        """Limpa canais e envia painéis no startup"""
+    def on_setting_changed(self, guild_id, chave, valor):
+        """Aplica alterações de configuração que têm estado fora do cache"""
+        guild = primary_guild(self)
+        if not guild or guild.id != guild_id:
+            return
+
+        # Canal de logs (um por processo: o do servidor principal)
+        if chave == 'canal_logs':
+            discord_handler = self.logger.discord_handler
+            if discord_handler and discord_handler.channel_id != valor:
+                discord_handler.channel_id = valor
+                discord_handler.channel = None
+
+        # Pool de canais de voz fica na categoria do servidor principal
+        elif chave == 'categoria_voz' and self.voice_handler and self.is_ready():
+            self.voice_handler.start_pool_refill()
+
+    async def seed_voice_sessions(self, guild):
+        """Contabiliza quem já está em voz no servidor"""
+        if self.voice_activity:
+            self.voice_activity.seed_sessions([guild])
+
+    @rest_subsystem('startup')
+    async def setup_guild_channels_and_panels(self, guild):
+        """Limpa os canais e envia os painéis configurados no servidor (startup do shard)"""
         try:
-            # IDs dos canais
-            team_channel_id = 1421842573760135268      # Canal de criação de equipes
-            mentoria_channel_id = 1404479492814016703  # Canal de mentoria
-            announcements_channel_id = 1421850940767473715  # Canal de anúncios
+            settings = get_guild_settings()
 
             # Buscar canais
-            team_channel = self.get_channel(team_channel_id)
-            mentoria_channel = self.get_channel(mentoria_channel_id)
-            announcements_channel = self.get_channel(announcements_channel_id)
+            team_channel = settings.channel(guild, 'canal_equipes')
+            mentoria_channel = settings.channel(guild, 'canal_mentoria')
+            announcements_channel = settings.channel(guild, 'canal_anuncios')
 
             channels_cleaned = 0
 
@@ -327,10 +493,10 @@ class MentoriaBot(commands.Bot):
                 await self.send_updates_announcement(announcements_channel, channels_cleaned)
 
             # Reenviar painéis de liderança
-            await self.resend_leader_panels()
+            await self.resend_leader_panels(guild)
 
         except Exception as e:
-            self.logger.error("Erro no setup de canais e painéis", exc_info=e)
+            self.logger.error(f"Erro no setup de canais e painéis do servidor {guild.id}", exc_info=e)
 
     async def send_mentoria_panel(self, channel):
         """Envia o painel de mentoria para um canal específico"""
@@ -497,9 +663,9 @@ Agora você pode criar e liderar sua própria equipe!
 
             embed.add_field(
                 name="📍 Onde Encontrar",
-                value="""
-                🎓 **Mentoria:** <#1404479492814016703>
-                🏆 **Equipes:** <#1421842573760135268>
+                value=f"""
+                🎓 **Mentoria:** <#{get_guild_settings().get(channel.guild.id, 'canal_mentoria')}>
+                🏆 **Equipes:** <#{get_guild_settings().get(channel.guild.id, 'canal_equipes')}>
                 🔊 **Canais Temporários:** Entre no canal trigger de voz
                 """,
                 inline=False
@@ -527,16 +693,17 @@ Agora você pode criar e liderar sua própria equipe!
         except Exception as e:
             self.logger.error("Erro ao enviar anúncio de atualizações", exc_info=e)
 
-    async def resend_leader_panels(self):
-        """Reenvia painéis de liderança na categoria especificada"""
+    @rest_subsystem('paineis_lider')
+    async def resend_leader_panels(self, guild):
+        """Reenvia painéis de liderança na categoria configurada no servidor"""
         try:
             self.logger.info("Iniciando reenvio de painéis de liderança...")
 
-            # ID da categoria específica solicitada
-            target_category_id = 1421848872401240127
+            # Categoria de liderança configurada no servidor
+            target_category_id = get_guild_settings().get(guild.id, 'categoria_lideranca')
 
             # Buscar a categoria alvo
-            target_category = self.get_channel(target_category_id)
+            target_category = guild.get_channel(target_category_id)
             if not target_category or not isinstance(target_category, discord.CategoryChannel):
                 self.logger.warning(f"Categoria {target_category_id} não encontrada ou não é uma categoria")
                 return
@@ -686,6 +853,7 @@ async def help_command(ctx):
         `n!membros` ou `/membros` - Lista membros por roles e status
         `n!info_equipe` - Ver informações sobre uma equipe
         `n!listar_equipes` - Listar todas as equipes do servidor
+        `/aplicar` - Aplicar para uma equipe com vagas
         """,
         inline=False
     )
@@ -699,6 +867,16 @@ async def help_command(ctx):
         inline=False
     )
 
+    # Comandos para líderes de equipe
+    embed.add_field(
+        name="👑 Comandos para Líderes",
+        value="""
+        `/aplicacoes` - Painel de aplicações pendentes da equipe
+        `/recomendar` - Pessoas disponíveis com habilidades complementares
+        """,
+        inline=False
+    )
+
     # Comandos administrativos
     embed.add_field(
         name="⚙️ Comandos Administrativos",
@@ -708,9 +886,16 @@ async def help_command(ctx):
         `n!export` ou `/export` - Exportar relatório de solicitações
         `n!clear` ou `/clear` - Limpar mensagens do chat
         `n!setup_equipes` - Configurar painel de equipes
+        `n!quadro_disponibilidade <modalidade>` - Publicar quadro de disponibilidade
+        `n!configurar [chave] [#canal|padrao]` - Ver/alterar canais do servidor
         `n!canais_temp` - Listar canais de voz temporários
         `n!limpar_canais` - Forçar limpeza de canais vazios
         `n!remover_canal_usuario` - Remover canais de um usuário
+        `n!horas_voz` - Ver horas em canais de voz por equipe
+        `n!perf` - Ver latência de comandos e botões (p50/p99)
+        `n!rest` - Ver uso da API e rate limits por rota/subsistema
+        `n!shards` - Ver prontidão, latência e eventos por shard
+        `n!profile [segundos]` - Perfilar o bot em execução (flamegraph)
         `n!reset_leader_panels` - Resetar painéis de liderança
         `n!test_welcome` - Testar mensagem de boas-vindas
         """,
@@ -727,6 +912,7 @@ async def help_command(ctx):
         • `/export` - Exportar dados
         • `/clear` - Limpar mensagens
         • `/solicitacoes` - Ver solicitações (mentores)
+        • `/aplicacoes` - Painel de aplicações (líderes)
         • `/ajuda` - Esta mensagem de ajuda
         """,
         inline=False
@@ -749,6 +935,68 @@ async def setup_equipes(ctx):
     await bot.send_team_panel()
     await ctx.send("✅ Painel de equipes configurado!")
 
+@bot.command(name='quadro_disponibilidade', aliases=['availability_board'])
+@commands.has_permissions(administrator=True)
+async def quadro_disponibilidade(ctx, modalidade: str = None):
+    """Publica neste canal o quadro de disponibilidade de uma modalidade (atualizado automaticamente)"""
+    modalidade_enum = parse_modalidade(modalidade)
+    if modalidade_enum is None:
+        await ctx.send("❌ Use: `n!quadro_disponibilidade presencial` ou `n!quadro_disponibilidade remoto`")
+        return
+
+    try:
+        await bot.availability_board.publish(ctx.channel, modalidade_enum)
+        await ctx.message.delete()
+    except discord.Forbidden:
+        pass
+    except Exception as e:
+        await ctx.send("❌ Erro ao publicar o quadro de disponibilidade.")
+        bot.logger.error(f"Erro ao publicar quadro de disponibilidade", exc_info=e)
+
+@bot.command(name='configurar', aliases=['config'])
+@commands.has_permissions(administrator=True)
+async def configurar(ctx, chave: str = None, *, valor: str = None):
+    """Mostra ou altera os canais e categorias usados pelo bot neste servidor"""
+    settings = get_guild_settings()
+
+    if not chave:
+        embed = discord.Embed(
+            title="⚙️ Configuração do Servidor",
+            description="Use `n!configurar <chave> <#canal|ID>` para alterar ou `n!configurar <chave> padrao` para voltar ao padrão.",
+            color=discord.Color.blue()
+        )
+        for nome, setting in SETTINGS.items():
+            origem = "padrão" if settings.is_default(ctx.guild.id, nome) else "configurado"
+            embed.add_field(
+                name=f"`{nome}`",
+                value=f"{setting.descricao}\n<#{settings.get(ctx.guild.id, nome)}> ({origem})",
+                inline=False
+            )
+        await ctx.send(embed=embed)
+        return
+
+    chave = chave.lower()
+    if chave not in SETTINGS:
+        await ctx.send(f"❌ Configuração desconhecida. Opções: {', '.join(f'`{nome}`' for nome in SETTINGS)}")
+        return
+
+    try:
+        if valor and valor.strip().lower() in ('padrao', 'padrão', 'default'):
+            await settings.reset(ctx.guild.id, chave)
+            await ctx.send(f"✅ `{chave}` voltou ao padrão: <#{settings.get(ctx.guild.id, chave)}>")
+            return
+
+        channel = parse_setting_channel(ctx.guild, chave, valor)
+        if not channel:
+            await ctx.send(f"❌ Informe um canal do tipo **{SETTINGS[chave].tipo}** deste servidor (menção ou ID).")
+            return
+
+        await settings.set(ctx.guild.id, chave, channel.id)
+        await ctx.send(f"✅ `{chave}` configurado: {channel.mention}")
+    except Exception as e:
+        await ctx.send("❌ Erro ao salvar a configuração.")
+        bot.logger.error(f"Erro ao configurar {chave} no servidor {ctx.guild.id}", exc_info=e)
+
 @bot.command(name='info_equipe', aliases=['equipe_info'])
 async def info_equipe(ctx, *, nome_equipe: str = None):
     """Mostra informações sobre uma equipe"""
@@ -911,6 +1159,20 @@ async def listar_equipes(ctx):
     except Exception as e:
         await ctx.send(f"❌ Erro ao listar equipes: {str(e)}")
 
+def add_voice_pool_field(embed, pool_info):
+    """Adiciona ao embed o estado do pool de canais e as latências de criação"""
+    if pool_info['size'] > 0:
+        pool_text = f"**Disponíveis:** {pool_info['available']}/{pool_info['size']}\n"
+        pool_text += f"**Acertos/Faltas:** {pool_info['hits']}/{pool_info['misses']}\n"
+    else:
+        pool_text = "**Pool:** desativado\n"
+
+    labels = {'pool': 'Pool', 'create': 'Criação'}
+    for source, latency in pool_info['latency'].items():
+        pool_text += f"**{labels[source]}:** p50 {latency['p50']:.2f}s | p99 {latency['p99']:.2f}s ({latency['count']} amostras)\n"
+
+    embed.add_field(name="⚡ Pool e Latência", value=pool_text, inline=False)
+
 @bot.command(name='canais_temp', aliases=['temp_channels'])
 @commands.has_permissions(administrator=True)
 async def listar_canais_temp(ctx):
@@ -921,6 +1183,7 @@ async def listar_canais_temp(ctx):
             return
 
         channels_info = bot.voice_handler.get_temp_channels_info()
+        pool_info = bot.voice_handler.get_pool_info()
 
         if not channels_info:
             embed = discord.Embed(
@@ -928,6 +1191,7 @@ async def listar_canais_temp(ctx):
                 description="Não há canais de voz temporários ativos no momento.",
                 color=discord.Color.orange()
             )
+            add_voice_pool_field(embed, pool_info)
             await ctx.send(embed=embed)
             return
 
@@ -947,18 +1211,23 @@ async def listar_canais_temp(ctx):
             if len(members_text) > 100:
                 members_text = members_text[:100] + "..."
 
+            delete_at = info['delete_at']
+            deletion_text = f"<t:{int(delete_at)}:R>" if delete_at else "Não agendada"
+
             embed.add_field(
                 name=f"{i}. {channel.name}",
                 value=f"""
                 **Criador:** {creator}
                 **Membros:** {member_count}
                 **Usuários:** {members_text}
+                **Remoção:** {deletion_text}
                 **ID:** {channel.id}
                 """,
                 inline=False
             )
 
-        embed.set_footer(text="Use n!limpar_canais para remover canais vazios")
+        add_voice_pool_field(embed, pool_info)
+        embed.set_footer(text=f"Canais vazios são removidos após {bot.voice_handler.delete_grace:g}s | Use n!limpar_canais para remover canais vazios")
         await ctx.send(embed=embed)
 
     except Exception as e:
@@ -1003,7 +1272,7 @@ async def reset_leader_panels_command(ctx):
         await ctx.send("🔄 **Reiniciando painéis de liderança...**")
 
         # Executar o reset
-        await bot.resend_leader_panels()
+        await bot.resend_leader_panels(ctx.guild)
 
         embed = discord.Embed(
             title="✅ Painéis de Liderança Resetados",
@@ -1013,7 +1282,7 @@ async def reset_leader_panels_command(ctx):
 
         embed.add_field(
             name="📍 Categoria Alvo",
-            value="1421848872401240127",
+            value=f"<#{get_guild_settings().get(ctx.guild.id, 'categoria_lideranca')}>",
             inline=True
         )
 
@@ -1050,7 +1319,7 @@ async def test_welcome_command(ctx, member: discord.Member = None):
 
         embed.add_field(
             name="📍 Canal de Destino",
-            value="1402431275859579064",
+            value=f"<#{get_guild_settings().get(member.guild.id, 'canal_boas_vindas')}>",
             inline=True
         )
 
@@ -1093,6 +1362,218 @@ async def remover_canais_usuario(ctx, user: discord.Member):
     except Exception as e:
         await ctx.send(f"❌ Erro ao remover canais do usuário: {str(e)}")
 
+@bot.command(name='horas_voz', aliases=['voice_hours'])
+@commands.has_permissions(administrator=True)
+async def horas_voz(ctx):
+    """Mostra as horas em canais de voz por equipe"""
+    try:
+        if not bot.voice_activity:
+            await ctx.send("❌ Sistema de atividade de voz não está ativo.")
+            return
+
+        # Gravar o tempo acumulado antes de consultar
+        await bot.voice_activity.flush()
+        teams, channel_types = await bot.voice_activity.get_team_hours()
+
+        embed = discord.Embed(
+            title="🎙️ Horas em Canais de Voz",
+            color=discord.Color.blue()
+        )
+
+        if teams:
+            team_list = "\n".join(
+                f"**{i}.** {team_name} - {hours:.1f}h" for i, (team_name, hours) in enumerate(teams, 1)
+            )
+        else:
+            team_list = "Nenhuma atividade registrada ainda."
+
+        embed.add_field(name="🏆 Por Equipe", value=team_list, inline=False)
+        embed.add_field(
+            name="📊 Por Tipo de Canal",
+            value=f"""
+            **Equipes:** {channel_types.get('equipe', 0):.1f}h
+            **Temporários:** {channel_types.get('temporario', 0):.1f}h
+            **Outros:** {channel_types.get('outro', 0):.1f}h
+            """,
+            inline=False
+        )
+        embed.set_footer(text=f"Atividade gravada a cada {bot.voice_activity.flush_interval}s")
+
+        await ctx.send(embed=embed)
+
+    except Exception as e:
+        bot.logger.error(f"Erro no comando de horas de voz", exc_info=e)
+        await ctx.send(f"❌ Erro ao buscar horas de voz: {str(e)}")
+
+@bot.command(name='perf', aliases=['latencia'])
+@commands.has_permissions(administrator=True)
+async def perf_command(ctx, filtro: str = None):
+    """Mostra a latência (p50/p99) de comandos e interações"""
+    try:
+        # Filtro opcional: tipo (prefix, slash, component, modal) ou parte do nome
+        kinds = ('prefix', 'slash', 'component', 'modal')
+        if filtro in kinds:
+            rows = format_latency_report(kind=filtro)
+        else:
+            rows = format_latency_report(name_filter=filtro)
+
+        embed = discord.Embed(
+            title="⏱️ Latência de Comandos e Interações",
+            description="Tempo total do handler e até a primeira resposta (p50 / p99)",
+            color=discord.Color.blue()
+        )
+
+        def fmt(seconds):
+            return f"{seconds * 1000:.0f}ms" if seconds is not None else "-"
+
+        if not rows:
+            embed.add_field(name="Sem dados", value="Nenhuma execução registrada ainda.", inline=False)
+
+        for row in rows[:20]:
+            embed.add_field(
+                name=f"{row['name']} ({row['kind']})",
+                value=f"""
+                **Execuções:** {row['count']}
+                **Handler:** {fmt(row['p50'])} / {fmt(row['p99'])}
+                **1ª resposta:** {fmt(row['first_p50'])} / {fmt(row['first_p99'])}
+                """,
+                inline=True
+            )
+
+        # Atraso do event loop e chamadas que mais o bloquearam
+        lag = get_metrics().get_histogram('event_loop_lag_seconds')
+        if lag:
+            loop_info = f"**Atraso:** {fmt(lag.percentile(0.5))} / {fmt(lag.percentile(0.99))}"
+            if bot.loop_watchdog and bot.loop_watchdog.sites:
+                loop_info += "\n" + "\n".join(
+                    f"`{site}` - {count}×" for site, count in bot.loop_watchdog.top_sites()
+                )
+            embed.add_field(name="🔁 Event Loop", value=loop_info[:1024], inline=False)
+
+        footer = f"Ordenado pelo p99 | Filtros: {', '.join(kinds)} ou parte do nome"
+        if config.METRICS_PORT:
+            footer += f" | Prometheus: :{config.METRICS_PORT}/metrics"
+        embed.set_footer(text=footer)
+
+        await ctx.send(embed=embed)
+
+    except Exception as e:
+        bot.logger.error(f"Erro no comando perf", exc_info=e)
+        await ctx.send(f"❌ Erro ao buscar latências: {str(e)}")
+
+@bot.command(name='rest', aliases=['ratelimits'])
+@commands.has_permissions(administrator=True)
+async def rest_stats(ctx):
+    """Mostra requisições e rate limits da API do Discord por rota e subsistema"""
+    try:
+        telemetry = get_rest_telemetry()
+        routes, subsystems = telemetry.report()
+
+        embed = discord.Embed(
+            title="🌐 API do Discord - Rate Limits",
+            description="Requisições, respostas 429 e tempo de espera (retry-after) desde o início do bot",
+            color=discord.Color.orange()
+        )
+
+        if subsystems:
+            subsystem_list = "\n".join(
+                f"**{name}:** {row['requests']:.0f} req | {row['ratelimited']:.0f}× 429 | {row['retry_after']:.1f}s"
+                for name, row in subsystems
+            )
+        else:
+            subsystem_list = "Nenhuma requisição registrada ainda."
+        embed.add_field(name="🧩 Por Subsistema", value=subsystem_list[:1024], inline=False)
+
+        if routes:
+            route_list = "\n".join(
+                f"`{route}`\n{row['requests']:.0f} req | {row['ratelimited']:.0f}× 429 | "
+                f"{row['retry_after']:.1f}s | esgotado {row['exhausted']:.0f}×"
+                for route, row in routes[:10]
+            )
+            embed.add_field(name="🛣️ Rotas (mais limitadas primeiro)", value=route_list[:1024], inline=False)
+
+        # Buckets com pouca folga na última resposta
+        saturated = [
+            (route, bucket) for route, bucket in telemetry.buckets.items()
+            if bucket['limit'] and bucket['remaining'] / bucket['limit'] <= 0.2
+        ]
+        if saturated:
+            saturated_list = "\n".join(
+                f"`{route}` {bucket['remaining']}/{bucket['limit']} (reset em {bucket['reset_after']:.1f}s)"
+                for route, bucket in saturated[:10]
+            )
+            embed.add_field(name="🔥 Buckets Saturados", value=saturated_list[:1024], inline=False)
+
+        if config.METRICS_PORT:
+            embed.set_footer(text=f"Métricas completas em :{config.METRICS_PORT}/metrics")
+
+        await ctx.send(embed=embed)
+
+    except Exception as e:
+        bot.logger.error(f"Erro no comando rest", exc_info=e)
+        await ctx.send(f"❌ Erro ao buscar telemetria da API: {str(e)}")
+
+@bot.command(name='shards')
+@commands.has_permissions(administrator=True)
+async def shards_status(ctx):
+    """Mostra a prontidão, a latência do gateway e a taxa de eventos de cada shard"""
+    try:
+        # Valores da última amostragem periódica (SHARD_METRICS_INTERVAL)
+        linhas = []
+        for shard_id, pronto, latencia, taxa, servidores in bot.shard_monitor.report():
+            status = "🟢" if pronto else "🔴"
+            latencia = f"{latencia * 1000:.0f}ms" if latencia is not None else "-"
+            taxa = f"{taxa:.1f} eventos/s" if taxa is not None else "-"
+            linhas.append(f"{status} **Shard {shard_id}** | {latencia} | {taxa} | {servidores} servidor(es)")
+
+        embed = discord.Embed(
+            title="🧭 Shards do Gateway",
+            description="\n".join(linhas) or "Nenhum shard conectado.",
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"Este servidor está no shard {ctx.guild.shard_id} de {bot.shard_count}")
+        await ctx.send(embed=embed)
+
+    except Exception as e:
+        bot.logger.error(f"Erro no comando shards", exc_info=e)
+        await ctx.send(f"❌ Erro ao buscar o estado dos shards: {str(e)}")
+
+@bot.command(name='profile', aliases=['perfilar'])
+@commands.has_permissions(administrator=True)
+async def profile_command(ctx, segundos: int = 30):
+    """Perfila o bot em execução por amostragem e envia o resultado como anexo"""
+    try:
+        segundos = max(1, min(segundos, 120))
+        await ctx.send(f"🔬 **Coletando amostras por {segundos}s...**")
+
+        profiler = await profile_loop(segundos)
+        if profiler is None:
+            await ctx.send("❌ Já existe um profiling em andamento.")
+            return
+
+        embed = discord.Embed(
+            title="🔬 Profiling Concluído",
+            description=f"**Amostras:** {profiler.samples} em {segundos}s ({profiler.interval * 1000:.0f}ms entre amostras)",
+            color=discord.Color.green()
+        )
+
+        if profiler.samples:
+            top_list = "\n".join(
+                f"`{function}` - {count / profiler.samples:.1%}"
+                for function, count in profiler.top_functions()
+            )
+            embed.add_field(name="🔥 Funções com mais tempo próprio", value=top_list[:1024], inline=False)
+
+        embed.set_footer(text="Arquivo no formato collapsed stack: use flamegraph.pl ou speedscope.app")
+
+        filename = f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+        file = discord.File(io.BytesIO(profiler.collapsed().encode('utf-8')), filename=filename)
+        await ctx.send(embed=embed, file=file)
+
+    except Exception as e:
+        bot.logger.error(f"Erro no comando profile", exc_info=e)
+        await ctx.send(f"❌ Erro ao executar profiling: {str(e)}")
+
 @bot.command(name='setup')
 @commands.has_permissions(administrator=True)
 async def setup_mentoria(ctx):
@@ -1450,52 +1931,122 @@ async def list_solicitacoes(interaction: discord.Interaction):
             )
             return
         
-        from sqlalchemy import select
-        from database.models import SolicitacaoMentoria, StatusSolicitacaoEnum
-        
-        async with await DatabaseManager.get_session() as session:
-            result = await session.execute(
-                select(SolicitacaoMentoria)
-                .where(SolicitacaoMentoria.status == StatusSolicitacaoEnum.PENDENTE)
-                .order_by(SolicitacaoMentoria.data_solicitacao.desc())
-                .limit(10)
-            )
-            solicitacoes = result.scalars().all()
+        # Paginação por keyset: cada clique busca só uma página (filtro padrão: pendentes).
+        # Mesmo sem pendentes a view é exibida, para que o filtro permita ver os demais status
+        await SolicitacoesView(interaction.user.id).send(interaction)
         
-        if not solicitacoes:
-            embed = discord.Embed(
-                title="📭 Nenhuma Solicitação Pendente",
-                description="Não há solicitações pendentes no momento.",
-                color=discord.Color.orange()
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+    except Exception as e:
+        await interaction.response.send_message(
+            "❌ Erro ao buscar solicitações.",
+            ephemeral=True
+        )
+        bot.logger.error(f"Erro ao listar solicitações", exc_info=e)
+
+# Autocomplete do nome da equipe: índice em memória das equipes com vagas
+async def equipe_autocomplete(interaction: discord.Interaction, current: str):
+    participante = await get_participant_cache().get_by_discord_id(interaction.user.id)
+    nomes = get_team_index().complete(
+        current,
+        modalidade=participante.modalidade if participante else None,
+        excluir=participante.nome_equipe if participante else None
+    )
+    return [discord.app_commands.Choice(name=nome, value=nome) for nome in nomes]
+
+# Comando para aplicar para uma equipe (nome escolhido no autocomplete)
+@bot.tree.command(name='aplicar', description='Aplicar para uma equipe com vagas')
+@discord.app_commands.describe(equipe='Nome da equipe (comece a digitar para ver as sugestões)')
+@discord.app_commands.autocomplete(equipe=equipe_autocomplete)
+async def aplicar(interaction: discord.Interaction, equipe: str):
+    """Abre o formulário de aplicação com a equipe já preenchida"""
+    try:
+        participante = await get_participant_cache().get_by_discord_id(interaction.user.id)
+        if not participante:
+            await interaction.response.send_message("❌ Você precisa se inscrever no evento primeiro.", ephemeral=True)
             return
-        
+
+        index = get_team_index()
+        nome_equipe = index.resolve(equipe)
+        if not nome_equipe or nome_equipe == participante.nome_equipe:
+            sugestoes = index.complete(equipe[:3], modalidade=participante.modalidade, excluir=participante.nome_equipe, limit=5)
+            mensagem = f"❌ A equipe '{equipe}' não foi encontrada."
+            if sugestoes:
+                mensagem += "\nVocê quis dizer: " + ", ".join(f"**{nome}**" for nome in sugestoes) + "?"
+            await interaction.response.send_message(mensagem, ephemeral=True)
+            return
+
+        if not index.has_open_slots(nome_equipe):
+            await interaction.response.send_message(f"❌ A equipe **{nome_equipe}** já está completa.", ephemeral=True)
+            return
+
+        await interaction.response.send_modal(TeamApplicationModal(participante.id, nome_equipe))
+
+    except Exception as e:
+        if not interaction.response.is_done():
+            await interaction.response.send_message("❌ Erro ao abrir o formulário de aplicação.", ephemeral=True)
+        bot.logger.error(f"Erro ao aplicar para equipe", exc_info=e)
+
+# Recomendação de pessoas disponíveis com habilidades complementares às da equipe
+@bot.tree.command(name='recomendar', description='Recomendar pessoas disponíveis com habilidades complementares à sua equipe')
+@discord.app_commands.describe(habilidades='Habilidades que a equipe procura (opcional, ex: design, dados)')
+async def recomendar(interaction: discord.Interaction, habilidades: str = None):
+    """Ranqueia as pessoas disponíveis da mesma modalidade pelo índice de habilidades em memória"""
+    try:
+        participante = await get_participant_cache().get_by_discord_id(interaction.user.id)
+        if not participante:
+            await interaction.response.send_message("❌ Você precisa se inscrever no evento primeiro.", ephemeral=True)
+            return
+        if not participante.nome_equipe:
+            await interaction.response.send_message("❌ Você precisa ter uma equipe para receber recomendações.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        recomendacoes = await get_skill_index().recommend_for_team(participante, procurando=habilidades, limit=10)
+
+        if not recomendacoes:
+            descricao = "Nenhuma pessoa disponível na sua modalidade"
+            descricao += f" com habilidades em **{habilidades}**." if habilidades else "."
+            embed = discord.Embed(title="📭 Nenhuma Recomendação", description=descricao, color=discord.Color.orange())
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+
         embed = discord.Embed(
-            title="📋 Solicitações Pendentes",
-            description=f"**{len(solicitacoes)}** solicitação(ões) aguardando mentor",
+            title=f"🎯 Recomendações para {participante.nome_equipe}",
+            description=(f"Pessoas disponíveis com **{habilidades}** e habilidades complementares às da equipe"
+                         if habilidades else "Pessoas disponíveis com habilidades complementares às da equipe"),
             color=discord.Color.blue()
         )
-        
-        for s in solicitacoes[:5]:
-            field_value = f"**Solicitante:** {s.discord_username}\n"
-            field_value += f"**Data:** {s.data_solicitacao.strftime('%d/%m %H:%M')}\n"
-            field_value += f"**Descrição:** {s.descricao[:100]}{'...' if len(s.descricao) > 100 else ''}"
-            
+        for posicao, recomendacao in enumerate(recomendacoes, start=1):
+            pessoa = recomendacao.participante
+            descricao = pessoa.descricao_habilidades[:200] + ("..." if len(pessoa.descricao_habilidades) > 200 else "")
             embed.add_field(
-                name=f"#{s.id} - {s.titulo}",
-                value=field_value,
+                name=f"{posicao}. {pessoa.nome} {pessoa.sobrenome} ({round(recomendacao.score * 100)}%)",
+                value=f"<@{pessoa.discord_user_id}> • {pessoa.cidade}\n{descricao}",
                 inline=False
             )
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        
+        embed.set_footer(text="Complementaridade = habilidades que a equipe ainda não tem • Convide pelo DM ou peça para aplicarem com /aplicar")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
     except Exception as e:
-        await interaction.response.send_message(
-            "❌ Erro ao buscar solicitações.",
-            ephemeral=True
-        )
-        bot.logger.error(f"Erro ao listar solicitações", exc_info=e)
+        if not interaction.response.is_done():
+            await interaction.response.send_message("❌ Erro ao buscar recomendações.", ephemeral=True)
+        bot.logger.error(f"Erro ao recomendar pessoas", exc_info=e)
+
+# Painel de aplicações para líderes de equipe
+@bot.tree.command(name='aplicacoes', description='Abrir o painel de aplicações pendentes da sua equipe')
+async def list_aplicacoes(interaction: discord.Interaction):
+    """Publica o painel de aplicações no canal de liderança (ou mostra um painel temporário)"""
+    try:
+        lider = await get_participant_cache().get_by_discord_id(interaction.user.id)
+        if not lider:
+            await interaction.response.send_message("❌ Você não está inscrito no evento.", ephemeral=True)
+            return
+
+        await bot.application_inbox.open(interaction, lider)
+
+    except Exception as e:
+        if not interaction.response.is_done():
+            await interaction.response.send_message("❌ Erro ao abrir o painel de aplicações.", ephemeral=True)
+        bot.logger.error(f"Erro ao abrir painel de aplicações", exc_info=e)
 
 # Comando slash para ajuda
 @bot.tree.command(name='ajuda', description='Mostrar todos os comandos disponíveis')
@@ -1513,6 +2064,7 @@ async def help_command_slash(interaction: discord.Interaction):
         value="""
         `n!ajuda` ou `/ajuda` - Mostra esta mensagem de ajuda
         `n!membros` ou `/membros` - Lista membros por roles e status
+        `/aplicar` - Aplicar para uma equipe com vagas
         """,
         inline=False
     )
@@ -1526,6 +2078,16 @@ async def help_command_slash(interaction: discord.Interaction):
         inline=False
     )
 
+    # Comandos para líderes de equipe
+    embed.add_field(
+        name="👑 Comandos para Líderes",
+        value="""
+        `/aplicacoes` - Painel de aplicações pendentes da equipe
+        `/recomendar` - Pessoas disponíveis com habilidades complementares
+        """,
+        inline=False
+    )
+
     # Comandos administrativos
     embed.add_field(
         name="⚙️ Comandos Administrativos",
@@ -1534,6 +2096,9 @@ async def help_command_slash(interaction: discord.Interaction):
         `n!stats` ou `/stats` - Ver estatísticas de mentoria
         `n!export` ou `/export` - Exportar relatório de solicitações
         `n!clear` ou `/clear` - Limpar mensagens do chat
+        `n!quadro_disponibilidade <modalidade>` - Publicar quadro de disponibilidade
+        `n!configurar [chave] [#canal|padrao]` - Ver/alterar canais do servidor
+        `n!shards` - Ver prontidão, latência e eventos por shard
         """,
         inline=False
     )
@@ -1548,6 +2113,7 @@ async def help_command_slash(interaction: discord.Interaction):
         • `/export` - Exportar dados
         • `/clear` - Limpar mensagens
         • `/solicitacoes` - Ver solicitações (mentores)
+        • `/aplicacoes` - Painel de aplicações (líderes)
         • `/ajuda` - Esta mensagem de ajuda
         """,
         inline=False
@@ -1696,6 +2262,10 @@ async def list_members_by_role_slash(interaction: discord.Interaction):
 @listar_canais_temp.error
 @limpar_canais_temp.error
 @remover_canais_usuario.error
+@horas_voz.error
+@perf_command.error
+@rest_stats.error
+@profile_command.error
 @setup_mentoria.error
 @mentoria_stats.error
 @export_solicitacoes.error
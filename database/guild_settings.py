@@ -0,0 +1,155 @@
+"""
+Configuração por servidor (canais e categorias usados pelo bot)
+Os valores ficam na tabela configuracoes_servidor e em um cache em memória carregado no
+startup; quem não configurou uma chave usa o ID padrão do evento. Alterações feitas com
+n!configurar avisam os interessados (ex: canal de logs) sem precisar de redeploy
+"""
+
+import re
+from collections import namedtuple
+import discord
+from sqlalchemy import select, delete
+from database.db import DatabaseManager
+from database.models import ConfiguracaoServidor
+from utils.logger import get_logger
+import config
+
+Setting = namedtuple('Setting', ['descricao', 'tipo', 'padrao'])
+
+# Chaves configuráveis: tipo do canal esperado (texto, voz ou categoria) e ID padrão
+SETTINGS = {
+    'canal_boas_vindas': Setting("Canal das mensagens de boas-vindas", 'texto', 1402431275859579064),
+    'canal_equipes': Setting("Canal do painel de equipes", 'texto', 1421842573760135268),
+    'canal_mentoria': Setting("Canal do painel de mentoria", 'texto', 1404479492814016703),
+    'canal_anuncios': Setting("Canal de anúncios do bot", 'texto', 1421850940767473715),
+    'canal_mentores': Setting("Canal onde os mentores recebem as solicitações", 'texto', 1404498946482503906),
+    'canal_logs': Setting("Canal de logs de erro/aviso", 'texto', config.LOG_CHANNEL_ID),
+    'categoria_lideranca': Setting("Categoria dos canais de liderança das equipes", 'categoria', 1421848872401240127),
+    'canal_voz_trigger': Setting("Canal de voz que cria canais temporários", 'voz', 1421849681637670993),
+    'categoria_voz': Setting("Categoria dos canais de voz temporários", 'categoria', 1421849561072144534),
+}
+
+# Tipo de canal aceito para cada tipo de configuração
+CHANNEL_TYPES = {
+    'texto': discord.TextChannel,
+    'voz': discord.VoiceChannel,
+    'categoria': discord.CategoryChannel,
+}
+
+
+class GuildSettings:
+    """Cache (guild_id, chave): valor com as configurações gravadas no banco"""
+
+    def __init__(self):
+        self.logger = get_logger()
+        self.values = {}  # (guild_id, chave): ID configurado
+        self.listeners = []  # callbacks chamados com (guild_id, chave, valor) a cada alteração
+        self.loaded = False
+
+    async def load(self):
+        """(Re)carrega do banco as configurações de todos os servidores"""
+        async with await DatabaseManager.get_session() as session:
+            result = await session.execute(select(ConfiguracaoServidor))
+            rows = result.scalars().all()
+
+        self.values = {(row.guild_id, row.chave): row.valor for row in rows if row.chave in SETTINGS}
+        self.loaded = True
+
+    def get(self, guild_id, chave, padrao=None):
+        """ID configurado no servidor; sem configuração, `padrao` ou o ID padrão da chave"""
+        valor = self.values.get((guild_id, chave))
+        if valor is not None:
+            return valor
+        return padrao if padrao is not None else SETTINGS[chave].padrao
+
+    def channel(self, guild, chave):
+        """Canal (ou categoria) configurado no servidor, se existir nele"""
+        return guild.get_channel(self.get(guild.id, chave))
+
+    def is_default(self, guild_id, chave):
+        return (guild_id, chave) not in self.values
+
+    async def set(self, guild_id, chave, valor):
+        """Grava a configuração do servidor e avisa os interessados"""
+        if chave not in SETTINGS:
+            raise ValueError(f"Configuração desconhecida: {chave}")
+
+        async with await DatabaseManager.get_session() as session:
+            result = await session.execute(
+                select(ConfiguracaoServidor).where(
+                    ConfiguracaoServidor.guild_id == guild_id,
+                    ConfiguracaoServidor.chave == chave
+                )
+            )
+            row = result.scalar_one_or_none()
+            if row:
+                row.valor = valor
+            else:
+                session.add(ConfiguracaoServidor(guild_id=guild_id, chave=chave, valor=valor))
+            await session.commit()
+
+        self.values[(guild_id, chave)] = valor
+        self._notify(guild_id, chave)
+
+    async def reset(self, guild_id, chave):
+        """Volta a chave do servidor para o ID padrão"""
+        if chave not in SETTINGS:
+            raise ValueError(f"Configuração desconhecida: {chave}")
+
+        async with await DatabaseManager.get_session() as session:
+            await session.execute(
+                delete(ConfiguracaoServidor).where(
+                    ConfiguracaoServidor.guild_id == guild_id,
+                    ConfiguracaoServidor.chave == chave
+                )
+            )
+            await session.commit()
+
+        self.values.pop((guild_id, chave), None)
+        self._notify(guild_id, chave)
+
+    def subscribe(self, callback):
+        """Registra um callback chamado com (guild_id, chave, valor) quando uma configuração muda"""
+        self.listeners.append(callback)
+
+    def _notify(self, guild_id, chave):
+        valor = self.get(guild_id, chave)
+        for callback in self.listeners:
+            try:
+                callback(guild_id, chave, valor)
+            except Exception as e:
+                self.logger.error(f"Erro ao aplicar a configuração {chave} do servidor {guild_id}", exc_info=e)
+
+
+def parse_setting_channel(guild, chave, texto):
+    """Canal do servidor indicado por menção (<#id>) ou ID, se for do tipo da configuração"""
+    match = re.fullmatch(r'<#(\d+)>|(\d+)', (texto or '').strip())
+    if not match:
+        return None
+    channel = guild.get_channel(int(match.group(1) or match.group(2)))
+    return channel if isinstance(channel, CHANNEL_TYPES[SETTINGS[chave].tipo]) else None
+
+
+def primary_guild(bot):
+    """Servidor principal do evento (GUILD_ID ou o primeiro servidor disponível do bot)"""
+    guild = bot.get_guild(int(config.GUILD_ID)) if config.GUILD_ID else None
+    if guild and not guild.unavailable:
+        return guild
+    return next((guild for guild in bot.guilds if not guild.unavailable), None)
+
+
+def member_guild(bot, user_id):
+    """Servidor em que o usuário está (o principal primeiro); None se o shard dele ainda não carregou"""
+    principal = primary_guild(bot)
+    for guild in ([principal] if principal else []) + list(bot.guilds):
+        if not guild.unavailable and guild.get_member(user_id):
+            return guild
+    return None
+
+
+# Instância global das configurações por servidor
+guild_settings = GuildSettings()
+
+def get_guild_settings():
+    """Retorna as configurações globais por servidor"""
+    return guild_settings
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Enum, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Enum, Boolean, Text, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 
@@ -11,6 +12,124 @@ class StatusSolicitacaoEnum(enum.Enum):
     CONCLUIDA = "Concluída"
     CANCELADA = "Cancelada"
 
+class StatusAplicacaoEnum(enum.Enum):
+    PENDENTE = "Pendente"
+    APROVADA = "Aprovada"
+    REJEITADA = "Rejeitada"
+    CANCELADA = "Cancelada"
+
+class EscolaridadeEnum(enum.Enum):
+    ENSINO_SUPERIOR = "Ensino Superior Completo"
+    GRADUANDO = "Graduando"
+    MESTRADO_COMPLETO = "Mestrado Completo"
+
+class ModalidadeEnum(enum.Enum):
+    PRESENCIAL = "Presencial"
+    REMOTO = "Remoto"
+
+class Participante(Base):
+    __tablename__ = 'participantes'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    discord_user_id = Column(BigInteger, nullable=False, unique=True, index=True)
+    discord_username = Column(String(100), nullable=False)
+    
+    # Dados pessoais
+    nome = Column(String(100), nullable=False)
+    sobrenome = Column(String(100), nullable=False)
+    email = Column(String(255), nullable=False, unique=True)
+    telefone = Column(String(20), nullable=False)
+    cpf = Column(String(14), nullable=False)
+    cidade = Column(String(100), nullable=False)
+    data_nascimento = Column(String(10), nullable=False)  # DD/MM/AAAA
+    
+    # Dados acadêmicos
+    escolaridade = Column(Enum(EscolaridadeEnum, values_callable=lambda x: [e.value for e in x]), nullable=False)
+    modalidade = Column(Enum(ModalidadeEnum, values_callable=lambda x: [e.value for e in x]), nullable=False)
+    
+    # Equipe
+    nome_equipe = Column(String(100), nullable=True, index=True)
+    membros_convidados = Column(Text, nullable=True)  # IDs do Discord separados por vírgula
+    disponivel_para_equipe = Column(Boolean, default=False)
+    descricao_habilidades = Column(Text, nullable=True)
+    
+    # Metadados
+    canal_privado_id = Column(BigInteger, nullable=True)
+    data_inscricao = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<Participante(nome='{self.nome} {self.sobrenome}', equipe='{self.nome_equipe}')>"
+
+# Índice funcional para a busca por email da verificação (where lower(email) == ...)
+Index('ix_participantes_email_lower', func.lower(Participante.email), unique=True)
+
+
+class AplicacaoEquipe(Base):
+    __tablename__ = 'aplicacoes_equipe'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    aplicante_id = Column(Integer, ForeignKey('participantes.id'), nullable=False, index=True)
+    equipe_nome = Column(String(100), nullable=False)
+    lider_id = Column(Integer, ForeignKey('participantes.id'), nullable=False, index=True)
+    mensagem_aplicacao = Column(Text, nullable=False)
+    
+    # Status
+    status = Column(Enum(StatusAplicacaoEnum, values_callable=lambda x: [e.value for e in x]), default=StatusAplicacaoEnum.PENDENTE)
+    resposta_lider = Column(Text, nullable=True)
+    
+    # Metadados
+    data_aplicacao = Column(DateTime, default=datetime.utcnow)
+    data_resposta = Column(DateTime, nullable=True)
+    
+    aplicante = relationship("Participante", foreign_keys=[aplicante_id])
+    
+    def __repr__(self):
+        return f"<AplicacaoEquipe(equipe='{self.equipe_nome}', status='{self.status.value}')>"
+
+# Índice da caixa de entrada do líder (pendentes por líder, keyset em data_aplicacao, id)
+Index('ix_aplicacoes_lider_status_data', AplicacaoEquipe.lider_id, AplicacaoEquipe.status, AplicacaoEquipe.data_aplicacao, AplicacaoEquipe.id)
+
+
+class PainelAplicacoes(Base):
+    __tablename__ = 'paineis_aplicacoes'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    lider_id = Column(Integer, ForeignKey('participantes.id'), nullable=False, unique=True)  # Um painel por líder
+    channel_id = Column(BigInteger, nullable=False)  # Canal de liderança da equipe
+    message_id = Column(BigInteger, nullable=False)
+    criado_em = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PainelAplicacoes(lider={self.lider_id}, canal={self.channel_id}, mensagem={self.message_id})>"
+
+
+class QuadroDisponibilidade(Base):
+    __tablename__ = 'quadros_disponibilidade'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    modalidade = Column(Enum(ModalidadeEnum, values_callable=lambda x: [e.value for e in x]), nullable=False, unique=True)  # Um quadro por modalidade
+    channel_id = Column(BigInteger, nullable=False)
+    message_id = Column(BigInteger, nullable=False)
+    criado_em = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<QuadroDisponibilidade(modalidade='{self.modalidade.value}', canal={self.channel_id}, mensagem={self.message_id})>"
+
+
+class ConfiguracaoServidor(Base):
+    __tablename__ = 'configuracoes_servidor'
+    __table_args__ = (UniqueConstraint('guild_id', 'chave'),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    guild_id = Column(BigInteger, nullable=False, index=True)
+    chave = Column(String(50), nullable=False)  # Ex: canal_equipes, categoria_voz (ver database/guild_settings.py)
+    valor = Column(BigInteger, nullable=False)  # ID do canal ou categoria
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ConfiguracaoServidor(guild={self.guild_id}, chave='{self.chave}', valor={self.valor})>"
+
+
 class SolicitacaoMentoria(Base):
     __tablename__ = 'solicitacoes_mentoria'
     
@@ -34,4 +153,74 @@ class SolicitacaoMentoria(Base):
     data_conclusao = Column(DateTime, nullable=True)
     
     def __repr__(self):
-        return f"<SolicitacaoMentoria(titulo='{self.titulo}', status='{self.status.value}')>"
\ No newline at end of file
+        return f"<SolicitacaoMentoria(titulo='{self.titulo}', status='{self.status.value}')>"
+
+# Índice da listagem paginada de solicitações (filtro por status, keyset em data_solicitacao, id)
+Index('ix_solicitacoes_status_data', SolicitacaoMentoria.status, SolicitacaoMentoria.data_solicitacao, SolicitacaoMentoria.id)
+
+
+class AtividadeVoz(Base):
+    __tablename__ = 'atividade_voz'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    discord_user_id = Column(BigInteger, nullable=False, index=True)
+    channel_id = Column(BigInteger, nullable=False)
+    tipo_canal = Column(String(20), nullable=False)  # equipe, temporario ou outro
+    team_name = Column(String(100), nullable=True, index=True)  # Equipe do membro no momento da sessão
+
+    # Tempo acumulado no período
+    segundos = Column(Integer, nullable=False)
+    periodo_inicio = Column(DateTime, nullable=False)
+    periodo_fim = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<AtividadeVoz(user={self.discord_user_id}, canal={self.channel_id}, segundos={self.segundos})>"
+
+
+class CodigoVerificacao(Base):
+    __tablename__ = 'codigos_verificacao'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    discord_user_id = Column(BigInteger, nullable=False, unique=True, index=True)  # Um código ativo por usuário
+    email = Column(String(255), nullable=False, index=True)
+    channel_id = Column(BigInteger, nullable=True)  # Canal privado da verificação
+
+    # Apenas o hash do código é armazenado
+    code_hash = Column(String(64), nullable=False)
+    salt = Column(String(32), nullable=False)
+    tentativas = Column(Integer, nullable=False, default=0)
+
+    # Metadados
+    criado_em = Column(DateTime, default=datetime.utcnow)
+    expira_em = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<CodigoVerificacao(user={self.discord_user_id}, email='{self.email}', expira_em={self.expira_em})>"
+
+
+class NotificacaoPendente(Base):
+    __tablename__ = 'notificacoes_pendentes'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tipo = Column(String(50), nullable=False)  # Ex: aplicacao_recebida, aplicacao_respondida, mentor_atribuido
+
+    # Destino: DM para o usuário ou mensagem em um canal
+    discord_user_id = Column(BigInteger, nullable=True, index=True)
+    channel_id = Column(BigInteger, nullable=True)
+    payload = Column(Text, nullable=False)  # Embed serializado em JSON
+
+    # Entrega
+    status = Column(String(20), nullable=False, default='pendente')  # pendente, enviada ou falhou
+    tentativas = Column(Integer, nullable=False, default=0)
+    erro = Column(Text, nullable=True)
+
+    # Metadados
+    criado_em = Column(DateTime, default=datetime.utcnow)
+    proxima_tentativa = Column(DateTime, nullable=False, default=datetime.utcnow)
+    enviado_em = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<NotificacaoPendente(tipo='{self.tipo}', status='{self.status}', tentativas={self.tentativas})>"
+
+# Índice da fila do worker (pendentes com tentativa vencida)
+Index('ix_notificacoes_pendentes_fila', NotificacaoPendente.status, NotificacaoPendente.proxima_tentativa)
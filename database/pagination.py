@@ -0,0 +1,39 @@
+"""
+Paginação por keyset (seek) para as listagens do bot
+Cada página é buscada a partir do cursor da página atual (valores das colunas de
+ordenação do primeiro/último item), sem OFFSET e sem carregar a tabela inteira
+"""
+
+from sqlalchemy import tuple_
+from database.db import DatabaseManager
+
+
+async def fetch_keyset_page(query, keys, after=None, before=None, limit=10, descending=False, scalars=False):
+    """Executa uma página de `query` ordenada por `keys` (colunas que juntas identificam a linha)
+
+    after: cursor do último item exibido (próxima página)
+    before: cursor do primeiro item exibido (página anterior)
+    Retorna (itens, ha_mais), onde ha_mais indica se existe página na direção pedida.
+    """
+    key = tuple_(*keys) if len(keys) > 1 else keys[0]
+    unwrap = (lambda cursor: tuple_(*cursor)) if len(keys) > 1 else (lambda cursor: cursor[0])
+
+    if after is not None:
+        query = query.where(key < unwrap(after) if descending else key > unwrap(after))
+    if before is not None:
+        query = query.where(key > unwrap(before) if descending else key < unwrap(before))
+
+    # Voltar uma página = percorrer a ordem ao contrário a partir do cursor
+    forward = before is None
+    ascending = forward != descending
+    query = query.order_by(*(column.asc() if ascending else column.desc() for column in keys))
+
+    async with await DatabaseManager.get_session() as session:
+        result = await session.execute(query.limit(limit + 1))
+        rows = result.scalars().all() if scalars else result.all()
+
+    has_more = len(rows) > limit
+    rows = list(rows[:limit])
+    if not forward:
+        rows.reverse()
+    return rows, has_more
@@ -0,0 +1,112 @@
+"""
+Cache read-through dos participantes
+Guarda projeções somente leitura (não objetos ORM) por discord_user_id com TTL curto;
+toda escrita em um participante deve invalidar a entrada correspondente
+"""
+
+import time
+from collections import namedtuple
+from sqlalchemy import select, func
+from database.db import DatabaseManager
+from database.models import Participante
+from utils.metrics import get_metrics
+from utils.singleflight import SingleFlight
+import config
+
+# Projeção com os mesmos atributos das colunas do modelo
+ParticipanteInfo = namedtuple('ParticipanteInfo', [column.name for column in Participante.__table__.columns])
+
+
+def project(participante):
+    """Converte um Participante (ORM) na projeção imutável"""
+    return ParticipanteInfo(*(getattr(participante, field) for field in ParticipanteInfo._fields))
+
+
+class ParticipantCache:
+    """Cache por discord_user_id (inclui "não inscrito") com índice secundário por email"""
+
+    def __init__(self, ttl=None, registry=None):
+        self.ttl = ttl if ttl is not None else config.PARTICIPANT_CACHE_TTL
+        self.metrics = registry or get_metrics()
+        self.entries = {}  # discord_user_id: (expira_em, projeção ou None)
+        self.emails = {}  # email minúsculo: discord_user_id
+        self.version = 0  # Incrementada a cada invalidação (descarta leituras concorrentes)
+        self.singleflight = SingleFlight()
+
+    def _fresh(self, discord_user_id):
+        entry = self.entries.get(discord_user_id)
+        if entry and entry[0] > time.monotonic():
+            return entry
+        return None
+
+    async def get_by_discord_id(self, discord_user_id):
+        """Participante pelo ID do Discord (None se não inscrito)"""
+        entry = self._fresh(discord_user_id)
+        if entry:
+            self.metrics.inc('participant_cache', result='hit')
+            return entry[1]
+
+        self.metrics.inc('participant_cache', result='miss')
+        participante, _ = await self.singleflight.do(
+            ('user', discord_user_id),
+            lambda: self._load(Participante.discord_user_id == discord_user_id, discord_user_id)
+        )
+        return participante
+
+    async def get_by_email(self, email):
+        """Participante pelo email, sem diferenciar maiúsculas (None se não encontrado)"""
+        email = email.strip().lower()
+        discord_user_id = self.emails.get(email)
+        entry = self._fresh(discord_user_id) if discord_user_id is not None else None
+        if entry and entry[1] and entry[1].email.lower() == email:
+            self.metrics.inc('participant_cache', result='hit')
+            return entry[1]
+
+        self.metrics.inc('participant_cache', result='miss')
+        participante, _ = await self.singleflight.do(
+            ('email', email),
+            lambda: self._load(func.lower(Participante.email) == email)
+        )
+        return participante
+
+    async def _load(self, condition, discord_user_id=None):
+        version = self.version
+        async with await DatabaseManager.get_session() as session:
+            result = await session.execute(select(Participante).where(condition))
+            participante = result.scalars().first()
+            info = project(participante) if participante else None
+
+        # Uma escrita durante a leitura invalida o resultado: não guardar
+        if version == self.version:
+            if info:
+                self._store(info.discord_user_id, info)
+            elif discord_user_id is not None:
+                self._store(discord_user_id, None)
+        return info
+
+    def _store(self, discord_user_id, info):
+        self.entries[discord_user_id] = (time.monotonic() + self.ttl, info)
+        if info:
+            self.emails[info.email.lower()] = discord_user_id
+
+    def invalidate(self, *discord_user_ids):
+        """Remove os participantes do cache (chamar após qualquer escrita)"""
+        self.version += 1
+        for discord_user_id in discord_user_ids:
+            entry = self.entries.pop(discord_user_id, None)
+            if entry and entry[1]:
+                self.emails.pop(entry[1].email.lower(), None)
+
+    def clear(self):
+        """Esvazia o cache"""
+        self.version += 1
+        self.entries.clear()
+        self.emails.clear()
+
+
+# Instância global do cache de participantes
+participant_cache = ParticipantCache()
+
+def get_participant_cache():
+    """Retorna o cache global de participantes"""
+    return participant_cache
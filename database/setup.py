@@ -3,6 +3,7 @@ Configuração e inicialização simplificada do banco de dados
 """
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from database.models import Base
@@ -86,13 +87,20 @@ class DatabaseSetup:
         """Cria todos os ENUMs necessários"""
         enums_sql = [
             {
-<<<<<<< HEAD
                 'name': 'statussolicitacaoenum',
                 'values': ['Pendente', 'Em Andamento', 'Concluída', 'Cancelada']
-=======
-            'name': 'statussolicitacaoenum',
-            'values': ['Pendente', 'Em Andamento', 'Concluída', 'Cancelada']
->>>>>>> a269f13e9aae25b953827b04a2ea4fa978cf00d0
+            },
+            {
+                'name': 'statusaplicacaoenum',
+                'values': ['Pendente', 'Aprovada', 'Rejeitada', 'Cancelada']
+            },
+            {
+                'name': 'escolaridadeenum',
+                'values': ['Ensino Superior Completo', 'Graduando', 'Mestrado Completo']
+            },
+            {
+                'name': 'modalidadeenum',
+                'values': ['Presencial', 'Remoto']
             }
         ]
 
@@ -115,11 +123,24 @@ class DatabaseSetup:
         try:
             Base.metadata.create_all(bind=self.sync_engine)
             print("Tabelas criadas/atualizadas com sucesso")
+            self.create_indexes()
             return True
         except Exception as e:
             print(f"Erro ao criar tabelas: {e}")
             return False
 
+    def create_indexes(self):
+        """Cria os índices declarados nos modelos que faltam em tabelas já existentes"""
+        # create_all só cria índices junto com tabelas novas
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    with self.sync_engine.connect() as connection:
+                        connection.execute(CreateIndex(index, if_not_exists=True))
+                        connection.commit()
+                except Exception as e:
+                    print(f"Erro ao criar indice {index.name}: {e}")
+
     def initialize_database(self):
         """Inicialização completa do banco"""
         print("Inicializando banco de dados de mentoria...")
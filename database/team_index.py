@@ -0,0 +1,142 @@
+"""
+Índice em memória dos nomes de equipes com vagas (autocomplete do /aplicar)
+Um array ordenado por modalidade com busca por prefixo via bisect; é carregado do banco
+no startup e atualizado quando uma equipe é criada, recebe/perde membros ou é removida
+"""
+
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from heapq import merge
+from itertools import islice
+from sqlalchemy import select, func
+from database.db import DatabaseManager
+from database.models import Participante
+from utils.metrics import get_metrics
+import config
+
+# Buckets do tempo de resposta do autocomplete (em segundos)
+COMPLETE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+
+def normalize(nome):
+    """Chave de busca: sem acentos, sem diferenciar maiúsculas e sem espaços nas pontas"""
+    decomposto = unicodedata.normalize('NFKD', nome.strip())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+
+class TeamNameIndex:
+    """Equipes com vagas por modalidade: [(chave normalizada, nome)] ordenado"""
+
+    def __init__(self, max_size=None, registry=None):
+        self.max_size = max_size or config.MAX_TEAM_SIZE
+        self.metrics = registry or get_metrics()
+        self.members = {}  # nome: quantidade de membros
+        self.modalidades = {}  # nome: modalidade da equipe
+        self.open_teams = {}  # modalidade: lista ordenada de (chave, nome) com vagas
+        self.by_key = {}  # chave normalizada: nome (resolução de nomes digitados)
+        self.loaded = False
+
+    def __len__(self):
+        return sum(len(teams) for teams in self.open_teams.values())
+
+    async def load(self):
+        """(Re)carrega do banco a contagem de membros de todas as equipes"""
+        async with await DatabaseManager.get_session() as session:
+            result = await session.execute(
+                select(Participante.nome_equipe, func.min(Participante.modalidade), func.count())
+                .where(Participante.nome_equipe.is_not(None))
+                .group_by(Participante.nome_equipe)
+            )
+            rows = result.all()
+
+        self.members.clear()
+        self.modalidades.clear()
+        self.open_teams.clear()
+        self.by_key.clear()
+        for nome, modalidade, total in rows:
+            self.set_team(nome, modalidade, total)
+        self.loaded = True
+
+    def set_team(self, nome, modalidade, total):
+        """Define a quantidade de membros de uma equipe (criação ou correção)"""
+        self._discard(nome)
+        self.members[nome] = total
+        self.modalidades[nome] = modalidade
+        self.by_key[normalize(nome)] = nome
+        if total < self.max_size:
+            insort(self.open_teams.setdefault(modalidade, []), (normalize(nome), nome))
+
+    def add_member(self, nome, modalidade=None):
+        """Um membro entrou na equipe (cria a equipe se ainda não existir)"""
+        if nome is None:
+            return
+        modalidade = self.modalidades.get(nome, modalidade)
+        self.set_team(nome, modalidade, self.members.get(nome, 0) + 1)
+
+    def remove_member(self, nome):
+        """Um membro saiu da equipe (a equipe some quando fica vazia)"""
+        if nome not in self.members:
+            return
+        total = self.members[nome] - 1
+        if total <= 0:
+            self.remove_team(nome)
+        else:
+            self.set_team(nome, self.modalidades[nome], total)
+
+    def move_member(self, antiga, nova):
+        """Membro transferido entre equipes (aprovação de aplicação)"""
+        if antiga == nova:
+            return
+        modalidade = self.modalidades.get(antiga)
+        self.remove_member(antiga)
+        self.add_member(nova, modalidade)
+
+    def remove_team(self, nome):
+        """Equipe removida"""
+        self._discard(nome)
+        self.members.pop(nome, None)
+        self.modalidades.pop(nome, None)
+        self.by_key.pop(normalize(nome), None)
+
+    def _discard(self, nome):
+        if nome not in self.members:
+            return
+        teams = self.open_teams.get(self.modalidades[nome], [])
+        entry = (normalize(nome), nome)
+        i = bisect_left(teams, entry)
+        if i < len(teams) and teams[i] == entry:
+            del teams[i]
+
+    def has_open_slots(self, nome):
+        return nome in self.members and self.members[nome] < self.max_size
+
+    def resolve(self, digitado):
+        """Nome exato da equipe a partir do texto digitado (sem diferenciar acentos/maiúsculas)"""
+        return self.by_key.get(normalize(digitado))
+
+    def complete(self, prefixo, modalidade=None, excluir=None, limit=25):
+        """Até `limit` equipes com vagas cujo nome começa com `prefixo`, em ordem alfabética"""
+        inicio = time.perf_counter()
+        chave = normalize(prefixo)
+        listas = [self.open_teams.get(modalidade, [])] if modalidade is not None else list(self.open_teams.values())
+
+        def matches(teams):
+            for i in range(bisect_left(teams, (chave,)), len(teams)):
+                key, nome = teams[i]
+                if not key.startswith(chave):
+                    break
+                if nome != excluir:
+                    yield key, nome
+
+        resultado = [nome for _, nome in islice(merge(*(matches(teams) for teams in listas)), limit)]
+        self.metrics.observe('team_autocomplete_seconds', time.perf_counter() - inicio, buckets=COMPLETE_BUCKETS)
+        return resultado
+
+
+# Instância global do índice de equipes
+team_index = TeamNameIndex()
+
+def get_team_index():
+    """Retorna o índice global de nomes de equipes"""
+    return team_index
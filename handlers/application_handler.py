@@ -1,41 +1,53 @@
 import discord
+from collections import namedtuple
 from discord.ext import commands
-from sqlalchemy import select, and_, update
+from sqlalchemy import select, and_, or_, update, func
 from database.db import DatabaseManager
 from database.models import Participante, AplicacaoEquipe, StatusAplicacaoEnum
+from database.participant_cache import get_participant_cache
+from database.team_index import get_team_index
+from database.guild_settings import member_guild
+from matchmaking.skill_index import get_skill_index
+from handlers.notification_outbox import enqueue_notification
+from database.pagination import fetch_keyset_page
+from views.application_inbox_view import INBOX_PAGE_SIZE
 from utils.logger import get_logger
 from datetime import datetime
+import config
+from utils.log_context import InteractionContextMixin
+
+# Resultado de uma resposta gravada (antigo_nome_equipe é None e lideres_cancelados vazio na rejeição)
+RespostaAplicada = namedtuple(
+    'RespostaAplicada', ['equipe_nome', 'aplicante_discord_id', 'antigo_nome_equipe', 'lideres_cancelados']
+)
 
 class ApplicationHandler:
     def __init__(self, bot):
         self.bot = bot
         self.logger = get_logger()
 
-    async def get_pending_applications(self, lider_user_id):
-        """Busca aplicações pendentes para as equipes do líder"""
-        try:
-            async with await DatabaseManager.get_session() as session:
-                # Buscar o líder
-                result = await session.execute(
-                    select(Participante).where(Participante.discord_user_id == lider_user_id)
-                )
-                lider = result.scalars().first()
-                
-                if not lider:
-                    return None, "Você não está inscrito no evento."
-
-                # Buscar aplicações pendentes para a equipe do líder
-                result = await session.execute(
-                    select(AplicacaoEquipe).where(
-                        and_(
-                            AplicacaoEquipe.lider_id == lider.id,
-                            AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE
-                        )
-                    ).order_by(AplicacaoEquipe.data_aplicacao.desc())
-                )
-                aplicacoes = result.scalars().all()
+    async def get_pending_applications(self, lider_user_id, after=None, limit=INBOX_PAGE_SIZE):
+        """Busca uma página de aplicações pendentes para as equipes do líder (mais recentes primeiro)
 
-                return aplicacoes, None
+        after: cursor (data_aplicacao, id) da última aplicação da página anterior
+        """
+        try:
+            # Buscar o líder (cache de participantes)
+            lider = await get_participant_cache().get_by_discord_id(lider_user_id)
+            if not lider:
+                return None, "Você não está inscrito no evento."
+
+            aplicacoes, _ = await fetch_keyset_page(
+                select(AplicacaoEquipe).where(
+                    and_(
+                        AplicacaoEquipe.lider_id == lider.id,
+                        AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE
+                    )
+                ),
+                [AplicacaoEquipe.data_aplicacao, AplicacaoEquipe.id],
+                after=after, limit=limit, descending=True, scalars=True
+            )
+            return aplicacoes, None
                 
         except Exception as e:
             self.logger.error(f"Erro ao buscar aplicações pendentes para líder {lider_user_id}", exc_info=e)
@@ -43,175 +55,224 @@ class ApplicationHandler:
 
     async def respond_to_application(self, lider_user_id, aplicacao_id, aprovada, resposta_texto=None):
         """Responde a uma aplicação (aprovar ou rejeitar)"""
+        resultados, erro = await self.respond_to_applications(lider_user_id, [aplicacao_id], aprovada, resposta_texto)
+        if erro:
+            return False, erro
+        return resultados[aplicacao_id]
+
+    async def respond_to_applications(self, lider_user_id, aplicacao_ids, aprovada, resposta_texto=None):
+        """Responde a várias aplicações do líder em uma única transação
+
+        Retorna ({aplicacao_id: (sucesso, mensagem)}, None) ou (None, erro) se nada foi gravado.
+        """
         try:
-            self.logger.info(f"Líder {lider_user_id} respondendo aplicação {aplicacao_id}: {'Aprovada' if aprovada else 'Rejeitada'}")
+            self.logger.info(f"Líder {lider_user_id} respondendo aplicações {list(aplicacao_ids)}: {'Aprovada' if aprovada else 'Rejeitada'}")
             
+            # Buscar o líder (cache de participantes)
+            lider = await get_participant_cache().get_by_discord_id(lider_user_id)
+            if not lider:
+                self.logger.warning(f"Usuário {lider_user_id} tentou responder aplicação mas não está inscrito")
+                return None, "Você não está inscrito no evento."
+
+            # Ordem fixa dos travamentos entre transações concorrentes
+            resultados = {}
+            respondidas = []
             async with await DatabaseManager.get_session() as session:
-                # Buscar o líder
-                result = await session.execute(
-                    select(Participante).where(Participante.discord_user_id == lider_user_id)
-                )
-                lider = result.scalars().first()
-                
-                if not lider:
-                    self.logger.warning(f"Usuário {lider_user_id} tentou responder aplicação mas não está inscrito")
-                    return False, "Você não está inscrito no evento."
+                async with session.begin():
+                    for aplicacao_id in sorted(set(aplicacao_ids)):
+                        resultado, erro = await self._apply_response(session, lider.id, aplicacao_id, aprovada, resposta_texto)
+                        if erro:
+                            resultados[aplicacao_id] = (False, erro)
+                        else:
+                            resultados[aplicacao_id] = (True, "Resposta enviada com sucesso!")
+                            respondidas.append(resultado)
 
-                # Buscar a aplicação
-                result = await session.execute(
-                    select(AplicacaoEquipe).where(
-                        and_(
-                            AplicacaoEquipe.id == aplicacao_id,
-                            AplicacaoEquipe.lider_id == lider.id,
-                            AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE
-                        )
-                    )
-                )
-                aplicacao = result.scalars().first()
+        except Exception as e:
+            self.logger.error(f"Erro ao responder aplicações {list(aplicacao_ids)} pelo líder {lider_user_id}", exc_info=e)
+            return None, f"Erro interno: {str(e)}"
 
-                if not aplicacao:
-                    self.logger.warning(f"Aplicação {aplicacao_id} não encontrada ou já respondida para líder {lider_user_id}")
-                    return False, "Aplicação não encontrada ou já foi respondida."
+        # As DMs para os aplicantes já foram gravadas no outbox junto com as respostas
+        self.bot.outbox.wake()
 
-            # Atualizar status da aplicação
-            novo_status = StatusAplicacaoEnum.APROVADA if aprovada else StatusAplicacaoEnum.REJEITADA
-            aplicacao.status = novo_status
-            aplicacao.resposta_lider = resposta_texto
-            aplicacao.data_resposta = datetime.utcnow()
+        # Painéis de outros líderes ainda oferecem as aplicações canceladas pela aprovação
+        for lider_id in set().union(*(resposta.lideres_cancelados for resposta in respondidas)):
+            self.bot.application_inbox.notify_new_application(lider_id)
 
-            session.add(aplicacao)
-            
-            # Se aprovada, adicionar membro à equipe
-            if aprovada:
-                # Buscar o aplicante
-                result = await session.execute(
-                    select(Participante).where(Participante.id == aplicacao.aplicante_id)
-                )
-                aplicante = result.scalars().first()
+        if aprovada:
+            if respondidas:
+                self.bot.availability_board.notify_change()  # Vagas e pessoas disponíveis mudaram
+            for resposta in respondidas:
+                get_participant_cache().invalidate(resposta.aplicante_discord_id)  # Mudou de equipe
+                get_team_index().move_member(resposta.antigo_nome_equipe, resposta.equipe_nome)
+                get_skill_index().remove(resposta.aplicante_discord_id)  # Não está mais disponível
+                await self._move_team_role(resposta.aplicante_discord_id, resposta.equipe_nome, resposta.antigo_nome_equipe)
 
-                if aplicante:
-                    # Verificar se a equipe não está cheia (máximo 6 membros)
-                    result = await session.execute(
-                        select(Participante).where(Participante.nome_equipe == aplicacao.equipe_nome)
-                    )
-                    membros_atuais = result.scalars().all()
-
-                    if len(membros_atuais) >= 6:
-                        aplicacao.status = StatusAplicacaoEnum.REJEITADA
-                        aplicacao.resposta_lider = "Equipe já está completa (6 membros máximo)."
-                        session.add(aplicacao)
-                        await session.commit()
-                        return False, "A equipe já está completa (6 membros máximo)."
-
-                    # Transferir o aplicante para a nova equipe
-                    antigo_nome_equipe = aplicante.nome_equipe
-                    aplicante.nome_equipe = aplicacao.equipe_nome
-                    aplicante.disponivel_para_equipe = False  # Não está mais disponível
-                    
-                    session.add(aplicante)
-                    
-                    # Cancelar outras aplicações pendentes do mesmo usuário
-                    await session.execute(
-                        update(AplicacaoEquipe).where(
-                            and_(
-                                AplicacaoEquipe.aplicante_id == aplicacao.aplicante_id,
-                                AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE,
-                                AplicacaoEquipe.id != aplicacao_id
-                            )
-                        ).values(
-                            status=StatusAplicacaoEnum.CANCELADA,
-                            resposta_lider="Usuário foi aceito em outra equipe."
-                        )
-                    )
+        return resultados, None
 
-            await session.commit()
+    async def _move_team_role(self, aplicante_discord_id, equipe_nome, antigo_nome_equipe):
+        """Adiciona a role da nova equipe (e remove a anterior) se possível"""
+        try:
+            guild = member_guild(self.bot, aplicante_discord_id)
+            if guild:
+                member = guild.get_member(aplicante_discord_id)
+                if member:
+                    # Buscar role da equipe
+                    team_role = discord.utils.get(guild.roles, name=f"Equipe {equipe_nome}")
+                    if team_role:
+                        await member.add_roles(team_role, reason="Aplicação aprovada para equipe")
+
+                        # Remover role da equipe anterior se existir
+                        old_role = discord.utils.get(guild.roles, name=f"Equipe {antigo_nome_equipe}")
+                        if old_role and old_role in member.roles:
+                            await member.remove_roles(old_role, reason="Transferido para nova equipe")
+        except Exception as e:
+            print(f"Erro ao gerenciar roles: {e}")
 
-            # Notificar o aplicante
-            try:
-                aplicante_user = await self.bot.fetch_user(aplicacao.aplicante.discord_user_id)
-                
-                if aprovada:
-                    embed = discord.Embed(
-                        title="🎉 Aplicação Aprovada!",
-                        description=f"Parabéns! Sua aplicação para a equipe **{aplicacao.equipe_nome}** foi **APROVADA**!",
-                        color=discord.Color.green()
-                    )
-                    
-                    if resposta_texto:
-                        embed.add_field(
-                            name="💬 Mensagem do Líder",
-                            value=resposta_texto,
-                            inline=False
-                        )
-                    
-                    embed.add_field(
-                        name="🚀 Próximos Passos",
-                        value="Você agora faz parte da equipe! Procure pelos canais da sua nova equipe no servidor para se integrar com os outros membros.",
-                        inline=False
-                    )
+    def _response_embed(self, aprovada, equipe_nome, resposta_texto):
+        """Embed da DM enviada ao aplicante com a resposta do líder"""
+        if aprovada:
+            embed = discord.Embed(
+                title="🎉 Aplicação Aprovada!",
+                description=f"Parabéns! Sua aplicação para a equipe **{equipe_nome}** foi **APROVADA**!",
+                color=discord.Color.green()
+            )
+        else:
+            embed = discord.Embed(
+                title="😔 Aplicação Rejeitada",
+                description=f"Sua aplicação para a equipe **{equipe_nome}** foi **rejeitada**.",
+                color=discord.Color.red()
+            )
 
-                    # Adicionar à role da equipe se possível
-                    try:
-                        guild = self.bot.guilds[0] if self.bot.guilds else None
-                        if guild:
-                            member = guild.get_member(aplicacao.aplicante.discord_user_id)
-                            if member:
-                                # Buscar role da equipe
-                                team_role = discord.utils.get(guild.roles, name=f"Equipe {aplicacao.equipe_nome}")
-                                if team_role:
-                                    await member.add_roles(team_role, reason="Aplicação aprovada para equipe")
-                                    
-                                    # Remover role da equipe anterior se existir
-                                    old_role = discord.utils.get(guild.roles, name=f"Equipe {antigo_nome_equipe}")
-                                    if old_role and old_role in member.roles:
-                                        await member.remove_roles(old_role, reason="Transferido para nova equipe")
-                    except Exception as e:
-                        print(f"Erro ao gerenciar roles: {e}")
-
-                else:
-                    embed = discord.Embed(
-                        title="😔 Aplicação Rejeitada",
-                        description=f"Sua aplicação para a equipe **{aplicacao.equipe_nome}** foi **rejeitada**.",
-                        color=discord.Color.red()
-                    )
-                    
-                    if resposta_texto:
-                        embed.add_field(
-                            name="💬 Mensagem do Líder",
-                            value=resposta_texto,
-                            inline=False
-                        )
-                    
-                    embed.add_field(
-                        name="🔄 Continue Tentando",
-                        value="Não desanime! Continue procurando por outras equipes ou marque-se como disponível para receber convites.",
-                        inline=False
-                    )
+        if resposta_texto:
+            embed.add_field(
+                name="💬 Mensagem do Líder",
+                value=resposta_texto,
+                inline=False
+            )
 
-                embed.set_footer(text="NASA Space Apps Challenge 2025 - Sistema de Equipes")
-                await aplicante_user.send(embed=embed)
-                
-            except Exception as e:
-                print(f"Erro ao notificar aplicante: {e}")
+        if aprovada:
+            embed.add_field(
+                name="🚀 Próximos Passos",
+                value="Você agora faz parte da equipe! Procure pelos canais da sua nova equipe no servidor para se integrar com os outros membros.",
+                inline=False
+            )
+        else:
+            embed.add_field(
+                name="🔄 Continue Tentando",
+                value="Não desanime! Continue procurando por outras equipes ou marque-se como disponível para receber convites.",
+                inline=False
+            )
 
-            return True, "Resposta enviada com sucesso!"
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao responder aplicação {aplicacao_id} pelo líder {lider_user_id}", exc_info=e)
-            return False, f"Erro interno: {str(e)}"
+        embed.set_footer(text="NASA Space Apps Challenge 2025 - Sistema de Equipes")
+        return embed
+
+    async def _apply_response(self, session, lider_id, aplicacao_id, aprovada, resposta_texto):
+        """Grava a resposta dentro da transação aberta em `session`
+
+        A aplicação e as linhas da equipe de destino (e do aplicante) ficam travadas com
+        SELECT ... FOR UPDATE até o commit, então aprovações simultâneas para a mesma equipe
+        são serializadas e a contagem de membros não fica desatualizada. A DM para o
+        aplicante entra no outbox na mesma transação.
+        Retorna (RespostaAplicada, None) ou (None, erro); na rejeição antigo_nome_equipe é None
+        e lideres_cancelados fica vazio.
+        """
+        result = await session.execute(
+            select(AplicacaoEquipe.equipe_nome, AplicacaoEquipe.aplicante_id).where(
+                and_(
+                    AplicacaoEquipe.id == aplicacao_id,
+                    AplicacaoEquipe.lider_id == lider_id,
+                    AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE
+                )
+            ).with_for_update()
+        )
+        aplicacao = result.first()
+
+        if not aplicacao:
+            self.logger.warning(f"Aplicação {aplicacao_id} não encontrada ou já respondida para líder {lider_id}")
+            return None, "Aplicação não encontrada ou já foi respondida."
+
+        equipe_nome, aplicante_id = aplicacao
+        resposta = {'resposta_lider': resposta_texto, 'data_resposta': datetime.utcnow()}
+
+        if not aprovada:
+            await session.execute(
+                update(AplicacaoEquipe).where(AplicacaoEquipe.id == aplicacao_id)
+                .values(status=StatusAplicacaoEnum.REJEITADA, **resposta)
+            )
+            result = await session.execute(select(Participante.discord_user_id).where(Participante.id == aplicante_id))
+            aplicante_discord_id = result.scalar_one()
+            enqueue_notification(
+                session, 'aplicacao_respondida', self._response_embed(False, equipe_nome, resposta_texto),
+                discord_user_id=aplicante_discord_id
+            )
+            return RespostaAplicada(equipe_nome, aplicante_discord_id, None, set()), None
+
+        # Travar membros da equipe e o aplicante (sempre na ordem do id, evitando deadlock)
+        result = await session.execute(
+            select(Participante.id, Participante.discord_user_id, Participante.nome_equipe)
+            .where(or_(Participante.nome_equipe == equipe_nome, Participante.id == aplicante_id))
+            .order_by(Participante.id)
+            .with_for_update()
+        )
+        aplicante = next((row for row in result.all() if row.id == aplicante_id), None)
+        if not aplicante:
+            return None, "Aplicante não encontrado."
+
+        # Verificar se a equipe não está cheia
+        result = await session.execute(
+            select(func.count()).select_from(Participante).where(Participante.nome_equipe == equipe_nome)
+        )
+        membros_atuais = result.scalar_one()
+
+        if aplicante.nome_equipe != equipe_nome and membros_atuais >= config.MAX_TEAM_SIZE:
+            await session.execute(
+                update(AplicacaoEquipe).where(AplicacaoEquipe.id == aplicacao_id).values(
+                    status=StatusAplicacaoEnum.REJEITADA,
+                    resposta_lider=f"Equipe já está completa ({config.MAX_TEAM_SIZE} membros máximo).",
+                    data_resposta=resposta['data_resposta']
+                )
+            )
+            return None, f"A equipe já está completa ({config.MAX_TEAM_SIZE} membros máximo)."
+
+        await session.execute(
+            update(AplicacaoEquipe).where(AplicacaoEquipe.id == aplicacao_id)
+            .values(status=StatusAplicacaoEnum.APROVADA, **resposta)
+        )
+
+        # Transferir o aplicante para a nova equipe (não está mais disponível)
+        await session.execute(
+            update(Participante).where(Participante.id == aplicante_id)
+            .values(nome_equipe=equipe_nome, disponivel_para_equipe=False)
+        )
+
+        # Cancelar outras aplicações pendentes do mesmo usuário (os painéis desses líderes precisam ser atualizados)
+        result = await session.execute(
+            update(AplicacaoEquipe).where(
+                and_(
+                    AplicacaoEquipe.aplicante_id == aplicante_id,
+                    AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE,
+                    AplicacaoEquipe.id != aplicacao_id
+                )
+            ).values(
+                status=StatusAplicacaoEnum.CANCELADA,
+                resposta_lider="Usuário foi aceito em outra equipe."
+            ).returning(AplicacaoEquipe.lider_id)
+        )
+        lideres_cancelados = set(result.scalars().all())
+        enqueue_notification(
+            session, 'aplicacao_respondida', self._response_embed(True, equipe_nome, resposta_texto),
+            discord_user_id=aplicante.discord_user_id
+        )
+        return RespostaAplicada(equipe_nome, aplicante.discord_user_id, aplicante.nome_equipe, lideres_cancelados), None
 
     async def get_user_applications(self, user_id):
         """Busca aplicações do usuário"""
         try:
-            async with await DatabaseManager.get_session() as session:
-                result = await session.execute(
-                    select(Participante).where(Participante.discord_user_id == user_id)
-                )
-                user_participante = result.scalars().first()
-                
-                if not user_participante:
-                    return None, "Você não está inscrito no evento."
+            user_participante = await get_participant_cache().get_by_discord_id(user_id)
+            if not user_participante:
+                return None, "Você não está inscrito no evento."
 
+            async with await DatabaseManager.get_session() as session:
                 result = await session.execute(
                     select(AplicacaoEquipe).where(AplicacaoEquipe.aplicante_id == user_participante.id)
                     .order_by(AplicacaoEquipe.data_aplicacao.desc())
@@ -225,7 +286,7 @@ class ApplicationHandler:
             return None, f"Erro interno: {str(e)}"
 
 
-class ApplicationResponseView(discord.ui.View):
+class ApplicationResponseView(InteractionContextMixin, discord.ui.View):
     def __init__(self, aplicacao_id, handler):
         super().__init__(timeout=None)  # Persistent view
         self.aplicacao_id = aplicacao_id
@@ -244,7 +305,7 @@ class ApplicationResponseView(discord.ui.View):
         await interaction.response.send_modal(modal)
 
 
-class ResponseModal(discord.ui.Modal):
+class ResponseModal(InteractionContextMixin, discord.ui.Modal):
     def __init__(self, aplicacao_id, aprovada, handler):
         self.aplicacao_id = aplicacao_id
         self.aprovada = aprovada
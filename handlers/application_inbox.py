@@ -0,0 +1,115 @@
+"""
+Painéis de aplicações dos líderes
+Cada líder tem um painel persistente no canal de liderança da equipe (👑│equipe-lider);
+novas aplicações atualizam o painel em vez de gerar uma DM por aplicação
+"""
+
+import discord
+from sqlalchemy import select, delete
+from database.db import DatabaseManager
+from database.models import PainelAplicacoes, Participante
+from database.participant_cache import project
+from handlers.team_handler import leader_channel_name
+from utils.logger import get_logger
+from views.application_inbox_view import ApplicationInboxView
+
+# Janela em que várias aplicações seguidas geram uma única atualização do painel (segundos)
+REFRESH_DELAY = 2
+
+
+class ApplicationInbox:
+    def __init__(self, bot, handler):
+        self.bot = bot
+        self.handler = handler
+        self.logger = get_logger()
+        self.panels = {}  # lider_id: view do painel publicado
+        self.restored = False
+
+    async def open(self, interaction, lider):
+        """Publica (ou move) o painel do líder no canal de liderança; sem canal, mostra um painel temporário"""
+        channel = None
+        if interaction.guild and lider.nome_equipe:
+            channel = discord.utils.get(interaction.guild.text_channels, name=leader_channel_name(lider.nome_equipe))
+
+        if channel is None:
+            view = ApplicationInboxView(self.handler, lider)
+            await view.send(interaction)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        view = ApplicationInboxView(self.handler, lider, persistent=True)
+        await view.load_page()
+        view.message = await channel.send(embed=view.build_embed(), view=view)
+
+        # Substituir o painel anterior (um por líder)
+        antigo = self.panels.pop(lider.id, None)
+        if antigo:
+            antigo.stop()
+            try:
+                await antigo.message.delete()
+            except discord.HTTPException:
+                pass
+
+        async with await DatabaseManager.get_session() as session:
+            await session.execute(delete(PainelAplicacoes).where(PainelAplicacoes.lider_id == lider.id))
+            session.add(PainelAplicacoes(lider_id=lider.id, channel_id=channel.id, message_id=view.message.id))
+            await session.commit()
+        self.panels[lider.id] = view
+
+        await interaction.followup.send(f"📥 Painel de aplicações publicado em {channel.mention}.", ephemeral=True)
+
+    def notify_new_application(self, lider_id):
+        """Agenda a atualização do painel do líder (aplicações em sequência são agrupadas)"""
+        if lider_id in self.panels and ('inbox', lider_id) not in self.bot.timers:
+            self.bot.timers.schedule(('inbox', lider_id), REFRESH_DELAY, self._refresh, lider_id)
+
+    async def _refresh(self, lider_id):
+        view = self.panels.get(lider_id)
+        if not view:
+            return
+        try:
+            await view.refresh()
+        except discord.NotFound:
+            # Mensagem apagada: o líder volta a receber DMs até publicar outro painel
+            await self.forget(lider_id)
+        except Exception as e:
+            self.logger.error(f"Erro ao atualizar painel de aplicações do líder {lider_id}", exc_info=e)
+
+    async def forget(self, lider_id):
+        """Remove o painel do líder"""
+        view = self.panels.pop(lider_id, None)
+        if view:
+            view.stop()
+        async with await DatabaseManager.get_session() as session:
+            await session.execute(delete(PainelAplicacoes).where(PainelAplicacoes.lider_id == lider_id))
+            await session.commit()
+
+    async def restore(self):
+        """Registra novamente as views dos painéis publicados (após um restart)"""
+        if self.restored:
+            return
+        self.restored = True
+        try:
+            async with await DatabaseManager.get_session() as session:
+                result = await session.execute(
+                    select(PainelAplicacoes, Participante).join(Participante, Participante.id == PainelAplicacoes.lider_id)
+                )
+                paineis = result.all()
+        except Exception as e:
+            self.logger.error("Erro ao carregar painéis de aplicações", exc_info=e)
+            return
+
+        for painel, lider in paineis:
+            try:
+                view = ApplicationInboxView(self.handler, project(lider), persistent=True)
+                await view.load_page()
+                channel = self.bot.get_channel(painel.channel_id)
+                if channel:
+                    view.message = channel.get_partial_message(painel.message_id)
+                self.bot.add_view(view, message_id=painel.message_id)
+                self.panels[painel.lider_id] = view
+            except Exception as e:
+                self.logger.error(f"Erro ao restaurar painel de aplicações do líder {painel.lider_id}", exc_info=e)
+
+        self.logger.info(f"{len(self.panels)} painel(is) de aplicações restaurado(s)")
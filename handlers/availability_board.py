@@ -0,0 +1,151 @@
+"""
+Quadros de disponibilidade por modalidade
+Uma mensagem persistente por modalidade com as equipes com vagas e as pessoas disponíveis;
+mudanças (disponibilidade, inscrição, aprovação) agendam uma edição agrupada, então as
+consultas rodam uma vez por mudança em vez de uma vez por pessoa que abre a lista
+"""
+
+import discord
+from sqlalchemy import select, delete
+from database.db import DatabaseManager
+from database.models import QuadroDisponibilidade, ModalidadeEnum
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+from views.team_search_view import (
+    MAX_TEAM_SIZE, count_available_people, count_available_teams, fetch_available_people, fetch_available_teams
+)
+import config
+
+# Itens de cada seção exibidos no quadro
+BOARD_ITEMS = 10
+
+
+class AvailabilityBoard:
+    def __init__(self, bot, delay=None, registry=None):
+        self.bot = bot
+        self.delay = delay if delay is not None else config.AVAILABILITY_BOARD_REFRESH_DELAY
+        self.metrics = registry or get_metrics()
+        self.logger = get_logger()
+        self.boards = {}  # modalidade: mensagem do quadro publicado
+        self.snapshots = {}  # modalidade: último embed renderizado
+        self.restored = False
+
+    async def publish(self, channel, modalidade):
+        """Publica (ou move) o quadro da modalidade no canal"""
+        embed = await self.render(modalidade)
+        message = await channel.send(embed=embed)
+
+        # Substituir o quadro anterior (um por modalidade)
+        antigo = self.boards.pop(modalidade, None)
+        if antigo:
+            try:
+                await antigo.delete()
+            except discord.HTTPException:
+                pass
+
+        async with await DatabaseManager.get_session() as session:
+            await session.execute(delete(QuadroDisponibilidade).where(QuadroDisponibilidade.modalidade == modalidade))
+            session.add(QuadroDisponibilidade(modalidade=modalidade, channel_id=channel.id, message_id=message.id))
+            await session.commit()
+        self.boards[modalidade] = message
+        return message
+
+    def notify_change(self, modalidade=None):
+        """Agenda a atualização do quadro da modalidade (ou de todos); mudanças em sequência são agrupadas"""
+        for board in ([modalidade] if modalidade is not None else list(self.boards)):
+            if board in self.boards and ('board', board) not in self.bot.timers:
+                self.bot.timers.schedule(('board', board), self.delay, self._refresh, board)
+
+    def snapshot(self, modalidade):
+        """Último embed do quadro publicado da modalidade (None sem quadro)"""
+        return self.snapshots.get(modalidade) if modalidade in self.boards else None
+
+    async def render(self, modalidade):
+        """Consulta equipes e pessoas disponíveis uma única vez e monta o embed do quadro"""
+        equipes, _ = await fetch_available_teams(modalidade, limit=BOARD_ITEMS)
+        total_equipes = await count_available_teams(modalidade)
+        pessoas, _ = await fetch_available_people(modalidade, limit=BOARD_ITEMS)
+        total_pessoas = await count_available_people(modalidade)
+        self.metrics.inc('availability_board_renders', modalidade=modalidade.value)
+
+        embed = discord.Embed(
+            title=f"📋 Quadro de Disponibilidade - {modalidade.value}",
+            description=f"**{total_equipes}** equipe(s) com vagas • **{total_pessoas}** pessoa(s) procurando equipe",
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+
+        linhas = [
+            f"🚀 **{equipe.nome_equipe}** - {equipe.total}/{MAX_TEAM_SIZE} (líder: {equipe.nome} {equipe.sobrenome})"
+            for equipe in equipes
+        ]
+        if total_equipes > len(equipes):
+            linhas.append(f"... e mais {total_equipes - len(equipes)} equipe(s)")
+        embed.add_field(name="🏆 Equipes com Vagas", value="\n".join(linhas)[:1024] or "Nenhuma equipe com vagas.", inline=False)
+
+        linhas = []
+        for pessoa in pessoas:
+            linha = f"👤 **{pessoa.nome} {pessoa.sobrenome}** ({pessoa.cidade})"
+            if pessoa.descricao_habilidades:
+                linha += f" - {pessoa.descricao_habilidades[:60]}" + ("..." if len(pessoa.descricao_habilidades) > 60 else "")
+            linhas.append(linha)
+        if total_pessoas > len(pessoas):
+            linhas.append(f"... e mais {total_pessoas - len(pessoas)} pessoa(s)")
+        embed.add_field(name="💼 Pessoas Disponíveis", value="\n".join(linhas)[:1024] or "Nenhuma pessoa disponível.", inline=False)
+
+        embed.set_footer(text="Atualizado automaticamente • Use /aplicar para entrar em uma equipe ou /recomendar se for líder")
+        self.snapshots[modalidade] = embed
+        return embed
+
+    async def _refresh(self, modalidade):
+        message = self.boards.get(modalidade)
+        if not message:
+            return
+        try:
+            await message.edit(embed=await self.render(modalidade))
+        except discord.NotFound:
+            # Mensagem apagada: o quadro deixa de existir até ser publicado de novo
+            await self.forget(modalidade)
+        except Exception as e:
+            self.logger.error(f"Erro ao atualizar o quadro de disponibilidade ({modalidade.value})", exc_info=e)
+
+    async def forget(self, modalidade):
+        """Remove o quadro da modalidade"""
+        self.boards.pop(modalidade, None)
+        self.snapshots.pop(modalidade, None)
+        async with await DatabaseManager.get_session() as session:
+            await session.execute(delete(QuadroDisponibilidade).where(QuadroDisponibilidade.modalidade == modalidade))
+            await session.commit()
+
+    async def restore(self):
+        """Recupera os quadros publicados (após um restart) e agenda uma atualização de cada um"""
+        if self.restored:
+            return
+        self.restored = True
+        try:
+            async with await DatabaseManager.get_session() as session:
+                result = await session.execute(select(QuadroDisponibilidade))
+                quadros = result.scalars().all()
+        except Exception as e:
+            self.logger.error("Erro ao carregar quadros de disponibilidade", exc_info=e)
+            return
+
+        for quadro in quadros:
+            channel = self.bot.get_channel(quadro.channel_id)
+            if channel:
+                self.boards[quadro.modalidade] = channel.get_partial_message(quadro.message_id)
+
+        # Mudanças feitas enquanto o bot estava fora
+        self.notify_change()
+        self.logger.info(f"{len(self.boards)} quadro(s) de disponibilidade restaurado(s)")
+
+    def jump_url(self, modalidade):
+        """Link para a mensagem do quadro"""
+        message = self.boards.get(modalidade)
+        return message.jump_url if message else None
+
+
+def parse_modalidade(texto):
+    """Modalidade a partir do texto do comando (ex: "presencial", "Remoto")"""
+    texto = (texto or '').strip().casefold()
+    return next((m for m in ModalidadeEnum if texto in (m.name.casefold(), m.value.casefold())), None)
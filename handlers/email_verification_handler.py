@@ -1,14 +1,8 @@
 import discord
 from discord.ext import commands
-import random
-import string
-import asyncio
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from sqlalchemy import select
-from database.db import DatabaseManager
-from database.models import Participante
+from database.participant_cache import get_participant_cache
 from utils.helpers import validate_email
 import config
 
@@ -16,6 +10,7 @@ class EmailVerificationHandler:
     def __init__(self, bot):
         self.bot = bot
         self.verification_sessions = {}  # Armazena sessões de verificação ativas
+        self.store = bot.verification_store  # Códigos, tentativas, limites de envio e timers
 
     async def start_email_verification_process(self, channel, user):
         """Inicia o processo de verificação por email"""
@@ -37,9 +32,7 @@ Por favor, **digite o email** que você usou para se inscrever no NASA Space App
             'channel': channel,
             'step': 'waiting_email',
             'email': None,
-            'verification_code': None,
-            'active': True,
-            'attempts': 0
+            'active': True
         }
 
     async def process_verification_message(self, message):
@@ -83,70 +76,63 @@ Por favor, **digite o email** que você usou para se inscrever no NASA Space App
         
         # Verificar se o email existe no banco de dados
         try:
-            async with await DatabaseManager.get_session() as db_session:
-                result = await db_session.execute(
-                    select(Participante).where(Participante.email == email.lower())
-                )
-                participante = result.scalars().first()
-                
-                if not participante:
-                    session['attempts'] += 1
-                    if session['attempts'] >= 3:
-                        embed = discord.Embed(
-                            title="Muitas Tentativas",
-                            description="Você excedeu o número máximo de tentativas. Este canal será fechado em 30 segundos.",
-                            color=discord.Color.red()
-                        )
-                        await session['channel'].send(embed=embed)
-                        await asyncio.sleep(30)
-                        await session['channel'].delete(reason="Verificação cancelada - muitas tentativas")
-                        session['active'] = False
-                        return
-                    
-                    embed = discord.Embed(
-                        title="Email Não Encontrado",
-                        description=f"Não encontrei uma inscrição com este email. Tentativas restantes: {3 - session['attempts']}\n\nTente novamente ou digite `cancelar` para sair.",
-                        color=discord.Color.red()
+            # Busca pelo email via cache de participantes (índice funcional em lower(email))
+            participante = await get_participant_cache().get_by_email(email)
+            
+            if not participante:
+                failures = self.store.register_lookup_failure(user_id)
+                if failures >= self.store.MAX_LOOKUP_FAILURES:
+                    await self.close_session(
+                        user_id, "Muitas Tentativas",
+                        "Você excedeu o número máximo de tentativas. Este canal será fechado em 30 segundos.",
+                        "Verificação cancelada - muitas tentativas"
                     )
-                    await session['channel'].send(embed=embed)
                     return
                 
-                # Email encontrado, gerar e enviar código
-                session['email'] = email.lower()
-                session['participante'] = participante
-                session['verification_code'] = self.generate_verification_code()
-                session['step'] = 'waiting_code'
+                embed = discord.Embed(
+                    title="Email Não Encontrado",
+                    description=f"Não encontrei uma inscrição com este email. Tentativas restantes: {self.store.MAX_LOOKUP_FAILURES - failures}\n\nTente novamente ou digite `cancelar` para sair.",
+                    color=discord.Color.red()
+                )
+                await session['channel'].send(embed=embed)
+                return
+            
+            # Limite de envios por email/usuário (evita usar o bot para inundar a caixa de alguém)
+            wait = self.store.retry_after(user_id, email.lower())
+            if wait:
+                embed = discord.Embed(
+                    title="Aguarde",
+                    description=f"Um código foi enviado recentemente. Tente novamente em {int(wait // 60)} min {int(wait % 60)} s.",
+                    color=discord.Color.orange()
+                )
+                await session['channel'].send(embed=embed)
+                return
+            
+            # Email encontrado, gerar e enviar código
+            code = await self.store.issue(user_id, email.lower(), session['channel'].id)
+            session['email'] = email.lower()
+            session['participante'] = participante
+            session['step'] = 'waiting_code'
+            
+            # Enviar código por email (a expiração é tratada pelo timer do store)
+            if await self.send_verification_email(email, code, participante.nome):
+                embed = discord.Embed(
+                    title="Código Enviado!",
+                    description=f"Enviei um código de verificação para **{email}**.\n\nDigite o código de 6 dígitos que você recebeu por email.",
+                    color=discord.Color.green()
+                )
+                embed.set_footer(text=f"O código expira em {self.store.ttl // 60} minutos")
+                await session['channel'].send(embed=embed)
+            else:
+                await self.store.discard(user_id)
+                session['step'] = 'waiting_email'
+                embed = discord.Embed(
+                    title="Erro ao Enviar Email",
+                    description="Não foi possível enviar o código de verificação. Tente novamente mais tarde.",
+                    color=discord.Color.red()
+                )
+                await session['channel'].send(embed=embed)
                 
-                # Enviar código por email
-                if await self.send_verification_email(email, session['verification_code'], participante.nome):
-                    embed = discord.Embed(
-                        title="Código Enviado!",
-                        description=f"Enviei um código de verificação para **{email}**.\n\nDigite o código de 6 dígitos que você recebeu por email.",
-                        color=discord.Color.green()
-                    )
-                    embed.set_footer(text="O código expira em 10 minutos")
-                    await session['channel'].send(embed=embed)
-                    
-                    # Configurar timeout para o código
-                    await asyncio.sleep(600)  # 10 minutos
-                    if session.get('step') == 'waiting_code' and session['active']:
-                        embed = discord.Embed(
-                            title="Código Expirado",
-                            description="O código de verificação expirou. Este canal será fechado em 30 segundos.",
-                            color=discord.Color.red()
-                        )
-                        await session['channel'].send(embed=embed)
-                        await asyncio.sleep(30)
-                        await session['channel'].delete(reason="Código de verificação expirado")
-                        session['active'] = False
-                else:
-                    embed = discord.Embed(
-                        title="Erro ao Enviar Email",
-                        description="Não foi possível enviar o código de verificação. Tente novamente mais tarde.",
-                        color=discord.Color.red()
-                    )
-                    await session['channel'].send(embed=embed)
-                    
         except Exception as e:
             print(f"Erro ao verificar email: {e}")
             embed = discord.Embed(
@@ -163,30 +149,41 @@ Por favor, **digite o email** que você usou para se inscrever no NASA Space App
             return
         
         # Verificar se o código está correto
-        if code.strip() == session['verification_code']:
+        result = await self.store.verify(user_id, code)
+        if result == 'ok':
             # Código correto, mostrar informações da inscrição
             await self.show_registration_info(user_id)
+        elif result == 'locked':
+            await self.close_session(
+                user_id, "Muitas Tentativas",
+                "Você excedeu o número máximo de tentativas. Este canal será fechado em 30 segundos.",
+                "Verificação cancelada - muitas tentativas"
+            )
+        elif result == 'expired':
+            await self.close_session(
+                user_id, "Código Expirado",
+                "O código de verificação expirou. Este canal será fechado em 30 segundos.",
+                "Código de verificação expirado"
+            )
         else:
-            session['attempts'] += 1
-            if session['attempts'] >= 3:
-                embed = discord.Embed(
-                    title="Muitas Tentativas",
-                    description="Você excedeu o número máximo de tentativas. Este canal será fechado em 30 segundos.",
-                    color=discord.Color.red()
-                )
-                await session['channel'].send(embed=embed)
-                await asyncio.sleep(30)
-                await session['channel'].delete(reason="Verificação cancelada - muitas tentativas")
-                session['active'] = False
-                return
-            
             embed = discord.Embed(
                 title="Código Incorreto",
-                description=f"Código incorreto. Tentativas restantes: {3 - session['attempts']}\n\nTente novamente.",
+                description=f"Código incorreto. Tentativas restantes: {self.store.attempts_left(user_id)}\n\nTente novamente.",
                 color=discord.Color.red()
             )
             await session['channel'].send(embed=embed)
 
+    async def close_session(self, user_id, title, description, reason, delay=30):
+        """Encerra a sessão com um aviso e agenda a remoção do canal"""
+        session = self.verification_sessions.get(user_id)
+        if not session:
+            return
+        session['active'] = False
+        
+        embed = discord.Embed(title=title, description=description, color=discord.Color.red())
+        await session['channel'].send(embed=embed)
+        self.store.schedule_teardown(session['channel'], delay, reason)
+
     async def show_registration_info(self, user_id):
         """Mostra as informações da inscrição verificada"""
         session = self.verification_sessions.get(user_id)
@@ -254,38 +251,24 @@ Por favor, **digite o email** que você usou para se inscrever no NASA Space App
         
         await session['channel'].send(embed=embed)
         
-        # Aguardar 60 segundos e deletar o canal
-        await asyncio.sleep(60)
-        try:
-            await session['channel'].delete(reason="Verificação concluída - canal removido automaticamente")
-            print(f"Canal de verificação {session['channel'].name} deletado")
-        except Exception as e:
-            print(f"Erro ao deletar canal de verificação: {e}")
+        # Remover o canal em 60 segundos
+        self.store.schedule_teardown(session['channel'], 60, "Verificação concluída - canal removido automaticamente")
         
         # Limpar sessão
         session['active'] = False
 
-    def generate_verification_code(self):
-        """Gera um código de verificação de 6 dígitos"""
-        return ''.join(random.choices(string.digits, k=6))
-
     async def send_verification_email(self, email, code, nome):
-        """Envia o código de verificação por email"""
+        """Envia o código de verificação por email (via fila do mailer, sem bloquear o event loop)"""
         try:
-            # Configurações do servidor SMTP (você precisa configurar isso)
-            smtp_server = config.SMTP_SERVER if hasattr(config, 'SMTP_SERVER') else None
-            smtp_port = config.SMTP_PORT if hasattr(config, 'SMTP_PORT') else 587
-            smtp_username = config.SMTP_USERNAME if hasattr(config, 'SMTP_USERNAME') else None
-            smtp_password = config.SMTP_PASSWORD if hasattr(config, 'SMTP_PASSWORD') else None
-            
-            if not all([smtp_server, smtp_username, smtp_password]):
+            mailer = getattr(self.bot, 'mailer', None)
+            if mailer is None:
                 print("Configurações SMTP não encontradas. Simulando envio de email...")
                 print(f"[SIMULAÇÃO] Código {code} seria enviado para {email}")
                 return True  # Simular sucesso para desenvolvimento
             
             # Criar mensagem
             msg = MIMEMultipart()
-            msg['From'] = smtp_username
+            msg['From'] = mailer.username
             msg['To'] = email
             msg['Subject'] = "Código de Verificação - NASA Space Apps Challenge"
             
@@ -296,7 +279,7 @@ Seu código de verificação para acessar suas informações de inscrição no N
 
 {code}
 
-Este código expira em 10 minutos.
+Este código expira em {self.store.ttl // 60} minutos.
 
 Se você não solicitou este código, ignore este email.
 
@@ -306,12 +289,9 @@ Equipe NASA Space Apps Challenge - Uberlândia
             
             msg.attach(MIMEText(body, 'plain', 'utf-8'))
             
-            # Conectar e enviar
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(smtp_username, smtp_password)
-            server.send_message(msg)
-            server.quit()
+            # Enfileirar e aguardar a entrega (conexão persistente, retry com backoff)
+            if not await mailer.send(msg):
+                return False
             
             print(f"Código de verificação enviado para {email}")
             return True
@@ -322,19 +302,9 @@ Equipe NASA Space Apps Challenge - Uberlândia
 
     async def cancel_verification(self, user_id):
         """Cancela o processo de verificação"""
-        session = self.verification_sessions.get(user_id)
-        if session:
-            session['active'] = False
-            
-            embed = discord.Embed(
-                title="Verificação Cancelada",
-                description="A verificação foi cancelada. Este canal será fechado em 30 segundos.",
-                color=discord.Color.red()
-            )
-            await session['channel'].send(embed=embed)
-            
-            await asyncio.sleep(30)
-            try:
-                await session['channel'].delete(reason="Verificação cancelada pelo usuário")
-            except Exception as e:
-                print(f"Erro ao deletar canal: {e}")
\ No newline at end of file
+        await self.store.discard(user_id)
+        await self.close_session(
+            user_id, "Verificação Cancelada",
+            "A verificação foi cancelada. Este canal será fechado em 30 segundos.",
+            "Verificação cancelada pelo usuário"
+        )
\ No newline at end of file
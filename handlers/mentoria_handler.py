@@ -1,9 +1,12 @@
 import discord
 from database.db import DatabaseManager
 from database.models import SolicitacaoMentoria, StatusSolicitacaoEnum
+from database.guild_settings import get_guild_settings, member_guild, primary_guild
+from handlers.notification_outbox import enqueue_notification
 from sqlalchemy import select, update
 from datetime import datetime
-import config
+from utils.log_context import InteractionContextMixin
+from utils.rest_telemetry import rest_subsystem
 
 class MentoriaHandler:
     def __init__(self, bot):
@@ -11,6 +14,7 @@ class MentoriaHandler:
         self.user_sessions = {}  # Para armazenar estados das solicitações
         self.logger = self.bot.logger
 
+    @rest_subsystem('mentoria')
     async def process_mentoria_answer(self, message):
         """Processa respostas do formulário de mentoria"""
         user_id = message.author.id
@@ -115,19 +119,17 @@ class MentoriaHandler:
     async def _notify_mentors(self, solicitacao):
         """Notifica os mentores sobre nova solicitação"""
         try:
-            # Buscar canal dos mentores
-            guild = self.bot.get_guild(int(config.GUILD_ID)) if config.GUILD_ID else None
-            if not guild:
-                guild = self.bot.guilds[0] if self.bot.guilds else None
+            # Buscar canal dos mentores no servidor do solicitante
+            guild = member_guild(self.bot, solicitacao.discord_user_id) or primary_guild(self.bot)
             
             if not guild:
                 self.logger.error("Nenhuma guild encontrada para notificar mentores")
                 return
             
             # Procurar canal de mentores
-            mentor_channel = discord.utils.get(guild.channels, id=1404498946482503906)  # ID do canal de mentores
+            mentor_channel = get_guild_settings().channel(guild, 'canal_mentores')
             if not mentor_channel:
-                self.logger.warning("Canal 'mentores' não encontrado")
+                self.logger.warning(f"Canal de mentores {get_guild_settings().get(guild.id, 'canal_mentores')} não encontrado")
                 return
             
             embed = discord.Embed(
@@ -165,6 +167,7 @@ class MentoriaHandler:
         except Exception as e:
             self.logger.error(f"Erro ao notificar mentores sobre solicitação {solicitacao.id}", exc_info=e)
 
+    @rest_subsystem('mentoria')
     async def assumir_mentoria(self, solicitacao_id, mentor_id, mentor_username):
         """Mentor assume uma solicitação"""
         try:
@@ -192,10 +195,11 @@ class MentoriaHandler:
                         data_assumida=datetime.utcnow()
                     )
                 )
+
+                # Notificar o solicitante (via outbox, gravado na mesma transação)
+                self._queue_mentor_assigned(session, solicitacao, mentor_username)
                 await session.commit()
-                
-                # Notificar o solicitante
-                await self._notify_user_mentor_assigned(solicitacao, mentor_username)
+                self.bot.outbox.wake()
                 
                 self.logger.info(f"Mentoria {solicitacao_id} assumida por {mentor_username}")
                 return True, "Mentoria assumida com sucesso!"
@@ -204,81 +208,71 @@ class MentoriaHandler:
             self.logger.error(f"Erro ao assumir mentoria {solicitacao_id}", exc_info=e)
             return False, "Erro interno."
 
-    async def _notify_user_mentor_assigned(self, solicitacao, mentor_username):
-        """Notifica a equipe que um mentor assumiu sua solicitação"""
-        try:
-            # Se há nome da equipe, tentar notificar o canal da equipe
-            if solicitacao.team_name:
-                guild = self.bot.get_guild(int(config.GUILD_ID)) if config.GUILD_ID else None
-                if not guild:
-                    guild = self.bot.guilds[0] if self.bot.guilds else None
-
-                if guild:
-                    # Procurar canal da equipe
-                    team_channel = discord.utils.get(
-                        guild.text_channels,
-                        name=f"💬│{solicitacao.team_name.lower().replace(' ', '-')}"
+    def _queue_mentor_assigned(self, session, solicitacao, mentor_username):
+        """Enfileira o aviso de que um mentor assumiu a solicitação (canal da equipe ou DM)"""
+        # Se há nome da equipe, notificar o canal da equipe (busca apenas no cache do servidor)
+        if solicitacao.team_name:
+            guild = member_guild(self.bot, solicitacao.discord_user_id) or primary_guild(self.bot)
+
+            if guild:
+                # Procurar canal da equipe
+                team_channel = discord.utils.get(
+                    guild.text_channels,
+                    name=f"💬│{solicitacao.team_name.lower().replace(' ', '-')}"
+                )
+
+                if team_channel:
+                    embed = discord.Embed(
+                        title="✅ Mentor Encontrado para a Equipe!",
+                        description=f"A solicitação **\"{solicitacao.titulo}\"** da equipe foi assumida por um mentor!",
+                        color=discord.Color.green()
                     )
 
-                    if team_channel:
-                        embed = discord.Embed(
-                            title="✅ Mentor Encontrado para a Equipe!",
-                            description=f"A solicitação **\"{solicitacao.titulo}\"** da equipe foi assumida por um mentor!",
-                            color=discord.Color.green()
-                        )
-
-                        embed.add_field(
-                            name="👥 Equipe",
-                            value=solicitacao.team_name,
-                            inline=True
-                        )
-
-                        embed.add_field(
-                            name="👨‍🏫 Mentor",
-                            value=mentor_username,
-                            inline=True
-                        )
-
-                        embed.add_field(
-                            name="📝 Solicitação",
-                            value=solicitacao.descricao[:200] + ("..." if len(solicitacao.descricao) > 200 else ""),
-                            inline=False
-                        )
-
-                        embed.set_footer(text="O mentor entrará em contato com a equipe em breve!")
-
-                        await team_channel.send(embed=embed)
-                        return
-
-            # Fallback: notificar o usuário individual por DM
-            user = self.bot.get_user(solicitacao.discord_user_id)
-            if not user:
-                return
+                    embed.add_field(
+                        name="👥 Equipe",
+                        value=solicitacao.team_name,
+                        inline=True
+                    )
 
-            embed = discord.Embed(
-                title="✅ Mentor Encontrado!",
-                description=f"Sua solicitação **\"{solicitacao.titulo}\"** foi assumida por um mentor!",
-                color=discord.Color.green()
-            )
+                    embed.add_field(
+                        name="👨‍🏫 Mentor",
+                        value=mentor_username,
+                        inline=True
+                    )
 
-            embed.add_field(
-                name="👨‍🏫 Mentor",
-                value=mentor_username,
-                inline=True
-            )
+                    embed.add_field(
+                        name="📝 Solicitação",
+                        value=solicitacao.descricao[:200] + ("..." if len(solicitacao.descricao) > 200 else ""),
+                        inline=False
+                    )
 
-            embed.add_field(
-                name="📝 Sua solicitação",
-                value=solicitacao.descricao[:200] + ("..." if len(solicitacao.descricao) > 200 else ""),
-                inline=False
-            )
+                    embed.set_footer(text="O mentor entrará em contato com a equipe em breve!")
 
-            embed.set_footer(text="O mentor entrará em contato com você em breve!")
+                    enqueue_notification(session, 'mentor_atribuido', embed, channel_id=team_channel.id)
+                    return
 
-            await user.send(embed=embed)
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao notificar usuário sobre mentor atribuído", exc_info=e)
+        # Fallback: notificar o usuário individual por DM
+        embed = discord.Embed(
+            title="✅ Mentor Encontrado!",
+            description=f"Sua solicitação **\"{solicitacao.titulo}\"** foi assumida por um mentor!",
+            color=discord.Color.green()
+        )
+
+        embed.add_field(
+            name="👨‍🏫 Mentor",
+            value=mentor_username,
+            inline=True
+        )
+
+        embed.add_field(
+            name="📝 Sua solicitação",
+            value=solicitacao.descricao[:200] + ("..." if len(solicitacao.descricao) > 200 else ""),
+            inline=False
+        )
+
+        embed.set_footer(text="O mentor entrará em contato com você em breve!")
+
+        enqueue_notification(session, 'mentor_atribuido', embed, discord_user_id=solicitacao.discord_user_id)
 
     def start_mentoria_request(self, user_id, username, team_name=None):
         """Inicia o processo de solicitação de mentoria"""
@@ -289,7 +283,7 @@ class MentoriaHandler:
         }
 
 
-class MentorResponseView(discord.ui.View):
+class MentorResponseView(InteractionContextMixin, discord.ui.View):
     def __init__(self, solicitacao_id, handler):
         super().__init__(timeout=None)
         self.solicitacao_id = solicitacao_id
@@ -0,0 +1,201 @@
+"""
+Outbox de notificações (DMs e mensagens em canais)
+As notificações são gravadas na mesma transação da mudança de estado e entregues
+por um worker em segundo plano, com concorrência limitada e retry com backoff.
+Usuários que não aceitam DMs ficam em um cache negativo para não gastar chamadas REST
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+import discord
+from sqlalchemy import select, update
+from database.db import DatabaseManager
+from database.models import NotificacaoPendente
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+import config
+
+# Buckets do tempo de entrega (em segundos)
+DELIVERY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def enqueue_notification(session, tipo, embed, discord_user_id=None, channel_id=None):
+    """Adiciona uma notificação à sessão (é gravada no commit da transação do chamador)"""
+    notificacao = NotificacaoPendente(
+        tipo=tipo,
+        discord_user_id=discord_user_id,
+        channel_id=channel_id,
+        payload=json.dumps(embed.to_dict()),
+        status='pendente',
+        tentativas=0,
+        proxima_tentativa=datetime.utcnow()
+    )
+    session.add(notificacao)
+    return notificacao
+
+
+class NotificationOutbox:
+    """Worker que drena a tabela notificacoes_pendentes"""
+
+    def __init__(self, bot, concurrency=None, max_retries=None, backoff=None, poll_interval=None,
+                 blocked_ttl=None, batch_size=50, lease=60, registry=None):
+        self.bot = bot
+        self.concurrency = concurrency or config.NOTIFICATION_CONCURRENCY
+        self.max_retries = max_retries or config.NOTIFICATION_MAX_RETRIES
+        self.backoff = backoff if backoff is not None else config.NOTIFICATION_RETRY_BACKOFF
+        self.poll_interval = poll_interval or config.NOTIFICATION_POLL_INTERVAL
+        self.blocked_ttl = blocked_ttl if blocked_ttl is not None else config.NOTIFICATION_DM_BLOCK_TTL
+        self.batch_size = batch_size
+        self.lease = lease  # Segundos em que uma notificação reservada não é pega de novo
+
+        self.metrics = registry or get_metrics()
+        self.logger = get_logger()
+        self.blocked = {}  # discord_user_id: expira_em (monotonic)
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        """Inicia o worker (idempotente)"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name='notification-outbox')
+
+    async def stop(self):
+        """Para o worker; notificações não entregues continuam na tabela"""
+        task, self.task = self.task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def wake(self):
+        """Pede uma drenagem imediata (chamar após o commit que enfileirou notificações)"""
+        self.wakeup.set()
+
+    def is_blocked(self, discord_user_id):
+        expira_em = self.blocked.get(discord_user_id)
+        if expira_em is None:
+            return False
+        if expira_em <= time.monotonic():
+            del self.blocked[discord_user_id]
+            return False
+        return True
+
+    def block(self, discord_user_id):
+        """Marca o usuário como não aceitando DMs por blocked_ttl segundos"""
+        self.blocked[discord_user_id] = time.monotonic() + self.blocked_ttl
+
+    async def _run(self):
+        while True:
+            try:
+                entregues = await self.drain_once()
+            except Exception as e:
+                self.logger.error("Erro ao drenar o outbox de notificações", exc_info=e)
+                entregues = 0
+
+            # Lote cheio: provavelmente há mais pendentes
+            if entregues >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+    async def drain_once(self):
+        """Reserva um lote vencido, entrega com concorrência limitada e grava o resultado"""
+        notificacoes = await self._claim()
+        if not notificacoes:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(notificacao):
+            async with semaphore:
+                return await self._deliver(notificacao)
+
+        resultados = await asyncio.gather(*(deliver(n) for n in notificacoes))
+        await self._record(notificacoes, resultados)
+        return len(notificacoes)
+
+    async def _claim(self):
+        agora = datetime.utcnow()
+        async with await DatabaseManager.get_session() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(NotificacaoPendente)
+                    .where(NotificacaoPendente.status == 'pendente', NotificacaoPendente.proxima_tentativa <= agora)
+                    .order_by(NotificacaoPendente.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                notificacoes = result.scalars().all()
+                if notificacoes:
+                    # Reserva: outra instância (ou um reinício) só retoma após o lease
+                    await session.execute(
+                        update(NotificacaoPendente)
+                        .where(NotificacaoPendente.id.in_([n.id for n in notificacoes]))
+                        .values(proxima_tentativa=agora + timedelta(seconds=self.lease))
+                    )
+        self.metrics.set('notification_outbox_claimed', len(notificacoes))
+        return notificacoes
+
+    async def _deliver(self, notificacao):
+        """Entrega uma notificação: retorna ('enviada' | 'retry' | 'falhou', motivo)"""
+        if notificacao.channel_id is None and self.is_blocked(notificacao.discord_user_id):
+            self.metrics.inc('notifications_skipped')
+            return 'falhou', 'dm_bloqueada'
+
+        inicio = time.perf_counter()
+        try:
+            embed = discord.Embed.from_dict(json.loads(notificacao.payload))
+            if notificacao.channel_id is not None:
+                destino = self.bot.get_channel(notificacao.channel_id) or await self.bot.fetch_channel(notificacao.channel_id)
+            else:
+                destino = self.bot.get_user(notificacao.discord_user_id) or await self.bot.fetch_user(notificacao.discord_user_id)
+            await destino.send(embed=embed)
+        except discord.Forbidden:
+            if notificacao.channel_id is None:
+                self.block(notificacao.discord_user_id)
+            return 'falhou', 'forbidden'
+        except discord.NotFound:
+            return 'falhou', 'not_found'
+        except discord.HTTPException as e:
+            if e.status >= 500 or e.status == 429:
+                return 'retry', f'http_{e.status}'
+            return 'falhou', f'http_{e.status}'
+        except Exception as e:
+            # Erros de rede/timeout: tentar de novo
+            return 'retry', type(e).__name__
+        finally:
+            self.metrics.observe('notification_delivery_seconds', time.perf_counter() - inicio, buckets=DELIVERY_BUCKETS)
+
+        return 'enviada', None
+
+    async def _record(self, notificacoes, resultados):
+        agora = datetime.utcnow()
+        async with await DatabaseManager.get_session() as session:
+            for notificacao, (status, motivo) in zip(notificacoes, resultados):
+                tentativas = notificacao.tentativas + 1
+                valores = {'tentativas': tentativas, 'erro': motivo}
+
+                if status == 'retry' and tentativas < self.max_retries:
+                    self.metrics.inc('notifications_retries')
+                    valores.update(proxima_tentativa=agora + timedelta(seconds=self.backoff * 2 ** (tentativas - 1)))
+                elif status == 'enviada':
+                    self.metrics.inc('notifications_sent', tipo=notificacao.tipo)
+                    valores.update(status='enviada', enviado_em=agora)
+                else:
+                    self.metrics.inc('notifications_failed', reason=motivo if status == 'falhou' else 'max_retries')
+                    valores.update(status='falhou')
+                    self.logger.warning(
+                        f"Notificação {notificacao.id} ({notificacao.tipo}) descartada após {tentativas} tentativa(s): {motivo}"
+                    )
+
+                await session.execute(
+                    update(NotificacaoPendente).where(NotificacaoPendente.id == notificacao.id).values(**valores)
+                )
+            await session.commit()
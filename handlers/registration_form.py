@@ -3,6 +3,8 @@ from discord.ext import commands
 from sqlalchemy import select
 from database.db import DatabaseManager
 from database.models import Participante, EscolaridadeEnum, ModalidadeEnum
+from database.participant_cache import get_participant_cache
+from database.team_index import get_team_index
 from utils.helpers import validate_email, validate_cpf, validate_phone, validate_date
 from utils.logger import get_logger
 import asyncio
@@ -16,13 +18,9 @@ class RegistrationHandler:
     async def check_existing_registration(self, user_id):
         """Verifica se o usuário já está inscrito"""
         try:
-            async with await DatabaseManager.get_session() as session:
-                result = await session.execute(
-                    select(Participante).where(Participante.discord_user_id == user_id)
-                )
-                is_registered = result.scalars().first() is not None
-                self.logger.debug(f"Verificação de inscrição para usuário {user_id}: {'Já inscrito' if is_registered else 'Não inscrito'}")
-                return is_registered
+            is_registered = await get_participant_cache().get_by_discord_id(user_id) is not None
+            self.logger.debug(f"Verificação de inscrição para usuário {user_id}: {'Já inscrito' if is_registered else 'Não inscrito'}")
+            return is_registered
         except Exception as e:
             self.logger.error(f"Erro ao verificar inscrição existente para usuário {user_id}", exc_info=e)
             return True  # Assumir inscrito em caso de erro para evitar duplicatas
@@ -282,12 +280,10 @@ Vou fazer algumas perguntas para completar sua inscrição. Responda uma pergunt
                     # Tentar encontrar o usuário pelo nome
                     username = word[1:].strip()
                     try:
-                        # Buscar membro no servidor
-                        guild = self.bot.guilds[0] if self.bot.guilds else None
-                        if guild:
-                            member = discord.utils.get(guild.members, name=username)
-                            if member:
-                                user_ids.append(str(member.id))
+                        # Buscar membro nos servidores já carregados (todos os shards)
+                        member = discord.utils.get(self.bot.get_all_members(), name=username)
+                        if member:
+                            user_ids.append(str(member.id))
                     except:
                         pass
             
@@ -338,6 +334,9 @@ Vou fazer algumas perguntas para completar sua inscrição. Responda uma pergunt
                 
                 db_session.add(participante)
                 await db_session.commit()
+                get_participant_cache().invalidate(user_id)
+                get_team_index().add_member(participante.nome_equipe, participante.modalidade)
+                self.bot.availability_board.notify_change(participante.modalidade)
                 
                 self.logger.log_database_operation("INSERT", "participantes", True, 
                     f"Usuário: {user.name}, Email: {session['data']['email']}, Equipe: {session['data']['nome_equipe']}")
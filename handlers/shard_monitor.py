@@ -0,0 +1,139 @@
+"""
+Prontidão e métricas por shard
+Com o AutoShardedBot o on_ready só chega depois que todos os shards conectaram; as tarefas
+de startup de cada servidor (painéis, sessões de voz) rodam assim que o shard dele fica
+pronto. Uma amostragem periódica registra a latência do gateway e a taxa de eventos por shard
+"""
+
+import asyncio
+import math
+import time
+import config
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+
+
+class ShardMonitor:
+    def __init__(self, bot, interval=None, registry=None):
+        self.bot = bot
+        self.interval = interval if interval is not None else config.SHARD_METRICS_INTERVAL
+        self.metrics = registry or get_metrics()
+        self.logger = get_logger()
+        self.ready_shards = set()
+        self.ready_events = {}  # shard_id: asyncio.Event (aguardar um shard ficar pronto)
+        self.guild_jobs = []  # corrotinas chamadas com o servidor quando o shard dele fica pronto
+        self.started_guilds = set()  # servidores cujas tarefas de startup já rodaram
+        self.samples = {}  # shard_id: (número de sequência, instante) da última amostra
+        self._task = None
+
+        bot.add_listener(self.on_shard_ready)
+        bot.add_listener(self.on_shard_resumed)
+        bot.add_listener(self.on_shard_disconnect)
+        bot.add_listener(self.on_guild_join)
+
+    def add_guild_job(self, job):
+        """Registra uma tarefa de startup executada uma vez por servidor"""
+        self.guild_jobs.append(job)
+
+    def is_ready(self, shard_id):
+        return shard_id in self.ready_shards
+
+    def guild_ready(self, guild):
+        """O shard do servidor está pronto e o servidor disponível"""
+        return guild.shard_id in self.ready_shards and not guild.unavailable
+
+    async def wait_until_ready(self, shard_id):
+        """Aguarda o shard ficar pronto"""
+        await self.ready_events.setdefault(shard_id, asyncio.Event()).wait()
+
+    def _set_ready(self, shard_id, ready):
+        event = self.ready_events.setdefault(shard_id, asyncio.Event())
+        if ready:
+            self.ready_shards.add(shard_id)
+            event.set()
+        else:
+            self.ready_shards.discard(shard_id)
+            event.clear()
+        self.metrics.set('shard_ready', int(ready), shard=shard_id)
+
+    async def on_shard_ready(self, shard_id):
+        self._set_ready(shard_id, True)
+        guilds = [guild for guild in self.bot.guilds if guild.shard_id == shard_id]
+        self.logger.info(f"Shard {shard_id} pronto com {len(guilds)} servidor(es)")
+        for guild in guilds:
+            await self.start_guild(guild)
+
+    async def on_shard_resumed(self, shard_id):
+        # RESUMED não gera shard_ready de novo; o cache do shard continua válido
+        self._set_ready(shard_id, True)
+
+    async def on_shard_disconnect(self, shard_id):
+        self._set_ready(shard_id, False)
+        self.metrics.inc('shard_disconnects', shard=shard_id)
+
+    async def on_guild_join(self, guild):
+        if self.is_ready(guild.shard_id):
+            await self.start_guild(guild)
+
+    async def start_guild(self, guild):
+        """Roda as tarefas de startup do servidor (uma única vez por processo)"""
+        if guild.id in self.started_guilds or guild.unavailable:
+            return
+        self.started_guilds.add(guild.id)
+        for job in self.guild_jobs:
+            try:
+                await job(guild)
+            except Exception as e:
+                self.logger.error(f"Erro na tarefa de startup {job.__name__} do servidor {guild.id}", exc_info=e)
+
+    def sample(self, now=None):
+        """Registra latência do heartbeat e eventos recebidos desde a última amostra, por shard"""
+        now = time.monotonic() if now is None else now
+        for shard_id, shard in self.bot.shards.items():
+            if math.isfinite(shard.latency):
+                self.metrics.set('gateway_latency_seconds', shard.latency, shard=shard_id)
+
+            # O número de sequência do gateway conta os eventos despachados na sessão do shard
+            ws = getattr(shard._parent, 'ws', None)
+            sequence = (ws.sequence if ws else None) or 0
+            anterior, instante = self.samples.get(shard_id, (0, None))
+            eventos = sequence - anterior if sequence >= anterior else sequence  # Nova sessão recomeça do zero
+            self.samples[shard_id] = (sequence, now)
+
+            self.metrics.inc('gateway_events', eventos, shard=shard_id)
+            if instante is not None and now > instante:
+                self.metrics.set('gateway_event_rate', eventos / (now - instante), shard=shard_id)
+
+    def report(self):
+        """Estado de cada shard: (shard_id, pronto, latência, eventos/s, servidores)"""
+        servidores = {}
+        for guild in self.bot.guilds:
+            servidores[guild.shard_id] = servidores.get(guild.shard_id, 0) + 1
+        return [
+            (
+                shard_id,
+                self.is_ready(shard_id),
+                self.metrics.get_gauge('gateway_latency_seconds', shard=shard_id),
+                self.metrics.get_gauge('gateway_event_rate', shard=shard_id),
+                servidores.get(shard_id, 0)
+            )
+            for shard_id in sorted(self.bot.shards)
+        ]
+
+    def start(self):
+        """Inicia a amostragem periódica (desativada com intervalo 0)"""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.error("Erro na amostragem das métricas dos shards", exc_info=e)
@@ -3,6 +3,18 @@ from discord.ext import commands
 import asyncio
 from views.team_view import TeamManagementView, MemberSelectView
 from utils.logger import get_logger
+from utils.rest_telemetry import rest_subsystem
+
+
+def channel_slug(nome):
+    """Nome da equipe no formato usado nos canais (💬│slug, 👑│slug-lider)"""
+    return ''.join(c for c in nome.lower() if c.isalnum() or c in ['-', '_']).replace(' ', '-')
+
+
+def leader_channel_name(nome):
+    """Nome do canal de liderança da equipe"""
+    return f"👑│{channel_slug(nome)}-lider"
+
 
 class TeamHandler:
     def __init__(self, bot):
@@ -10,6 +22,7 @@ class TeamHandler:
         self.user_sessions = {}  # user_id: session_data
         self.logger = get_logger()
 
+    @rest_subsystem('equipes')
     async def start_team_creation(self, interaction: discord.Interaction):
         """Inicia o processo de criação de equipe"""
         user_id = interaction.user.id
@@ -103,6 +116,7 @@ Escolha um nome único e criativo para sua equipe.
             except:
                 pass
 
+    @rest_subsystem('equipes')
     async def process_team_creation(self, message):
         """Processa as respostas do formulário de criação"""
         user_id = message.author.id
@@ -340,7 +354,7 @@ Escolha o desafio que sua equipe pretende resolver no NASA Space Apps Challenge
                     reason="Categoria para canais de liderança"
                 )
 
-            nome_limpo = ''.join(c for c in nome.lower() if c.isalnum() or c in ['-', '_']).replace(' ', '-')
+            nome_limpo = channel_slug(nome)
 
             # Configurar permissões para canais da equipe
             team_overwrites = {
@@ -390,7 +404,7 @@ Escolha o desafio que sua equipe pretende resolver no NASA Space Apps Challenge
 
             # Criar canal do líder
             leader_channel = await guild.create_text_channel(
-                f"👑│{nome_limpo}-lider",
+                leader_channel_name(nome),
                 category=leader_category,
                 overwrites=leader_overwrites,
                 topic=f"Canal de gerenciamento da equipe {nome} - Apenas para o líder",
@@ -505,6 +519,7 @@ Aqui você pode gerenciar sua equipe completamente.
         view = TeamManagementView(team_name, leader_id)
         await channel.send(embed=embed, view=view)
 
+    @rest_subsystem('equipes')
     async def cancel_team_creation(self, user, channel):
         """Cancela a criação de equipe"""
         try:
@@ -525,6 +540,7 @@ Aqui você pode gerenciar sua equipe completamente.
         except Exception as e:
             self.logger.error(f"Erro ao cancelar criação de equipe", exc_info=e)
 
+    @rest_subsystem('equipes')
     async def start_add_member(self, interaction, team_name):
         """Inicia processo de adicionar membro"""
         await interaction.response.send_message(
@@ -576,6 +592,7 @@ Aqui você pode gerenciar sua equipe completamente.
         except asyncio.TimeoutError:
             await interaction.followup.send("⏰ Tempo esgotado!", ephemeral=True)
 
+    @rest_subsystem('equipes')
     async def confirm_add_member(self, interaction, member, team_name):
         """Confirma adição de membro"""
         guild = interaction.guild
@@ -625,6 +642,7 @@ Aqui você pode gerenciar sua equipe completamente.
             self.logger.error(f"Erro ao adicionar membro {member.id} à equipe {team_name}", exc_info=e)
             await interaction.followup.send("❌ Erro ao adicionar membro!", ephemeral=True)
 
+    @rest_subsystem('equipes')
     async def start_remove_member(self, interaction, team_name):
         """Inicia processo de remover membro"""
         guild = interaction.guild
@@ -646,6 +664,7 @@ Aqui você pode gerenciar sua equipe completamente.
         view = MemberSelectView(members, "remover", team_name, interaction.user.id)
         await interaction.response.send_message("👥 **Selecione o membro para remover:**", view=view, ephemeral=True)
 
+    @rest_subsystem('equipes')
     async def confirm_remove_member(self, interaction, member, team_name):
         """Confirma remoção de membro"""
         guild = interaction.guild
@@ -678,6 +697,7 @@ Aqui você pode gerenciar sua equipe completamente.
             except:
                 pass
 
+    @rest_subsystem('equipes')
     async def start_edit_team(self, interaction, team_name):
         """Inicia edição de informações da equipe"""
         await interaction.response.send_message(
@@ -689,6 +709,7 @@ Aqui você pode gerenciar sua equipe completamente.
             ephemeral=True
         )
 
+    @rest_subsystem('equipes')
     async def delete_team(self, interaction, team_name):
         """Deleta a equipe completamente"""
         try:
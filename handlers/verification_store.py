@@ -0,0 +1,238 @@
+import hashlib
+import hmac
+import secrets
+import time
+from collections import deque
+from datetime import datetime
+import discord
+from sqlalchemy import select, delete, update
+from database.db import DatabaseManager
+from database.models import CodigoVerificacao
+from utils.logger import get_logger
+import config
+
+# Janela dos limites de envio (segundos)
+RATE_WINDOW = 3600
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def hash_code(code, salt):
+    """Hash do código de verificação (o código em si nunca é armazenado)"""
+    return hashlib.sha256(f"{salt}:{code}".encode()).hexdigest()
+
+
+class VerificationStore:
+    """Códigos de verificação com hash, expiração, contadores de tentativas e limites de envio
+
+    Os códigos ficam em memória e no banco (para sobreviver a um restart); a expiração
+    e a remoção dos canais de verificação passam pelo TimerHeap do bot.
+    """
+
+    MAX_ATTEMPTS = 3  # Códigos incorretos antes de invalidar
+    MAX_LOOKUP_FAILURES = 3  # Emails não encontrados antes de fechar o canal
+
+    def __init__(self, bot, timers, ttl=None, cooldown=None, max_per_hour=None):
+        self.bot = bot
+        self.timers = timers
+        self.logger = get_logger()
+        self.ttl = ttl if ttl is not None else config.VERIFICATION_CODE_TTL
+        self.cooldown = cooldown if cooldown is not None else config.VERIFICATION_RESEND_COOLDOWN
+        self.max_per_hour = max_per_hour if max_per_hour is not None else config.VERIFICATION_MAX_CODES_PER_HOUR
+
+        self.codes = {}  # user_id: código ativo (hash, salt, email, tentativas, expiração)
+        self.sends = {}  # ('email', email) ou ('user', user_id): instantes dos últimos envios
+        self.lookup_failures = {}  # user_id: emails não encontrados
+        self.restored = False
+
+    def _recent_sends(self, key, now):
+        """Envios da chave dentro da janela (descarta os antigos)"""
+        sent = self.sends.get(key)
+        if sent is None:
+            return ()
+        while sent and sent[0] <= now - RATE_WINDOW:
+            sent.popleft()
+        if not sent:
+            del self.sends[key]
+        return sent
+
+    def retry_after(self, user_id, email, now=None):
+        """Segundos até ser permitido enviar outro código (0 = permitido)"""
+        now = now or time.time()
+        wait = 0.0
+        for key in (('email', email), ('user', user_id)):
+            sent = self._recent_sends(key, now)
+            if sent:
+                wait = max(wait, sent[-1] + self.cooldown - now)
+            if len(sent) >= self.max_per_hour:
+                wait = max(wait, sent[0] + RATE_WINDOW - now)
+        return max(0.0, wait)
+
+    async def issue(self, user_id, email, channel_id=None):
+        """Gera um novo código (substituindo o anterior); retorna None se o limite de envios foi atingido"""
+        now = time.time()
+        if self.retry_after(user_id, email, now):
+            return None
+
+        for key in (('email', email), ('user', user_id)):
+            self.sends.setdefault(key, deque()).append(now)
+
+        code = f"{secrets.randbelow(10 ** 6):06d}"
+        salt = secrets.token_hex(8)
+        entry = {
+            'email': email,
+            'channel_id': channel_id,
+            'salt': salt,
+            'code_hash': hash_code(code, salt),
+            'attempts': 0,
+            'created': now,
+            'expires_at': now + self.ttl
+        }
+        self.codes[user_id] = entry
+        self.timers.schedule_at(('codigo', user_id), entry['expires_at'], self._expire, user_id)
+        await self._save(user_id, entry)
+        return code
+
+    async def verify(self, user_id, code):
+        """Confere o código: 'ok', 'invalid', 'locked' (tentativas esgotadas) ou 'expired'"""
+        entry = self.codes.get(user_id)
+        if entry is None or time.time() >= entry['expires_at']:
+            await self.discard(user_id)
+            return 'expired'
+
+        if hmac.compare_digest(hash_code(code.strip(), entry['salt']), entry['code_hash']):
+            await self.discard(user_id)
+            self.lookup_failures.pop(user_id, None)
+            return 'ok'
+
+        entry['attempts'] += 1
+        if entry['attempts'] >= self.MAX_ATTEMPTS:
+            await self.discard(user_id)
+            return 'locked'
+
+        await self._save_attempts(user_id, entry['attempts'])
+        return 'invalid'
+
+    def attempts_left(self, user_id):
+        """Tentativas restantes para o código ativo do usuário"""
+        entry = self.codes.get(user_id)
+        return self.MAX_ATTEMPTS - entry['attempts'] if entry else 0
+
+    def register_lookup_failure(self, user_id):
+        """Conta um email não encontrado; retorna o total do usuário"""
+        self.lookup_failures[user_id] = self.lookup_failures.get(user_id, 0) + 1
+        return self.lookup_failures[user_id]
+
+    async def discard(self, user_id):
+        """Remove o código ativo do usuário"""
+        self.timers.cancel(('codigo', user_id))
+        if self.codes.pop(user_id, None) is not None:
+            await self._delete(user_id)
+
+    def schedule_teardown(self, channel, delay, reason):
+        """Agenda a remoção do canal de verificação (sem manter uma coroutine parada)"""
+        self.timers.schedule(('canal', channel.id), delay, self._delete_channel, channel, reason)
+
+    async def _delete_channel(self, channel, reason):
+        try:
+            await channel.delete(reason=reason)
+        except discord.NotFound:
+            pass
+        except Exception as e:
+            self.logger.error(f"Erro ao deletar canal de verificação {channel.id}", exc_info=e)
+
+    async def _expire(self, user_id):
+        """Timer de expiração: invalida o código e fecha o canal da verificação"""
+        entry = self.codes.pop(user_id, None)
+        if entry is None:
+            return
+        self.lookup_failures.pop(user_id, None)
+        await self._delete(user_id)
+
+        channel = self.bot.get_channel(entry['channel_id']) if entry['channel_id'] else None
+        if channel is None:
+            return
+
+        embed = discord.Embed(
+            title="Código Expirado",
+            description="O código de verificação expirou. Este canal será fechado em 30 segundos.",
+            color=discord.Color.red()
+        )
+        try:
+            await channel.send(embed=embed)
+        except Exception as e:
+            self.logger.warning(f"Não foi possível avisar a expiração no canal {channel.id}: {e}")
+        self.schedule_teardown(channel, 30, "Código de verificação expirado")
+
+    async def restore(self):
+        """Recarrega do banco os códigos pendentes e seus timers (após um restart)"""
+        if self.restored:
+            return
+        self.restored = True
+        try:
+            async with await DatabaseManager.get_session() as session:
+                result = await session.execute(select(CodigoVerificacao))
+                rows = result.scalars().all()
+        except Exception as e:
+            self.logger.error("Erro ao carregar códigos de verificação", exc_info=e)
+            return
+
+        for row in rows:
+            created = (row.criado_em - EPOCH).total_seconds()
+            entry = {
+                'email': row.email,
+                'channel_id': row.channel_id,
+                'salt': row.salt,
+                'code_hash': row.code_hash,
+                'attempts': row.tentativas,
+                'created': created,
+                'expires_at': (row.expira_em - EPOCH).total_seconds()
+            }
+            self.codes[row.discord_user_id] = entry
+            for key in (('email', row.email), ('user', row.discord_user_id)):
+                self.sends.setdefault(key, deque()).append(created)
+            # Códigos já vencidos disparam imediatamente
+            self.timers.schedule_at(('codigo', row.discord_user_id), entry['expires_at'], self._expire, row.discord_user_id)
+
+        self.sends = {key: deque(sorted(sent)) for key, sent in self.sends.items()}
+
+        if rows:
+            self.logger.info(f"{len(rows)} código(s) de verificação restaurado(s)")
+
+    async def _save(self, user_id, entry):
+        try:
+            async with await DatabaseManager.get_session() as session:
+                await session.execute(delete(CodigoVerificacao).where(CodigoVerificacao.discord_user_id == user_id))
+                session.add(CodigoVerificacao(
+                    discord_user_id=user_id,
+                    email=entry['email'],
+                    channel_id=entry['channel_id'],
+                    code_hash=entry['code_hash'],
+                    salt=entry['salt'],
+                    tentativas=entry['attempts'],
+                    criado_em=datetime.utcfromtimestamp(entry['created']),
+                    expira_em=datetime.utcfromtimestamp(entry['expires_at'])
+                ))
+                await session.commit()
+        except Exception as e:
+            self.logger.error("Erro ao salvar código de verificação", exc_info=e)
+
+    async def _save_attempts(self, user_id, attempts):
+        try:
+            async with await DatabaseManager.get_session() as session:
+                await session.execute(
+                    update(CodigoVerificacao)
+                    .where(CodigoVerificacao.discord_user_id == user_id)
+                    .values(tentativas=attempts)
+                )
+                await session.commit()
+        except Exception as e:
+            self.logger.error("Erro ao atualizar tentativas do código de verificação", exc_info=e)
+
+    async def _delete(self, user_id):
+        try:
+            async with await DatabaseManager.get_session() as session:
+                await session.execute(delete(CodigoVerificacao).where(CodigoVerificacao.discord_user_id == user_id))
+                await session.commit()
+        except Exception as e:
+            self.logger.error("Erro ao remover código de verificação", exc_info=e)
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from datetime import datetime
+from sqlalchemy import insert, select, func
+from database.db import DatabaseManager
+from database.models import AtividadeVoz
+from utils.logger import get_logger
+import config
+
+class VoiceActivityHandler:
+    def __init__(self, bot):
+        self.bot = bot
+        self.logger = get_logger()
+        self.flush_interval = config.VOICE_ACTIVITY_FLUSH_INTERVAL
+
+        # Sessões de voz abertas: member_id -> dados da sessão
+        self.open_sessions = {}
+        # Segundos acumulados desde a última gravação: (member_id, channel_id, tipo_canal, equipe) -> segundos
+        self.pending = {}
+        self.period_start = datetime.utcnow()
+
+    def handle_voice_state_update(self, member, before, after):
+        """Atualiza as sessões de voz (O(1) por evento, sem acesso ao banco)"""
+        if member.bot:
+            return
+
+        before_id = before.channel.id if before.channel else None
+        after_id = after.channel.id if after.channel else None
+
+        # Mute/deafen/stream não mudam de canal
+        if before_id == after_id:
+            return
+
+        now = time.monotonic()
+        if before_id is not None:
+            self._close_session(member.id, now)
+        if after_id is not None:
+            self._open_session(member, after.channel, now)
+
+    def seed_sessions(self, guilds):
+        """Abre sessões para quem já estava em canais de voz quando o bot iniciou"""
+        now = time.monotonic()
+        for guild in guilds:
+            for channel in guild.voice_channels:
+                for member in channel.members:
+                    if not member.bot and member.id not in self.open_sessions:
+                        self._open_session(member, channel, now)
+
+    def _open_session(self, member, channel, now):
+        team_role = next((role for role in member.roles if role.name.startswith("Equipe ")), None)
+        self.open_sessions[member.id] = {
+            'channel_id': channel.id,
+            'tipo_canal': self._channel_type(channel),
+            'team_name': team_role.name.replace("Equipe ", "") if team_role else None,
+            'started': now
+        }
+
+    def _close_session(self, member_id, now):
+        session = self.open_sessions.pop(member_id, None)
+        if session:
+            self._credit(member_id, session, now - session['started'])
+
+    def _credit(self, member_id, session, seconds):
+        key = (member_id, session['channel_id'], session['tipo_canal'], session['team_name'])
+        self.pending[key] = self.pending.get(key, 0.0) + seconds
+
+    def _channel_type(self, channel):
+        """Classifica o canal: equipe, temporario ou outro"""
+        voice_handler = getattr(self.bot, 'voice_handler', None)
+        if voice_handler and channel.id in voice_handler.temp_channels:
+            return 'temporario'
+        if channel.name.startswith("🔊│"):
+            return 'equipe'
+        return 'outro'
+
+    async def flush(self):
+        """Grava em lote o tempo acumulado (inclui a parte já decorrida das sessões abertas)"""
+        now = time.monotonic()
+        for member_id, session in self.open_sessions.items():
+            self._credit(member_id, session, now - session['started'])
+            session['started'] = now
+
+        pending, self.pending = self.pending, {}
+        period_start, self.period_start = self.period_start, datetime.utcnow()
+
+        rows = [
+            {
+                'discord_user_id': member_id,
+                'channel_id': channel_id,
+                'tipo_canal': tipo_canal,
+                'team_name': team_name,
+                'segundos': int(round(seconds)),
+                'periodo_inicio': period_start,
+                'periodo_fim': self.period_start
+            }
+            for (member_id, channel_id, tipo_canal, team_name), seconds in pending.items()
+            if seconds >= 1
+        ]
+        if not rows:
+            return 0
+
+        try:
+            async with await DatabaseManager.get_session() as session:
+                await session.execute(insert(AtividadeVoz), rows)
+                await session.commit()
+            return len(rows)
+
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar atividade de voz ({len(rows)} registros)", exc_info=e)
+            # Devolver ao acumulador para tentar na próxima gravação
+            for key, seconds in pending.items():
+                self.pending[key] = self.pending.get(key, 0.0) + seconds
+            self.period_start = period_start
+            return 0
+
+    async def run_flush_loop(self):
+        """Grava a atividade de voz periodicamente"""
+        while not self.bot.is_closed():
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+            except Exception as e:
+                self.logger.error("Erro no loop de gravação de atividade de voz", exc_info=e)
+
+    async def get_team_hours(self, limit=15):
+        """Retorna horas de voz por equipe e por tipo de canal"""
+        async with await DatabaseManager.get_session() as session:
+            teams_result = await session.execute(
+                select(AtividadeVoz.team_name, func.sum(AtividadeVoz.segundos))
+                .where(AtividadeVoz.team_name.isnot(None))
+                .group_by(AtividadeVoz.team_name)
+                .order_by(func.sum(AtividadeVoz.segundos).desc())
+                .limit(limit)
+            )
+            types_result = await session.execute(
+                select(AtividadeVoz.tipo_canal, func.sum(AtividadeVoz.segundos))
+                .group_by(AtividadeVoz.tipo_canal)
+            )
+
+            teams = [(team_name, seconds / 3600) for team_name, seconds in teams_result.fetchall()]
+            channel_types = {tipo: seconds / 3600 for tipo, seconds in types_result.fetchall()}
+
+        return teams, channel_types
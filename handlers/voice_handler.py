@@ -1,44 +1,100 @@
 import discord
 from discord.ext import commands
 import asyncio
+import time
+import config
 from utils.logger import get_logger
+from utils.metrics import get_metrics
+from utils.singleflight import SingleFlight
+from utils.rest_telemetry import rest_subsystem
+from database.guild_settings import get_guild_settings, primary_guild, SETTINGS
 
 class VoiceHandler:
+    # Nome dos canais ociosos mantidos no pool
+    POOL_CHANNEL_NAME = "⏳ canal-reservado"
+
     def __init__(self, bot):
         self.bot = bot
         self.logger = get_logger()
+        self.metrics = get_metrics()
+        self.settings = get_guild_settings()
 
-        # IDs configuráveis
-        self.trigger_channel_id = 1421849681637670993  # Canal que ativa a criação
-        self.category_id = 1421849561072144534  # Categoria onde criar novos canais
+        # IDs padrão (cada servidor pode configurar os seus com n!configurar)
+        self.trigger_channel_id = SETTINGS['canal_voz_trigger'].padrao  # Canal que ativa a criação
+        self.category_id = SETTINGS['categoria_voz'].padrao  # Categoria onde criar novos canais
+        self.pool_category_id = None  # Categoria onde o pool foi criado
 
         # Controle de canais temporários
         self.temp_channels = set()  # IDs dos canais temporários criados
         self.channel_creators = {}  # channel_id: creator_id
 
+        # Remoção agendada de canais vazios (um timer por canal)
+        self.delete_grace = config.TEMP_VOICE_DELETE_GRACE
+        self.deletion_timers = {}  # channel_id: {'task': asyncio.Task, 'delete_at': timestamp}
+
+        # Pool de canais pré-criados (desativado com tamanho 0)
+        self.pool_size = config.TEMP_VOICE_POOL_SIZE
+        self.pool_channels = []  # IDs de canais ociosos prontos para uso
+        self._pool_lock = asyncio.Lock()
+        self._pool_adopted = False
+        self.refill_tasks = set()  # Reposições do pool em segundo plano
+
+        # Criações em andamento por membro (evita canais duplicados)
+        self.creation_flights = SingleFlight()
+
+    @rest_subsystem('voz')
     async def handle_voice_state_update(self, member, before, after):
         """Processa mudanças de estado de voz"""
         try:
+            # Alguém entrou em um canal temporário: cancelar remoção agendada
+            if after.channel and after.channel.id in self.temp_channels:
+                self.cancel_channel_deletion(after.channel.id)
+
             # Verificar se alguém entrou no canal trigger
-            if after.channel and after.channel.id == self.trigger_channel_id:
-                await self.create_temp_channel(member)
+            if after.channel and after.channel.id == self.trigger_id(member.guild):
+                await self.handle_trigger_join(member)
 
-            # Verificar se alguém saiu de um canal temporário (limpeza)
-            if before.channel and before.channel.id in self.temp_channels:
-                await self.check_temp_channel_cleanup(before.channel)
+            # Verificar se o último membro saiu de um canal temporário
+            if before.channel and before.channel != after.channel and before.channel.id in self.temp_channels:
+                if len(before.channel.members) == 0:
+                    self.schedule_channel_deletion(before.channel)
 
         except Exception as e:
             self.logger.error(f"Erro no handler de voz para {member.id}", exc_info=e)
 
+    def trigger_id(self, guild):
+        """Canal de voz que cria canais temporários no servidor"""
+        return self.settings.get(guild.id, 'canal_voz_trigger', self.trigger_channel_id)
+
+    def category_for(self, guild):
+        """Categoria dos canais temporários no servidor"""
+        return self.settings.get(guild.id, 'categoria_voz', self.category_id)
+
+    async def handle_trigger_join(self, member):
+        """Cria (ou reaproveita) o canal do membro, agrupando entradas concorrentes"""
+        channel, shared = await self.creation_flights.do(
+            member.id, lambda: self.create_temp_channel(member)
+        )
+
+        if shared:
+            self.metrics.inc('voice_creation_coalesced')
+            # O membro voltou ao trigger enquanto a criação estava em andamento
+            if channel and member.voice and member.voice.channel and member.voice.channel.id == self.trigger_id(member.guild):
+                await member.move_to(channel)
+
+        return channel
+
     async def create_temp_channel(self, member):
         """Cria um canal de voz temporário e move o usuário"""
+        started = time.perf_counter()
         try:
             guild = member.guild
-            category = guild.get_channel(self.category_id)
+            category_id = self.category_for(guild)
+            category = guild.get_channel(category_id)
 
             if not category:
-                self.logger.error(f"Categoria {self.category_id} não encontrada")
-                return
+                self.logger.error(f"Categoria {category_id} não encontrada")
+                return None
 
             # Verificar se usuário já tem um canal temporário ativo
             existing_channel = self.get_user_temp_channel(member.id)
@@ -46,7 +102,7 @@ class VoiceHandler:
                 # Se já tem canal, apenas move para ele
                 if member.voice and member.voice.channel:
                     await member.move_to(existing_channel)
-                return
+                return existing_channel
 
             # Gerar nome único para o canal
             base_name = f"🔊 {member.display_name}"
@@ -81,12 +137,19 @@ class VoiceHandler:
                 )
             }
 
-            # Criar canal temporário
-            temp_channel = await category.create_voice_channel(
-                name=channel_name,
-                overwrites=overwrites,
-                reason=f"Canal temporário criado para {member.display_name}"
-            )
+            # Usar um canal pré-criado do pool quando disponível
+            source = 'pool'
+            temp_channel = None
+            if self.pool_category_id in (None, category.id):
+                temp_channel = await self._claim_pool_channel(channel_name, overwrites, member)
+
+            if not temp_channel:
+                source = 'create'
+                temp_channel = await category.create_voice_channel(
+                    name=channel_name,
+                    overwrites=overwrites,
+                    reason=f"Canal temporário criado para {member.display_name}"
+                )
 
             # Registrar canal como temporário
             self.temp_channels.add(temp_channel.id)
@@ -95,8 +158,16 @@ class VoiceHandler:
             # Mover o usuário para o novo canal
             if member.voice and member.voice.channel:
                 await member.move_to(temp_channel)
+                self.metrics.observe('voice_join_to_move_seconds', time.perf_counter() - started, source=source)
+            else:
+                # Usuário saiu antes do canal ficar pronto
+                self.schedule_channel_deletion(temp_channel)
+
+            self.logger.info(f"Canal temporário '{channel_name}' criado para {member.id} ({member.display_name}) via {source}")
 
-            self.logger.info(f"Canal temporário '{channel_name}' criado para {member.id} ({member.display_name})")
+            # Repor o pool em segundo plano
+            if source == 'pool':
+                self.start_pool_refill()
 
             # Enviar mensagem de boas-vindas (opcional)
             try:
@@ -130,47 +201,191 @@ Este canal será removido automaticamente quando todos saírem.""",
             except Exception as e:
                 self.logger.error(f"Erro ao enviar mensagem de boas-vindas", exc_info=e)
 
+            return temp_channel
+
         except discord.Forbidden:
-            self.logger.error(f"Sem permissão para criar canal de voz na categoria {self.category_id}")
+            self.logger.error(f"Sem permissão para criar canal de voz na categoria {self.category_for(member.guild)}")
         except Exception as e:
             self.logger.error(f"Erro ao criar canal temporário para {member.id}", exc_info=e)
 
-    async def check_temp_channel_cleanup(self, channel):
-        """Verifica se um canal temporário deve ser deletado"""
-        try:
-            # Aguardar um pouco para evitar deletar muito rapidamente
-            await asyncio.sleep(2)
+        return None
 
-            # Verificar se ainda é um canal temporário válido
-            if channel.id not in self.temp_channels:
-                return
+    async def _claim_pool_channel(self, channel_name, overwrites, member):
+        """Retira um canal ocioso do pool e o configura para o membro"""
+        while self.pool_channels:
+            channel = self.bot.get_channel(self.pool_channels.pop(0))
+            if not channel:
+                # Canal do pool foi removido manualmente
+                continue
 
-            # Recarregar o canal para ter dados atualizados
             try:
-                updated_channel = self.bot.get_channel(channel.id)
-                if not updated_channel:
-                    # Canal já foi deletado
-                    self.temp_channels.discard(channel.id)
-                    self.channel_creators.pop(channel.id, None)
-                    return
+                await channel.edit(
+                    name=channel_name,
+                    overwrites=overwrites,
+                    reason=f"Canal temporário criado para {member.display_name}"
+                )
+                self.metrics.inc('voice_pool_claims', result='hit')
+                return channel
+            except discord.NotFound:
+                continue
+            except Exception as e:
+                self.logger.error(f"Erro ao usar canal {channel.id} do pool", exc_info=e)
+                break
+
+        if self.pool_size > 0:
+            self.metrics.inc('voice_pool_claims', result='miss')
+        return None
 
-                # Verificar se há membros no canal
-                if len(updated_channel.members) == 0:
-                    await self.delete_temp_channel(updated_channel)
+    @rest_subsystem('voz')
+    async def refill_pool(self):
+        """Completa o pool de canais ociosos até o tamanho configurado"""
+        if self.pool_size <= 0:
+            return
+
+        async with self._pool_lock:
+            try:
+                # O pool fica na categoria do servidor principal
+                guild = primary_guild(self.bot)
+                category_id = self.category_for(guild) if guild else self.category_id
+                category = self.bot.get_channel(category_id)
+                if not category:
+                    self.logger.warning(f"Categoria {category_id} não encontrada para o pool de canais")
+                    return
+                if category.id != self.pool_category_id:
+                    # Categoria reconfigurada: remover os canais ociosos do pool antigo
+                    await self._delete_pool_channels()
+                    self.pool_category_id = category.id
+                    self._pool_adopted = False
+
+                # Adotar canais ociosos que sobraram de uma execução anterior
+                if not self._pool_adopted:
+                    for channel in category.voice_channels:
+                        if channel.name == self.POOL_CHANNEL_NAME and channel.id not in self.pool_channels:
+                            self.pool_channels.append(channel.id)
+                    self._pool_adopted = True
+
+                guild = category.guild
+                while len(self.pool_channels) < self.pool_size:
+                    overwrites = {
+                        guild.default_role: discord.PermissionOverwrite(
+                            view_channel=False,
+                            connect=False
+                        ),
+                        guild.me: discord.PermissionOverwrite(
+                            view_channel=True,
+                            connect=True,
+                            manage_channels=True,
+                            move_members=True
+                        )
+                    }
+                    channel = await category.create_voice_channel(
+                        name=self.POOL_CHANNEL_NAME,
+                        overwrites=overwrites,
+                        reason="Canal reservado para o pool de canais temporários"
+                    )
+                    self.pool_channels.append(channel.id)
 
+            except Exception as e:
+                self.logger.error("Erro ao repor o pool de canais temporários", exc_info=e)
+
+    def start_pool_refill(self):
+        """Repõe o pool em segundo plano (a task fica referenciada até terminar)"""
+        task = asyncio.create_task(self.refill_pool())
+        self.refill_tasks.add(task)
+        task.add_done_callback(self._refill_done)
+        return task
+
+    def _refill_done(self, task):
+        self.refill_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error("Erro ao repor o pool de canais temporários", exc_info=task.exception())
+
+    async def _delete_pool_channels(self):
+        """Deleta os canais ociosos do pool atual e esvazia o pool"""
+        antigos, self.pool_channels = self.pool_channels, []
+        for channel_id in antigos:
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                continue
+            try:
+                await channel.delete(reason="Pool de canais temporários movido para outra categoria")
             except discord.NotFound:
+                pass
+            except Exception as e:
+                self.logger.error(f"Erro ao deletar o canal {channel_id} do pool antigo", exc_info=e)
+
+    def get_pool_info(self):
+        """Retorna o estado do pool e as latências de entrada -> movimentação"""
+        info = {
+            'size': self.pool_size,
+            'available': len(self.pool_channels),
+            'hits': self.metrics.get_counter('voice_pool_claims', result='hit'),
+            'misses': self.metrics.get_counter('voice_pool_claims', result='miss'),
+            'latency': {}
+        }
+
+        for source in ('pool', 'create'):
+            histogram = self.metrics.get_histogram('voice_join_to_move_seconds', source=source)
+            if histogram:
+                info['latency'][source] = {
+                    'count': histogram.count,
+                    'p50': histogram.percentile(0.5),
+                    'p99': histogram.percentile(0.99)
+                }
+
+        return info
+
+    def schedule_channel_deletion(self, channel, delay=None):
+        """Agenda a remoção de um canal temporário vazio após o período de tolerância"""
+        if channel.id in self.deletion_timers:
+            return
+
+        delay = self.delete_grace if delay is None else delay
+        task = asyncio.create_task(self._deletion_countdown(channel.id, delay))
+        self.deletion_timers[channel.id] = {
+            'task': task,
+            'delete_at': time.time() + delay
+        }
+
+    def cancel_channel_deletion(self, channel_id):
+        """Cancela a remoção agendada de um canal (ex: alguém entrou novamente)"""
+        timer = self.deletion_timers.pop(channel_id, None)
+        if not timer:
+            return False
+
+        timer['task'].cancel()
+        return True
+
+    async def _deletion_countdown(self, channel_id, delay):
+        """Aguarda o período de tolerância e deleta o canal se continuar vazio"""
+        await asyncio.sleep(delay)
+
+        # A partir daqui o timer não pode mais ser cancelado
+        self.deletion_timers.pop(channel_id, None)
+
+        try:
+            if channel_id not in self.temp_channels:
+                return
+
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
                 # Canal já foi deletado
-                self.temp_channels.discard(channel.id)
-                self.channel_creators.pop(channel.id, None)
+                self.temp_channels.discard(channel_id)
+                self.channel_creators.pop(channel_id, None)
+                return
+
+            if len(channel.members) == 0:
+                await self.delete_temp_channel(channel)
 
         except Exception as e:
-            self.logger.error(f"Erro ao verificar limpeza do canal {channel.id}", exc_info=e)
+            self.logger.error(f"Erro na remoção agendada do canal {channel_id}", exc_info=e)
 
     async def delete_temp_channel(self, channel):
         """Deleta um canal temporário"""
         try:
             channel_id = channel.id
             creator_id = self.channel_creators.get(channel_id)
+            self.cancel_channel_deletion(channel_id)
 
             await channel.delete(reason="Canal temporário vazio - limpeza automática")
 
@@ -202,8 +417,9 @@ Este canal será removido automaticamente quando todos saírem.""",
                     return channel
         return None
 
+    @rest_subsystem('voz')
     async def cleanup_abandoned_channels(self):
-        """Limpa canais temporários abandonados (executado periodicamente)"""
+        """Varredura de segurança: limpa canais temporários vazios que escaparam dos timers"""
         try:
             channels_to_remove = []
 
@@ -227,6 +443,7 @@ Este canal será removido automaticamente quando todos saírem.""",
         except Exception as e:
             self.logger.error("Erro na limpeza periódica de canais", exc_info=e)
 
+    @rest_subsystem('voz')
     async def force_cleanup_user_channels(self, user_id):
         """Remove todos os canais temporários de um usuário específico"""
         try:
@@ -256,11 +473,14 @@ Este canal será removido automaticamente quando todos saírem.""",
                 creator = self.bot.get_user(creator_id) if creator_id else None
                 creator_name = creator.display_name if creator else "Desconhecido"
 
+                timer = self.deletion_timers.get(channel_id)
+
                 info.append({
                     'channel': channel,
                     'creator': creator_name,
                     'member_count': len(channel.members),
-                    'members': [m.display_name for m in channel.members]
+                    'members': [m.display_name for m in channel.members],
+                    'delete_at': timer['delete_at'] if timer else None
                 })
 
         return info
\ No newline at end of file
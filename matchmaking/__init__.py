@@ -0,0 +1 @@
+# Matchmaking package
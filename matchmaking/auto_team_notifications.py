@@ -0,0 +1,165 @@
+"""
+Formação automática de equipes entre as pessoas disponíveis
+Carrega quem está marcado como disponível, roda o algoritmo vetorizado fora do event loop
+e envia a cada membro (via outbox) a equipe sugerida e como entrar nela pelo /aplicar
+"""
+
+import asyncio
+import time
+from collections import Counter
+import discord
+from sqlalchemy import select
+from database.db import DatabaseManager
+from database.models import Participante
+from database.participant_cache import project
+from database.team_index import get_team_index
+from handlers.notification_outbox import enqueue_notification
+from matchmaking.team_formation import form_teams, region_key
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+import config
+
+# Buckets do tempo de execução do algoritmo (em segundos)
+FORMATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Regiões listadas no resumo (a cidade é texto livre; as demais entram em "outras")
+MAX_REGIONS_SHOWN = 10
+
+
+class AutoTeamNotificationSystem:
+    def __init__(self, bot, max_size=None, min_size=None, registry=None):
+        self.bot = bot
+        self.max_size = max_size or config.MAX_TEAM_SIZE
+        self.min_size = min_size or config.AUTO_TEAM_MIN_SIZE
+        self.metrics = registry or get_metrics()
+        self.logger = get_logger()
+
+    async def load_candidates(self):
+        """Participantes disponíveis para equipe (projeções somente leitura)"""
+        async with await DatabaseManager.get_session() as session:
+            result = await session.execute(
+                select(Participante).where(Participante.disponivel_para_equipe == True).order_by(Participante.id)
+            )
+            return [project(p) for p in result.scalars().all()]
+
+    def suggested_team_name(self, membros):
+        """Equipe atual de um dos membros que tenha mais vagas (os demais aplicam para ela)
+
+        Só sugere equipes que comportem o grupo inteiro; sem nenhuma, o grupo escolhe quem cria a equipe
+        """
+        index = get_team_index()
+        equipes = [
+            p.nome_equipe for p in membros
+            if p.nome_equipe and index.members.get(p.nome_equipe, 1) + len(membros) - 1 <= self.max_size
+        ]
+        if not equipes:
+            return None
+        return min(equipes, key=lambda nome: index.members.get(nome, 1))
+
+    async def executar_formacao_completa(self):
+        """Forma as equipes, notifica os membros e retorna o resumo exibido para o administrador"""
+        try:
+            participantes = await self.load_candidates()
+            if len(participantes) < self.min_size:
+                return {
+                    "sucesso": True,
+                    "equipes_formadas": 0,
+                    "motivo": f"São necessárias ao menos {self.min_size} pessoas disponíveis (há {len(participantes)})."
+                }
+
+            inicio = time.perf_counter()
+            formacao = await asyncio.to_thread(form_teams, participantes, self.max_size, self.min_size)
+            duracao = time.perf_counter() - inicio
+            self.metrics.observe('auto_team_formation_seconds', duracao, buckets=FORMATION_BUCKETS)
+            self.logger.info(
+                f"Formação automática: {len(formacao.equipes)} equipe(s) com {len(participantes)} pessoa(s) "
+                f"em {duracao:.2f}s ({formacao.trocas} troca(s) na busca local)"
+            )
+
+            if not formacao.equipes:
+                return {
+                    "sucesso": True,
+                    "equipes_formadas": 0,
+                    "motivo": "Não há pessoas suficientes na mesma modalidade/região para formar uma equipe."
+                }
+
+            equipes_detalhes = []
+            notificacoes = 0
+            async with await DatabaseManager.get_session() as session:
+                for numero, (indices, score) in enumerate(zip(formacao.equipes, formacao.scores), start=1):
+                    membros = [participantes[i] for i in indices]
+                    nome_equipe = self.suggested_team_name(membros)
+                    score_percentual = round(score * 100)
+
+                    for membro in membros:
+                        embed = self.build_suggestion_embed(membro, membros, nome_equipe, score_percentual)
+                        enqueue_notification(session, 'equipe_sugerida', embed, discord_user_id=membro.discord_user_id)
+                        notificacoes += 1
+
+                    equipes_detalhes.append({
+                        "nome_sugerido": nome_equipe or f"Equipe Sugerida {numero}",
+                        "tamanho": len(membros),
+                        "score_compatibilidade": score_percentual,
+                        "membros": [membro.discord_user_id for membro in membros]
+                    })
+                await session.commit()
+            self.bot.outbox.wake()
+
+            agrupados = [participantes[i] for indices in formacao.equipes for i in indices]
+            self.metrics.inc('auto_teams_formed', len(formacao.equipes))
+
+            return {
+                "sucesso": True,
+                "equipes_formadas": len(formacao.equipes),
+                "participantes_agrupados": len(agrupados),
+                "participantes_restantes": len(formacao.restantes),
+                "notificacoes_enviadas": notificacoes,
+                "grupos_por_regiao": self.regions_summary(agrupados),
+                "equipes_detalhes": sorted(equipes_detalhes, key=lambda e: -e["score_compatibilidade"])
+            }
+
+        except Exception as e:
+            self.logger.error("Erro na formação automática de equipes", exc_info=e)
+            return {"sucesso": False, "erro": str(e)}
+
+    @staticmethod
+    def regions_summary(agrupados):
+        """Pessoas agrupadas por região: as MAX_REGIONS_SHOWN maiores e o restante somado em outras"""
+        contagem = Counter(region_key(p.cidade) for p in agrupados).most_common()
+        resumo = dict(contagem[:MAX_REGIONS_SHOWN])
+        outras = sum(count for _, count in contagem[MAX_REGIONS_SHOWN:])
+        if outras:
+            resumo['outras'] = resumo.get('outras', 0) + outras
+        return resumo
+
+    def build_suggestion_embed(self, membro, membros, nome_equipe, score_percentual):
+        """DM para um membro com os colegas sugeridos e como formar a equipe"""
+        embed = discord.Embed(
+            title="🤖 Encontramos uma Equipe Para Você!",
+            description=f"A formação automática juntou você com **{len(membros) - 1}** pessoa(s) compatível(is) "
+                        f"(**{score_percentual}%** de compatibilidade).",
+            color=discord.Color.green()
+        )
+
+        colegas = ""
+        for outro in membros:
+            if outro.discord_user_id == membro.discord_user_id:
+                continue
+            colegas += f"• <@{outro.discord_user_id}> **{outro.nome} {outro.sobrenome}** - {outro.cidade}"
+            colegas += f" ({outro.escolaridade.value})\n"
+            if outro.descricao_habilidades:
+                habilidades = outro.descricao_habilidades[:80] + ("..." if len(outro.descricao_habilidades) > 80 else "")
+                colegas += f"  ↳ {habilidades}\n"
+        embed.add_field(name="👥 Seus Colegas", value=colegas[:1024], inline=False)
+
+        if nome_equipe is None:
+            proximos = "Converse com o grupo e escolham quem vai criar a equipe; os demais aplicam com `/aplicar`."
+        elif membro.nome_equipe == nome_equipe:
+            proximos = (f"Os colegas foram convidados a aplicar para a sua equipe **{nome_equipe}**. "
+                        f"O líder aprova as aplicações pelo `/aplicacoes`.")
+        else:
+            proximos = f"Use `/aplicar equipe:{nome_equipe}` para entrar na equipe **{nome_equipe}** junto com o grupo."
+        embed.add_field(name="📋 Próximos Passos", value=proximos, inline=False)
+
+        embed.set_footer(text="A sugestão não é obrigatória: você continua livre para escolher outra equipe")
+        return embed
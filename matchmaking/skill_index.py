@@ -0,0 +1,180 @@
+"""
+Índice TF-IDF das habilidades das pessoas disponíveis (/recomendar)
+Vetores esparsos (termo: frequência) com lista invertida por termo; é carregado do banco no
+startup e atualizado quando alguém se marca como disponível ou entra em uma equipe
+"""
+
+import heapq
+import math
+import re
+import time
+from collections import Counter, namedtuple
+from sqlalchemy import select
+from database.db import DatabaseManager
+from database.models import Participante
+from database.participant_cache import project
+from database.team_index import normalize
+from utils.metrics import get_metrics
+
+STOPWORDS = frozenset("""
+    a o as os e de da do das dos em no na nos nas um uma uns umas com por para pra que se
+    ao aos sou tenho meu minha eu tambem mais muito bem como ja sobre and the of in with
+""".split())
+
+PESO_RELEVANCIA = 0.7  # Com habilidades procuradas: peso da relevância contra a complementaridade
+
+# Buckets do tempo de uma recomendação (em segundos)
+RECOMMEND_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+
+Recomendacao = namedtuple('Recomendacao', ['participante', 'score', 'complementaridade', 'relevancia'])
+
+
+def skill_tokens(texto):
+    """Palavras da descrição de habilidades (sem acentos, sem maiúsculas e sem stopwords)"""
+    return [token for token in re.findall(r'[a-z0-9+#]+', normalize(texto or '')) if len(token) > 1 and token not in STOPWORDS]
+
+
+def skill_terms(texto):
+    """Termos do índice: palavras e pares de palavras vizinhas (ex: "machine learning")"""
+    tokens = skill_tokens(texto)
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class SkillIndex:
+    """Pessoas disponíveis por discord_user_id: termos da descrição, projeção e lista invertida"""
+
+    def __init__(self, registry=None):
+        self.metrics = registry or get_metrics()
+        self.docs = {}  # discord_user_id: Counter(termo: frequência)
+        self.people = {}  # discord_user_id: projeção do participante
+        self.postings = {}  # termo: discord_user_ids que o usam
+        self.loaded = False
+
+    def __len__(self):
+        return len(self.docs)
+
+    async def load(self):
+        """(Re)carrega do banco as pessoas disponíveis"""
+        async with await DatabaseManager.get_session() as session:
+            result = await session.execute(
+                select(Participante).where(Participante.disponivel_para_equipe == True)
+            )
+            participantes = [project(p) for p in result.scalars().all()]
+
+        self.docs.clear()
+        self.people.clear()
+        self.postings.clear()
+        for participante in participantes:
+            self.upsert(participante)
+        self.loaded = True
+
+    def upsert(self, participante):
+        """Atualiza uma pessoa (quem não está disponível ou não descreveu habilidades sai do índice)"""
+        self.remove(participante.discord_user_id)
+        termos = Counter(skill_terms(participante.descricao_habilidades))
+        if not participante.disponivel_para_equipe or not termos:
+            return
+        self.docs[participante.discord_user_id] = termos
+        self.people[participante.discord_user_id] = participante
+        for termo in termos:
+            self.postings.setdefault(termo, set()).add(participante.discord_user_id)
+
+    def remove(self, discord_user_id):
+        """Remove uma pessoa (entrou em uma equipe ou deixou de estar disponível)"""
+        termos = self.docs.pop(discord_user_id, None)
+        self.people.pop(discord_user_id, None)
+        for termo in termos or ():
+            usuarios = self.postings[termo]
+            usuarios.discard(discord_user_id)
+            if not usuarios:
+                del self.postings[termo]
+
+    def idf(self, termo):
+        return math.log((1 + len(self.docs)) / (1 + len(self.postings.get(termo, ())))) + 1
+
+    def _weights(self, termos):
+        """Pesos TF-IDF (tf sublinear) e a norma do vetor"""
+        pesos = {termo: (1 + math.log(tf)) * self.idf(termo) for termo, tf in termos.items()}
+        return pesos, math.sqrt(sum(peso * peso for peso in pesos.values()))
+
+    def similarities(self, textos):
+        """Cosseno entre os textos (somados em um único vetor) e cada pessoa que compartilha algum termo"""
+        termos = Counter(termo for texto in textos for termo in skill_terms(texto))
+        pesos, norma = self._weights(termos)
+        if not norma:
+            return {}
+
+        # Produto escalar só com quem aparece nas listas invertidas dos termos da consulta
+        produtos = Counter()
+        for termo, peso in pesos.items():
+            idf = self.idf(termo)
+            for discord_user_id in self.postings.get(termo, ()):
+                produtos[discord_user_id] += peso * (1 + math.log(self.docs[discord_user_id][termo])) * idf
+
+        return {
+            discord_user_id: produto / (norma * self._weights(self.docs[discord_user_id])[1])
+            for discord_user_id, produto in produtos.items()
+        }
+
+    def recommend(self, textos_equipe, procurando=None, modalidade=None, equipe_excluida=None, limit=10):
+        """As `limit` pessoas mais complementares às habilidades da equipe
+
+        Sem `procurando` o score é a complementaridade (1 - cosseno com a equipe); com habilidades
+        procuradas, só quem tem algum termo em comum entra, e a relevância pesa mais no score.
+        """
+        inicio = time.perf_counter()
+        similaridade_equipe = self.similarities(textos_equipe)
+        relevancia = self.similarities([procurando]) if procurando else None
+        candidatos = relevancia.keys() if relevancia is not None else self.docs.keys()
+
+        def elegivel(discord_user_id):
+            pessoa = self.people[discord_user_id]
+            return ((modalidade is None or pessoa.modalidade == modalidade)
+                    and (equipe_excluida is None or pessoa.nome_equipe != equipe_excluida))
+
+        def score(discord_user_id):
+            complementaridade = 1 - similaridade_equipe.get(discord_user_id, 0.0)
+            if relevancia is None:
+                return complementaridade
+            return PESO_RELEVANCIA * relevancia[discord_user_id] + (1 - PESO_RELEVANCIA) * complementaridade
+
+        # Empate (ex: equipe sem descrições): quem descreveu mais habilidades primeiro
+        melhores = heapq.nlargest(
+            limit, filter(elegivel, candidatos),
+            key=lambda discord_user_id: (score(discord_user_id), len(self.docs[discord_user_id]))
+        )
+        resultado = [
+            Recomendacao(
+                participante=self.people[discord_user_id],
+                score=score(discord_user_id),
+                complementaridade=1 - similaridade_equipe.get(discord_user_id, 0.0),
+                relevancia=relevancia[discord_user_id] if relevancia is not None else None
+            )
+            for discord_user_id in melhores
+        ]
+        self.metrics.observe('skill_recommend_seconds', time.perf_counter() - inicio, buckets=RECOMMEND_BUCKETS)
+        return resultado
+
+    async def recommend_for_team(self, participante, procurando=None, limit=10):
+        """Recomendações para a equipe do participante (habilidades de todos os membros, disponíveis ou não)"""
+        async with await DatabaseManager.get_session() as session:
+            result = await session.execute(
+                select(Participante.descricao_habilidades).where(Participante.nome_equipe == participante.nome_equipe)
+            )
+            textos_equipe = [texto for texto in result.scalars().all() if texto]
+
+        return self.recommend(
+            textos_equipe,
+            procurando=procurando,
+            modalidade=participante.modalidade,
+            equipe_excluida=participante.nome_equipe,
+            limit=limit
+        )
+
+
+# Instância global do índice de habilidades
+skill_index = SkillIndex()
+
+def get_skill_index():
+    """Retorna o índice global de habilidades"""
+    return skill_index
@@ -0,0 +1,207 @@
+"""
+Formação automática de equipes (vetorizada com NumPy)
+Os participantes viram arrays de características (modalidade, região, escolaridade e um vetor
+de habilidades); a compatibilidade de todos os pares é calculada de uma vez por bloco e as
+equipes saem de um guloso seguido de busca local por trocas de membros entre equipes
+"""
+
+import math
+import re
+import zlib
+from collections import namedtuple
+import numpy as np
+from database.models import ModalidadeEnum
+from database.team_index import normalize
+from matchmaking.skill_index import skill_tokens
+import config
+
+# Pesos da compatibilidade entre duas pessoas (somam 1, então o score fica entre 0 e 1)
+PESO_HABILIDADES = 0.5  # Habilidades complementares
+PESO_REGIAO = 0.3  # Mesma região (cidade)
+PESO_ESCOLARIDADE = 0.2  # Mesmo nível de formação
+
+SKILL_DIM = 256  # Dimensão do vetor de habilidades (hashing de palavras)
+BLOCK_SIZE = 512  # Máximo de pessoas por matriz de compatibilidade (512² floats = 1 MB)
+LOCAL_SEARCH_ROUNDS = 50  # Rodadas de trocas da busca local
+
+Features = namedtuple('Features', ['modalidade', 'regiao', 'escolaridade', 'habilidades', 'tem_habilidades', 'regioes'])
+Formacao = namedtuple('Formacao', ['equipes', 'scores', 'restantes', 'trocas'])
+
+
+def region_key(cidade):
+    """Chave da região a partir da cidade digitada (ex: "São Paulo" -> "sao_paulo")"""
+    return re.sub(r'\W+', '_', normalize(cidade or '')).strip('_') or 'sem_regiao'
+
+
+def skill_vectors(textos, dim=SKILL_DIM):
+    """Vetores de habilidades (hashing das palavras, normalizados); texto vazio vira vetor nulo"""
+    linhas, colunas, valores = [], [], []
+    for i, texto in enumerate(textos):
+        for token in skill_tokens(texto):
+            h = zlib.crc32(token.encode())
+            linhas.append(i)
+            colunas.append(h % dim)
+            valores.append(1.0 if h & 0x80000000 else -1.0)  # Sinal do hash reduz o viés das colisões
+
+    vetores = np.zeros((len(textos), dim), dtype=np.float32)
+    np.add.at(vetores, (np.array(linhas, dtype=np.intp), np.array(colunas, dtype=np.intp)), np.array(valores, dtype=np.float32))
+    normas = np.linalg.norm(vetores, axis=1)
+    np.divide(vetores, normas[:, None], out=vetores, where=normas[:, None] > 0)
+    return vetores
+
+
+def build_features(participantes):
+    """Arrays de características dos participantes (na mesma ordem da lista)"""
+    regioes = [region_key(p.cidade) for p in participantes]
+    _, regiao = np.unique(np.array(regioes, dtype=object), return_inverse=True)
+    _, escolaridade = np.unique(np.array([p.escolaridade.value for p in participantes], dtype=object), return_inverse=True)
+    habilidades = skill_vectors([p.descricao_habilidades for p in participantes])
+    return Features(
+        modalidade=np.array([p.modalidade.value for p in participantes], dtype=object),
+        regiao=regiao.astype(np.int32),
+        escolaridade=escolaridade.astype(np.int32),
+        habilidades=habilidades,
+        tem_habilidades=habilidades.any(axis=1),
+        regioes=regioes
+    )
+
+
+def compatibility(features, idx):
+    """Matriz de compatibilidade (len(idx) x len(idx)) entre os participantes idx, com diagonal zero"""
+    regiao = features.regiao[idx]
+    escolaridade = features.escolaridade[idx]
+    habilidades = features.habilidades[idx]
+    tem = features.tem_habilidades[idx]
+
+    # Sem descrição de um dos lados a complementaridade é neutra
+    complementar = np.where(tem[:, None] & tem[None, :], 1.0 - habilidades @ habilidades.T, 0.5)
+    score = PESO_HABILIDADES * np.clip(complementar, 0.0, 1.0)
+    score += PESO_REGIAO * (regiao[:, None] == regiao[None, :])
+    score += PESO_ESCOLARIDADE * (escolaridade[:, None] == escolaridade[None, :])
+    score = score.astype(np.float32)
+    np.fill_diagonal(score, 0.0)
+    return score
+
+
+def team_sizes(n, max_size, min_size):
+    """Tamanhos equilibrados para dividir n pessoas em equipes de min_size a max_size"""
+    k = math.ceil(n / max_size)
+    if k and n // k < min_size:
+        k = n // min_size
+    if k == 0:
+        return []
+    total = min(n, k * max_size)
+    base, extra = divmod(total, k)
+    return [base + 1] * extra + [base] * (k - extra)
+
+
+def greedy_teams(score, sizes):
+    """Guloso: começa pela pessoa mais difícil de encaixar e adiciona quem mais soma à equipe"""
+    livre = np.ones(len(score), dtype=bool)
+    dificuldade = score.sum(axis=1)
+    equipes = []
+    for tamanho in sizes:
+        candidatos = np.flatnonzero(livre)
+        semente = candidatos[np.argmin(dificuldade[candidatos])]
+        livre[semente] = False
+        membros = [semente]
+        ganho = np.where(livre, score[semente], -np.inf)
+        for _ in range(tamanho - 1):
+            escolhido = int(np.argmax(ganho))
+            livre[escolhido] = False
+            membros.append(escolhido)
+            ganho += score[escolhido]
+            ganho[escolhido] = -np.inf
+        equipes.append(np.array(membros))
+    return equipes, np.flatnonzero(livre)
+
+
+def local_search(score, equipes, max_rounds=LOCAL_SEARCH_ROUNDS):
+    """Troca membros entre equipes enquanto a soma das compatibilidades internas aumentar
+
+    afinidade[i, k] = compatibilidade de i com a equipe k. O ganho de trocar a (equipe A) com
+    b (equipe B) sai de afinidade em O(1), então cada rodada avalia todos os pares de uma vez
+    e aplica as melhores trocas entre pares de equipes distintos.
+    """
+    if len(equipes) < 2:
+        return equipes, 0
+
+    membros = np.concatenate(equipes)
+    equipe_de = np.concatenate([np.full(len(e), k) for k, e in enumerate(equipes)])
+    interno = score[np.ix_(membros, membros)]
+    afinidade = interno @ np.eye(len(equipes), dtype=np.float32)[equipe_de]
+    linhas = np.arange(len(membros))
+
+    trocas = 0
+    for _ in range(max_rounds):
+        cruzada = afinidade[:, equipe_de]  # cruzada[i, j] = afinidade de i com a equipe de j
+        propria = afinidade[linhas, equipe_de]
+        ganho = cruzada + cruzada.T - 2 * interno - propria[:, None] - propria[None, :]
+        ganho[equipe_de[:, None] == equipe_de[None, :]] = -np.inf
+
+        # Melhor parceiro de cada pessoa, das trocas mais vantajosas para as menos
+        parceiro = np.argmax(ganho, axis=1)
+        melhor = ganho[linhas, parceiro]
+        ordem = np.argsort(-melhor)
+        ordem = ordem[melhor[ordem] > 1e-6]
+        if not len(ordem):
+            break
+
+        # Trocas entre pares de equipes diferentes não interferem entre si
+        tocadas = set()
+        for a in ordem:
+            b = parceiro[a]
+            time_a, time_b = int(equipe_de[a]), int(equipe_de[b])
+            if time_a in tocadas or time_b in tocadas:
+                continue
+            tocadas.update((time_a, time_b))
+            afinidade[:, time_a] += interno[:, b] - interno[:, a]
+            afinidade[:, time_b] += interno[:, a] - interno[:, b]
+            equipe_de[a], equipe_de[b] = time_b, time_a
+            trocas += 1
+
+    return [membros[equipe_de == k] for k in range(len(equipes))], trocas
+
+
+def team_score(score, equipe):
+    """Compatibilidade média entre os pares da equipe (0 a 1)"""
+    n = len(equipe)
+    if n < 2:
+        return 0.0
+    return float(score[np.ix_(equipe, equipe)].sum() / (n * (n - 1)))
+
+
+def buckets(features):
+    """Grupos que podem formar equipe juntos: mesma modalidade e, no presencial, mesma região"""
+    chaves = {}
+    for i, (modalidade, regiao) in enumerate(zip(features.modalidade, features.regiao)):
+        chave = (modalidade, int(regiao)) if modalidade == ModalidadeEnum.PRESENCIAL.value else (modalidade, None)
+        chaves.setdefault(chave, []).append(i)
+
+    for idx in chaves.values():
+        idx = np.array(idx)
+        # Blocos ordenados por região e escolaridade: vizinhos no bloco são os mais compatíveis
+        ordem = np.lexsort((features.escolaridade[idx], features.regiao[idx]))
+        yield from np.array_split(idx[ordem], math.ceil(len(idx) / BLOCK_SIZE))
+
+
+def form_teams(participantes, max_size=None, min_size=None, max_rounds=LOCAL_SEARCH_ROUNDS):
+    """Agrupa os participantes em equipes; retorna índices da lista de entrada"""
+    max_size = max_size or config.MAX_TEAM_SIZE
+    min_size = min_size or config.AUTO_TEAM_MIN_SIZE
+    equipes, scores, restantes, trocas = [], [], [], 0
+    if not participantes:
+        return Formacao(equipes, scores, restantes, trocas)
+
+    features = build_features(participantes)
+    for bloco in buckets(features):
+        score = compatibility(features, bloco)
+        locais, sobra = greedy_teams(score, team_sizes(len(bloco), max_size, min_size))
+        locais, n_trocas = local_search(score, locais, max_rounds)
+        trocas += n_trocas
+        for equipe in locais:
+            equipes.append(bloco[equipe].tolist())
+            scores.append(team_score(score, equipe))
+        restantes.extend(bloco[sobra].tolist())
+
+    return Formacao(equipes, scores, restantes, trocas)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Script para consultar os logs estruturados (LOG_FORMAT=json)
+
+Exemplos:
+    python query_logs.py -w level=ERROR
+    python query_logs.py -w user_id=123456789 -w event=command_completed
+    python query_logs.py -w "duration_ms>500" --fields ts,command,duration_ms
+    python query_logs.py --count-by command nasa_spaceapps_bot.log.1.gz
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import operator
+import re
+import sys
+from collections import Counter
+
+OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '<': operator.lt,
+    '=': operator.eq
+}
+CONDITION_PATTERN = re.compile(r'^([\w.]+)(>=|<=|!=|>|<|=)(.*)$')
+
+
+def parse_condition(text):
+    """Converte 'campo<op>valor' em (campo, função de comparação, valor)"""
+    match = CONDITION_PATTERN.match(text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Condição inválida: {text} (use campo=valor, campo>valor, ...)")
+    field, op, value = match.groups()
+    return field, OPERATORS[op], value
+
+
+def matches(record, conditions):
+    """Verifica se o registro atende a todas as condições"""
+    for field, compare, expected in conditions:
+        if field not in record:
+            return False
+        value = record[field]
+        try:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                expected_value = float(expected)
+            else:
+                value, expected_value = str(value), expected
+            if not compare(value, expected_value):
+                return False
+        except ValueError:
+            return False
+    return True
+
+
+def default_files():
+    """Arquivo de log atual e os rotacionados (.gz), do mais antigo para o mais novo"""
+    try:
+        import config
+        base = config.LOG_FILE
+    except Exception:
+        base = 'nasa_spaceapps_bot.log'
+
+    def age(name):
+        # Rotação por tamanho: .1 é o mais novo; por tempo: o sufixo é a data
+        suffix = name[len(base) + 1:-len('.gz')]
+        return (-int(suffix), '') if suffix.isdigit() else (0, suffix)
+
+    return sorted(glob.glob(f"{base}.*.gz"), key=age) + [base]
+
+
+def read_records(paths):
+    """Lê as linhas JSON dos arquivos (ignora linhas em texto livre)"""
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if not line.startswith('{'):
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            print(f"Arquivo não encontrado: {path}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help="arquivos de log (padrão: LOG_FILE e rotacionados)")
+    parser.add_argument('-w', '--where', action='append', type=parse_condition, default=[],
+                        help="filtro campo<op>valor (pode repetir; todos precisam ser atendidos)")
+    parser.add_argument('--since', help="apenas registros a partir deste horário ISO (ex: 2025-10-04T12:00)")
+    parser.add_argument('--fields', help="campos a exibir, separados por vírgula (padrão: registro completo)")
+    parser.add_argument('--count-by', help="conta os registros por valor do campo")
+    parser.add_argument('-n', '--limit', type=int, help="máximo de registros exibidos")
+    args = parser.parse_args()
+
+    conditions = list(args.where)
+    if args.since:
+        conditions.append(('ts', operator.ge, args.since))
+    fields = args.fields.split(',') if args.fields else None
+
+    counter = Counter()
+    shown = 0
+    for record in read_records(args.files or default_files()):
+        if not matches(record, conditions):
+            continue
+
+        if args.count_by:
+            counter[record.get(args.count_by)] += 1
+            continue
+
+        if fields:
+            record = {field: record.get(field) for field in fields}
+        print(json.dumps(record, ensure_ascii=False))
+        shown += 1
+        if args.limit and shown >= args.limit:
+            break
+
+    if args.count_by:
+        for value, count in counter.most_common():
+            print(f"{count:>8}  {value}")
+
+
+if __name__ == "__main__":
+    main()
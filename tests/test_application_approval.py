@@ -0,0 +1,152 @@
+"""
+Testes de concorrência para a aprovação de aplicações
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select, event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Participante, AplicacaoEquipe, NotificacaoPendente, EscolaridadeEnum, ModalidadeEnum, StatusAplicacaoEnum
+from database.participant_cache import ParticipantCache
+from handlers.application_handler import ApplicationHandler
+from utils.metrics import MetricsRegistry
+
+
+def make_participant(i, equipe):
+    return Participante(
+        id=i,
+        discord_user_id=1000 + i,
+        discord_username=f'user{i}',
+        nome=f'Nome{i}',
+        sobrenome='Silva',
+        email=f'p{i}@example.com',
+        telefone='34999887766',
+        cpf='12345678901',
+        cidade='Uberlândia',
+        data_nascimento='15/08/1995',
+        escolaridade=EscolaridadeEnum.GRADUANDO,
+        modalidade=ModalidadeEnum.PRESENCIAL,
+        nome_equipe=equipe
+    )
+
+
+@pytest_asyncio.fixture
+async def approval_db(tmp_path):
+    """Equipe Alfa com 4 membros (líder id 1), Equipe Beta (líder id 5) e 5 aplicantes sem equipe cheia"""
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "aprovacoes.db"}')
+
+    # O SQLite não tem FOR UPDATE: BEGIN IMMEDIATE serializa as transações de escrita,
+    # o que é o comportamento que o travamento das linhas garante no PostgreSQL
+    @event.listens_for(engine.sync_engine, 'connect')
+    def autocommit_driver(dbapi_connection, record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, 'begin')
+    def begin_immediate(conn):
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        session.add_all([make_participant(i, 'Alfa') for i in range(1, 5)])
+        session.add(make_participant(5, 'Beta'))
+        session.add_all([make_participant(i, f'Solo {i}') for i in range(10, 15)])
+        await session.flush()
+        for i in range(10, 15):
+            session.add(AplicacaoEquipe(id=i, aplicante_id=i, equipe_nome='Alfa', lider_id=1, mensagem_aplicacao='Oi'))
+        # O aplicante 10 também aplicou para a Beta
+        session.add(AplicacaoEquipe(id=20, aplicante_id=10, equipe_nome='Beta', lider_id=5, mensagem_aplicacao='Oi'))
+        await session.commit()
+
+    async def get_session():
+        return factory()
+
+    cache = ParticipantCache(ttl=60, registry=MetricsRegistry())
+    with patch('database.db.DatabaseManager.get_session', get_session), \
+            patch('handlers.application_handler.get_participant_cache', return_value=cache):
+        yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def handler():
+    bot = MagicMock()
+    bot.fetch_user = AsyncMock()
+    bot.guilds = []
+    return ApplicationHandler(bot)
+
+
+class TestApplicationApproval:
+
+    @pytest.mark.asyncio
+    async def test_parallel_approvals_never_exceed_team_size(self, approval_db, handler):
+        """Com 4 membros, só 2 de 5 aprovações simultâneas entram; as demais são rejeitadas"""
+        resultados = await asyncio.gather(*(
+            handler.respond_to_application(1001, aplicacao_id, True) for aplicacao_id in range(10, 15)
+        ))
+
+        assert sum(ok for ok, _ in resultados) == 2
+        assert all("completa" in mensagem for ok, mensagem in resultados if not ok)
+
+        async with approval_db() as session:
+            membros = (await session.execute(select(Participante).where(Participante.nome_equipe == 'Alfa'))).scalars().all()
+            aplicacoes = (await session.execute(
+                select(AplicacaoEquipe).where(AplicacaoEquipe.equipe_nome == 'Alfa')
+            )).scalars().all()
+
+        assert len(membros) == 6
+        status = [aplicacao.status for aplicacao in aplicacoes]
+        assert status.count(StatusAplicacaoEnum.APROVADA) == 2
+        assert status.count(StatusAplicacaoEnum.REJEITADA) == 3
+
+    @pytest.mark.asyncio
+    async def test_applicant_accepted_by_two_teams_joins_only_one(self, approval_db, handler):
+        """Aprovações simultâneas do mesmo aplicante por equipes diferentes: a segunda encontra a aplicação cancelada"""
+        (ok_alfa, _), (ok_beta, _) = await asyncio.gather(
+            handler.respond_to_application(1001, 10, True),
+            handler.respond_to_application(1005, 20, True)
+        )
+
+        assert ok_alfa != ok_beta
+        async with approval_db() as session:
+            aplicante = await session.get(Participante, 10)
+            aplicacoes = (await session.execute(
+                select(AplicacaoEquipe).where(AplicacaoEquipe.aplicante_id == 10)
+            )).scalars().all()
+
+        status = {aplicacao.equipe_nome: aplicacao.status for aplicacao in aplicacoes}
+        assert status[aplicante.nome_equipe] == StatusAplicacaoEnum.APROVADA
+        assert StatusAplicacaoEnum.CANCELADA in status.values()
+        assert aplicante.disponivel_para_equipe is False
+
+    @pytest.mark.asyncio
+    async def test_rejection_does_not_move_applicant(self, approval_db, handler):
+        """Rejeitar apenas grava a resposta"""
+        ok, _ = await handler.respond_to_application(1001, 11, False, "Sem vagas para esse perfil")
+        assert ok
+
+        async with approval_db() as session:
+            aplicante = await session.get(Participante, 11)
+            aplicacao = await session.get(AplicacaoEquipe, 11)
+            notificacoes = (await session.execute(select(NotificacaoPendente))).scalars().all()
+
+        assert aplicante.nome_equipe == 'Solo 11'
+        # A DM para o aplicante foi gravada no outbox junto com a resposta
+        assert [(n.tipo, n.discord_user_id) for n in notificacoes] == [('aplicacao_respondida', 1011)]
+        assert aplicacao.status == StatusAplicacaoEnum.REJEITADA
+        assert aplicacao.resposta_lider == "Sem vagas para esse perfil"
+
+    @pytest.mark.asyncio
+    async def test_approval_refreshes_inbox_of_cancelled_applications(self, approval_db, handler):
+        """A aprovação cancela a aplicação para a Beta: o painel do líder da Beta é atualizado"""
+        ok, _ = await handler.respond_to_application(1001, 10, True)
+        assert ok
+
+        async with approval_db() as session:
+            assert (await session.get(AplicacaoEquipe, 20)).status == StatusAplicacaoEnum.CANCELADA
+        handler.bot.application_inbox.notify_new_application.assert_called_once_with(5)
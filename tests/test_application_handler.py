@@ -3,221 +3,126 @@ Testes para o handler de aplicações
 """
 
 import pytest
+import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
 from handlers.application_handler import ApplicationHandler
-from database.models import Participante, AplicacaoEquipe, EscolaridadeEnum, ModalidadeEnum, StatusAplicacaoEnum
+from database.models import Base, Participante, AplicacaoEquipe, EscolaridadeEnum, ModalidadeEnum, StatusAplicacaoEnum
+from database.participant_cache import ParticipantCache
+from utils.metrics import MetricsRegistry
+import config
+
+LIDER_DISCORD_ID = 123456789
+
+
+def make_participant(i, discord_user_id, nome_equipe):
+    return Participante(
+        id=i,
+        discord_user_id=discord_user_id,
+        discord_username=f'user{i}',
+        nome=f'Nome{i}',
+        sobrenome='Silva',
+        email=f'p{i}@example.com',
+        telefone='34999887766',
+        cpf='12345678901',
+        cidade='Uberlândia',
+        data_nascimento='15/08/1995',
+        escolaridade=EscolaridadeEnum.GRADUANDO,
+        modalidade=ModalidadeEnum.PRESENCIAL,
+        nome_equipe=nome_equipe
+    )
+
+
+@pytest_asyncio.fixture
+async def applications_db():
+    """Líder (id 1) da Equipe Teste, aplicante (id 2) com aplicação pendente (id 1)"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        session.add(make_participant(1, LIDER_DISCORD_ID, 'Equipe Teste'))
+        session.add(make_participant(2, 987654321, 'Equipe Original'))
+        await session.flush()
+        session.add(AplicacaoEquipe(
+            id=1, aplicante_id=2, equipe_nome='Equipe Teste', lider_id=1,
+            mensagem_aplicacao="Quero me juntar à equipe"
+        ))
+        await session.commit()
+
+    async def get_session():
+        return factory()
+
+    cache = ParticipantCache(ttl=60, registry=MetricsRegistry())
+    with patch('database.db.DatabaseManager.get_session', get_session), \
+            patch('handlers.application_handler.get_participant_cache', return_value=cache):
+        yield factory
+    await engine.dispose()
+
 
 class TestApplicationHandler:
-    
+
     @pytest.fixture
-    def mock_bot(self):
-        """Cria um bot mock para testes"""
+    def application_handler(self):
+        """Cria uma instância do ApplicationHandler para testes"""
         bot = MagicMock()
         bot.fetch_user = AsyncMock()
         bot.guilds = []
-        return bot
-    
-    @pytest.fixture
-    def application_handler(self, mock_bot):
-        """Cria uma instância do ApplicationHandler para testes"""
-        return ApplicationHandler(mock_bot)
-    
+        return ApplicationHandler(bot)
+
     @pytest.mark.asyncio
-    async def test_get_pending_applications_no_user(self, application_handler):
+    async def test_get_pending_applications_no_user(self, applications_db, application_handler):
         """Testa busca de aplicações quando usuário não existe"""
-        with patch('handlers.application_handler.DatabaseManager.get_session') as mock_get_session:
-            mock_session = AsyncMock()
-            mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_session.__aexit__ = AsyncMock(return_value=None)
-            mock_session.execute = AsyncMock()
-            mock_session.execute.return_value.scalars.return_value.first.return_value = None
-            mock_get_session.return_value = mock_session
-            
-            aplicacoes, erro = await application_handler.get_pending_applications(123456789)
-            
-            assert aplicacoes is None
-            assert erro == "Você não está inscrito no evento."
-    
+        aplicacoes, erro = await application_handler.get_pending_applications(111)
+
+        assert aplicacoes is None
+        assert erro == "Você não está inscrito no evento."
+
     @pytest.mark.asyncio
-    async def test_get_pending_applications_success(self, application_handler, sample_participant_data):
+    async def test_get_pending_applications_success(self, applications_db, application_handler):
         """Testa busca de aplicações com sucesso"""
-        # Mock do participante (líder)
-        lider = Participante(
-            id=1,
-            **sample_participant_data,
-            escolaridade=EscolaridadeEnum.ENSINO_SUPERIOR,
-            modalidade=ModalidadeEnum.PRESENCIAL
-        )
-        
-        # Mock de aplicação pendente
-        aplicacao = AplicacaoEquipe(
-            id=1,
-            aplicante_id=2,
-            equipe_nome=sample_participant_data['nome_equipe'],
-            lider_id=1,
-            mensagem_aplicacao="Quero me juntar à equipe",
-            status=StatusAplicacaoEnum.PENDENTE
-        )
-        
-        with patch('handlers.application_handler.DatabaseManager.get_session') as mock_get_session:
-            mock_session = AsyncMock()
-            mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_session.__aexit__ = AsyncMock(return_value=None)
-            
-            # Mock das consultas
-            mock_session.execute = AsyncMock()
-            
-            # Primeira consulta: buscar líder
-            mock_result_lider = AsyncMock()
-            mock_result_lider.scalars.return_value.first.return_value = lider
-            
-            # Segunda consulta: buscar aplicações
-            mock_result_apps = AsyncMock()
-            mock_result_apps.scalars.return_value.all.return_value = [aplicacao]
-            
-            mock_session.execute.side_effect = [mock_result_lider, mock_result_apps]
-            mock_get_session.return_value = mock_session
-            
-            aplicacoes, erro = await application_handler.get_pending_applications(123456789)
-            
-            assert erro is None
-            assert len(aplicacoes) == 1
-            assert aplicacoes[0].status == StatusAplicacaoEnum.PENDENTE
-    
+        aplicacoes, erro = await application_handler.get_pending_applications(LIDER_DISCORD_ID)
+
+        assert erro is None
+        assert [aplicacao.id for aplicacao in aplicacoes] == [1]
+        assert aplicacoes[0].status == StatusAplicacaoEnum.PENDENTE
+
     @pytest.mark.asyncio
-    async def test_respond_to_application_approve(self, application_handler, sample_participant_data):
+    async def test_respond_to_application_approve(self, applications_db, application_handler):
         """Testa aprovação de aplicação"""
-        # Mock do líder
-        lider = Participante(
-            id=1,
-            **sample_participant_data,
-            escolaridade=EscolaridadeEnum.ENSINO_SUPERIOR,
-            modalidade=ModalidadeEnum.PRESENCIAL
-        )
-        
-        # Mock do aplicante
-        aplicante_data = sample_participant_data.copy()
-        aplicante_data.update({
-            'discord_user_id': 987654321,
-            'email': 'aplicante@example.com',
-            'nome_equipe': 'Equipe Original'
-        })
-        
-        aplicante = Participante(
-            id=2,
-            **aplicante_data,
-            escolaridade=EscolaridadeEnum.GRADUANDO,
-            modalidade=ModalidadeEnum.PRESENCIAL
-        )
-        
-        # Mock da aplicação
-        aplicacao = AplicacaoEquipe(
-            id=1,
-            aplicante_id=2,
-            equipe_nome=sample_participant_data['nome_equipe'],
-            lider_id=1,
-            status=StatusAplicacaoEnum.PENDENTE
-        )
-        aplicacao.aplicante = aplicante
-        
-        with patch('handlers.application_handler.DatabaseManager.get_session') as mock_get_session:
-            mock_session = AsyncMock()
-            mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_session.__aexit__ = AsyncMock(return_value=None)
-            mock_session.add = MagicMock()
-            mock_session.commit = AsyncMock()
-            mock_session.execute = AsyncMock()
-            
-            # Simular consultas sequenciais
-            results = [
-                # Buscar líder
-                MagicMock(scalars=MagicMock(return_value=MagicMock(first=MagicMock(return_value=lider)))),
-                # Buscar aplicação
-                MagicMock(scalars=MagicMock(return_value=MagicMock(first=MagicMock(return_value=aplicacao)))),
-                # Buscar aplicante
-                MagicMock(scalars=MagicMock(return_value=MagicMock(first=MagicMock(return_value=aplicante)))),
-                # Buscar membros da equipe (para verificar limite)
-                MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[lider]))))  # Só o líder
-            ]
-            
-            mock_session.execute.side_effect = results
-            mock_get_session.return_value = mock_session
-            
-            # Mock do bot para envio de DM
-            application_handler.bot.fetch_user.return_value = AsyncMock(send=AsyncMock())
-            
-            sucesso, mensagem = await application_handler.respond_to_application(
-                123456789, 1, True, "Bem-vindo!"
-            )
-            
-            assert sucesso is True
-            assert mensagem == "Resposta enviada com sucesso!"
-    
+        sucesso, mensagem = await application_handler.respond_to_application(LIDER_DISCORD_ID, 1, True, "Bem-vindo!")
+
+        assert sucesso is True
+        assert mensagem == "Resposta enviada com sucesso!"
+        async with applications_db() as session:
+            aplicante = await session.get(Participante, 2)
+            aplicacao = await session.get(AplicacaoEquipe, 1)
+        assert aplicante.nome_equipe == 'Equipe Teste'
+        assert aplicacao.status == StatusAplicacaoEnum.APROVADA
+        assert aplicacao.resposta_lider == "Bem-vindo!"
+
     @pytest.mark.asyncio
-    async def test_respond_to_application_team_full(self, application_handler, sample_participant_data):
+    async def test_respond_to_application_team_full(self, applications_db, application_handler):
         """Testa rejeição por equipe cheia"""
-        # Criar mocks de 6 membros (equipe cheia)
-        membros = []
-        for i in range(6):
-            membro_data = sample_participant_data.copy()
-            membro_data.update({
-                'discord_user_id': 100000000 + i,
-                'email': f'membro{i}@example.com'
-            })
-            membro = Participante(
-                id=i+1,
-                **membro_data,
-                escolaridade=EscolaridadeEnum.ENSINO_SUPERIOR,
-                modalidade=ModalidadeEnum.PRESENCIAL
-            )
-            membros.append(membro)
-        
-        lider = membros[0]
-        aplicante = Participante(
-            id=7,
-            discord_user_id=987654321,
-            email='aplicante@example.com',
-            nome_equipe='Equipe Original',
-            **{k: v for k, v in sample_participant_data.items() if k not in ['discord_user_id', 'email', 'nome_equipe']},
-            escolaridade=EscolaridadeEnum.GRADUANDO,
-            modalidade=ModalidadeEnum.PRESENCIAL
-        )
-        
-        aplicacao = AplicacaoEquipe(
-            id=1,
-            aplicante_id=7,
-            equipe_nome=sample_participant_data['nome_equipe'],
-            lider_id=1,
-            status=StatusAplicacaoEnum.PENDENTE
-        )
-        aplicacao.aplicante = aplicante
-        
-        with patch('handlers.application_handler.DatabaseManager.get_session') as mock_get_session:
-            mock_session = AsyncMock()
-            mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_session.__aexit__ = AsyncMock(return_value=None)
-            mock_session.add = MagicMock()
-            mock_session.commit = AsyncMock()
-            mock_session.execute = AsyncMock()
-            
-            # Simular consultas
-            results = [
-                # Buscar líder
-                MagicMock(scalars=MagicMock(return_value=MagicMock(first=MagicMock(return_value=lider)))),
-                # Buscar aplicação
-                MagicMock(scalars=MagicMock(return_value=MagicMock(first=MagicMock(return_value=aplicacao)))),
-                # Buscar aplicante
-                MagicMock(scalars=MagicMock(return_value=MagicMock(first=MagicMock(return_value=aplicante)))),
-                # Buscar membros da equipe (equipe cheia)
-                MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=membros))))  # 6 membros
-            ]
-            
-            mock_session.execute.side_effect = results
-            mock_get_session.return_value = mock_session
-            
-            sucesso, mensagem = await application_handler.respond_to_application(
-                123456789, 1, True, "Bem-vindo!"
-            )
-            
-            assert sucesso is False
-            assert "já está completa" in mensagem
\ No newline at end of file
+        async with applications_db() as session:
+            session.add_all([
+                make_participant(10 + i, 100000000 + i, 'Equipe Teste') for i in range(config.MAX_TEAM_SIZE - 1)
+            ])
+            await session.commit()
+
+        sucesso, mensagem = await application_handler.respond_to_application(LIDER_DISCORD_ID, 1, True, "Bem-vindo!")
+
+        assert sucesso is False
+        assert "já está completa" in mensagem
+        async with applications_db() as session:
+            aplicante = await session.get(Participante, 2)
+            aplicacao = await session.get(AplicacaoEquipe, 1)
+            membros = (await session.execute(
+                select(Participante).where(Participante.nome_equipe == 'Equipe Teste')
+            )).scalars().all()
+        assert aplicante.nome_equipe == 'Equipe Original'
+        assert aplicacao.status == StatusAplicacaoEnum.REJEITADA
+        assert len(membros) == config.MAX_TEAM_SIZE
@@ -0,0 +1,179 @@
+"""
+Testes para o painel de aplicações do líder
+"""
+
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Participante, AplicacaoEquipe, NotificacaoPendente, EscolaridadeEnum, ModalidadeEnum, StatusAplicacaoEnum
+from database.participant_cache import ParticipantCache, project
+from handlers.application_handler import ApplicationHandler
+from handlers.application_inbox import ApplicationInbox
+from utils.metrics import MetricsRegistry
+from utils.timers import TimerHeap
+from views.application_inbox_view import ApplicationInboxView, BulkResponseModal, fetch_pending_applications
+
+
+def make_participant(i, equipe):
+    return Participante(
+        id=i,
+        discord_user_id=1000 + i,
+        discord_username=f'user{i}',
+        nome=f'Nome{i}',
+        sobrenome='Silva',
+        email=f'p{i}@example.com',
+        telefone='34999887766',
+        cpf='12345678901',
+        cidade='Uberlândia',
+        data_nascimento='15/08/1995',
+        escolaridade=EscolaridadeEnum.GRADUANDO,
+        modalidade=ModalidadeEnum.PRESENCIAL,
+        nome_equipe=equipe
+    )
+
+
+@pytest_asyncio.fixture
+async def inbox_db():
+    """Líder (id 1) da Equipe Alfa com 12 aplicações pendentes, uma de outro líder e uma já respondida"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    inicio = datetime(2025, 9, 1)
+    async with factory() as session:
+        session.add(make_participant(1, 'Alfa'))
+        session.add(make_participant(2, 'Beta'))
+        session.add_all([make_participant(i, None) for i in range(10, 24)])
+        await session.flush()
+        for i in range(10, 22):
+            session.add(AplicacaoEquipe(
+                id=i, aplicante_id=i, equipe_nome='Alfa', lider_id=1, mensagem_aplicacao=f'Mensagem {i}',
+                data_aplicacao=inicio + timedelta(minutes=i)
+            ))
+        session.add(AplicacaoEquipe(id=22, aplicante_id=22, equipe_nome='Beta', lider_id=2, mensagem_aplicacao='Oi'))
+        session.add(AplicacaoEquipe(
+            id=23, aplicante_id=23, equipe_nome='Alfa', lider_id=1, mensagem_aplicacao='Oi',
+            status=StatusAplicacaoEnum.REJEITADA
+        ))
+        await session.commit()
+
+    async def get_session():
+        return factory()
+
+    cache = ParticipantCache(ttl=60, registry=MetricsRegistry())
+    with patch('database.db.DatabaseManager.get_session', get_session), \
+            patch('handlers.application_handler.get_participant_cache', return_value=cache):
+        async with factory() as session:
+            lider = project(await session.get(Participante, 1))
+        yield factory, lider
+    await engine.dispose()
+
+
+@pytest.fixture
+def handler():
+    bot = MagicMock()
+    bot.guilds = []
+    return ApplicationHandler(bot)
+
+
+class TestApplicationInbox:
+
+    @pytest.mark.asyncio
+    async def test_pending_applications_are_paged_per_leader(self, inbox_db):
+        """Só as pendentes do líder, mais recentes primeiro, uma página por consulta"""
+        primeira, ha_mais = await fetch_pending_applications(1, limit=10)
+        assert [a.id for a in primeira] == list(range(21, 11, -1))
+        assert ha_mais
+
+        segunda, ha_mais = await fetch_pending_applications(1, after=(primeira[-1].data_aplicacao, primeira[-1].id), limit=10)
+        assert [a.id for a in segunda] == [11, 10]
+        assert not ha_mais
+        assert segunda[0].nome == 'Nome11'
+
+    @pytest.mark.asyncio
+    async def test_page_fills_multi_select(self, inbox_db, handler):
+        """O select oferece as aplicações da página atual, com seleção múltipla"""
+        _, lider = inbox_db
+        view = ApplicationInboxView(handler, lider)
+        await view.load_page()
+
+        assert view.total == 12
+        assert [option.value for option in view.selection.options] == [str(i) for i in range(21, 11, -1)]
+        assert view.selection.max_values == 10
+        assert not view.approve_selected.disabled
+
+    @pytest.mark.asyncio
+    async def test_bulk_rejection_runs_once_and_refreshes_panel(self, inbox_db, handler):
+        """Rejeitar várias aplicações grava todas de uma vez e atualiza o painel na resposta"""
+        factory, lider = inbox_db
+        view = ApplicationInboxView(handler, lider)
+        await view.load_page()
+
+        interaction = MagicMock()
+        interaction.user.id = lider.discord_user_id
+        interaction.response.edit_message = AsyncMock()
+        interaction.followup.send = AsyncMock()
+        modal = BulkResponseModal(view, [21, 20, 19], False)
+        modal.resposta._value = "Equipe definida"
+        await modal.on_submit(interaction)
+
+        async with factory() as session:
+            status = dict((await session.execute(select(AplicacaoEquipe.id, AplicacaoEquipe.status))).all())
+            notificacoes = (await session.execute(select(NotificacaoPendente))).scalars().all()
+
+        assert all(status[i] == StatusAplicacaoEnum.REJEITADA for i in (19, 20, 21))
+        assert status[18] == StatusAplicacaoEnum.PENDENTE
+        assert len(notificacoes) == 3
+        assert view.total == 9 and view.items[0].id == 18
+        interaction.response.edit_message.assert_awaited_once()
+        assert "**3**" in interaction.followup.send.await_args.kwargs['embed'].description
+
+    @pytest.mark.asyncio
+    async def test_error_after_panel_update_uses_followup(self, inbox_db, handler):
+        """Falha depois de responder a interação é registrada e avisada por followup"""
+        _, lider = inbox_db
+        view = ApplicationInboxView(handler, lider)
+        await view.load_page()
+
+        interaction = MagicMock()
+        interaction.user.id = lider.discord_user_id
+        interaction.response.edit_message = AsyncMock()
+        interaction.response.send_message = AsyncMock()
+        interaction.response.is_done.return_value = True
+        interaction.followup.send = AsyncMock(side_effect=[RuntimeError("falha no envio"), None])
+        modal = BulkResponseModal(view, [21], False)
+        modal.resposta._value = ""
+        await modal.on_submit(interaction)
+
+        interaction.client.logger.error.assert_called_once()
+        assert isinstance(interaction.client.logger.error.call_args.kwargs['exc_info'], RuntimeError)
+        interaction.response.send_message.assert_not_awaited()
+        assert interaction.followup.send.await_args.kwargs['embed'].title == "❌ Erro"
+
+    @pytest.mark.asyncio
+    async def test_persistent_panel_has_stable_custom_ids(self, inbox_db, handler):
+        """O painel do canal de liderança pode ser registrado novamente após um restart"""
+        _, lider = inbox_db
+        view = ApplicationInboxView(handler, lider, persistent=True)
+
+        assert view.is_persistent()
+        assert all(item.custom_id.startswith('inbox:1:') for item in view.children)
+
+    @pytest.mark.asyncio
+    async def test_new_applications_are_coalesced_into_one_refresh(self, handler):
+        """Várias aplicações seguidas agendam uma única atualização do painel"""
+        bot = MagicMock()
+        bot.timers = TimerHeap()
+        inbox = ApplicationInbox(bot, handler)
+        inbox.panels[1] = MagicMock()
+
+        inbox.notify_new_application(1)
+        inbox.notify_new_application(1)
+        inbox.notify_new_application(2)  # Sem painel: nada a atualizar
+
+        assert len(bot.timers) == 1
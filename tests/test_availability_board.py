@@ -0,0 +1,186 @@
+"""
+Testes para os quadros de disponibilidade
+"""
+
+import discord
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Participante, QuadroDisponibilidade, EscolaridadeEnum, ModalidadeEnum
+from database.participant_cache import project
+from handlers.availability_board import AvailabilityBoard, parse_modalidade
+from utils.metrics import MetricsRegistry
+from utils.timers import TimerHeap
+from views.team_search_view import AvailableTeamsView, BoardSnapshotView, send_board_snapshot
+
+PRESENCIAL = ModalidadeEnum.PRESENCIAL
+REMOTO = ModalidadeEnum.REMOTO
+
+
+def make_participant(i, equipe, modalidade=PRESENCIAL, disponivel=False):
+    return Participante(
+        id=i,
+        discord_user_id=1000 + i,
+        discord_username=f'user{i}',
+        nome=f'Nome{i}',
+        sobrenome='Silva',
+        email=f'p{i}@example.com',
+        telefone='34999887766',
+        cpf='12345678901',
+        cidade='Uberlândia',
+        data_nascimento='15/08/1995',
+        escolaridade=EscolaridadeEnum.GRADUANDO,
+        modalidade=modalidade,
+        nome_equipe=equipe,
+        disponivel_para_equipe=disponivel,
+        descricao_habilidades='Python e dados' if disponivel else None
+    )
+
+
+@pytest_asyncio.fixture
+async def board_db():
+    """Presencial: Alfa (2 membros), Beta (1, disponível) e Cheia (6); Remoto: Gama (1, disponível)"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        session.add_all([make_participant(1, 'Alfa'), make_participant(2, 'Alfa'), make_participant(3, 'Beta', disponivel=True)])
+        session.add_all([make_participant(i, 'Cheia') for i in range(10, 16)])
+        session.add(make_participant(20, 'Gama', modalidade=REMOTO, disponivel=True))
+        await session.commit()
+
+    async def get_session():
+        return factory()
+
+    with patch('database.db.DatabaseManager.get_session', get_session):
+        yield factory
+    await engine.dispose()
+
+
+def make_board():
+    bot = MagicMock()
+    bot.timers = TimerHeap()
+    return AvailabilityBoard(bot, delay=5, registry=MetricsRegistry())
+
+
+def make_channel(channel_id=50, message_id=500):
+    channel = MagicMock()
+    channel.id = channel_id
+    message = MagicMock()
+    message.id = message_id
+    message.jump_url = f'https://discord.com/channels/1/{channel_id}/{message_id}'
+    message.edit = AsyncMock()
+    message.delete = AsyncMock()
+    channel.send = AsyncMock(return_value=message)
+    return channel, message
+
+
+class TestAvailabilityBoard:
+
+    def test_parse_modalidade(self):
+        assert parse_modalidade(' presencial ') == PRESENCIAL
+        assert parse_modalidade('Remoto') == REMOTO
+        assert parse_modalidade('hibrido') is None
+
+    @pytest.mark.asyncio
+    async def test_render_lists_open_teams_and_available_people(self, board_db):
+        board = make_board()
+
+        embed = await board.render(PRESENCIAL)
+
+        assert "**2** equipe(s) com vagas" in embed.description
+        assert "**1** pessoa(s)" in embed.description
+        equipes, pessoas = embed.fields
+        assert "Alfa" in equipes.value and "Beta" in equipes.value and "Cheia" not in equipes.value
+        assert "Nome3" in pessoas.value and "Nome20" not in pessoas.value
+        assert board.metrics.get_counter('availability_board_renders', modalidade='Presencial') == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_persists_and_replaces_previous_board(self, board_db):
+        board = make_board()
+        canal_antigo, antiga = make_channel(50, 500)
+        canal_novo, nova = make_channel(60, 600)
+
+        await board.publish(canal_antigo, PRESENCIAL)
+        await board.publish(canal_novo, PRESENCIAL)
+
+        antiga.delete.assert_awaited_once()
+        assert board.boards[PRESENCIAL] is nova
+        async with board_db() as session:
+            quadros = (await session.execute(select(QuadroDisponibilidade))).scalars().all()
+        assert [(q.modalidade, q.channel_id, q.message_id) for q in quadros] == [(PRESENCIAL, 60, 600)]
+
+    @pytest.mark.asyncio
+    async def test_changes_are_coalesced_into_one_edit_per_board(self, board_db):
+        """Várias mudanças seguidas agendam uma única edição; modalidade sem quadro é ignorada"""
+        board = make_board()
+        _, message = make_channel()
+        board.boards[PRESENCIAL] = message
+
+        board.notify_change(PRESENCIAL)
+        board.notify_change(PRESENCIAL)
+        board.notify_change()
+        board.notify_change(REMOTO)
+
+        assert len(board.bot.timers) == 1
+        await board._refresh(PRESENCIAL)
+        message.edit.assert_awaited_once()
+        assert board.snapshot(PRESENCIAL) is message.edit.await_args.kwargs['embed']
+        assert board.snapshot(REMOTO) is None
+
+    @pytest.mark.asyncio
+    async def test_deleted_board_is_forgotten(self, board_db):
+        board = make_board()
+        canal, message = make_channel()
+        await board.publish(canal, PRESENCIAL)
+        message.edit.side_effect = discord.NotFound(MagicMock(status=404), 'Unknown Message')
+
+        await board._refresh(PRESENCIAL)
+
+        assert PRESENCIAL not in board.boards and board.snapshot(PRESENCIAL) is None
+        async with board_db() as session:
+            assert (await session.execute(select(QuadroDisponibilidade))).first() is None
+
+    @pytest.mark.asyncio
+    async def test_restore_reattaches_boards_and_schedules_refresh(self, board_db):
+        async with board_db() as session:
+            session.add(QuadroDisponibilidade(modalidade=REMOTO, channel_id=70, message_id=700))
+            await session.commit()
+        board = make_board()
+        canal = MagicMock()
+        board.bot.get_channel.return_value = canal
+
+        await board.restore()
+
+        canal.get_partial_message.assert_called_once_with(700)
+        assert board.boards[REMOTO] is canal.get_partial_message.return_value
+        assert ('board', REMOTO) in board.bot.timers
+
+
+class TestBoardSnapshot:
+
+    @pytest.mark.asyncio
+    async def test_search_buttons_reuse_board_snapshot_without_queries(self, board_db):
+        board = make_board()
+        canal, message = make_channel()
+        await board.publish(canal, PRESENCIAL)
+
+        async with board_db() as session:
+            participante = project(await session.get(Participante, 1))
+        interaction = MagicMock()
+        interaction.client.availability_board = board
+        interaction.response.send_message = AsyncMock()
+
+        with patch('database.db.DatabaseManager.get_session', side_effect=AssertionError("consulta inesperada")):
+            enviado = await send_board_snapshot(interaction, participante, AvailableTeamsView, discord.Embed())
+
+        assert enviado
+        kwargs = interaction.response.send_message.await_args.kwargs
+        assert kwargs['embed'] is board.snapshot(PRESENCIAL)
+        assert isinstance(kwargs['view'], BoardSnapshotView)
+        assert any(item.url == message.jump_url for item in kwargs['view'].children)
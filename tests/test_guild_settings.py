@@ -0,0 +1,131 @@
+"""
+Testes para as configurações por servidor
+"""
+
+import discord
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, ConfiguracaoServidor
+from database.guild_settings import GuildSettings, SETTINGS, parse_setting_channel
+from handlers.voice_handler import VoiceHandler
+
+
+@pytest_asyncio.fixture
+async def settings_db():
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_session():
+        return factory()
+
+    with patch('database.db.DatabaseManager.get_session', get_session):
+        yield factory
+    await engine.dispose()
+
+
+def make_guild(guild_id, channels=()):
+    guild = MagicMock()
+    guild.id = guild_id
+    by_id = {channel.id: channel for channel in channels}
+    guild.get_channel = lambda channel_id: by_id.get(channel_id)
+    return guild
+
+
+def make_channel(channel_id, tipo=discord.TextChannel):
+    channel = MagicMock(spec=tipo)
+    channel.id = channel_id
+    return channel
+
+
+class TestGuildSettings:
+
+    def test_unconfigured_keys_use_defaults(self):
+        settings = GuildSettings()
+
+        assert settings.get(1, 'canal_equipes') == SETTINGS['canal_equipes'].padrao
+        assert settings.get(1, 'categoria_voz', 99) == 99
+        assert settings.is_default(1, 'canal_equipes')
+
+    @pytest.mark.asyncio
+    async def test_values_are_per_guild_and_persisted(self, settings_db):
+        settings = GuildSettings()
+
+        await settings.set(1, 'canal_equipes', 111)
+        await settings.set(2, 'canal_equipes', 222)
+        await settings.set(1, 'canal_equipes', 333)
+
+        assert settings.get(1, 'canal_equipes') == 333
+        assert settings.get(2, 'canal_equipes') == 222
+
+        # Outro processo (ou um restart) enxerga os mesmos valores
+        recarregado = GuildSettings()
+        await recarregado.load()
+        assert recarregado.values == {(1, 'canal_equipes'): 333, (2, 'canal_equipes'): 222}
+
+    @pytest.mark.asyncio
+    async def test_changes_notify_subscribers(self, settings_db):
+        settings = GuildSettings()
+        mudancas = []
+        settings.subscribe(lambda *args: mudancas.append(args))
+
+        await settings.set(1, 'canal_logs', 555)
+        await settings.reset(1, 'canal_logs')
+
+        assert mudancas == [(1, 'canal_logs', 555), (1, 'canal_logs', SETTINGS['canal_logs'].padrao)]
+        async with settings_db() as session:
+            assert (await session.execute(select(ConfiguracaoServidor))).first() is None
+
+        with pytest.raises(ValueError):
+            await settings.set(1, 'canal_inexistente', 1)
+
+    def test_parse_channel_checks_guild_and_type(self):
+        texto = make_channel(10)
+        categoria = make_channel(20, discord.CategoryChannel)
+        guild = make_guild(1, [texto, categoria])
+
+        assert parse_setting_channel(guild, 'canal_equipes', '<#10>') is texto
+        assert parse_setting_channel(guild, 'categoria_voz', '20') is categoria
+        assert parse_setting_channel(guild, 'categoria_voz', '10') is None  # Tipo errado
+        assert parse_setting_channel(guild, 'canal_equipes', '30') is None  # Outro servidor
+        assert parse_setting_channel(guild, 'canal_equipes', 'geral') is None
+
+
+class TestVoiceHandlerPerGuild:
+
+    @pytest.mark.asyncio
+    async def test_each_guild_uses_its_trigger_and_category(self, settings_db):
+        settings = GuildSettings()
+        await settings.set(1, 'canal_voz_trigger', 100)
+        await settings.set(1, 'categoria_voz', 101)
+        await settings.set(2, 'canal_voz_trigger', 200)
+
+        handler = VoiceHandler(MagicMock())
+        handler.settings = settings
+        handler.create_temp_channel = AsyncMock()
+
+        for guild_id, trigger_id in ((1, 100), (2, 200)):
+            member = MagicMock()
+            member.id = guild_id
+            member.guild.id = guild_id
+            trigger = make_channel(trigger_id)
+            after = MagicMock()
+            after.channel = trigger
+            await handler.handle_voice_state_update(member, MagicMock(channel=None), after)
+
+        assert handler.create_temp_channel.await_count == 2
+        assert handler.category_for(make_guild(1)) == 101
+        assert handler.category_for(make_guild(2)) == SETTINGS['categoria_voz'].padrao
+
+        # O trigger de um servidor não cria canais no outro
+        member = MagicMock()
+        member.guild.id = 2
+        after = MagicMock()
+        after.channel = make_channel(100)
+        await handler.handle_voice_state_update(member, MagicMock(channel=None), after)
+        assert handler.create_temp_channel.await_count == 2
@@ -0,0 +1,193 @@
+"""
+Testes para o sistema de logging
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import queue
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from utils.logger import DiscordLogHandler, ContextQueueHandler, JsonFormatter, BotLogger, create_file_handler, get_logger
+from utils.log_context import bind_interaction, get_context, start_request
+from utils.rest_telemetry import set_subsystem, DEFAULT_SUBSYSTEM
+
+
+def make_record(message, level=logging.ERROR, lineno=10):
+    """Cria um LogRecord simples"""
+    return logging.LogRecord('nasa_spaceapps_bot', level, __file__, lineno, message, None, None, func='teste')
+
+
+class TestDiscordLogHandler:
+
+    @pytest.fixture
+    def channel(self):
+        channel = MagicMock()
+        channel.send = AsyncMock()
+        return channel
+
+    @pytest.fixture
+    def handler(self, channel):
+        """Handler com janela de agrupamento curta e fila pequena"""
+        handler = DiscordLogHandler(bot=None, channel_id=1)
+        handler.flush_interval = 0.05
+        handler.queue = asyncio.Queue(maxsize=20)
+        handler.channel = channel
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_burst_becomes_single_message(self, handler, channel):
+        """Uma rajada de erros idênticos vira um único envio com contador ×N"""
+        handler.start()
+        tasks_before = len(asyncio.all_tasks())
+
+        for _ in range(15):
+            handler.emit(make_record("Falha ao conectar"))
+        assert len(asyncio.all_tasks()) == tasks_before
+
+        await asyncio.sleep(0.1)
+        handler._consumer.cancel()
+
+        channel.send.assert_awaited_once()
+        embeds = channel.send.await_args.kwargs['embeds']
+        assert len(embeds) == 1
+        assert embeds[0].title.endswith("×15")
+
+    @pytest.mark.asyncio
+    async def test_overflow_is_dropped_and_counted(self, handler, channel):
+        """Logs acima do limite da fila são descartados e resumidos"""
+        for i in range(25):
+            handler.emit(make_record(f"erro {i}", lineno=i))
+        assert handler.queue.qsize() == 20
+        assert handler.dropped == 5
+
+        handler.start()
+        await asyncio.sleep(0.1)
+        handler._consumer.cancel()
+
+        embeds = channel.send.await_args.kwargs['embeds']
+        assert len(embeds) == DiscordLogHandler.MAX_EMBEDS_PER_MESSAGE
+        summary = embeds[-1].description
+        assert "11** log(s) em 11 grupo(s)" in summary
+        assert "5** log(s) descartados" in summary
+        assert handler.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_distinct_tracebacks_respect_message_char_limit(self, handler, channel):
+        """Erros distintos com stack trace são divididos em mensagens de até 6000 caracteres"""
+        for i in range(6):
+            try:
+                raise ValueError("x" * 2000)
+            except ValueError:
+                record = make_record("y" * 1500, lineno=i)
+                record.exc_info = sys.exc_info()
+            handler.emit(record)
+
+        handler.start()
+        await asyncio.sleep(0.1)
+        handler._consumer.cancel()
+
+        assert channel.send.await_count > 1
+        enviados = [call.kwargs['embeds'] for call in channel.send.await_args_list]
+        assert sum(len(embeds) for embeds in enviados) == 6
+        for embeds in enviados:
+            assert sum(len(e) for e in embeds) <= DiscordLogHandler.MAX_CHARS_PER_MESSAGE
+            assert len(embeds) <= DiscordLogHandler.MAX_EMBEDS_PER_MESSAGE
+
+
+class TestFileLogging:
+
+    def test_console_and_file_run_off_loop(self):
+        """O logger só enfileira; console e arquivo ficam no QueueListener"""
+        bot_logger = get_logger()
+        handlers = bot_logger.logger.handlers
+
+        assert any(isinstance(handler, logging.handlers.QueueHandler) for handler in handlers)
+        assert not any(isinstance(handler, logging.StreamHandler) for handler in handlers)
+        assert bot_logger.listener is not None
+
+    def test_rotated_files_are_gzipped(self, tmp_path):
+        """Arquivos rotacionados são comprimidos em .gz"""
+        handler = create_file_handler(str(tmp_path / "bot.log"))
+        handler.maxBytes = 200
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+        for i in range(20):
+            handler.emit(make_record(f"linha de log número {i}", level=logging.DEBUG))
+        handler.close()
+
+        rotated = sorted(tmp_path.glob("bot.log.*.gz"))
+        assert rotated
+        with gzip.open(rotated[0], 'rt', encoding='utf-8') as f:
+            assert "linha de log" in f.read()
+
+
+class TestStructuredLogging:
+
+    @pytest.fixture(autouse=True)
+    def reset_request_context(self):
+        """bind_interaction também define o subsistema REST; limpar para não vazar para outros testes"""
+        yield
+        start_request()
+        set_subsystem(DEFAULT_SUBSYSTEM)
+
+    def make_interaction(self):
+        interaction = MagicMock()
+        interaction.id = 42
+        interaction.guild_id = 7
+        interaction.channel_id = 8
+        interaction.user.id = 123
+        role = MagicMock()
+        role.name = "Equipe Apollo"
+        interaction.user.roles = [role]
+        interaction.command.qualified_name = "stats"
+        interaction.data = {}
+        return interaction
+
+    def test_interaction_context_is_bound(self):
+        """O contexto da interação é preenchido a partir do objeto Interaction"""
+        bind_interaction(self.make_interaction())
+        context = get_context()
+
+        assert context['interaction_id'] == 42
+        assert context['user_id'] == 123
+        assert context['team'] == "Apollo"
+        assert context['command'] == "stats"
+
+    def test_json_line_has_context_and_fields(self):
+        """Cada registro vira uma linha JSON com contexto e campos do evento"""
+        log_queue = queue.SimpleQueue()
+        logger = logging.getLogger('teste.json')
+        logger.handlers.clear()
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(ContextQueueHandler(log_queue))
+
+        bind_interaction(self.make_interaction())
+        logger.info("Comando /%s concluído", "stats", extra={'event': 'app_command_completed', 'fields': {'duration_ms': 12.5}})
+
+        data = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+        assert data['event'] == 'app_command_completed'
+        assert data['message'] == "Comando /stats concluído"
+        assert data['interaction_id'] == 42
+        assert data['guild_id'] == 7
+        assert data['duration_ms'] == 12.5
+
+    def test_filtered_levels_are_not_formatted(self):
+        """Helpers não formatam a mensagem quando o nível está desativado"""
+        bot_logger = BotLogger.__new__(BotLogger)
+        bot_logger.logger = logging.getLogger('teste.lazy')
+        bot_logger.logger.setLevel(logging.WARNING)
+
+        calls = []
+
+        class Expensive:
+            def __str__(self):
+                calls.append(1)
+                return "caro"
+
+        bot_logger.log_user_action(1, "acao", Expensive())
+        bot_logger.debug("valor %s", Expensive())
+        assert calls == []
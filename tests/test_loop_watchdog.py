@@ -0,0 +1,50 @@
+"""
+Testes para o watchdog de travamentos do event loop
+"""
+
+import asyncio
+import time
+import pytest
+from utils.loop_watchdog import LoopWatchdog
+
+
+def sync_disk_write():
+    """Simula uma chamada síncrona que bloqueia o loop"""
+    time.sleep(0.3)
+
+
+class TestLoopWatchdog:
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_site_is_named(self):
+        """Um travamento acima do limite registra o call site do projeto"""
+        watchdog = LoopWatchdog(threshold=0.1, interval=0.02)
+        watchdog.metrics.reset()
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.05)
+            sync_disk_write()
+            await asyncio.sleep(0.05)
+        finally:
+            watchdog.stop()
+
+        sites = dict(watchdog.top_sites())
+        assert len(sites) == 1
+        site = next(iter(sites))
+        assert site.startswith("tests/test_loop_watchdog.py:")
+        assert site.endswith("(sync_disk_write)")
+        assert watchdog.metrics.get_counter('event_loop_blocked', site=site) == 1
+        assert watchdog.metrics.get_histogram('event_loop_lag_seconds').percentile(1.0) >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_no_report_without_stall(self):
+        """Sem bloqueios nada é registrado"""
+        watchdog = LoopWatchdog(threshold=0.1, interval=0.02)
+        watchdog.start()
+        try:
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+        finally:
+            watchdog.stop()
+
+        assert watchdog.sites == {}
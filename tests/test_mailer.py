@@ -0,0 +1,138 @@
+"""
+Testes para a fila de envio de emails (contra um servidor SMTP local)
+"""
+
+import asyncio
+import socket
+import pytest
+from email.message import EmailMessage
+from utils.metrics import MetricsRegistry
+from utils.mailer import Mailer
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class RecordingHandler:
+    """Handler do aiosmtpd que guarda as mensagens e pode falhar nas primeiras entregas"""
+
+    def __init__(self, fail_with=None, failures=0):
+        self.messages = []
+        self.fail_with = fail_with
+        self.failures = failures
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.failures:
+            self.failures -= 1
+            return self.fail_with
+        self.messages.append(envelope)
+        return '250 OK'
+
+
+class SlowHandler(RecordingHandler):
+    """Handler que demora a aceitar o DATA (envio em andamento na thread do worker)"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.started = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.loop.call_soon_threadsafe(self.started.set)
+        await asyncio.sleep(self.delay)
+        return await super().handle_DATA(server, session, envelope)
+
+
+@pytest.fixture
+def smtp_server():
+    servers = []
+
+    def start(handler):
+        controller = aiosmtpd_controller.Controller(handler, hostname='127.0.0.1', port=free_port())
+        controller.start()
+        servers.append(controller)
+        return controller
+
+    yield start
+    for controller in servers:
+        controller.stop()
+
+
+def make_message(to):
+    msg = EmailMessage()
+    msg['From'] = 'bot@example.com'
+    msg['To'] = to
+    msg['Subject'] = 'Código de Verificação'
+    msg.set_content('123456')
+    return msg
+
+
+def make_mailer(controller, **kwargs):
+    return Mailer(controller.hostname, controller.port, use_tls=False, backoff=0.01,
+                  registry=MetricsRegistry(), **kwargs)
+
+
+class TestMailer:
+
+    @pytest.mark.asyncio
+    async def test_messages_reuse_pooled_connections(self, smtp_server):
+        """Vários envios usam no máximo uma conexão por worker"""
+        handler = RecordingHandler()
+        mailer = make_mailer(smtp_server(handler), concurrency=2)
+        try:
+            results = await asyncio.gather(*(mailer.send(make_message(f"p{i}@example.com")) for i in range(8)))
+        finally:
+            await mailer.stop()
+
+        assert all(results)
+        assert len(handler.messages) == 8
+        assert mailer.metrics.get_counter('mail_sent') == 8
+        assert mailer.metrics.get_counter('mail_connections') <= 2
+
+    @pytest.mark.asyncio
+    async def test_temporary_error_is_retried(self, smtp_server):
+        """Erros 4xx são repetidos com backoff até a entrega"""
+        handler = RecordingHandler(fail_with='451 Tente mais tarde', failures=2)
+        mailer = make_mailer(smtp_server(handler), concurrency=1)
+        try:
+            assert await mailer.send(make_message("p@example.com"))
+        finally:
+            await mailer.stop()
+
+        assert len(handler.messages) == 1
+        assert mailer.metrics.get_counter('mail_retries') == 2
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_is_not_retried(self, smtp_server):
+        """Erros 5xx falham imediatamente"""
+        handler = RecordingHandler(fail_with='550 Caixa inexistente', failures=1)
+        mailer = make_mailer(smtp_server(handler), concurrency=1)
+        try:
+            assert not await mailer.send(make_message("p@example.com"))
+        finally:
+            await mailer.stop()
+
+        assert mailer.metrics.get_counter('mail_retries') == 0
+        assert mailer.metrics.get_counter('mail_failed', reason='permanent') == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_finishes_in_flight_delivery_and_fails_queued_sends(self, smtp_server):
+        """stop() responde False aos envios na fila; o envio em andamento termina e responde True"""
+        handler = SlowHandler(delay=0.3)
+        mailer = make_mailer(smtp_server(handler), concurrency=1)
+        envios = [asyncio.create_task(mailer.send(make_message(f"p{i}@example.com"))) for i in range(3)]
+        await asyncio.wait_for(handler.started.wait(), timeout=5)
+
+        await mailer.stop()
+
+        assert await asyncio.wait_for(asyncio.gather(*envios), timeout=1) == [True, False, False]
+        # A primeira mensagem já estava na thread: foi entregue antes do QUIT, sem erro de protocolo
+        assert len(handler.messages) == 1
+        assert mailer.metrics.get_counter('mail_failed', reason='stopped') == 2
+        assert mailer.queue.empty()
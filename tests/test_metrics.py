@@ -0,0 +1,37 @@
+"""
+Testes para o registro de métricas em memória
+"""
+
+import pytest
+from utils.metrics import Histogram, MetricsRegistry
+
+
+class TestHistogram:
+
+    def test_percentiles(self):
+        """Percentis são estimados a partir dos buckets"""
+        histogram = Histogram(buckets=(1, 2, 3, 4))
+        for value in (0.5, 1.5, 2.5, 3.5):
+            histogram.observe(value)
+
+        assert histogram.count == 4
+        assert histogram.percentile(0.5) == pytest.approx(2.0)
+        assert histogram.percentile(1.0) == pytest.approx(4.0)
+        assert histogram.mean == pytest.approx(2.0)
+
+    def test_empty_histogram(self):
+        """Histograma vazio não tem percentis"""
+        assert Histogram().percentile(0.5) is None
+
+
+class TestMetricsRegistry:
+
+    def test_counters_with_labels(self):
+        """Contadores são separados por labels"""
+        registry = MetricsRegistry()
+        registry.inc('eventos', tipo='a')
+        registry.inc('eventos', 2, tipo='b')
+
+        assert registry.get_counter('eventos', tipo='a') == 1
+        assert registry.get_counter('eventos', tipo='b') == 2
+        assert registry.get_counter('eventos', tipo='c') == 0
@@ -0,0 +1,170 @@
+"""
+Testes para o outbox de notificações
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+import discord
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, NotificacaoPendente
+from handlers.notification_outbox import NotificationOutbox, enqueue_notification
+from utils.metrics import MetricsRegistry
+
+
+@pytest_asyncio.fixture
+async def outbox_db():
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_session():
+        return factory()
+
+    with patch('handlers.notification_outbox.DatabaseManager.get_session', get_session):
+        yield factory
+    await engine.dispose()
+
+
+def make_bot(send):
+    """Bot falso: nenhum usuário em cache, fetch_user devolve um usuário com `send`"""
+    bot = MagicMock()
+    bot.get_user.return_value = None
+    bot.fetch_user = AsyncMock(side_effect=lambda user_id: MagicMock(id=user_id, send=send))
+    return bot
+
+
+def make_outbox(bot, **kwargs):
+    kwargs.setdefault('registry', MetricsRegistry())
+    return NotificationOutbox(
+        bot, concurrency=kwargs.pop('concurrency', 2), max_retries=kwargs.pop('max_retries', 3),
+        backoff=0, poll_interval=1, blocked_ttl=60, **kwargs
+    )
+
+
+async def enqueue(factory, *user_ids):
+    async with factory() as session:
+        for user_id in user_ids:
+            enqueue_notification(session, 'teste', discord.Embed(title=f"Olá {user_id}"), discord_user_id=user_id)
+        await session.commit()
+
+
+async def load_all(factory):
+    async with factory() as session:
+        result = await session.execute(select(NotificacaoPendente).order_by(NotificacaoPendente.id))
+        return result.scalars().all()
+
+
+def http_error(exception_type, status):
+    return exception_type(MagicMock(status=status, reason='erro'), 'erro')
+
+
+class TestNotificationOutbox:
+
+    @pytest.mark.asyncio
+    async def test_delivers_and_marks_as_sent(self, outbox_db):
+        """Notificações vencidas são entregues com o embed gravado"""
+        send = AsyncMock()
+        outbox = make_outbox(make_bot(send))
+        await enqueue(outbox_db, 1, 2)
+
+        assert await outbox.drain_once() == 2
+
+        assert send.await_count == 2
+        assert send.await_args.kwargs['embed'].title.startswith("Olá")
+        assert [n.status for n in await load_all(outbox_db)] == ['enviada', 'enviada']
+        assert outbox.metrics.get_counter('notifications_sent', tipo='teste') == 2
+        assert await outbox.drain_once() == 0
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_transaction_sends_nothing(self, outbox_db):
+        """A notificação só existe se a transação da mudança de estado for confirmada"""
+        async with outbox_db() as session:
+            enqueue_notification(session, 'teste', discord.Embed(title="x"), discord_user_id=1)
+            await session.rollback()
+
+        assert await load_all(outbox_db) == []
+
+    @pytest.mark.asyncio
+    async def test_forbidden_user_goes_to_negative_cache(self, outbox_db):
+        """Após um Forbidden, novas DMs para o usuário são descartadas sem chamada REST"""
+        bot = make_bot(AsyncMock(side_effect=http_error(discord.Forbidden, 403)))
+        outbox = make_outbox(bot)
+        await enqueue(outbox_db, 7)
+        await outbox.drain_once()
+
+        await enqueue(outbox_db, 7)
+        await outbox.drain_once()
+
+        assert bot.fetch_user.await_count == 1
+        notificacoes = await load_all(outbox_db)
+        assert [(n.status, n.erro) for n in notificacoes] == [('falhou', 'forbidden'), ('falhou', 'dm_bloqueada')]
+        assert outbox.metrics.get_counter('notifications_skipped') == 1
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_retried_until_max_retries(self, outbox_db):
+        """Erros 5xx reagendam a notificação; após max_retries ela é descartada"""
+        outbox = make_outbox(make_bot(AsyncMock(side_effect=http_error(discord.HTTPException, 503))), max_retries=2)
+        await enqueue(outbox_db, 3)
+
+        await outbox.drain_once()
+        (notificacao,) = await load_all(outbox_db)
+        assert (notificacao.status, notificacao.tentativas, notificacao.erro) == ('pendente', 1, 'http_503')
+
+        await outbox.drain_once()
+        (notificacao,) = await load_all(outbox_db)
+        assert (notificacao.status, notificacao.tentativas) == ('falhou', 2)
+        assert outbox.metrics.get_counter('notifications_failed', reason='max_retries') == 1
+
+    @pytest.mark.asyncio
+    async def test_claimed_notifications_are_not_picked_twice(self, outbox_db):
+        """Uma notificação reservada só volta à fila depois do lease"""
+        outbox = make_outbox(make_bot(AsyncMock()))
+        await enqueue(outbox_db, 1)
+
+        assert len(await outbox._claim()) == 1
+        assert await outbox._claim() == []
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, outbox_db):
+        """No máximo `concurrency` entregas simultâneas"""
+        ativos = 0
+        pico = 0
+
+        async def send(embed):
+            nonlocal ativos, pico
+            ativos += 1
+            pico = max(pico, ativos)
+            await asyncio.sleep(0.01)
+            ativos -= 1
+
+        outbox = make_outbox(make_bot(send), concurrency=3)
+        await enqueue(outbox_db, *range(10))
+
+        assert await outbox.drain_once() == 10
+        assert pico == 3
+
+    @pytest.mark.asyncio
+    async def test_worker_drains_on_wake(self, outbox_db):
+        """wake() faz o worker entregar sem esperar o intervalo de verificação"""
+        send = AsyncMock()
+        outbox = make_outbox(make_bot(send))
+        outbox.poll_interval = 60
+        outbox.start()
+        try:
+            await asyncio.sleep(0.05)
+            await enqueue(outbox_db, 1)
+            outbox.wake()
+            for _ in range(50):
+                if send.await_count:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await outbox.stop()
+
+        assert send.await_count == 1
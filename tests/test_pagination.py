@@ -0,0 +1,135 @@
+"""
+Testes para a paginação por keyset e para o paginador de solicitações
+"""
+
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, SolicitacaoMentoria, StatusSolicitacaoEnum
+from views.mentoria_view import SolicitacoesView, fetch_solicitacoes
+
+
+@pytest_asyncio.fixture
+async def solicitacoes_db():
+    """12 solicitações pendentes (duas a duas com a mesma data) e 3 concluídas"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    inicio = datetime(2025, 10, 1)
+    async with factory() as session:
+        for i in range(15):
+            session.add(SolicitacaoMentoria(
+                discord_user_id=1000 + i,
+                discord_username=f'user{i}',
+                titulo=f'Solicitação {i}',
+                descricao='Preciso de ajuda',
+                status=StatusSolicitacaoEnum.PENDENTE if i < 12 else StatusSolicitacaoEnum.CONCLUIDA,
+                # Datas repetidas: o id desempata o cursor
+                data_solicitacao=inicio + timedelta(minutes=i // 2)
+            ))
+        await session.commit()
+
+    async def get_session():
+        return factory()
+
+    with patch('database.pagination.DatabaseManager.get_session', get_session):
+        yield
+    await engine.dispose()
+
+
+def make_interaction(user_id=42):
+    interaction = MagicMock()
+    interaction.user.id = user_id
+    interaction.response.send_message = AsyncMock()
+    interaction.response.edit_message = AsyncMock()
+    interaction.original_response = AsyncMock()
+    return interaction
+
+
+class TestKeysetPagination:
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_all_rows_without_repeats(self, solicitacoes_db):
+        """Percorrer as páginas para frente visita cada solicitação uma vez, mais recentes primeiro"""
+        vistos = []
+        after = None
+        while True:
+            pagina, ha_mais = await fetch_solicitacoes(StatusSolicitacaoEnum.PENDENTE, after=after, limit=5)
+            vistos += [s.id for s in pagina]
+            if not ha_mais:
+                break
+            after = (pagina[-1].data_solicitacao, pagina[-1].id)
+
+        assert vistos == list(range(12, 0, -1))
+
+    @pytest.mark.asyncio
+    async def test_before_returns_previous_page_in_display_order(self, solicitacoes_db):
+        """A página anterior volta na mesma ordem de exibição"""
+        primeira, _ = await fetch_solicitacoes(StatusSolicitacaoEnum.PENDENTE, limit=5)
+        segunda, _ = await fetch_solicitacoes(
+            StatusSolicitacaoEnum.PENDENTE, after=(primeira[-1].data_solicitacao, primeira[-1].id), limit=5
+        )
+        anterior, ha_mais = await fetch_solicitacoes(
+            StatusSolicitacaoEnum.PENDENTE, before=(segunda[0].data_solicitacao, segunda[0].id), limit=5
+        )
+
+        assert [s.id for s in anterior] == [s.id for s in primeira]
+        assert ha_mais is False
+
+
+class TestSolicitacoesView:
+
+    @pytest.mark.asyncio
+    async def test_navigation_and_filter(self, solicitacoes_db):
+        """Botões avançam/voltam e trocar o filtro volta para a primeira página"""
+        view = SolicitacoesView(owner_id=42)
+        with patch('views.mentoria_view.count_solicitacoes', AsyncMock(return_value=12)):
+            await view.load_page()
+            assert [s.id for s in view.items] == [12, 11, 10, 9, 8]
+            assert view.previous_page.disabled and not view.next_page.disabled
+
+            await view.load_page(after=view.cursor(view.items[-1]))
+            await view.load_page(after=view.cursor(view.items[-1]))
+            assert view.page == 2
+            assert [s.id for s in view.items] == [2, 1]
+            assert view.next_page.disabled
+
+            await view.load_page(before=view.cursor(view.items[0]))
+            assert view.page == 1
+            assert [s.id for s in view.items] == [7, 6, 5, 4, 3]
+            assert "Página 2 de 3" in view.build_embed().footer.text
+
+        with patch('views.mentoria_view.count_solicitacoes', AsyncMock(return_value=3)):
+            interaction = make_interaction()
+            view.filter_select._values = [str(list(StatusSolicitacaoEnum).index(StatusSolicitacaoEnum.CONCLUIDA))]
+            await view.change_filter(interaction)
+
+        assert view.page == 0
+        assert [s.id for s in view.items] == [15, 14, 13]
+        interaction.response.edit_message.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_only_owner_can_use_the_controls(self):
+        """Outros usuários recebem um aviso em vez de controlar a listagem"""
+        view = SolicitacoesView(owner_id=42)
+        intruso = make_interaction(user_id=7)
+
+        assert await view.interaction_check(intruso) is False
+        intruso.response.send_message.assert_awaited_once()
+        assert await view.interaction_check(make_interaction()) is True
+
+    @pytest.mark.asyncio
+    async def test_timeout_disables_controls(self):
+        """Ao expirar, os controles são desativados na mensagem"""
+        view = SolicitacoesView(owner_id=42)
+        view.message = MagicMock(edit=AsyncMock())
+
+        await view.on_timeout()
+
+        assert all(item.disabled for item in view.children)
+        view.message.edit.assert_awaited_once_with(view=view)
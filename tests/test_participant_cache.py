@@ -0,0 +1,104 @@
+"""
+Testes para o cache read-through de participantes
+"""
+
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+from sqlalchemy import select, event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Participante, EscolaridadeEnum, ModalidadeEnum
+from database.participant_cache import ParticipantCache
+from utils.metrics import MetricsRegistry
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Banco SQLite em memória com um participante"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add(Participante(
+            discord_user_id=123456789,
+            discord_username='testuser#1234',
+            nome='João',
+            sobrenome='Silva',
+            email='Joao@Example.com',
+            telefone='34999887766',
+            cpf='12345678901',
+            cidade='Uberlândia',
+            data_nascimento='15/08/1995',
+            escolaridade=EscolaridadeEnum.ENSINO_SUPERIOR,
+            modalidade=ModalidadeEnum.PRESENCIAL,
+            nome_equipe='Equipe Teste'
+        ))
+        await session.commit()
+
+    # Registrar as consultas feitas ao banco
+    queries = []
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def record(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    async def get_session():
+        return factory()
+
+    with patch('database.participant_cache.DatabaseManager.get_session', get_session):
+        yield queries, factory
+
+    await engine.dispose()
+
+
+class TestParticipantCache:
+
+    @pytest.mark.asyncio
+    async def test_lookups_hit_cache_after_first_read(self, session_factory):
+        """Após a primeira leitura, buscas por ID e por email não vão ao banco"""
+        queries, _ = session_factory
+        cache = ParticipantCache(ttl=60, registry=MetricsRegistry())
+
+        participante = await cache.get_by_discord_id(123456789)
+        assert participante.nome == 'João'
+        assert participante.modalidade == ModalidadeEnum.PRESENCIAL
+        count = len(queries)
+
+        assert (await cache.get_by_discord_id(123456789)).id == participante.id
+        assert (await cache.get_by_email(' joao@EXAMPLE.com ')).id == participante.id
+        assert len(queries) == count
+        assert cache.metrics.get_counter('participant_cache', result='hit') == 2
+
+    @pytest.mark.asyncio
+    async def test_unregistered_user_is_cached_until_invalidated(self, session_factory):
+        """"Não inscrito" também é cacheado e a inscrição invalida a entrada"""
+        queries, factory = session_factory
+        cache = ParticipantCache(ttl=60, registry=MetricsRegistry())
+
+        assert await cache.get_by_discord_id(42) is None
+        count = len(queries)
+        assert await cache.get_by_discord_id(42) is None
+        assert len(queries) == count
+
+        async with factory() as session:
+            participante = (await session.execute(select(Participante))).scalars().first()
+            participante.discord_user_id = 42
+            await session.commit()
+        cache.invalidate(42, 123456789)
+
+        assert (await cache.get_by_discord_id(42)).nome == 'João'
+        assert await cache.get_by_discord_id(123456789) is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_reloaded(self, session_factory):
+        """Entradas vencidas voltam a consultar o banco"""
+        queries, _ = session_factory
+        cache = ParticipantCache(ttl=0, registry=MetricsRegistry())
+
+        await cache.get_by_discord_id(123456789)
+        count = len(queries)
+        await cache.get_by_discord_id(123456789)
+        assert len(queries) > count
@@ -0,0 +1,120 @@
+"""
+Testes para a medição de latência de comandos e interações
+"""
+
+import asyncio
+import discord
+import pytest
+from unittest.mock import MagicMock
+from utils.log_context import InteractionContextMixin, start_request
+from utils.metrics import get_metrics, MetricsRegistry
+from utils.metrics_server import render_prometheus
+from utils.perf import mark_first_response, record_latency, format_latency_report, HANDLER_METRIC, FIRST_RESPONSE_METRIC
+
+
+def make_interaction():
+    """Cria uma interação mock de componente"""
+    interaction = MagicMock()
+    interaction.id = 1
+    interaction.user.roles = []
+    interaction.command = None
+    interaction.data = {'custom_id': 'create_team_button'}
+    return interaction
+
+
+class SampleView(InteractionContextMixin, discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    @discord.ui.button(label="Criar Equipe", custom_id='create_team_button')
+    async def create_team(self, interaction, button):
+        await asyncio.sleep(0.01)
+        mark_first_response()
+        await asyncio.sleep(0.02)
+
+
+class SampleModal(InteractionContextMixin, discord.ui.Modal, title="Teste"):
+    nome = discord.ui.TextInput(label="Nome")
+
+    async def on_submit(self, interaction):
+        mark_first_response()
+
+
+class TestLatencyInstrumentation:
+
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self):
+        get_metrics().reset()
+        yield
+        start_request()
+
+    @pytest.mark.asyncio
+    async def test_view_callback_records_histograms(self):
+        """Callbacks de View registram tempo total e até a primeira resposta pelo custom_id"""
+        view = SampleView()
+        interaction = make_interaction()
+        button = view.children[0]
+
+        assert await view.interaction_check(interaction)
+        await button.callback(interaction)
+
+        handler = get_metrics().get_histogram(HANDLER_METRIC, kind='component', name='create_team_button')
+        first = get_metrics().get_histogram(FIRST_RESPONSE_METRIC, kind='component', name='create_team_button')
+        assert handler.count == 1 and first.count == 1
+        assert first.sum < handler.sum
+        assert handler.sum >= 0.03
+
+    @pytest.mark.asyncio
+    async def test_dynamic_items_are_instrumented(self):
+        """Itens adicionados com add_item também são medidos"""
+        view = SampleView()
+        select = discord.ui.Select(options=[discord.SelectOption(label="a")])
+
+        async def callback(interaction):
+            pass
+
+        select.callback = callback
+        view.add_item(select)
+
+        await view.interaction_check(make_interaction())
+        await select.callback(make_interaction())
+
+        assert get_metrics().get_histogram(HANDLER_METRIC, kind='component', name='SampleView.Select').count == 1
+
+    @pytest.mark.asyncio
+    async def test_modal_submit_is_instrumented(self):
+        """on_submit dos Modals é medido com o nome da classe"""
+        modal = SampleModal()
+        await modal.interaction_check(make_interaction())
+        await modal.on_submit(make_interaction())
+
+        assert get_metrics().get_histogram(FIRST_RESPONSE_METRIC, kind='modal', name='SampleModal').count == 1
+
+    def test_latency_recorded_once_per_request(self):
+        """Uma requisição gera uma única amostra mesmo com várias chamadas"""
+        start_request()
+        record_latency('slash', 'stats')
+        record_latency('slash', 'stats')
+
+        rows = format_latency_report(kind='slash')
+        assert len(rows) == 1
+        assert rows[0]['count'] == 1
+        assert rows[0]['first_p50'] is None
+
+
+class TestPrometheusExport:
+
+    def test_render_counters_and_histograms(self):
+        """A exposição segue o formato texto do Prometheus"""
+        registry = MetricsRegistry()
+        registry.inc('voice_pool_claims', result='hit')
+        registry.observe('handler_seconds', 0.2, buckets=(0.1, 0.5), kind='component', name='view_available_teams')
+
+        text = render_prometheus(registry)
+
+        assert 'nasa_bot_voice_pool_claims_total{result="hit"} 1' in text
+        assert '# TYPE nasa_bot_handler_seconds histogram' in text
+        assert 'nasa_bot_handler_seconds_bucket{kind="component",name="view_available_teams",le="0.1"} 0' in text
+        assert 'nasa_bot_handler_seconds_bucket{kind="component",name="view_available_teams",le="0.5"} 1' in text
+        assert 'nasa_bot_handler_seconds_bucket{kind="component",name="view_available_teams",le="+Inf"} 1' in text
+        assert 'nasa_bot_handler_seconds_count{kind="component",name="view_available_teams"} 1' in text
@@ -0,0 +1,83 @@
+"""
+Testes para a telemetria das requisições REST ao Discord
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from yarl import URL
+from utils.metrics import MetricsRegistry
+from utils.rest_telemetry import RestTelemetry, route_template, rest_subsystem, subsystem, current_subsystem
+
+
+def make_params(method, url, status=200, headers=None):
+    """Parâmetros no formato dos sinais do aiohttp.TraceConfig"""
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    return SimpleNamespace(method=method, url=URL(url), response=response)
+
+
+class TestRouteTemplate:
+
+    def test_ids_and_tokens_are_normalized(self):
+        """IDs, tokens e emojis viram placeholders"""
+        base = "https://discord.com/api/v10"
+        assert route_template("POST", URL(f"{base}/channels/1404479492814016703/messages")) == "POST /channels/:id/messages"
+        assert route_template("POST", URL(f"{base}/interactions/1404479492814016703/aW50ZXJhY3Rpb24/callback")) == \
+            "POST /interactions/:id/:token/callback"
+        assert route_template("PUT", URL(f"{base}/channels/1404479492814016703/messages/1404479492814016704/reactions/%F0%9F%91%8D/@me")) == \
+            "PUT /channels/:id/messages/:id/reactions/:emoji/@me"
+
+
+class TestRestTelemetry:
+
+    @pytest.fixture
+    def telemetry(self):
+        return RestTelemetry(MetricsRegistry())
+
+    async def request(self, telemetry, params):
+        """Simula a sequência de sinais de uma requisição"""
+        trace_ctx = SimpleNamespace()
+        await telemetry._on_request_start(None, trace_ctx, params)
+        await telemetry._on_request_end(None, trace_ctx, params)
+
+    @pytest.mark.asyncio
+    async def test_ratelimits_are_counted_per_route_and_subsystem(self, telemetry):
+        """429s e retry-after são somados por rota e pelo subsistema do contextvar"""
+        url = "https://discord.com/api/v10/channels/1404479492814016703/messages"
+
+        @rest_subsystem('startup')
+        async def purge():
+            await self.request(telemetry, make_params("DELETE", url + "/1404479492814016704"))
+            await self.request(telemetry, make_params("DELETE", url + "/1404479492814016705", status=429, headers={
+                'X-RateLimit-Remaining': '0', 'X-RateLimit-Limit': '5', 'Retry-After': '2',
+                'X-RateLimit-Reset-After': '1.5', 'X-RateLimit-Scope': 'user'
+            }))
+
+        await purge()
+        await self.request(telemetry, make_params("POST", url, headers={
+            'X-RateLimit-Remaining': '0', 'X-RateLimit-Limit': '5', 'X-RateLimit-Reset-After': '0.8'
+        }))
+
+        routes, subsystems = telemetry.report()
+        routes = dict(routes)
+        subsystems = dict(subsystems)
+
+        assert routes["DELETE /channels/:id/messages/:id"]['requests'] == 2
+        assert routes["DELETE /channels/:id/messages/:id"]['ratelimited'] == 1
+        assert routes["DELETE /channels/:id/messages/:id"]['retry_after'] == pytest.approx(1.5)
+        assert subsystems['startup']['requests'] == 2
+        assert subsystems['outro']['exhausted'] == 1
+        assert telemetry.registry.get_gauge('discord_rest_bucket_remaining', route="POST /channels/:id/messages") == 0
+
+    @pytest.mark.asyncio
+    async def test_subsystem_is_restored_after_block(self):
+        """O subsistema vale apenas dentro do bloco/método marcado"""
+        with subsystem('voz'):
+            assert current_subsystem() == 'voz'
+            with subsystem('equipes'):
+                assert current_subsystem() == 'equipes'
+            assert current_subsystem() == 'voz'
+        assert current_subsystem() == 'outro'
@@ -0,0 +1,50 @@
+"""
+Testes para o profiler por amostragem
+"""
+
+import asyncio
+import time
+import pytest
+from utils.sampling_profiler import profile_loop
+
+
+def busy_work(seconds):
+    """Consome CPU na thread do loop"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+async def slow_coroutine():
+    for _ in range(20):
+        busy_work(0.01)
+        await asyncio.sleep(0)
+
+
+class TestSamplingProfiler:
+
+    @pytest.mark.asyncio
+    async def test_collects_collapsed_stacks(self):
+        """As amostras trazem a coroutine e a função que estava executando"""
+        worker = asyncio.create_task(slow_coroutine())
+        profiler = await profile_loop(0.3, interval=0.005)
+        await worker
+
+        assert profiler.samples > 0
+        collapsed = profiler.collapsed()
+        busy_lines = [line for line in collapsed.splitlines() if 'busy_work' in line]
+        assert busy_lines
+        assert all(line.startswith("task:slow_coroutine;") for line in busy_lines)
+        assert any('tests/test_sampling_profiler.py:busy_work' in function for function, _ in profiler.top_functions())
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive(self):
+        """Coletar amostras não bloqueia o loop"""
+        profiling = asyncio.create_task(profile_loop(0.2, interval=0.005))
+        ticks = 0
+        while not profiling.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+        assert ticks >= 10
+        assert await profile_loop(0.01) is not None
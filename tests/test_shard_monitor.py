@@ -0,0 +1,180 @@
+"""
+Testes para a prontidão e as métricas por shard
+Um gateway falso (websocket local) atende dois shards do AutoShardedBot de verdade
+"""
+
+import asyncio
+import json
+import discord
+import pytest
+from aiohttp import web, ClientSession
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from discord.ext import commands
+from database.guild_settings import member_guild, primary_guild
+from handlers.shard_monitor import ShardMonitor
+from utils.metrics import MetricsRegistry
+
+SHARD_COUNT = 2
+BOT_USER = {'id': '1000', 'username': 'bot', 'discriminator': '0000', 'avatar': None, 'bot': True}
+
+# Servidores de cada shard: (guild_id >> 22) % SHARD_COUNT
+GUILDS = {0: [0 << 22, 2 << 22], 1: [1 << 22]}
+EXTRA_EVENTS = {0: 3, 1: 10}
+
+
+def guild_payload(guild_id, member_ids=()):
+    return {
+        'id': str(guild_id), 'name': f'Servidor {guild_id}', 'owner_id': BOT_USER['id'], 'unavailable': False,
+        'large': False, 'member_count': len(member_ids), 'roles': [], 'emojis': [], 'stickers': [],
+        'features': [], 'channels': [], 'threads': [], 'voice_states': [], 'presences': [],
+        'members': [
+            {'user': {'id': str(user_id), 'username': f'user{user_id}', 'discriminator': '0000', 'avatar': None},
+             'roles': [], 'joined_at': '2025-10-01T00:00:00+00:00', 'deaf': False, 'mute': False, 'flags': 0}
+            for user_id in member_ids
+        ],
+    }
+
+
+class FakeGateway:
+    """Gateway mínimo: HELLO, IDENTIFY -> READY + GUILD_CREATE, heartbeats e eventos extras"""
+
+    def __init__(self):
+        self.identified = []
+        self.sockets = []
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.append(ws)
+        await ws.send_str(json.dumps({'op': 10, 'd': {'heartbeat_interval': 45000}}))
+
+        sequence = 0
+
+        async def dispatch(event, data):
+            nonlocal sequence
+            sequence += 1
+            await ws.send_str(json.dumps({'op': 0, 't': event, 's': sequence, 'd': data}))
+
+        async for msg in ws:
+            payload = json.loads(msg.data)
+            if payload['op'] == 1:
+                await ws.send_str(json.dumps({'op': 11}))
+            elif payload['op'] == 2:
+                shard_id, shard_count = payload['d']['shard']
+                self.identified.append(shard_id)
+                guilds = GUILDS[shard_id]
+                await dispatch('READY', {
+                    'v': 10, 'user': BOT_USER, 'session_id': f'sessao-{shard_id}', 'shard': [shard_id, shard_count],
+                    'resume_gateway_url': f'ws://{request.host}/', 'application': {'id': BOT_USER['id'], 'flags': 0},
+                    'guilds': [{'id': str(guild_id), 'unavailable': True} for guild_id in guilds],
+                })
+                for guild_id in guilds:
+                    await dispatch('GUILD_CREATE', guild_payload(guild_id, member_ids=[5000 + guild_id]))
+                for _ in range(EXTRA_EVENTS[shard_id]):
+                    await dispatch('TYPING_START', {'channel_id': '1', 'user_id': '2', 'timestamp': 0})
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/', self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        return f'ws://127.0.0.1:{port}/'
+
+    async def stop(self):
+        for ws in self.sockets:
+            await ws.close()
+        await self.runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_two_shards_get_ready_independently_with_metrics():
+    gateway = FakeGateway()
+    url = await gateway.start()
+    session = ClientSession()
+
+    intents = discord.Intents.default()
+    intents.members = True  # member_count == membros enviados: o servidor já chega completo, sem chunking
+    bot = commands.AutoShardedBot(command_prefix='n!', intents=intents, guild_ready_timeout=0.05)
+    bot.http.static_login = AsyncMock(return_value=BOT_USER)
+    bot.http.get_bot_gateway = AsyncMock(return_value=(SHARD_COUNT, url, {}))
+    bot.http.ws_connect = lambda ws_url, **kwargs: session.ws_connect(ws_url)
+    bot.before_identify_hook = AsyncMock()  # Sem a espera de 5s entre IDENTIFYs
+    bot.application_info = AsyncMock(return_value=SimpleNamespace(
+        id=int(BOT_USER['id']), interactions_endpoint_url=None, flags=discord.ApplicationFlags()
+    ))
+
+    registry = MetricsRegistry()
+    monitor = ShardMonitor(bot, interval=0, registry=registry)
+    iniciados = []
+
+    async def job(guild):
+        # Quando a tarefa roda, o shard do servidor já está pronto (mesmo que o outro não esteja)
+        iniciados.append((guild.id, guild.shard_id, monitor.is_ready(guild.shard_id)))
+
+    monitor.add_guild_job(job)
+
+    try:
+        await bot.login('token')
+        connect = asyncio.create_task(bot.connect())
+        await asyncio.wait_for(asyncio.gather(monitor.wait_until_ready(0), monitor.wait_until_ready(1)), timeout=10)
+
+        assert sorted(gateway.identified) == [0, 1]
+        assert sorted(iniciados) == [(0, 0, True), (1 << 22, 1, True), (2 << 22, 0, True)]
+        assert monitor.guild_ready(bot.get_guild(1 << 22))
+
+        # Resolução de servidores atravessa os shards
+        assert member_guild(bot, 5000 + (1 << 22)).id == 1 << 22
+        assert primary_guild(bot) is not None
+
+        # Aguardar o primeiro heartbeat ACK e os eventos extras de cada shard
+        for _ in range(100):
+            if all(shard.latency != float('inf') for shard in bot.shards.values()) and \
+                    all(shard._parent.ws.sequence == 1 + len(GUILDS[i]) + EXTRA_EVENTS[i] for i, shard in bot.shards.items()):
+                break
+            await asyncio.sleep(0.02)
+
+        monitor.sample(now=100.0)
+        for shard_id in range(SHARD_COUNT):
+            eventos = 1 + len(GUILDS[shard_id]) + EXTRA_EVENTS[shard_id]
+            assert registry.get_counter('gateway_events', shard=shard_id) == eventos
+            assert registry.get_gauge('gateway_latency_seconds', shard=shard_id) >= 0
+            assert registry.get_gauge('shard_ready', shard=shard_id) == 1
+
+        # Segunda amostra: sem eventos novos, taxa zero
+        monitor.sample(now=110.0)
+        assert registry.get_gauge('gateway_event_rate', shard=1) == 0
+
+        # Queda de um shard não afeta o outro; as tarefas de startup não se repetem
+        await monitor.on_shard_disconnect(1)
+        assert not monitor.is_ready(1) and monitor.is_ready(0)
+        assert registry.get_counter('shard_disconnects', shard=1) == 1
+        await monitor.on_shard_ready(1)
+        assert len(iniciados) == 3
+        assert [row[:2] for row in monitor.report()] == [(0, True), (1, True)]
+    finally:
+        await bot.close()
+        await session.close()
+        await gateway.stop()
+        await asyncio.gather(connect, return_exceptions=True)
+
+
+def test_sample_counts_events_across_new_sessions():
+    """Um novo IDENTIFY recomeça a sequência: os eventos da nova sessão são somados, não descontados"""
+    ws = SimpleNamespace(sequence=50)
+    bot = MagicMock()
+    bot.shards = {0: SimpleNamespace(latency=float('inf'), _parent=SimpleNamespace(ws=ws))}
+    registry = MetricsRegistry()
+    monitor = ShardMonitor(bot, interval=0, registry=registry)
+
+    monitor.sample(now=0.0)
+    ws.sequence = 20
+    monitor.sample(now=10.0)
+
+    assert registry.get_counter('gateway_events', shard=0) == 70
+    assert registry.get_gauge('gateway_event_rate', shard=0) == 2.0
+    assert registry.get_gauge('gateway_latency_seconds', shard=0) is None  # Sem heartbeat ACK ainda
@@ -0,0 +1,153 @@
+"""
+Testes para o índice de habilidades (/recomendar)
+"""
+
+import time
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Participante, EscolaridadeEnum, ModalidadeEnum
+from database.participant_cache import project
+from matchmaking.skill_index import SkillIndex, skill_terms
+from utils.metrics import MetricsRegistry
+
+PRESENCIAL = ModalidadeEnum.PRESENCIAL
+REMOTO = ModalidadeEnum.REMOTO
+
+
+def make_participant(i, habilidades, equipe=None, modalidade=PRESENCIAL, disponivel=True):
+    return Participante(
+        id=i,
+        discord_user_id=1000 + i,
+        discord_username=f'user{i}',
+        nome=f'Nome{i}',
+        sobrenome='Silva',
+        email=f'p{i}@example.com',
+        telefone='34999887766',
+        cpf='12345678901',
+        cidade='Uberlândia',
+        data_nascimento='15/08/1995',
+        escolaridade=EscolaridadeEnum.GRADUANDO,
+        modalidade=modalidade,
+        nome_equipe=equipe or f'Equipe {i}',
+        disponivel_para_equipe=disponivel,
+        descricao_habilidades=habilidades
+    )
+
+
+def make_index(*pessoas):
+    index = SkillIndex(registry=MetricsRegistry())
+    for pessoa in pessoas:
+        index.upsert(project(pessoa))
+    return index
+
+
+def ids(recomendacoes):
+    return [r.participante.discord_user_id for r in recomendacoes]
+
+
+class TestSkillIndex:
+
+    def test_terms_include_bigrams_without_accents_or_stopwords(self):
+        assert skill_terms("Análise de Dados e Machine Learning") == [
+            "analise", "dados", "machine", "learning", "analise dados", "dados machine", "machine learning"
+        ]
+
+    def test_complementary_people_rank_first(self):
+        """Uma equipe de programadores recebe primeiro quem faz design e dados"""
+        index = make_index(
+            make_participant(1, "Python, backend e APIs REST"),
+            make_participant(2, "Design UI/UX e Figma"),
+            make_participant(3, "Python backend Django"),
+            make_participant(4, "Ciência de dados e estatística")
+        )
+
+        recomendacoes = index.recommend(["Programação Python backend", "APIs em Python"])
+
+        assert set(ids(recomendacoes[:2])) == {1002, 1004}
+        assert ids(recomendacoes)[-1] in (1001, 1003)
+        assert recomendacoes[0].complementaridade == pytest.approx(1.0)
+
+    def test_sought_skills_filter_and_rank_by_relevance(self):
+        index = make_index(
+            make_participant(1, "Design gráfico e ilustração"),
+            make_participant(2, "Design UI/UX e Figma"),
+            make_participant(3, "Marketing e pitch")
+        )
+
+        recomendacoes = index.recommend(["Design gráfico"], procurando="design ux")
+
+        assert ids(recomendacoes) == [1002, 1001]
+        assert recomendacoes[0].relevancia > recomendacoes[1].relevancia
+
+    def test_filters_modality_team_and_updates_incrementally(self):
+        index = make_index(
+            make_participant(1, "Design UI/UX"),
+            make_participant(2, "Design de produto", modalidade=REMOTO),
+            make_participant(3, "Design de jogos", equipe="Cometa")
+        )
+
+        assert ids(index.recommend([], modalidade=PRESENCIAL, equipe_excluida="Cometa")) == [1001]
+
+        # Entrou em uma equipe: sai do índice; nova disponibilidade: entra sem recarregar
+        index.remove(1001)
+        index.upsert(project(make_participant(4, "Design e animação 3D")))
+        assert ids(index.recommend([], procurando="design", modalidade=PRESENCIAL, equipe_excluida="Cometa")) == [1004]
+        assert "animacao" in index.postings and len(index) == 3
+
+    def test_top_k_is_fast_with_thousands_of_people(self):
+        habilidades = ["python backend", "design ux figma", "dados machine learning", "pitch marketing", "hardware arduino"]
+        index = make_index(*(
+            make_participant(i, f"{habilidades[i % 5]} {habilidades[(i * 7) % 5]} projeto {i}")
+            for i in range(5000)
+        ))
+
+        inicio = time.perf_counter()
+        for _ in range(20):
+            recomendacoes = index.recommend(["python backend apis"], procurando="design", limit=10)
+        duracao = time.perf_counter() - inicio
+
+        assert len(recomendacoes) == 10
+        assert duracao < 2.0
+
+
+@pytest_asyncio.fixture
+async def skills_db():
+    """Equipe Alfa (Python e backend, um membro sem descrição) e três pessoas disponíveis"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        session.add_all([
+            make_participant(1, "Python e backend", equipe="Alfa", disponivel=False),
+            make_participant(2, None, equipe="Alfa", disponivel=False),
+            make_participant(3, "Backend em Python"),
+            make_participant(4, "Design UI/UX"),
+            make_participant(5, "Design gráfico", disponivel=False),
+        ])
+        await session.commit()
+        lider = project(await session.get(Participante, 1))
+
+    async def get_session():
+        return factory()
+
+    with patch('database.db.DatabaseManager.get_session', get_session):
+        yield lider
+    await engine.dispose()
+
+
+class TestRecommendForTeam:
+
+    @pytest.mark.asyncio
+    async def test_loads_available_people_and_uses_team_skills(self, skills_db):
+        index = SkillIndex(registry=MetricsRegistry())
+        await index.load()
+
+        recomendacoes = await index.recommend_for_team(skills_db)
+
+        assert len(index) == 2
+        assert ids(recomendacoes) == [1004, 1003]
@@ -0,0 +1,191 @@
+"""
+Testes para a formação automática de equipes
+"""
+
+import json
+import random
+import pytest
+import pytest_asyncio
+from unittest.mock import MagicMock, patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Participante, NotificacaoPendente, EscolaridadeEnum, ModalidadeEnum
+from database.participant_cache import project
+from database.team_index import TeamNameIndex
+from matchmaking.auto_team_notifications import AutoTeamNotificationSystem, MAX_REGIONS_SHOWN
+from matchmaking.team_formation import (
+    build_features, compatibility, form_teams, greedy_teams, local_search, region_key, team_score, team_sizes
+)
+from utils.metrics import MetricsRegistry
+
+HABILIDADES = ["python backend", "design ux", "frontend react", "dados machine learning", "pitch marketing", "hardware arduino"]
+CIDADES = ["Uberlândia", "Uberaba", "São Paulo"]
+
+
+def make_participant(i, modalidade=ModalidadeEnum.PRESENCIAL, cidade="Uberlândia", habilidades=None):
+    return Participante(
+        id=i,
+        discord_user_id=1000 + i,
+        discord_username=f'user{i}',
+        nome=f'Nome{i}',
+        sobrenome='Silva',
+        email=f'p{i}@example.com',
+        telefone='34999887766',
+        cpf='12345678901',
+        cidade=cidade,
+        data_nascimento='15/08/1995',
+        escolaridade=EscolaridadeEnum.GRADUANDO,
+        modalidade=modalidade,
+        nome_equipe=f'Equipe {i}',
+        disponivel_para_equipe=True,
+        descricao_habilidades=habilidades
+    )
+
+
+def random_participants(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        project(make_participant(
+            i,
+            modalidade=rng.choice(list(ModalidadeEnum)),
+            cidade=rng.choice(CIDADES),
+            habilidades=rng.choice(HABILIDADES + [None])
+        ))
+        for i in range(n)
+    ]
+
+
+class TestTeamFormation:
+
+    def test_team_sizes_are_balanced_within_limits(self):
+        assert team_sizes(12, 6, 3) == [6, 6]
+        assert team_sizes(13, 6, 3) == [5, 4, 4]
+        assert team_sizes(7, 6, 4) == [6]  # Uma pessoa sobra em vez de duas equipes pequenas
+        assert team_sizes(2, 6, 3) == []
+
+    def test_teams_respect_modality_region_and_size(self):
+        """Presencial só junta pessoas da mesma cidade; remoto junta qualquer região"""
+        participantes = random_participants(300)
+        formacao = form_teams(participantes, max_size=6, min_size=3)
+
+        agrupados = [i for equipe in formacao.equipes for i in equipe]
+        assert sorted(agrupados + formacao.restantes) == list(range(300))
+        for equipe in formacao.equipes:
+            membros = [participantes[i] for i in equipe]
+            assert 3 <= len(membros) <= 6
+            assert len({p.modalidade for p in membros}) == 1
+            if membros[0].modalidade == ModalidadeEnum.PRESENCIAL:
+                assert len({region_key(p.cidade) for p in membros}) == 1
+
+    def test_complementary_skills_end_up_together(self):
+        """Com uma pessoa de cada habilidade por grupo, cada equipe recebe habilidades diferentes"""
+        participantes = [
+            project(make_participant(i, habilidades=HABILIDADES[i % 6]))
+            for i in range(36)
+        ]
+        formacao = form_teams(participantes, max_size=6, min_size=3)
+
+        assert len(formacao.equipes) == 6
+        for equipe in formacao.equipes:
+            assert len({participantes[i].descricao_habilidades for i in equipe}) == 6
+
+    def test_local_search_never_makes_teams_worse(self):
+        participantes = random_participants(200, seed=3)
+        features = build_features(participantes)
+        idx = list(range(len(participantes)))
+        score = compatibility(features, idx)
+
+        equipes, _ = greedy_teams(score, team_sizes(len(idx), 6, 3))
+        antes = sum(team_score(score, e) * len(e) * (len(e) - 1) for e in equipes)
+        melhoradas, trocas = local_search(score, equipes)
+        depois = sum(team_score(score, e) * len(e) * (len(e) - 1) for e in melhoradas)
+
+        assert sorted(len(e) for e in melhoradas) == sorted(len(e) for e in equipes)
+        assert depois >= antes - 1e-4
+        assert trocas == 0 or depois > antes
+
+
+@pytest_asyncio.fixture
+async def available_db():
+    """7 pessoas presenciais disponíveis em Uberlândia e 1 indisponível"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        session.add_all([make_participant(i, habilidades=HABILIDADES[i % 6]) for i in range(1, 8)])
+        indisponivel = make_participant(8)
+        indisponivel.disponivel_para_equipe = False
+        session.add(indisponivel)
+        await session.commit()
+
+    async def get_session():
+        return factory()
+
+    with patch('database.db.DatabaseManager.get_session', get_session):
+        yield factory
+    await engine.dispose()
+
+
+class TestAutoTeamNotificationSystem:
+
+    @pytest.mark.asyncio
+    async def test_forms_teams_and_queues_suggestions(self, available_db):
+        bot = MagicMock()
+        system = AutoTeamNotificationSystem(bot, max_size=6, min_size=4, registry=MetricsRegistry())
+
+        resultados = await system.executar_formacao_completa()
+
+        assert resultados["sucesso"]
+        assert resultados["equipes_formadas"] == 1
+        assert resultados["participantes_agrupados"] == 6
+        assert resultados["participantes_restantes"] == 1
+        assert resultados["notificacoes_enviadas"] == 6
+        assert resultados["grupos_por_regiao"] == {"uberlandia": 6}
+        equipe = resultados["equipes_detalhes"][0]
+        assert equipe["tamanho"] == 6 and 0 < equipe["score_compatibilidade"] <= 100
+
+        async with available_db() as session:
+            notificacoes = (await session.execute(select(NotificacaoPendente))).scalars().all()
+        assert sorted(n.discord_user_id for n in notificacoes) == sorted(equipe["membros"])
+        assert all(n.tipo == 'equipe_sugerida' for n in notificacoes)
+        assert equipe["nome_sugerido"] in json.loads(notificacoes[0].payload)["fields"][1]["value"]
+        bot.outbox.wake.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_not_enough_people_returns_reason(self, available_db):
+        system = AutoTeamNotificationSystem(MagicMock(), min_size=10, registry=MetricsRegistry())
+
+        resultados = await system.executar_formacao_completa()
+
+        assert resultados["sucesso"]
+        assert resultados["equipes_formadas"] == 0
+        assert "10" in resultados["motivo"]
+
+    def test_suggested_team_must_fit_whole_group(self):
+        """Uma equipe com 4 membros não comporta mais 5 colegas: sugerir outra ou deixar o grupo decidir"""
+        system = AutoTeamNotificationSystem(MagicMock(), max_size=6, registry=MetricsRegistry())
+        membros = [project(make_participant(i)) for i in range(1, 7)]
+        index = TeamNameIndex(max_size=6, registry=MetricsRegistry())
+        for membro in membros:
+            index.set_team(membro.nome_equipe, membro.modalidade, 4)
+
+        with patch('matchmaking.auto_team_notifications.get_team_index', return_value=index):
+            assert system.suggested_team_name(membros) is None
+            embed = system.build_suggestion_embed(membros[0], membros, None, 80)
+            assert "escolham quem vai criar" in embed.fields[1].value
+
+            index.set_team('Equipe 3', membros[2].modalidade, 1)
+            assert system.suggested_team_name(membros) == 'Equipe 3'
+
+    def test_regions_summary_is_capped(self):
+        """Cidades digitadas livremente: o resumo lista as maiores regiões e soma o restante"""
+        agrupados = [project(make_participant(i, cidade=f"Cidade {i % 40}")) for i in range(80)]
+
+        resumo = AutoTeamNotificationSystem.regions_summary(agrupados)
+
+        assert len(resumo) == MAX_REGIONS_SHOWN + 1
+        assert resumo['outras'] == 80 - 2 * MAX_REGIONS_SHOWN
+        assert sum(resumo.values()) == 80
@@ -0,0 +1,109 @@
+"""
+Testes para o índice de nomes de equipes (autocomplete do /aplicar)
+"""
+
+import time
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Participante, EscolaridadeEnum, ModalidadeEnum
+from database.team_index import TeamNameIndex
+from utils.metrics import MetricsRegistry
+
+PRESENCIAL = ModalidadeEnum.PRESENCIAL
+REMOTO = ModalidadeEnum.REMOTO
+
+
+def make_index():
+    return TeamNameIndex(max_size=6, registry=MetricsRegistry())
+
+
+@pytest_asyncio.fixture
+async def teams_db():
+    """Astronautas (2 membros), Órbita (6, cheia) e Astro Remoto (1, remota)"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    equipes = [("Astronautas", PRESENCIAL)] * 2 + [("Órbita", PRESENCIAL)] * 6 + [("Astro Remoto", REMOTO)]
+    async with factory() as session:
+        for i, (equipe, modalidade) in enumerate(equipes):
+            session.add(Participante(
+                discord_user_id=1000 + i,
+                discord_username=f'user{i}',
+                nome=f'Nome{i}',
+                sobrenome='Silva',
+                email=f'p{i}@example.com',
+                telefone='34999887766',
+                cpf='12345678901',
+                cidade='Uberlândia',
+                data_nascimento='15/08/1995',
+                escolaridade=EscolaridadeEnum.GRADUANDO,
+                modalidade=modalidade,
+                nome_equipe=equipe
+            ))
+        await session.commit()
+
+    async def get_session():
+        return factory()
+
+    with patch('database.team_index.DatabaseManager.get_session', get_session):
+        yield
+    await engine.dispose()
+
+
+class TestTeamNameIndex:
+
+    @pytest.mark.asyncio
+    async def test_load_keeps_only_teams_with_open_slots(self, teams_db):
+        """Equipes cheias ficam fora das sugestões; a modalidade filtra as demais"""
+        index = make_index()
+        await index.load()
+
+        assert index.complete("", modalidade=PRESENCIAL) == ["Astronautas"]
+        assert index.complete("astro") == ["Astro Remoto", "Astronautas"]
+        assert index.resolve(" órbita ") == "Órbita"
+        assert not index.has_open_slots("Órbita")
+
+    def test_prefix_is_case_and_accent_insensitive(self):
+        index = make_index()
+        for nome in ("Órion", "orbital", "Oráculo", "Pulsar"):
+            index.set_team(nome, PRESENCIAL, 1)
+
+        assert index.complete("OR") == ["Oráculo", "orbital", "Órion"]
+        assert index.complete("ori") == ["Órion"]
+        assert index.complete("or", limit=2) == ["Oráculo", "orbital"]
+        assert index.complete("or", excluir="orbital") == ["Oráculo", "Órion"]
+
+    def test_membership_changes_update_open_slots(self):
+        """Encher tira a equipe das sugestões; perder um membro devolve; remover apaga"""
+        index = make_index()
+        index.add_member("Cometa", PRESENCIAL)
+        for _ in range(5):
+            index.add_member("Cometa")
+        assert index.complete("com") == []
+
+        index.move_member("Cometa", "Nebulosa")
+        assert index.complete("") == ["Cometa", "Nebulosa"]
+        assert index.members == {"Cometa": 5, "Nebulosa": 1}
+
+        index.remove_team("Cometa")
+        assert index.complete("") == ["Nebulosa"]
+        assert index.resolve("cometa") is None
+
+    def test_completion_is_fast_with_thousands_of_teams(self):
+        """Busca por prefixo em ~10 mil equipes bem abaixo do limite de 3s do Discord"""
+        index = make_index()
+        for i in range(10000):
+            index.set_team(f"Equipe {i:05d}", PRESENCIAL if i % 2 else REMOTO, i % 6)
+
+        inicio = time.perf_counter()
+        for i in range(1000):
+            sugestoes = index.complete(f"equipe 0{i % 100:02d}", modalidade=PRESENCIAL)
+        duracao = time.perf_counter() - inicio
+
+        assert len(sugestoes) == 25
+        assert duracao < 1.0  # 1 ms por busca, com folga
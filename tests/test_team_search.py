@@ -0,0 +1,88 @@
+"""
+Testes para a listagem paginada de equipes disponíveis
+"""
+
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Participante, EscolaridadeEnum, ModalidadeEnum
+from views.team_search_view import fetch_available_teams, count_available_teams
+
+
+def make_participant(i, equipe, modalidade=ModalidadeEnum.PRESENCIAL, minutos=0):
+    return Participante(
+        discord_user_id=1000 + i,
+        discord_username=f'user{i}',
+        nome=f'Nome{i}',
+        sobrenome='Silva',
+        email=f'p{i}@example.com',
+        telefone='34999887766',
+        cpf='12345678901',
+        cidade='Uberlândia',
+        data_nascimento='15/08/1995',
+        escolaridade=EscolaridadeEnum.GRADUANDO,
+        modalidade=modalidade,
+        nome_equipe=equipe,
+        data_inscricao=datetime(2025, 9, 1) + timedelta(minutes=minutos)
+    )
+
+
+@pytest_asyncio.fixture
+async def teams_db():
+    """Equipe A..L (12 equipes de 2 membros), uma equipe cheia e uma remota"""
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    participantes = []
+    for n, letra in enumerate("ABCDEFGHIJKL"):
+        # O segundo membro se inscreve antes no id, mas depois no tempo: o líder é o primeiro inscrito
+        participantes.append(make_participant(n * 2, f"Equipe {letra}", minutos=n * 2 + 1))
+        participantes.append(make_participant(n * 2 + 1, f"Equipe {letra}", minutos=n * 2))
+    participantes += [make_participant(100 + i, "Equipe Cheia", minutos=100 + i) for i in range(6)]
+    participantes.append(make_participant(200, "Equipe Remota", modalidade=ModalidadeEnum.REMOTO))
+
+    async with factory() as session:
+        session.add_all(participantes)
+        await session.commit()
+
+    async def get_session():
+        return factory()
+
+    with patch('views.team_search_view.DatabaseManager.get_session', get_session):
+        yield
+    await engine.dispose()
+
+
+class TestAvailableTeams:
+
+    @pytest.mark.asyncio
+    async def test_pages_are_aggregated_in_sql(self, teams_db):
+        """Páginas por keyset, sem equipes cheias, da própria equipe ou de outra modalidade"""
+        total = await count_available_teams(ModalidadeEnum.PRESENCIAL, "Equipe A")
+        assert total == 11
+
+        pagina, ha_mais = await fetch_available_teams(ModalidadeEnum.PRESENCIAL, "Equipe A", limit=5)
+        assert [e.nome_equipe for e in pagina] == ["Equipe B", "Equipe C", "Equipe D", "Equipe E", "Equipe F"]
+        assert ha_mais
+        assert pagina[0].total == 2
+        assert pagina[0].nome == "Nome3"  # Primeiro inscrito da Equipe B
+
+        pagina, ha_mais = await fetch_available_teams(ModalidadeEnum.PRESENCIAL, "Equipe A", after=("Equipe K",), limit=5)
+        assert [e.nome_equipe for e in pagina] == ["Equipe L"]
+        assert not ha_mais
+
+    @pytest.mark.asyncio
+    async def test_previous_page_uses_reverse_keyset(self, teams_db):
+        """A página anterior é buscada em ordem reversa e devolvida em ordem crescente"""
+        pagina, ha_mais = await fetch_available_teams(ModalidadeEnum.PRESENCIAL, before=("Equipe H",), limit=3)
+        assert [e.nome_equipe for e in pagina] == ["Equipe E", "Equipe F", "Equipe G"]
+        assert ha_mais
+
+        pagina, ha_mais = await fetch_available_teams(ModalidadeEnum.PRESENCIAL, before=("Equipe C",), limit=3)
+        assert [e.nome_equipe for e in pagina] == ["Equipe A", "Equipe B"]
+        assert not ha_mais
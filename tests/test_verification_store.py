@@ -0,0 +1,125 @@
+"""
+Testes para o armazenamento de códigos de verificação e o agendador de timers
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from handlers.email_verification_handler import EmailVerificationHandler
+from handlers.verification_store import VerificationStore, RATE_WINDOW
+from utils.timers import TimerHeap
+
+
+class TestTimerHeap:
+
+    @pytest.mark.asyncio
+    async def test_timers_fire_in_order_and_cancel(self):
+        """Uma única task dispara os timers por ordem de vencimento; cancelados não disparam"""
+        timers = TimerHeap()
+        timers.start()
+        fired = []
+
+        async def record(name):
+            fired.append(name)
+
+        timers.schedule('b', 0.04, record, 'b')
+        timers.schedule('a', 0.02, record, 'a')
+        timers.schedule('c', 0.03, record, 'c')
+        timers.cancel('c')
+        # Reagendar a mesma chave substitui o timer anterior
+        timers.schedule('b', 0.01, record, 'b2')
+
+        await asyncio.sleep(0.1)
+        await timers.stop()
+
+        assert fired == ['b2', 'a']
+        assert len(timers) == 0
+
+
+class TestVerificationStore:
+
+    @pytest.fixture
+    def store(self):
+        """Store com timers mock e persistência desativada"""
+        store = VerificationStore(MagicMock(), MagicMock(), ttl=600, cooldown=60, max_per_hour=3)
+        store._save = AsyncMock()
+        store._save_attempts = AsyncMock()
+        store._delete = AsyncMock()
+        return store
+
+    @pytest.mark.asyncio
+    async def test_code_is_hashed_and_verified_once(self, store):
+        """Somente o hash fica armazenado e o código é de uso único"""
+        code = await store.issue(1, "p@example.com", channel_id=10)
+
+        entry = store.codes[1]
+        assert code not in entry.values()
+        assert len(code) == 6 and code.isdigit()
+        store.timers.schedule_at.assert_called_once()
+
+        assert await store.verify(1, code) == 'ok'
+        assert await store.verify(1, code) == 'expired'
+
+    @pytest.mark.asyncio
+    async def test_wrong_codes_lock_after_max_attempts(self, store):
+        """Após o máximo de tentativas o código é invalidado"""
+        code = await store.issue(1, "p@example.com")
+        wrong = "000000" if code != "000000" else "111111"
+
+        assert await store.verify(1, wrong) == 'invalid'
+        assert store.attempts_left(1) == 2
+        assert await store.verify(1, wrong) == 'invalid'
+        assert await store.verify(1, wrong) == 'locked'
+        assert await store.verify(1, code) == 'expired'
+
+    @pytest.mark.asyncio
+    async def test_sends_are_rate_limited_per_email_and_user(self, store):
+        """Cooldown entre envios e limite por hora, tanto por email quanto por usuário"""
+        clock = [10_000.0]
+        with patch('handlers.verification_store.time.time', lambda: clock[0]):
+            assert await store.issue(1, "alvo@example.com")
+            # Outro usuário pedindo código para o mesmo email ainda respeita o cooldown do email
+            assert await store.issue(2, "alvo@example.com") is None
+            assert store.retry_after(2, "alvo@example.com") == pytest.approx(60)
+
+            for _ in range(2):
+                clock[0] += 61
+                assert await store.issue(1, "alvo@example.com")
+
+            clock[0] += 61
+            assert await store.issue(1, "alvo@example.com") is None
+            assert store.retry_after(1, "alvo@example.com") == pytest.approx(RATE_WINDOW - 3 * 61)
+
+            clock[0] += RATE_WINDOW
+            assert await store.issue(1, "alvo@example.com")
+
+    @pytest.mark.asyncio
+    async def test_expiry_notifies_and_schedules_teardown(self, store):
+        """O timer de expiração invalida o código, avisa no canal e agenda a remoção"""
+        channel = MagicMock()
+        channel.id = 10
+        channel.send = AsyncMock()
+        store.bot.get_channel.return_value = channel
+
+        await store.issue(1, "p@example.com", channel_id=10)
+        await store._expire(1)
+
+        assert 1 not in store.codes
+        channel.send.assert_awaited_once()
+        store.timers.schedule.assert_called_once()
+        assert store.timers.schedule.call_args.args[:2] == (('canal', 10), 30)
+
+
+@pytest.mark.asyncio
+async def test_email_body_uses_configured_ttl():
+    """O texto do email acompanha o TTL configurado (não um valor fixo)"""
+    bot = MagicMock()
+    bot.verification_store.ttl = 900
+    bot.mailer.send = AsyncMock(return_value=True)
+    handler = EmailVerificationHandler(bot)
+
+    assert await handler.send_verification_email('p@example.com', '123456', 'Nome')
+
+    msg = bot.mailer.send.call_args.args[0]
+    corpo = msg.get_payload()[0].get_payload(decode=True).decode('utf-8')
+    assert "expira em 15 minutos" in corpo
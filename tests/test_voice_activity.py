@@ -0,0 +1,139 @@
+"""
+Testes para a contabilização de atividade em canais de voz
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from handlers.voice_activity_handler import VoiceActivityHandler
+import handlers.voice_activity_handler as voice_activity_module
+
+
+def make_channel(channel_id, name="geral"):
+    """Cria um canal de voz mock"""
+    channel = MagicMock()
+    channel.id = channel_id
+    channel.name = name
+    return channel
+
+
+def make_member(member_id, team=None):
+    """Cria um membro mock, opcionalmente com role de equipe"""
+    member = MagicMock()
+    member.id = member_id
+    member.bot = False
+    roles = []
+    if team:
+        role = MagicMock()
+        role.name = f"Equipe {team}"
+        roles.append(role)
+    member.roles = roles
+    return member
+
+
+def make_voice_state(channel):
+    """Cria um VoiceState mock"""
+    state = MagicMock()
+    state.channel = channel
+    return state
+
+
+class FakeClock:
+    """Relógio controlado para time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestVoiceActivityHandler:
+
+    @pytest.fixture
+    def clock(self):
+        clock = FakeClock()
+        with patch.object(voice_activity_module.time, 'monotonic', clock):
+            yield clock
+
+    @pytest.fixture
+    def tracker(self, clock):
+        """Cria um VoiceActivityHandler com bot mock"""
+        bot = MagicMock()
+        bot.voice_handler.temp_channels = {500}
+        return VoiceActivityHandler(bot)
+
+    @pytest.fixture
+    def db_session(self):
+        """Sessão de banco mock retornada pelo DatabaseManager"""
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        with patch.object(voice_activity_module.DatabaseManager, 'get_session', AsyncMock(return_value=session)):
+            yield session
+
+    def test_join_leave_accumulates_in_memory(self, tracker, clock):
+        """Entrar e sair só acumula em memória, agrupado por membro e canal"""
+        member = make_member(1, team="Apollo")
+        channel = make_channel(10, name="🔊│Apollo")
+
+        tracker.handle_voice_state_update(member, make_voice_state(None), make_voice_state(channel))
+        clock.now += 120
+        tracker.handle_voice_state_update(member, make_voice_state(channel), make_voice_state(None))
+        tracker.handle_voice_state_update(member, make_voice_state(None), make_voice_state(channel))
+        clock.now += 30
+        tracker.handle_voice_state_update(member, make_voice_state(channel), make_voice_state(None))
+
+        assert tracker.open_sessions == {}
+        assert tracker.pending == {(1, 10, 'equipe', 'Apollo'): 150}
+
+    def test_mute_does_not_split_session(self, tracker, clock):
+        """Atualizações sem troca de canal (mute, deafen) são ignoradas"""
+        member = make_member(2)
+        channel = make_channel(500)
+
+        tracker.handle_voice_state_update(member, make_voice_state(None), make_voice_state(channel))
+        started = tracker.open_sessions[2]['started']
+        clock.now += 10
+        tracker.handle_voice_state_update(member, make_voice_state(channel), make_voice_state(channel))
+
+        assert tracker.open_sessions[2]['started'] == started
+        assert tracker.open_sessions[2]['tipo_canal'] == 'temporario'
+        assert tracker.pending == {}
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_single_batch(self, tracker, clock, db_session):
+        """A gravação usa um único INSERT em lote e credita sessões abertas"""
+        channel = make_channel(20)
+        for member_id in range(1, 51):
+            tracker.handle_voice_state_update(make_member(member_id), make_voice_state(None), make_voice_state(channel))
+        clock.now += 60
+
+        written = await tracker.flush()
+
+        assert written == 50
+        db_session.execute.assert_awaited_once()
+        rows = db_session.execute.await_args.args[1]
+        assert len(rows) == 50
+        assert all(row['segundos'] == 60 and row['tipo_canal'] == 'outro' for row in rows)
+        db_session.commit.assert_awaited_once()
+
+        # Sessões continuam abertas, mas o tempo já gravado não é contado de novo
+        assert len(tracker.open_sessions) == 50
+        assert tracker.pending == {}
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_keeps_pending(self, tracker, clock, db_session):
+        """Se a gravação falhar, o tempo volta para o acumulador"""
+        member = make_member(3)
+        channel = make_channel(30)
+        tracker.handle_voice_state_update(member, make_voice_state(None), make_voice_state(channel))
+        clock.now += 45
+        tracker.handle_voice_state_update(member, make_voice_state(channel), make_voice_state(None))
+
+        db_session.execute.side_effect = Exception("banco indisponível")
+        written = await tracker.flush()
+
+        assert written == 0
+        assert tracker.pending == {(3, 30, 'outro', None): 45}
@@ -0,0 +1,318 @@
+"""
+Testes para o handler de canais de voz temporários
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from handlers.voice_handler import VoiceHandler
+
+
+def make_channel(channel_id, members=None):
+    """Cria um canal de voz mock"""
+    channel = MagicMock()
+    channel.id = channel_id
+    channel.name = f"canal-{channel_id}"
+    channel.members = members if members is not None else []
+    channel.delete = AsyncMock()
+    return channel
+
+
+def make_voice_state(channel):
+    """Cria um VoiceState mock"""
+    state = MagicMock()
+    state.channel = channel
+    return state
+
+
+class TestTempChannelDeletion:
+
+    @pytest.fixture
+    def channels(self):
+        """Canais conhecidos pelo bot mock"""
+        return {}
+
+    @pytest.fixture
+    def voice_handler(self, channels):
+        """Cria um VoiceHandler com bot mock e período de tolerância curto"""
+        bot = MagicMock()
+        bot.get_channel = lambda channel_id: channels.get(channel_id)
+        bot.get_user = MagicMock(return_value=None)
+        handler = VoiceHandler(bot)
+        handler.delete_grace = 0.05
+        return handler
+
+    def register(self, handler, channels, channel, creator_id=1):
+        channels[channel.id] = channel
+        handler.temp_channels.add(channel.id)
+        handler.channel_creators[channel.id] = creator_id
+
+    @pytest.mark.asyncio
+    async def test_last_leaver_arms_timer(self, voice_handler, channels):
+        """Apenas a saída do último membro agenda a remoção"""
+        member = MagicMock()
+        remaining = MagicMock()
+        channel = make_channel(10, members=[remaining])
+        self.register(voice_handler, channels, channel)
+
+        await voice_handler.handle_voice_state_update(member, make_voice_state(channel), make_voice_state(None))
+        assert 10 not in voice_handler.deletion_timers
+
+        channel.members = []
+        await voice_handler.handle_voice_state_update(remaining, make_voice_state(channel), make_voice_state(None))
+        assert 10 in voice_handler.deletion_timers
+
+        await asyncio.sleep(0.1)
+        channel.delete.assert_awaited_once()
+        assert 10 not in voice_handler.temp_channels
+        assert 10 not in voice_handler.deletion_timers
+
+    @pytest.mark.asyncio
+    async def test_rejoin_cancels_timer(self, voice_handler, channels):
+        """Entrar novamente no canal cancela a remoção agendada"""
+        member = MagicMock()
+        channel = make_channel(20)
+        self.register(voice_handler, channels, channel)
+
+        await voice_handler.handle_voice_state_update(member, make_voice_state(channel), make_voice_state(None))
+        assert 20 in voice_handler.deletion_timers
+
+        channel.members = [member]
+        await voice_handler.handle_voice_state_update(member, make_voice_state(None), make_voice_state(channel))
+        assert 20 not in voice_handler.deletion_timers
+
+        await asyncio.sleep(0.1)
+        channel.delete.assert_not_awaited()
+        assert 20 in voice_handler.temp_channels
+
+    @pytest.mark.asyncio
+    async def test_rapid_toggles_keep_single_timer(self, voice_handler, channels):
+        """Saídas e entradas rápidas nunca geram mais de um timer por canal"""
+        member = MagicMock()
+        channel = make_channel(30)
+        self.register(voice_handler, channels, channel)
+
+        for _ in range(50):
+            channel.members = []
+            await voice_handler.handle_voice_state_update(member, make_voice_state(channel), make_voice_state(None))
+            channel.members = [member]
+            await voice_handler.handle_voice_state_update(member, make_voice_state(None), make_voice_state(channel))
+
+        channel.members = []
+        await voice_handler.handle_voice_state_update(member, make_voice_state(channel), make_voice_state(None))
+        assert len(voice_handler.deletion_timers) == 1
+
+        await asyncio.sleep(0.1)
+        channel.delete.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_info_exposes_scheduled_deletion(self, voice_handler, channels):
+        """get_temp_channels_info informa quando a remoção está agendada"""
+        channel = make_channel(40)
+        self.register(voice_handler, channels, channel)
+
+        voice_handler.schedule_channel_deletion(channel, delay=60)
+        info = voice_handler.get_temp_channels_info()
+
+        assert info[0]['delete_at'] is not None
+        voice_handler.cancel_channel_deletion(40)
+        assert voice_handler.get_temp_channels_info()[0]['delete_at'] is None
+
+
+class TestWarmPool:
+
+    @staticmethod
+    def make_category(category_id, channel_ids):
+        """Categoria mock que registra os canais criados"""
+        category = MagicMock()
+        category.id = category_id
+        category.voice_channels = []
+        created = iter(channel_ids)
+
+        async def create_voice_channel(name, overwrites=None, reason=None):
+            channel = make_channel(next(created))
+            channel.name = name
+            channel.edit = AsyncMock()
+            category.voice_channels.append(channel)
+            return channel
+
+        category.create_voice_channel = AsyncMock(side_effect=create_voice_channel)
+        return category
+
+    @pytest.fixture
+    def category(self):
+        return self.make_category(1, range(100, 200))
+
+    @pytest.fixture
+    def voice_handler(self, category):
+        """VoiceHandler com pool de 2 canais"""
+        bot = MagicMock()
+        bot.categories = {1: category}
+
+        def get_channel(channel_id):
+            if channel_id in bot.categories:
+                return bot.categories[channel_id]
+            canais = [ch for categoria in bot.categories.values() for ch in categoria.voice_channels]
+            return next((ch for ch in canais if ch.id == channel_id), None)
+
+        bot.get_channel = get_channel
+        handler = VoiceHandler(bot)
+        handler.category_id = 1
+        handler.pool_size = 2
+        handler.metrics.reset()
+        return handler
+
+    def make_member(self, category):
+        member = MagicMock()
+        member.id = 555
+        member.display_name = "astronauta"
+        member.guild.get_channel = MagicMock(return_value=category)
+        member.voice.channel = MagicMock()
+        member.move_to = AsyncMock()
+        member.send = AsyncMock()
+        return member
+
+    @pytest.mark.asyncio
+    async def test_refill_creates_idle_channels(self, voice_handler, category):
+        """O pool é preenchido até o tamanho configurado"""
+        await voice_handler.refill_pool()
+        assert len(voice_handler.pool_channels) == 2
+        assert category.create_voice_channel.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_join_claims_pool_channel(self, voice_handler, category):
+        """Entrar no trigger reaproveita um canal do pool e registra a latência"""
+        await voice_handler.refill_pool()
+        pooled_id = voice_handler.pool_channels[0]
+        member = self.make_member(category)
+
+        await voice_handler.create_temp_channel(member)
+        await asyncio.sleep(0)
+
+        assert pooled_id in voice_handler.temp_channels
+        member.move_to.assert_awaited_once()
+        assert voice_handler.metrics.get_counter('voice_pool_claims', result='hit') == 1
+        assert voice_handler.metrics.get_histogram('voice_join_to_move_seconds', source='pool').count == 1
+
+        # Pool reposto em segundo plano
+        await asyncio.sleep(0.01)
+        assert len(voice_handler.pool_channels) == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_pool_falls_back_to_create(self, voice_handler, category):
+        """Sem canais no pool, o canal é criado normalmente"""
+        voice_handler.pool_size = 1
+        member = self.make_member(category)
+
+        await voice_handler.create_temp_channel(member)
+
+        assert len(voice_handler.temp_channels) == 1
+        assert voice_handler.metrics.get_counter('voice_pool_claims', result='miss') == 1
+        assert voice_handler.metrics.get_histogram('voice_join_to_move_seconds', source='create').count == 1
+
+
+    @pytest.mark.asyncio
+    async def test_reconfigured_category_deletes_old_pool(self, voice_handler, category):
+        """Trocar a categoria remove os canais ociosos da categoria antiga"""
+        await voice_handler.refill_pool()
+        antigos = list(category.voice_channels)
+
+        nova = self.make_category(2, range(200, 300))
+        voice_handler.bot.categories[2] = nova
+        voice_handler.category_id = 2
+        await voice_handler.refill_pool()
+
+        for channel in antigos:
+            channel.delete.assert_awaited_once()
+        assert voice_handler.pool_channels == [200, 201]
+
+    @pytest.mark.asyncio
+    async def test_background_refill_is_tracked_and_logs_errors(self, voice_handler):
+        """A reposição em segundo plano fica referenciada e erros não se perdem"""
+        voice_handler.refill_pool = AsyncMock(side_effect=RuntimeError("falhou"))
+        voice_handler.logger = MagicMock()
+
+        task = voice_handler.start_pool_refill()
+        assert task in voice_handler.refill_tasks
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert not voice_handler.refill_tasks
+        voice_handler.logger.error.assert_called_once()
+
+
+class TestCreationSingleFlight:
+
+    @pytest.fixture
+    def category(self):
+        """Categoria mock com criação de canal lenta (simula REST sob rate limit)"""
+        category = MagicMock()
+        category.voice_channels = []
+        created = iter(range(1000, 2000))
+
+        async def create_voice_channel(name, overwrites=None, reason=None):
+            await asyncio.sleep(0.02)
+            channel = make_channel(next(created))
+            channel.name = name
+            category.voice_channels.append(channel)
+            return channel
+
+        category.create_voice_channel = AsyncMock(side_effect=create_voice_channel)
+        return category
+
+    @pytest.fixture
+    def voice_handler(self, category):
+        bot = MagicMock()
+        bot.get_channel = lambda channel_id: next(
+            (ch for ch in category.voice_channels if ch.id == channel_id), None
+        )
+        handler = VoiceHandler(bot)
+        handler.pool_size = 0
+        handler.delete_grace = 60
+        return handler
+
+    def make_member(self, category, trigger):
+        member = MagicMock()
+        member.id = 777
+        member.display_name = "saltitante"
+        member.guild.get_channel = MagicMock(return_value=category)
+        member.voice.channel = trigger
+        member.move_to = AsyncMock()
+        member.send = AsyncMock()
+        return member
+
+    @pytest.mark.asyncio
+    async def test_200_rapid_toggles_create_one_channel(self, voice_handler, category):
+        """200 entradas/saídas rápidas no trigger geram um único canal"""
+        trigger = make_channel(voice_handler.trigger_channel_id)
+        member = self.make_member(category, trigger)
+
+        events = []
+        for i in range(200):
+            if i % 2 == 0:
+                events.append(asyncio.create_task(voice_handler.handle_voice_state_update(
+                    member, make_voice_state(None), make_voice_state(trigger))))
+            else:
+                events.append(asyncio.create_task(voice_handler.handle_voice_state_update(
+                    member, make_voice_state(trigger), make_voice_state(None))))
+            if i % 10 == 0:
+                # Parte dos eventos chega depois que a primeira criação terminou
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(*events)
+
+        assert category.create_voice_channel.await_count == 1
+        assert len(voice_handler.temp_channels) == 1
+        assert len(voice_handler.creation_flights) == 0
+        for timer in list(voice_handler.deletion_timers.values()):
+            timer['task'].cancel()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_triggers_coalesce(self, voice_handler, category):
+        """Entradas concorrentes aguardam a mesma criação em andamento"""
+        trigger = make_channel(voice_handler.trigger_channel_id)
+        member = self.make_member(category, trigger)
+
+        results = await asyncio.gather(*[voice_handler.handle_trigger_join(member) for _ in range(5)])
+
+        assert len({channel.id for channel in results}) == 1
+        assert voice_handler.metrics.get_counter('voice_creation_coalesced') >= 4
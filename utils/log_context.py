@@ -0,0 +1,131 @@
+"""
+Contexto de requisição para os logs estruturados
+Os campos (guild_id, user_id, interaction_id, ...) viajam em contextvars e são
+anexados automaticamente a cada registro de log emitido na mesma task
+"""
+
+import contextvars
+import discord
+from discord import app_commands
+from utils.perf import start_timer, track_response, record_latency
+from utils.rest_telemetry import set_subsystem
+
+# Campos do contexto atual (dict imutável por convenção: sempre substituir, nunca alterar)
+_log_context = contextvars.ContextVar('log_context', default={})
+
+
+def get_context():
+    """Retorna os campos de contexto da task atual"""
+    return _log_context.get()
+
+
+def bind_context(**fields):
+    """Acrescenta campos ao contexto da task atual; retorna um token para reset_context"""
+    fields = {key: value for key, value in fields.items() if value is not None}
+    return _log_context.set({**_log_context.get(), **fields})
+
+
+def reset_context(token):
+    """Restaura o contexto anterior a um bind_context"""
+    _log_context.reset(token)
+
+
+def start_request(**fields):
+    """Inicia uma nova requisição: substitui o contexto e marca o início"""
+    start_timer()
+    fields = {key: value for key, value in fields.items() if value is not None}
+    _log_context.set(fields)
+
+
+def _team_of(member):
+    """Nome da equipe do membro (role "Equipe ..."), se houver"""
+    roles = getattr(member, 'roles', None) or []
+    team_role = next((role for role in roles if role.name.startswith("Equipe ")), None)
+    return team_role.name.replace("Equipe ", "") if team_role else None
+
+
+def bind_interaction(interaction):
+    """Inicia o contexto de uma interação (comando slash, botão, select ou modal)"""
+    track_response(interaction)
+    set_subsystem('interacoes')
+    command = interaction.command.qualified_name if interaction.command else None
+    custom_id = interaction.data.get('custom_id') if interaction.data else None
+    start_request(
+        interaction_id=interaction.id,
+        guild_id=interaction.guild_id,
+        channel_id=interaction.channel_id,
+        user_id=interaction.user.id,
+        team=_team_of(interaction.user),
+        command=command,
+        custom_id=custom_id
+    )
+
+
+def bind_command(ctx):
+    """Inicia o contexto de um comando de prefixo"""
+    set_subsystem('comandos')
+    start_request(
+        message_id=ctx.message.id,
+        guild_id=ctx.guild.id if ctx.guild else None,
+        channel_id=ctx.channel.id,
+        user_id=ctx.author.id,
+        team=_team_of(ctx.author),
+        command=ctx.command.qualified_name if ctx.command else None
+    )
+
+
+class InteractionContextMixin:
+    """Mixin para Views e Modals: inicia o contexto de log e mede a latência de cada callback"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if isinstance(self, discord.ui.Modal):
+            self.on_submit = self._timed(self.on_submit, 'modal', type(self).__name__)
+        else:
+            for item in self.children:
+                self._instrument_item(item)
+
+    async def interaction_check(self, interaction):
+        bind_interaction(interaction)
+        return await super().interaction_check(interaction)
+
+    def add_item(self, item):
+        if not isinstance(self, discord.ui.Modal):
+            self._instrument_item(item)
+        return super().add_item(item)
+
+    def _instrument_item(self, item):
+        """Envolve o callback do item para registrar a latência com o custom_id como nome"""
+        if getattr(item.callback, '__timed__', False):
+            return
+        # IDs gerados automaticamente são aleatórios; nesses casos usar View.Item
+        if getattr(item, '_provided_custom_id', False):
+            name = item.custom_id
+        else:
+            name = f"{type(self).__name__}.{type(item).__name__}"
+        item.callback = self._timed(item.callback, 'component', name)
+
+    @staticmethod
+    def _timed(callback, kind, name):
+        async def timed_callback(interaction):
+            try:
+                return await callback(interaction)
+            finally:
+                record_latency(kind, name)
+
+        timed_callback.__timed__ = True
+        return timed_callback
+
+
+class ContextCommandTree(app_commands.CommandTree):
+    """CommandTree que inicia o contexto de log antes de cada comando slash"""
+
+    async def interaction_check(self, interaction):
+        bind_interaction(interaction)
+        return True
+
+    async def on_error(self, interaction, error):
+        # Comandos que falham não disparam on_app_command_completion
+        if interaction.command:
+            record_latency('slash', interaction.command.qualified_name)
+        await super().on_error(interaction, error)
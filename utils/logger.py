@@ -4,37 +4,65 @@ Envia logs importantes para um canal Discord específico
 """
 
 import logging
+import logging.handlers
 import asyncio
+import atexit
+import copy
+import gzip
+import json
+import os
+import queue
+import shutil
 import traceback
 from datetime import datetime
 from typing import Optional
 import discord
+from utils.log_context import get_context
+from utils.rest_telemetry import set_subsystem
 
 class DiscordLogHandler(logging.Handler):
-    """Handler customizado para enviar logs para canal Discord"""
-    
+    """Handler customizado para enviar logs para canal Discord
+
+    Os registros entram em uma fila limitada e são enviados por um único consumidor,
+    agrupados em uma mensagem por intervalo e com erros repetidos contados como ×N.
+    """
+
+    MAX_EMBEDS_PER_MESSAGE = 10  # Limite do Discord
+    MAX_CHARS_PER_MESSAGE = 6000  # Limite do Discord para a soma dos embeds de uma mensagem
+
     def __init__(self, bot=None, channel_id: int = None):
         super().__init__()
         self.bot = bot
         # Usar configuração do config.py se disponível
-        if channel_id is None:
-            try:
-                import config
-                self.channel_id = config.LOG_CHANNEL_ID
-            except:
-                self.channel_id = 1404498057239859371  # Fallback
-        else:
-            self.channel_id = channel_id
+        try:
+            import config
+            default_channel_id = config.LOG_CHANNEL_ID
+            self.flush_interval = config.LOG_DISCORD_FLUSH_INTERVAL
+            queue_size = config.LOG_DISCORD_QUEUE_SIZE
+        except:
+            default_channel_id = 1404498057239859371  # Fallback
+            self.flush_interval = 5.0
+            queue_size = 200
+        self.channel_id = channel_id if channel_id is not None else default_channel_id
         self.channel = None
-        self.message_queue = []
-        self.is_sending = False
-        
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._consumer = None
+        self._loop = None
+
     def set_bot(self, bot):
         """Define o bot após inicialização"""
         self.bot = bot
         if bot and bot.is_ready():
-            asyncio.create_task(self._get_channel())
-    
+            self.start()
+
+    def start(self):
+        """Inicia o consumidor da fila (uma única task)"""
+        if self._consumer and not self._consumer.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._consumer = self._loop.create_task(self._ship_loop())
+
     async def _get_channel(self):
         """Obtém o canal de logs"""
         if self.bot and self.bot.is_ready():
@@ -43,61 +71,134 @@ class DiscordLogHandler(logging.Handler):
                 if not self.channel:
                     # Tentar fetch se get não funcionar
                     self.channel = await self.bot.fetch_channel(self.channel_id)
-                
-                # Processar mensagens em fila
-                if self.channel and self.message_queue:
-                    await self._process_queue()
-                    
             except Exception as e:
                 print(f"Erro ao obter canal de logs: {e}")
-    
-    async def _process_queue(self):
-        """Processa mensagens em fila"""
-        if self.is_sending:
-            return
-            
-        self.is_sending = True
-        while self.message_queue:
-            embed = self.message_queue.pop(0)
-            try:
-                if self.channel:
-                    await self.channel.send(embed=embed)
-                    await asyncio.sleep(1)  # Rate limit
-            except Exception as e:
-                print(f"Erro ao enviar log para Discord: {e}")
-                break
-        self.is_sending = False
-    
+        return self.channel
+
     def emit(self, record):
-        """Emite log para Discord"""
+        """Coloca o log na fila (nunca cria tasks nem faz I/O aqui)"""
         try:
-            embed = self._create_embed(record)
-            
-            if self.channel:
-                # Enviar imediatamente se canal disponível
-                asyncio.create_task(self._send_embed(embed))
+            entry = self._create_entry(record)
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+
+            if self._loop and running_loop is not self._loop:
+                # Log vindo de outra thread: a fila só pode ser usada no loop do bot
+                self._loop.call_soon_threadsafe(self._enqueue, entry)
             else:
-                # Adicionar à fila se canal não disponível
-                self.message_queue.append(embed)
-                if len(self.message_queue) > 50:  # Limitar fila
-                    self.message_queue.pop(0)
-                
-                # Tentar obter canal
-                if self.bot:
-                    asyncio.create_task(self._get_channel())
-                    
+                self._enqueue(entry)
+
         except Exception as e:
             print(f"Erro no DiscordLogHandler: {e}")
-    
-    async def _send_embed(self, embed):
-        """Envia embed para o canal"""
+
+    def _enqueue(self, entry):
+        """Adiciona à fila, descartando (e contando) quando estiver cheia"""
         try:
-            if self.channel:
-                await self.channel.send(embed=embed)
-        except Exception as e:
-            print(f"Erro ao enviar embed de log: {e}")
-    
-    def _create_embed(self, record) -> discord.Embed:
+            self.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _create_entry(self, record) -> dict:
+        """Extrai do registro apenas o necessário para montar o embed depois"""
+        message = record.getMessage()
+        if len(message) > 1000:
+            message = message[:1000] + "..."
+
+        tb = None
+        if record.levelname == 'ERROR' and record.exc_info:
+            tb = ''.join(traceback.format_exception(*record.exc_info))
+            if len(tb) > 1000:
+                tb = tb[-1000:]  # Pegar últimas 1000 chars
+
+        return {
+            'key': (record.levelname, record.name, record.funcName, record.lineno, message),
+            'levelname': record.levelname,
+            'name': record.name,
+            'funcName': record.funcName,
+            'lineno': record.lineno,
+            'message': message,
+            'traceback': tb,
+            'context': get_context(),
+            'created': record.created
+        }
+
+    async def _ship_loop(self):
+        """Consumidor único: agrupa os logs de cada intervalo em uma só mensagem"""
+        set_subsystem('logs')
+        while True:
+            try:
+                first = await self.queue.get()
+                # Janela de agrupamento: tudo que chegar no intervalo vai junto
+                await asyncio.sleep(self.flush_interval)
+                batch = [first]
+                while not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+
+                channel = self.channel or await self._get_channel()
+                if channel:
+                    await self._send_batch(channel, batch)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Erro ao enviar logs para Discord: {e}")
+
+    def _coalesce(self, batch):
+        """Agrupa registros idênticos mantendo a ordem da primeira ocorrência"""
+        groups = {}
+        for entry in batch:
+            group = groups.get(entry['key'])
+            if group:
+                group['count'] += 1
+            else:
+                groups[entry['key']] = {'entry': entry, 'count': 1}
+        return list(groups.values())
+
+    def _build_embeds(self, batch):
+        """Monta os embeds de um lote (no máximo MAX_EMBEDS_PER_MESSAGE)"""
+        groups = self._coalesce(batch)
+        dropped, self.dropped = self.dropped, 0
+
+        summary_slots = 1 if dropped or len(groups) > self.MAX_EMBEDS_PER_MESSAGE else 0
+        shown = groups[:self.MAX_EMBEDS_PER_MESSAGE - summary_slots]
+        embeds = [self._create_embed(group['entry'], group['count']) for group in shown]
+
+        if summary_slots:
+            hidden = groups[len(shown):]
+            lines = []
+            if hidden:
+                lines.append(f"**{sum(group['count'] for group in hidden)}** log(s) em {len(hidden)} grupo(s) não exibidos")
+            if dropped:
+                lines.append(f"**{dropped}** log(s) descartados (fila cheia)")
+            embeds.append(discord.Embed(
+                title="⚠️ Logs resumidos",
+                description="\n".join(lines),
+                color=discord.Color.dark_grey()
+            ))
+
+        return embeds
+
+    def _split_messages(self, embeds):
+        """Divide os embeds em mensagens dentro dos limites de quantidade e de caracteres"""
+        messages, current, size = [], [], 0
+        for embed in embeds:
+            if current and (size + len(embed) > self.MAX_CHARS_PER_MESSAGE or len(current) == self.MAX_EMBEDS_PER_MESSAGE):
+                messages.append(current)
+                current, size = [], 0
+            current.append(embed)
+            size += len(embed)
+        if current:
+            messages.append(current)
+        return messages
+
+    async def _send_batch(self, channel, batch):
+        """Envia o lote (várias mensagens quando os embeds passam do limite de caracteres)"""
+        for embeds in self._split_messages(self._build_embeds(batch)):
+            await channel.send(embeds=embeds)
+
+    def _create_embed(self, entry, count=1) -> discord.Embed:
         """Cria embed para o log"""
         level_colors = {
             'ERROR': discord.Color.red(),
@@ -113,37 +214,120 @@ class DiscordLogHandler(logging.Handler):
             'DEBUG': '⚪'
         }
         
-        color = level_colors.get(record.levelname, discord.Color.light_grey())
-        emoji = level_emojis.get(record.levelname, '📝')
+        color = level_colors.get(entry['levelname'], discord.Color.light_grey())
+        emoji = level_emojis.get(entry['levelname'], '📝')
+        title = f"{emoji} {entry['levelname']}"
+        if count > 1:
+            title += f" ×{count}"
         
         embed = discord.Embed(
-            title=f"{emoji} {record.levelname}",
+            title=title,
             color=color,
-            timestamp=datetime.fromtimestamp(record.created)
+            timestamp=datetime.fromtimestamp(entry['created'])
         )
         
         # Adicionar informações do log
-        embed.add_field(name="Módulo", value=record.name, inline=True)
-        embed.add_field(name="Função", value=record.funcName or "N/A", inline=True)
-        embed.add_field(name="Linha", value=record.lineno, inline=True)
+        embed.add_field(name="Módulo", value=entry['name'], inline=True)
+        embed.add_field(name="Função", value=entry['funcName'] or "N/A", inline=True)
+        embed.add_field(name="Linha", value=entry['lineno'], inline=True)
         
-        # Mensagem principal (limitar tamanho)
-        message = record.getMessage()
-        if len(message) > 1000:
-            message = message[:1000] + "..."
-        embed.add_field(name="Mensagem", value=f"```{message}```", inline=False)
+        # Mensagem principal (já limitada em _create_entry)
+        embed.add_field(name="Mensagem", value=f"```{entry['message']}```", inline=False)
+        
+        # Contexto da interação/comando que gerou o log
+        if entry['context']:
+            context = " | ".join(f"{key}={value}" for key, value in entry['context'].items())
+            embed.add_field(name="Contexto", value=f"`{context[:1000]}`", inline=False)
         
         # Adicionar stack trace se for erro
-        if record.levelname == 'ERROR' and record.exc_info:
-            tb = ''.join(traceback.format_exception(*record.exc_info))
-            if len(tb) > 1000:
-                tb = tb[-1000:]  # Pegar últimas 1000 chars
-            embed.add_field(name="Stack Trace", value=f"```python\n{tb}```", inline=False)
+        if entry['traceback']:
+            embed.add_field(name="Stack Trace", value=f"```python\n{entry['traceback']}```", inline=False)
         
         embed.set_footer(text="NASA Space Apps Bot - Sistema de Logs")
         return embed
 
 
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que anexa o contexto da task e adia a formatação para a thread de escrita"""
+
+    def prepare(self, record):
+        # Só o necessário roda no loop: resolver a mensagem (args podem mudar depois)
+        # e capturar o contexto, que não existe na thread do QueueListener
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.context = get_context()
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON"""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': getattr(record, 'event', None),
+            'message': record.getMessage(),
+            'func': record.funcName,
+            'line': record.lineno
+        }
+        data.update(getattr(record, 'context', None) or {})
+        data.update(getattr(record, 'fields', None) or {})
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def gzip_rotator(source, dest):
+    """Comprime o arquivo de log rotacionado"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def get_log_format():
+    """Formato do arquivo de log: 'text' ou 'json'"""
+    try:
+        import config
+        return config.LOG_FORMAT
+    except:
+        return 'text'
+
+
+def create_file_handler(filename=None):
+    """Cria o handler de arquivo com rotação por tamanho ou por tempo"""
+    try:
+        import config
+        filename = filename or config.LOG_FILE
+        rotation_when = config.LOG_ROTATION_WHEN
+        max_bytes = config.LOG_MAX_BYTES
+        backup_count = config.LOG_BACKUP_COUNT
+    except:
+        filename = filename or 'nasa_spaceapps_bot.log'
+        rotation_when = None
+        max_bytes = 10 * 1024 * 1024
+        backup_count = 5
+
+    if rotation_when:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            filename, when=rotation_when, backupCount=backup_count, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+
+    handler.namer = lambda name: name + '.gz'
+    handler.rotator = gzip_rotator
+    return handler
+
+
 class BotLogger:
     """Logger principal do bot"""
     
@@ -151,6 +335,7 @@ class BotLogger:
         self.bot = bot
         self.logger = logging.getLogger('nasa_spaceapps_bot')
         self.discord_handler = None
+        self.listener = None
         self._setup_logger()
     
     def _setup_logger(self):
@@ -159,6 +344,7 @@ class BotLogger:
         self.logger.setLevel(logging.DEBUG)
         
         # Limpar handlers existentes
+        self.stop()
         self.logger.handlers.clear()
         
         # Handler para console
@@ -168,70 +354,100 @@ class BotLogger:
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
         
-        # Handler para arquivo
-        file_handler = logging.FileHandler('nasa_spaceapps_bot.log', encoding='utf-8')
+        # Handler para arquivo (com rotação e compressão dos arquivos antigos)
+        file_handler = create_file_handler()
         file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-        )
+        if get_log_format() == 'json':
+            file_formatter = JsonFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+            )
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        
+        # Console e arquivo rodam em uma thread própria: o loop só enfileira o registro
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(ContextQueueHandler(log_queue))
+        self.listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.stop)
         
         # Handler para Discord (apenas WARN e ERROR)
         self.discord_handler = DiscordLogHandler(self.bot)
         self.discord_handler.setLevel(logging.WARNING)
         self.logger.addHandler(self.discord_handler)
     
+    def stop(self):
+        """Para a thread de escrita, gravando o que ainda estiver na fila"""
+        listener, self.listener = getattr(self, 'listener', None), None
+        if listener:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+    
     def set_bot(self, bot):
         """Define o bot após inicialização"""
         self.bot = bot
         if self.discord_handler:
             self.discord_handler.set_bot(bot)
     
-    def info(self, message: str, **kwargs):
+    def info(self, message: str, *args, **kwargs):
         """Log de informação"""
-        self.logger.info(message, **kwargs)
+        self.logger.info(message, *args, **kwargs)
     
-    def warning(self, message: str, **kwargs):
+    def warning(self, message: str, *args, **kwargs):
         """Log de warning"""
-        self.logger.warning(message, **kwargs)
+        self.logger.warning(message, *args, **kwargs)
     
-    def error(self, message: str, exc_info=None, **kwargs):
+    def error(self, message: str, *args, exc_info=None, **kwargs):
         """Log de erro"""
-        self.logger.error(message, exc_info=exc_info, **kwargs)
+        self.logger.error(message, *args, exc_info=exc_info, **kwargs)
     
-    def debug(self, message: str, **kwargs):
+    def debug(self, message: str, *args, **kwargs):
         """Log de debug"""
-        self.logger.debug(message, **kwargs)
+        self.logger.debug(message, *args, **kwargs)
+    
+    def event(self, event: str, message: str, *args, level=logging.INFO, exc_info=None, **fields):
+        """Log estruturado: nome do evento + campos extras (formatação só se o nível estiver ativo)"""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, *args, exc_info=exc_info, extra={'event': event, 'fields': fields})
     
     def log_user_action(self, user_id: int, action: str, details: str = ""):
         """Log de ação de usuário"""
-        self.info(f"Usuário {user_id} executou: {action} | {details}")
+        self.event('user_action', "Usuário %s executou: %s | %s", user_id, action, details,
+                   user_id=user_id, action=action)
     
     def log_database_operation(self, operation: str, table: str, success: bool, details: str = ""):
         """Log de operação de banco de dados"""
-        level = self.info if success else self.warning
+        level = logging.INFO if success else logging.WARNING
         status = "✅" if success else "❌"
-        level(f"DB {status} {operation} em {table} | {details}")
+        self.event('db_operation', "DB %s %s em %s | %s", status, operation, table, details, level=level,
+                   operation=operation, table=table, success=success)
     
     def log_command_execution(self, command: str, user_id: int, success: bool, error_msg: str = ""):
         """Log de execução de comando"""
         if success:
-            self.info(f"Comando /{command} executado com sucesso por usuário {user_id}")
+            self.event('command_execution', "Comando /%s executado com sucesso por usuário %s", command, user_id,
+                       command=command, user_id=user_id, success=True)
         else:
-            self.warning(f"Comando /{command} falhou para usuário {user_id}: {error_msg}")
+            self.event('command_execution', "Comando /%s falhou para usuário %s: %s", command, user_id, error_msg,
+                       level=logging.WARNING, command=command, user_id=user_id, success=False)
     
     def log_team_operation(self, operation: str, team_name: str, user_id: int, success: bool, details: str = ""):
         """Log de operações de equipe"""
         status = "✅" if success else "❌"
-        level = self.info if success else self.warning
-        level(f"Equipe {status} {operation}: '{team_name}' por usuário {user_id} | {details}")
+        level = logging.INFO if success else logging.WARNING
+        self.event('team_operation', "Equipe %s %s: '%s' por usuário %s | %s", status, operation, team_name, user_id, details,
+                   level=level, operation=operation, team=team_name, user_id=user_id, success=success)
     
     def log_application_action(self, action: str, applicant_id: int, team_name: str, leader_id: int, details: str = ""):
         """Log de ações de aplicação"""
-        self.info(f"Aplicação {action}: Candidato {applicant_id} -> Equipe '{team_name}' (Líder: {leader_id}) | {details}")
+        self.event('application_action', "Aplicação %s: Candidato %s -> Equipe '%s' (Líder: %s) | %s",
+                   action, applicant_id, team_name, leader_id, details,
+                   action=action, applicant_id=applicant_id, team=team_name, leader_id=leader_id)
 
 
 # Instância global do logger
@@ -242,21 +458,21 @@ def get_logger():
     """Retorna o logger principal"""
     return bot_logger
 
-def log_info(message: str, **kwargs):
+def log_info(message: str, *args, **kwargs):
     """Log de informação"""
-    bot_logger.info(message, **kwargs)
+    bot_logger.info(message, *args, **kwargs)
 
-def log_warning(message: str, **kwargs):
+def log_warning(message: str, *args, **kwargs):
     """Log de warning"""
-    bot_logger.warning(message, **kwargs)
+    bot_logger.warning(message, *args, **kwargs)
 
-def log_error(message: str, exc_info=None, **kwargs):
+def log_error(message: str, *args, exc_info=None, **kwargs):
     """Log de erro"""
-    bot_logger.error(message, exc_info=exc_info, **kwargs)
+    bot_logger.error(message, *args, exc_info=exc_info, **kwargs)
 
-def log_debug(message: str, **kwargs):
+def log_debug(message: str, *args, **kwargs):
     """Log de debug"""
-    bot_logger.debug(message, **kwargs)
+    bot_logger.debug(message, *args, **kwargs)
 
 def set_bot_instance(bot):
     """Define a instância do bot para logging"""
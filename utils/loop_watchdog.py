@@ -0,0 +1,121 @@
+"""
+Watchdog de latência do event loop
+Mede o atraso do loop continuamente e, quando ele trava além do limite,
+captura a pilha da thread do loop a partir de uma thread auxiliar para
+identificar a chamada bloqueante
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from utils.metrics import get_metrics
+from utils.logger import get_logger
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Buckets do atraso do loop (em segundos)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _is_project_frame(filename):
+    filename = os.path.abspath(filename)
+    return (
+        filename.startswith(PROJECT_ROOT)
+        and 'site-packages' not in filename
+        and filename != os.path.abspath(__file__)
+    )
+
+
+def _site(frame_summary):
+    """Identificação curta de um frame: arquivo:linha (função)"""
+    filename = frame_summary.filename
+    if _is_project_frame(filename):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{frame_summary.lineno} ({frame_summary.name})"
+
+
+class LoopWatchdog:
+    """Heartbeat no loop + thread auxiliar que inspeciona a pilha quando o loop trava"""
+
+    def __init__(self, threshold=0.25, interval=0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.metrics = get_metrics()
+        self.logger = get_logger()
+
+        self.last_beat = time.monotonic()
+        self.loop_thread_id = None
+        self.stall_reported = False
+        self.sites = {}  # call site do projeto: número de travamentos
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Inicia o heartbeat (no loop atual) e a thread de inspeção"""
+        if self._task and not self._task.done():
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._monitor, name='loop-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Para o watchdog"""
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _heartbeat(self):
+        """Roda no loop: mede quanto cada sleep curto atrasou"""
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.metrics.observe('event_loop_lag_seconds', max(0.0, now - start - self.interval), buckets=LAG_BUCKETS)
+            self.last_beat = now
+            self.stall_reported = False
+
+    def _monitor(self):
+        """Roda na thread auxiliar: detecta travamentos e captura a pilha uma vez por travamento"""
+        while not self._stop.wait(self.interval / 2):
+            stalled_for = time.monotonic() - self.last_beat
+            if stalled_for > self.threshold + self.interval and not self.stall_reported:
+                self.stall_reported = True
+                self._report_stall(stalled_for)
+
+    def capture_stack(self):
+        """Pilha atual da thread do loop (do frame mais externo para o mais interno)"""
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.extract_stack(frame)
+
+    def _report_stall(self, stalled_for):
+        stack = self.capture_stack()
+        if not stack:
+            return
+
+        # Culpado: frame mais interno do projeto; a chamada que bloqueia de fato é o mais interno de todos
+        project_frame = next((fs for fs in reversed(stack) if _is_project_frame(fs.filename)), stack[-1])
+        site = _site(project_frame)
+        blocking_call = _site(stack[-1])
+
+        self.sites[site] = self.sites.get(site, 0) + 1
+        self.metrics.inc('event_loop_blocked', site=site)
+
+        self.logger.warning(
+            "Event loop travado há %.0fms em %s (chamada bloqueante: %s)\n%s",
+            stalled_for * 1000, site, blocking_call, ''.join(traceback.format_list(stack[-12:]))
+        )
+
+    def top_sites(self, limit=5):
+        """Call sites que mais travaram o loop"""
+        return sorted(self.sites.items(), key=lambda item: item[1], reverse=True)[:limit]
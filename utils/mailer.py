@@ -0,0 +1,203 @@
+"""
+Envio assíncrono de emails com conexões SMTP persistentes
+Os emails entram em uma fila atendida por poucos workers; cada worker mantém
+sua própria conexão autenticada e faz o I/O do smtplib fora do event loop
+"""
+
+import asyncio
+import smtplib
+import threading
+import time
+from utils.metrics import get_metrics
+from utils.logger import get_logger
+
+# Buckets do tempo de envio (em segundos)
+SEND_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class SmtpConnection:
+    """Conexão SMTP de um worker (usada apenas dentro de asyncio.to_thread)"""
+
+    def __init__(self, mailer):
+        self.mailer = mailer
+        self.smtp = None
+        # Cancelar o worker não interrompe a thread do envio: close() espera o envio em andamento
+        self.lock = threading.RLock()
+
+    def _connect(self):
+        mailer = self.mailer
+        if mailer.port == 465:
+            smtp = smtplib.SMTP_SSL(mailer.host, mailer.port, timeout=mailer.timeout)
+        else:
+            smtp = smtplib.SMTP(mailer.host, mailer.port, timeout=mailer.timeout)
+            if mailer.use_tls:
+                smtp.starttls()
+        if mailer.username:
+            smtp.login(mailer.username, mailer.password)
+        mailer.metrics.inc('mail_connections')
+        return smtp
+
+    def deliver(self, message):
+        """Envia a mensagem, (re)conectando se necessário"""
+        with self.lock:
+            if self.smtp is None:
+                self.smtp = self._connect()
+            try:
+                self.smtp.send_message(message)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Conexão caiu: descartar para reconectar na próxima tentativa
+                self.close()
+                raise
+
+    def close(self):
+        with self.lock:
+            smtp, self.smtp = self.smtp, None
+            if smtp is not None:
+                try:
+                    smtp.quit()
+                except Exception:
+                    smtp.close()
+
+
+class Mailer:
+    """Fila de envio com concorrência limitada, retry com backoff exponencial e métricas"""
+
+    def __init__(self, host, port=587, username=None, password=None, use_tls=True,
+                 concurrency=2, max_retries=3, backoff=1.0, queue_size=500, timeout=30, registry=None):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.metrics = registry or get_metrics()
+        self.logger = get_logger()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = []
+        self.connections = []
+        self.deliveries = set()  # envios em andamento (sobrevivem ao cancelamento dos workers)
+        self.stopping = False
+
+    @classmethod
+    def from_config(cls):
+        """Cria o mailer a partir do config.py (None se o SMTP não estiver configurado)"""
+        import config
+        if not all([config.SMTP_SERVER, config.SMTP_USERNAME, config.SMTP_PASSWORD]):
+            return None
+        return cls(
+            config.SMTP_SERVER,
+            config.SMTP_PORT,
+            config.SMTP_USERNAME,
+            config.SMTP_PASSWORD,
+            concurrency=config.SMTP_POOL_SIZE,
+            max_retries=config.SMTP_MAX_RETRIES
+        )
+
+    def start(self):
+        """Inicia os workers (um por conexão)"""
+        if self.workers:
+            return
+        self.stopping = False
+        for i in range(self.concurrency):
+            connection = SmtpConnection(self)
+            self.connections.append(connection)
+            self.workers.append(asyncio.create_task(self._worker(connection), name=f"mailer-{i}"))
+
+    async def stop(self):
+        """Para os workers, falha os envios pendentes e fecha as conexões
+
+        Um envio que já está em andamento termina e responde com o resultado real
+        (a thread do smtplib não pode ser interrompida e o email sairia de qualquer forma)
+        """
+        self.stopping = True
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+        # Mensagens que nenhum worker vai atender: quem aguarda send() recebe False
+        while not self.queue.empty():
+            message, future = self.queue.get_nowait()
+            self.queue.task_done()
+            if not future.done():
+                future.set_result(False)
+                self.metrics.inc('mail_failed', reason='stopped')
+        self.metrics.set('mail_queue_depth', 0)
+
+        await asyncio.gather(*self.deliveries, return_exceptions=True)
+        for connection in self.connections:
+            await asyncio.to_thread(connection.close)
+        self.connections = []
+
+    async def send(self, message):
+        """Enfileira a mensagem e aguarda a entrega; retorna True se foi entregue"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((message, future))
+        except asyncio.QueueFull:
+            self.metrics.inc('mail_failed', reason='queue_full')
+            return False
+        self.metrics.set('mail_queue_depth', self.queue.qsize())
+        return await future
+
+    @staticmethod
+    def _is_permanent(error):
+        """Erros 5xx e destinatários recusados não adiantam repetir"""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 500 <= error.smtp_code < 600
+        return False
+
+    async def _worker(self, connection):
+        while True:
+            message, future = await self.queue.get()
+            self.metrics.set('mail_queue_depth', self.queue.qsize())
+            # O envio roda em uma task própria: cancelar o worker não descarta o resultado
+            delivery = asyncio.create_task(self._deliver_with_retry(connection, message))
+            self.deliveries.add(delivery)
+            delivery.add_done_callback(lambda task, future=future: self._resolve(task, future))
+            try:
+                await asyncio.shield(delivery)
+            finally:
+                self.queue.task_done()
+
+    def _resolve(self, delivery, future):
+        """Responde a quem aguarda send() quando o envio termina"""
+        self.deliveries.discard(delivery)
+        if future.done():
+            return
+        if delivery.cancelled() or delivery.exception() is not None:
+            future.set_result(False)
+        else:
+            future.set_result(delivery.result())
+
+    async def _deliver_with_retry(self, connection, message):
+        for attempt in range(self.max_retries + 1):
+            if attempt and self.stopping:
+                # Parando: não insistir em novas tentativas
+                self.metrics.inc('mail_failed', reason='stopped')
+                return False
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(connection.deliver, message)
+                self.metrics.observe('mail_send_seconds', time.perf_counter() - start, buckets=SEND_BUCKETS)
+                self.metrics.inc('mail_sent')
+                return True
+
+            except Exception as e:
+                if self._is_permanent(e) or attempt == self.max_retries:
+                    reason = 'permanent' if self._is_permanent(e) else 'retries_exhausted'
+                    self.metrics.inc('mail_failed', reason=reason)
+                    self.logger.error(f"Falha ao enviar email para {message['To']} ({reason})", exc_info=e)
+                    return False
+
+                delay = self.backoff * (2 ** attempt)
+                self.metrics.inc('mail_retries')
+                self.logger.warning(f"Erro temporário ao enviar email para {message['To']}, nova tentativa em {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
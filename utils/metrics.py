@@ -0,0 +1,110 @@
+"""
+Métricas em memória do NASA Space Apps Bot
+Contadores e histogramas simples consultados pelos comandos administrativos
+"""
+
+import threading
+from bisect import bisect_left
+
+# Limites dos buckets (em segundos) usados por padrão nos histogramas de latência
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Histograma de buckets fixos (compatível com o formato do Prometheus)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Último bucket = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Registra uma amostra"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q):
+        """Estima o percentil q (0-1) por interpolação linear dentro do bucket"""
+        if self.count == 0:
+            return None
+
+        target = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bucket_count in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else lower
+            if bucket_count and seen + bucket_count >= target:
+                fraction = (target - seen) / bucket_count
+                return lower + (upper - lower) * fraction
+            seen += bucket_count
+            lower = upper
+        return lower
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+
+class MetricsRegistry:
+    """Registro central de contadores, gauges e histogramas com labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}  # (nome, labels): valor
+        self.gauges = {}  # (nome, labels): último valor
+        self.histograms = {}  # (nome, labels): Histogram
+
+    # name/value são apenas posicionais para permitir labels como name=...
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, /, **labels):
+        """Incrementa um contador"""
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, /, **labels):
+        """Define o valor atual de um gauge"""
+        key = self._key(name, labels)
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, name, value, /, buckets=DEFAULT_BUCKETS, **labels):
+        """Registra uma amostra em um histograma"""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def get_counter(self, name, /, **labels):
+        """Retorna o valor atual de um contador"""
+        return self.counters.get(self._key(name, labels), 0)
+
+    def get_gauge(self, name, /, **labels):
+        """Retorna o valor atual de um gauge (ou None se nunca foi definido)"""
+        return self.gauges.get(self._key(name, labels))
+
+    def get_histogram(self, name, /, **labels):
+        """Retorna um histograma (ou None se nunca recebeu amostras)"""
+        return self.histograms.get(self._key(name, labels))
+
+    def reset(self):
+        """Zera todas as métricas"""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+
+# Instância global das métricas
+metrics = MetricsRegistry()
+
+def get_metrics():
+    """Retorna o registro global de métricas"""
+    return metrics
@@ -0,0 +1,78 @@
+"""
+Endpoint HTTP local com as métricas no formato texto do Prometheus
+"""
+
+from aiohttp import web
+from utils.metrics import get_metrics
+from utils.logger import get_logger
+
+METRIC_PREFIX = 'nasa_bot_'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, extra=None):
+    items = list(labels) + list(extra or [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in items) + '}'
+
+
+def render_prometheus(registry=None):
+    """Renderiza contadores, gauges e histogramas no formato de exposição do Prometheus"""
+    registry = registry or get_metrics()
+    lines = []
+
+    counters = {}
+    for (name, labels), value in list(registry.counters.items()):
+        counters.setdefault(name, []).append((labels, value))
+    for name, series in sorted(counters.items()):
+        metric = f"{METRIC_PREFIX}{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for labels, value in series:
+            lines.append(f"{metric}{_labels(labels)} {value}")
+
+    gauges = {}
+    for (name, labels), value in list(registry.gauges.items()):
+        gauges.setdefault(name, []).append((labels, value))
+    for name, series in sorted(gauges.items()):
+        metric = f"{METRIC_PREFIX}{name}"
+        lines.append(f"# TYPE {metric} gauge")
+        for labels, value in series:
+            lines.append(f"{metric}{_labels(labels)} {value}")
+
+    histograms = {}
+    for (name, labels), histogram in list(registry.histograms.items()):
+        histograms.setdefault(name, []).append((labels, histogram))
+    for name, series in sorted(histograms.items()):
+        metric = f"{METRIC_PREFIX}{name}"
+        lines.append(f"# TYPE {metric} histogram")
+        for labels, histogram in series:
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(labels, [('le', f'{bound:g}')])} {cumulative}")
+            lines.append(f"{metric}_bucket{_labels(labels, [('le', '+Inf')])} {histogram.count}")
+            lines.append(f"{metric}_sum{_labels(labels)} {histogram.sum}")
+            lines.append(f"{metric}_count{_labels(labels)} {histogram.count}")
+
+    return '\n'.join(lines) + '\n'
+
+
+async def handle_metrics(request):
+    return web.Response(text=render_prometheus(), content_type='text/plain', charset='utf-8')
+
+
+async def start_metrics_server(host, port):
+    """Inicia o servidor de métricas em /metrics; retorna o AppRunner (para cleanup)"""
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    get_logger().info(f"Métricas disponíveis em http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,118 @@
+"""
+Medição de latência de comandos e interações
+Registra o tempo até a primeira resposta e o tempo total de cada handler
+nos histogramas de utils.metrics
+"""
+
+import contextvars
+import time
+import discord
+from discord.ext import commands
+from utils.metrics import get_metrics
+
+HANDLER_METRIC = 'handler_seconds'
+FIRST_RESPONSE_METRIC = 'first_response_seconds'
+
+# Buckets de latência (o Discord exige a primeira resposta de uma interação em até 3s)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0)
+
+# Tempos da requisição atual; o dict é compartilhado com as tasks filhas
+_request_timing = contextvars.ContextVar('request_timing', default=None)
+
+
+def start_timer():
+    """Marca o início da requisição atual"""
+    _request_timing.set({'started': time.perf_counter(), 'first_response': None, 'recorded': False})
+
+
+def mark_first_response():
+    """Marca a primeira resposta enviada ao usuário (apenas a primeira conta)"""
+    timing = _request_timing.get()
+    if timing and timing['first_response'] is None:
+        timing['first_response'] = time.perf_counter()
+
+
+def elapsed_ms():
+    """Milissegundos desde o início da requisição (ou None fora de uma requisição)"""
+    timing = _request_timing.get()
+    if timing is None:
+        return None
+    return round((time.perf_counter() - timing['started']) * 1000, 2)
+
+
+def record_latency(kind, name):
+    """Registra os histogramas da requisição atual (uma vez por requisição)"""
+    timing = _request_timing.get()
+    if timing is None or timing['recorded']:
+        return
+    timing['recorded'] = True
+
+    metrics = get_metrics()
+    metrics.observe(HANDLER_METRIC, time.perf_counter() - timing['started'],
+                    buckets=LATENCY_BUCKETS, kind=kind, name=name)
+    if timing['first_response'] is not None:
+        metrics.observe(FIRST_RESPONSE_METRIC, timing['first_response'] - timing['started'],
+                        buckets=LATENCY_BUCKETS, kind=kind, name=name)
+
+
+class TimedInteractionResponse(discord.InteractionResponse):
+    """InteractionResponse que marca o momento da primeira resposta"""
+
+    async def send_message(self, *args, **kwargs):
+        mark_first_response()
+        return await super().send_message(*args, **kwargs)
+
+    async def defer(self, *args, **kwargs):
+        mark_first_response()
+        return await super().defer(*args, **kwargs)
+
+    async def send_modal(self, *args, **kwargs):
+        mark_first_response()
+        return await super().send_modal(*args, **kwargs)
+
+    async def edit_message(self, *args, **kwargs):
+        mark_first_response()
+        return await super().edit_message(*args, **kwargs)
+
+
+def track_response(interaction):
+    """Instala a resposta cronometrada na interação
+
+    discord.py não tem um hook público para o envio da resposta; a propriedade
+    Interaction.response é cacheada no slot _cs_response, que preenchemos aqui.
+    """
+    interaction._cs_response = TimedInteractionResponse(interaction)
+
+
+class TimedContext(commands.Context):
+    """Context de comandos de prefixo que marca a primeira mensagem enviada"""
+
+    async def send(self, *args, **kwargs):
+        mark_first_response()
+        return await super().send(*args, **kwargs)
+
+
+def format_latency_report(kind=None, name_filter=None):
+    """Linhas (kind, nome, contagem, p50, p99 do handler e da 1ª resposta), ordenadas pelo p99"""
+    metrics = get_metrics()
+    rows = []
+    for (metric, labels), histogram in list(metrics.histograms.items()):
+        if metric != HANDLER_METRIC:
+            continue
+        labels = dict(labels)
+        if kind and labels.get('kind') != kind:
+            continue
+        if name_filter and name_filter not in labels.get('name', ''):
+            continue
+        first = metrics.get_histogram(FIRST_RESPONSE_METRIC, **labels)
+        rows.append({
+            'kind': labels.get('kind'),
+            'name': labels.get('name'),
+            'count': histogram.count,
+            'p50': histogram.percentile(0.5),
+            'p99': histogram.percentile(0.99),
+            'first_p50': first.percentile(0.5) if first else None,
+            'first_p99': first.percentile(0.99) if first else None
+        })
+    rows.sort(key=lambda row: row['p99'], reverse=True)
+    return rows
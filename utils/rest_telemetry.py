@@ -0,0 +1,161 @@
+"""
+Telemetria das requisições REST ao Discord
+Conta requisições, 429s, tempo de retry-after e saturação dos buckets de rate limit
+por rota e por subsistema do bot (voz, equipes, startup, ...)
+"""
+
+import contextvars
+import functools
+import re
+import time
+from contextlib import contextmanager
+import aiohttp
+from utils.metrics import get_metrics
+
+DEFAULT_SUBSYSTEM = 'outro'
+
+# Subsistema responsável pelas requisições da task atual
+_subsystem = contextvars.ContextVar('rest_subsystem', default=DEFAULT_SUBSYSTEM)
+
+_API_PREFIX = re.compile(r'^/api(/v\d+)?')
+_SNOWFLAKE = re.compile(r'/\d{15,21}(?=/|$)')
+_TOKEN = re.compile(r'/(webhooks|interactions)/:id/[^/]+')
+_EMOJI = re.compile(r'/reactions/[^/]+')
+
+# Buckets de latência das requisições REST
+REST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def current_subsystem():
+    """Subsistema da task atual"""
+    return _subsystem.get()
+
+
+def set_subsystem(name):
+    """Define o subsistema da task atual (e das tasks criadas a partir dela)"""
+    _subsystem.set(name)
+
+
+@contextmanager
+def subsystem(name):
+    """Marca as requisições feitas dentro do bloco com o subsistema informado"""
+    token = _subsystem.set(name)
+    try:
+        yield
+    finally:
+        _subsystem.reset(token)
+
+
+def rest_subsystem(name):
+    """Decorador para métodos assíncronos: marca as requisições feitas durante a chamada"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with subsystem(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def route_template(method, url):
+    """Converte a URL concreta em um modelo de rota (ex: POST /channels/:id/messages)"""
+    path = _API_PREFIX.sub('', url.path)
+    path = _SNOWFLAKE.sub('/:id', path)
+    path = _TOKEN.sub(r'/\1/:id/:token', path)
+    path = _EMOJI.sub('/reactions/:emoji', path)
+    return f"{method} {path}"
+
+
+class RestTelemetry:
+    """Coleta as métricas via aiohttp.TraceConfig (passado ao bot como http_trace)"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or get_metrics()
+        self.buckets = {}  # rota: estado mais recente do bucket de rate limit
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_request_end.append(self._on_request_end)
+        self.trace_config.on_request_exception.append(self._on_request_exception)
+
+    async def _on_request_start(self, session, trace_ctx, params):
+        # Os callbacks rodam na task que fez a requisição, então o contextvar está disponível
+        trace_ctx.started = time.perf_counter()
+        trace_ctx.subsystem = current_subsystem()
+
+    async def _on_request_end(self, session, trace_ctx, params):
+        self.record(params.method, params.url, params.response.status, params.response.headers,
+                    time.perf_counter() - trace_ctx.started, trace_ctx.subsystem)
+
+    async def _on_request_exception(self, session, trace_ctx, params):
+        route = route_template(params.method, params.url)
+        self.registry.inc('discord_rest_errors', route=route, subsystem=trace_ctx.subsystem)
+
+    def record(self, method, url, status, headers, duration, subsystem_name):
+        """Registra uma resposta da API"""
+        route = route_template(method, url)
+        labels = {'route': route, 'subsystem': subsystem_name}
+
+        self.registry.inc('discord_rest_requests', **labels)
+        self.registry.observe('discord_rest_seconds', duration, buckets=REST_BUCKETS, route=route)
+
+        if status == 429:
+            scope = headers.get('X-RateLimit-Scope', 'global' if headers.get('X-RateLimit-Global') else 'user')
+            retry_after = float(headers.get('X-RateLimit-Reset-After') or headers.get('Retry-After') or 0)
+            self.registry.inc('discord_rest_ratelimited', scope=scope, **labels)
+            self.registry.inc('discord_rest_retry_after_seconds', retry_after, **labels)
+
+        if 'X-RateLimit-Remaining' in headers:
+            limit = int(headers.get('X-RateLimit-Limit', 0))
+            remaining = int(headers['X-RateLimit-Remaining'])
+            self.buckets[route] = {
+                'bucket': headers.get('X-RateLimit-Bucket'),
+                'limit': limit,
+                'remaining': remaining,
+                'reset_after': float(headers.get('X-RateLimit-Reset-After', 0)),
+                'seen': time.time()
+            }
+            self.registry.set('discord_rest_bucket_remaining', remaining, route=route)
+            self.registry.set('discord_rest_bucket_limit', limit, route=route)
+            if remaining == 0:
+                self.registry.inc('discord_rest_bucket_exhausted', **labels)
+
+    def _totals(self, group_by):
+        """Soma os contadores REST agrupando por 'route' ou 'subsystem'"""
+        totals = {}
+        for (name, labels), value in list(self.registry.counters.items()):
+            if not name.startswith('discord_rest_'):
+                continue
+            key = dict(labels).get(group_by)
+            if key is None:
+                continue
+            row = totals.setdefault(key, {
+                'requests': 0, 'ratelimited': 0, 'retry_after': 0.0, 'exhausted': 0, 'errors': 0
+            })
+            field = {
+                'discord_rest_requests': 'requests',
+                'discord_rest_ratelimited': 'ratelimited',
+                'discord_rest_retry_after_seconds': 'retry_after',
+                'discord_rest_bucket_exhausted': 'exhausted',
+                'discord_rest_errors': 'errors'
+            }.get(name)
+            if field:
+                row[field] += value
+        return totals
+
+    def report(self):
+        """Resumo por rota (ordenado por 429s e requisições) e por subsistema"""
+        routes = sorted(
+            self._totals('route').items(),
+            key=lambda item: (item[1]['ratelimited'], item[1]['exhausted'], item[1]['requests']),
+            reverse=True
+        )
+        subsystems = sorted(self._totals('subsystem').items(), key=lambda item: item[1]['requests'], reverse=True)
+        return routes, subsystems
+
+
+# Instância global da telemetria REST
+rest_telemetry = RestTelemetry()
+
+def get_rest_telemetry():
+    """Retorna a telemetria REST global"""
+    return rest_telemetry
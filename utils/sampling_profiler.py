@@ -0,0 +1,95 @@
+"""
+Profiler por amostragem do processo em execução
+Uma thread auxiliar lê a pilha da thread do event loop periodicamente e agrega
+as amostras em formato "collapsed stack" (pronto para flamegraph.pl / speedscope)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _frame_label(code):
+    """Rótulo de um frame: arquivo:função (sem linha, para agregar por função)"""
+    filename = os.path.abspath(code.co_filename)
+    if filename.startswith(PROJECT_ROOT) and 'site-packages' not in filename:
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """Amostra a pilha da thread do loop sem executar nada no próprio loop"""
+
+    def __init__(self, loop, loop_thread_id, interval=0.01):
+        self.loop = loop
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.stacks = Counter()  # pilha colapsada: amostras
+        self.self_samples = Counter()  # função no topo da pilha: amostras
+        self.samples = 0
+
+    def sample(self):
+        """Coleta uma amostra (chamado da thread auxiliar)"""
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return
+
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+
+        # Coroutine em execução no momento (a task atual do loop), como raiz da pilha
+        task = asyncio.current_task(self.loop)
+        if task is not None:
+            coro = task.get_coro()
+            labels.insert(0, f"task:{getattr(coro, '__qualname__', task.get_name())}")
+        else:
+            labels.insert(0, "loop")
+
+        self.stacks[';'.join(labels)] += 1
+        self.self_samples[labels[-1]] += 1
+        self.samples += 1
+
+    def run(self, seconds):
+        """Amostra por N segundos (bloqueia a thread chamadora, nunca o loop)"""
+        deadline = time.monotonic() + seconds
+        next_sample = time.monotonic()
+        while time.monotonic() < deadline:
+            self.sample()
+            next_sample += self.interval
+            time.sleep(max(0.0, next_sample - time.monotonic()))
+        return self
+
+    def collapsed(self):
+        """Conteúdo no formato collapsed stack: 'frame;frame;frame contagem' por linha"""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + '\n'
+
+    def top_functions(self, limit=10):
+        """Funções com mais amostras no topo da pilha (tempo próprio)"""
+        return self.self_samples.most_common(limit)
+
+
+_profile_lock = threading.Lock()
+
+
+async def profile_loop(seconds, interval=0.01):
+    """Executa o profiler sobre o loop atual em uma thread auxiliar
+
+    Retorna None se já houver um profiling em andamento.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        profiler = SamplingProfiler(asyncio.get_running_loop(), threading.get_ident(), interval)
+        return await asyncio.to_thread(profiler.run, seconds)
+    finally:
+        _profile_lock.release()
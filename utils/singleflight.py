@@ -0,0 +1,43 @@
+"""
+Execução única por chave (single-flight) para operações assíncronas
+Chamadas concorrentes com a mesma chave aguardam a mesma execução em andamento
+"""
+
+import asyncio
+
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução"""
+
+    def __init__(self):
+        self._inflight = {}  # chave: asyncio.Task
+
+    async def do(self, key, coro_factory):
+        """Executa coro_factory() uma vez por chave em andamento
+
+        Retorna (resultado, compartilhado), onde compartilhado indica que a
+        chamada aproveitou uma execução iniciada por outra.
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+
+        if not shared:
+            task = asyncio.ensure_future(coro_factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._evict(key, done))
+
+        # shield: cancelar quem espera não cancela a execução compartilhada
+        result = await asyncio.shield(task)
+        return result, shared
+
+    def _evict(self, key, task):
+        """Remove a chave quando a execução termina"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def in_flight(self, key):
+        """Indica se há uma execução em andamento para a chave"""
+        return key in self._inflight
+
+    def __len__(self):
+        return len(self._inflight)
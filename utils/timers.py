@@ -0,0 +1,103 @@
+"""
+Agendador de timers baseado em heap
+Uma única task dorme até o próximo vencimento, em vez de uma coroutine
+parada em asyncio.sleep para cada prazo (expiração de códigos, remoção de canais, ...)
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from utils.logger import get_logger
+
+
+class TimerHeap:
+    """Timers com chave (reagendar a mesma chave substitui o anterior) e prazos em epoch"""
+
+    def __init__(self):
+        self.logger = get_logger()
+        self._heap = []  # [vencimento, sequência, chave, callback, args, ativo]
+        self._entries = {}  # chave: entrada ativa
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def start(self):
+        """Inicia a task do agendador"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Para o agendador (timers pendentes não são executados)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def schedule_at(self, key, when, callback, *args):
+        """Agenda callback(*args) (coroutine function) para o instante `when` (time.time())"""
+        self.cancel(key)
+        entry = [when, next(self._counter), key, callback, args, True]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._wakeup.set()  # Novo prazo mais próximo: acordar o agendador
+        return entry
+
+    def schedule(self, key, delay, callback, *args):
+        """Agenda callback(*args) para daqui a `delay` segundos"""
+        return self.schedule_at(key, time.time() + delay, callback, *args)
+
+    def cancel(self, key):
+        """Cancela o timer da chave (remoção preguiçosa do heap)"""
+        entry = self._entries.pop(key, None)
+        if entry:
+            entry[5] = False
+        return entry is not None
+
+    def due_at(self, key):
+        """Vencimento do timer da chave, se existir"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    async def _run(self):
+        while True:
+            # Descartar entradas canceladas do topo
+            while self._heap and not self._heap[0][5]:
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            entry = heapq.heappop(self._heap)
+            if self._entries.get(entry[2]) is entry:
+                del self._entries[entry[2]]
+            # Cada callback roda em sua própria task para não atrasar os próximos timers
+            task = asyncio.create_task(self._fire(entry[2], entry[3], entry[4]))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _fire(self, key, callback, args):
+        try:
+            await callback(*args)
+        except Exception as e:
+            self.logger.error(f"Erro ao executar timer {key}", exc_info=e)
@@ -0,0 +1,239 @@
+import discord
+from sqlalchemy import select, func
+from database.db import DatabaseManager
+from database.models import Participante, AplicacaoEquipe, StatusAplicacaoEnum
+from database.pagination import fetch_keyset_page
+from utils.log_context import InteractionContextMixin
+from views.paginator import KeysetPaginatorView
+
+INBOX_PAGE_SIZE = 10
+
+
+def pending_applications_query(lider_id):
+    """Aplicações pendentes para o líder com os dados do aplicante (uma única consulta)"""
+    return (
+        select(
+            AplicacaoEquipe.id,
+            AplicacaoEquipe.data_aplicacao,
+            AplicacaoEquipe.mensagem_aplicacao,
+            Participante.nome,
+            Participante.sobrenome,
+            Participante.escolaridade,
+            Participante.cidade,
+            Participante.descricao_habilidades
+        )
+        .join(Participante, Participante.id == AplicacaoEquipe.aplicante_id)
+        .where(AplicacaoEquipe.lider_id == lider_id, AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE)
+    )
+
+
+async def fetch_pending_applications(lider_id, after=None, before=None, limit=INBOX_PAGE_SIZE):
+    """Uma página de aplicações pendentes, mais recentes primeiro (cursor: (data_aplicacao, id))"""
+    return await fetch_keyset_page(
+        pending_applications_query(lider_id), [AplicacaoEquipe.data_aplicacao, AplicacaoEquipe.id],
+        after=after, before=before, limit=limit, descending=True
+    )
+
+
+async def count_pending_applications(lider_id):
+    """Total de aplicações pendentes para o líder"""
+    async with await DatabaseManager.get_session() as session:
+        result = await session.execute(
+            select(func.count()).select_from(AplicacaoEquipe).where(
+                AplicacaoEquipe.lider_id == lider_id,
+                AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE
+            )
+        )
+        return result.scalar_one()
+
+
+def _truncate(texto, limite):
+    return texto[:limite] + ("..." if len(texto) > limite else "")
+
+
+class ApplicationInboxView(KeysetPaginatorView):
+    """Caixa de entrada do líder: aplicações pendentes paginadas com seleção múltipla e decisão em lote
+
+    Persistente (timeout=None e custom_ids por líder) quando publicada no canal de liderança.
+    """
+
+    per_page = INBOX_PAGE_SIZE
+
+    def __init__(self, handler, lider, persistent=False):
+        super().__init__(owner_id=lider.discord_user_id, timeout=None if persistent else 180)
+        self.handler = handler
+        self.lider_id = lider.id
+        self.equipe_nome = lider.nome_equipe
+        self.total = 0
+        self.selected = []
+
+        self.selection = discord.ui.Select(
+            placeholder="Selecione as aplicações...",
+            options=[discord.SelectOption(label="Nenhuma aplicação pendente", value="0")],
+            disabled=True,
+            row=1
+        )
+        self.selection.callback = self.select_applications
+        self.add_item(self.selection)
+
+        if persistent:
+            self.selection.custom_id = f"inbox:{lider.id}:selecao"
+            self.previous_page.custom_id = f"inbox:{lider.id}:anterior"
+            self.next_page.custom_id = f"inbox:{lider.id}:proxima"
+            self.refresh_button.custom_id = f"inbox:{lider.id}:atualizar"
+            self.approve_selected.custom_id = f"inbox:{lider.id}:aprovar"
+            self.reject_selected.custom_id = f"inbox:{lider.id}:rejeitar"
+
+    async def load_totals(self):
+        self.total = await count_pending_applications(self.lider_id)
+
+    async def fetch_page(self, after=None, before=None):
+        return await fetch_pending_applications(self.lider_id, after=after, before=before)
+
+    def cursor(self, aplicacao):
+        return (aplicacao.data_aplicacao, aplicacao.id)
+
+    async def load_page(self, after=None, before=None):
+        await super().load_page(after=after, before=before)
+
+        # Opções do select = aplicações da página atual
+        self.selected = []
+        if self.items:
+            self.selection.options = [
+                discord.SelectOption(
+                    label=_truncate(f"#{a.id} - {a.nome} {a.sobrenome}", 100),
+                    description=_truncate(a.mensagem_aplicacao, 100),
+                    value=str(a.id)
+                )
+                for a in self.items
+            ]
+            self.selection.max_values = len(self.items)
+            self.selection.disabled = False
+        else:
+            self.selection.options = [discord.SelectOption(label="Nenhuma aplicação pendente", value="0")]
+            self.selection.max_values = 1
+            self.selection.disabled = True
+        self.approve_selected.disabled = self.reject_selected.disabled = not self.items
+
+    async def refresh(self):
+        """Atualiza o painel (nova aplicação ou decisão): a primeira página é recarregada, nas demais só o total"""
+        if self.page == 0:
+            await self.load_page()
+        else:
+            await self.load_totals()
+        if self.message:
+            await self.message.edit(embed=self.build_embed(), view=self)
+
+    def build_embed(self):
+        embed = discord.Embed(
+            title=f"📥 Aplicações Pendentes - {self.equipe_nome}",
+            description=f"**{self.total}** aplicação(ões) aguardando resposta",
+            color=discord.Color.blue()
+        )
+
+        if not self.items:
+            embed.description += "\nNenhuma aplicação pendente no momento."
+
+        for a in self.items:
+            field_value = f"**Escolaridade:** {a.escolaridade.value}\n"
+            field_value += f"**Cidade:** {a.cidade}\n"
+            if a.descricao_habilidades:
+                field_value += f"**Habilidades:** {_truncate(a.descricao_habilidades, 100)}\n"
+            field_value += f"**Mensagem:** {_truncate(a.mensagem_aplicacao, 150)}"
+
+            embed.add_field(
+                name=f"#{a.id} - {a.nome} {a.sobrenome} ({a.data_aplicacao.strftime('%d/%m %H:%M')})",
+                value=field_value,
+                inline=False
+            )
+
+        embed.set_footer(text=f"{self.page_footer(self.total)} • Selecione as aplicações e escolha aprovar ou rejeitar")
+        return embed
+
+    async def select_applications(self, interaction: discord.Interaction):
+        self.selected = [int(value) for value in self.selection.values]
+        await interaction.response.defer()
+
+    @discord.ui.button(label="🔄 Atualizar", style=discord.ButtonStyle.secondary, row=0)
+    async def refresh_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Recarrega a primeira página"""
+        await self.load_page()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="✅ Aprovar selecionadas", style=discord.ButtonStyle.green, disabled=True, row=2)
+    async def approve_selected(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._decide(interaction, True)
+
+    @discord.ui.button(label="❌ Rejeitar selecionadas", style=discord.ButtonStyle.red, disabled=True, row=2)
+    async def reject_selected(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._decide(interaction, False)
+
+    async def _decide(self, interaction, aprovada):
+        if not self.selected:
+            await interaction.response.send_message("⚠️ Selecione ao menos uma aplicação.", ephemeral=True)
+            return
+        await interaction.response.send_modal(BulkResponseModal(self, list(self.selected), aprovada))
+
+
+class BulkResponseModal(InteractionContextMixin, discord.ui.Modal):
+    def __init__(self, inbox_view, aplicacao_ids, aprovada):
+        self.inbox_view = inbox_view
+        self.aplicacao_ids = aplicacao_ids
+        self.aprovada = aprovada
+
+        acao = "Aprovar" if aprovada else "Rejeitar"
+        super().__init__(title=f"{acao} {len(aplicacao_ids)} Candidato(s)")
+
+    resposta = discord.ui.TextInput(
+        label="Mensagem para os candidatos (opcional)",
+        placeholder="Deixe uma mensagem explicando sua decisão...",
+        style=discord.TextStyle.paragraph,
+        max_length=500,
+        required=False
+    )
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            resultados, erro = await self.inbox_view.handler.respond_to_applications(
+                interaction.user.id,
+                self.aplicacao_ids,
+                self.aprovada,
+                self.resposta.value.strip() or None
+            )
+
+            if erro:
+                embed = discord.Embed(title="❌ Erro", description=erro, color=discord.Color.red())
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            # Atualizar o painel na própria resposta da interação
+            await self.inbox_view.load_page()
+            await interaction.response.edit_message(embed=self.inbox_view.build_embed(), view=self.inbox_view)
+
+            sucessos = [aplicacao_id for aplicacao_id, (ok, _) in resultados.items() if ok]
+            status_text = "aprovada(s)" if self.aprovada else "rejeitada(s)"
+            embed = discord.Embed(
+                title="✅ Respostas Enviadas!",
+                description=f"**{len(sucessos)}** aplicação(ões) {status_text}. Os candidatos serão notificados.",
+                color=discord.Color.green() if self.aprovada else discord.Color.red()
+            )
+            falhas = [f"#{aplicacao_id}: {mensagem}" for aplicacao_id, (ok, mensagem) in resultados.items() if not ok]
+            if falhas:
+                embed.add_field(name="⚠️ Não processadas", value=_truncate("\n".join(falhas), 1000), inline=False)
+            await interaction.followup.send(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            interaction.client.logger.error(f"Erro ao responder aplicações {list(self.aplicacao_ids)}", exc_info=e)
+            embed = discord.Embed(
+                title="❌ Erro",
+                description="Ocorreu um erro ao processar sua resposta. Confira o painel antes de tentar novamente.",
+                color=discord.Color.red()
+            )
+            try:
+                # O painel já pode ter sido atualizado na resposta da interação
+                if interaction.response.is_done():
+                    await interaction.followup.send(embed=embed, ephemeral=True)
+                else:
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+            except discord.HTTPException:
+                pass
@@ -1,6 +1,12 @@
 import discord
+from sqlalchemy import select, func
+from database.db import DatabaseManager
+from database.models import SolicitacaoMentoria, StatusSolicitacaoEnum
+from database.pagination import fetch_keyset_page
+from utils.log_context import InteractionContextMixin
+from views.paginator import KeysetPaginatorView
 
-class MentoriaRequestView(discord.ui.View):
+class MentoriaRequestView(InteractionContextMixin, discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)
 
@@ -162,4 +168,77 @@ class MentoriaRequestView(discord.ui.View):
                 ephemeral=True
             )
             if hasattr(interaction.client, 'logger'):
-                interaction.client.logger.error(f"Erro ao iniciar solicitação de mentoria", exc_info=e)
\ No newline at end of file
+                interaction.client.logger.error(f"Erro ao iniciar solicitação de mentoria", exc_info=e)
+
+
+SOLICITACOES_PER_PAGE = 5
+
+
+async def fetch_solicitacoes(status=None, after=None, before=None, limit=SOLICITACOES_PER_PAGE):
+    """Uma página de solicitações, mais recentes primeiro (cursor: (data_solicitacao, id))"""
+    query = select(SolicitacaoMentoria)
+    if status is not None:
+        query = query.where(SolicitacaoMentoria.status == status)
+    return await fetch_keyset_page(
+        query, [SolicitacaoMentoria.data_solicitacao, SolicitacaoMentoria.id],
+        after=after, before=before, limit=limit, descending=True, scalars=True
+    )
+
+
+async def count_solicitacoes(status=None):
+    """Total de solicitações com o status (todas se None)"""
+    query = select(func.count()).select_from(SolicitacaoMentoria)
+    if status is not None:
+        query = query.where(SolicitacaoMentoria.status == status)
+    async with await DatabaseManager.get_session() as session:
+        result = await session.execute(query)
+        return result.scalar_one()
+
+
+class SolicitacoesView(KeysetPaginatorView):
+    """Lista paginada de solicitações de mentoria com filtro por status"""
+
+    per_page = SOLICITACOES_PER_PAGE
+
+    def __init__(self, owner_id=None, status=StatusSolicitacaoEnum.PENDENTE):
+        filters = [(s.value, s) for s in StatusSolicitacaoEnum] + [("Todas", None)]
+        super().__init__(owner_id=owner_id, filters=filters, selected_filter=status)
+        self.total = 0
+
+    async def load_totals(self):
+        self.total = await count_solicitacoes(self.filter)
+
+    async def fetch_page(self, after=None, before=None):
+        return await fetch_solicitacoes(self.filter, after=after, before=before)
+
+    def cursor(self, solicitacao):
+        return (solicitacao.data_solicitacao, solicitacao.id)
+
+    def build_embed(self):
+        status = self.filter.value if self.filter else "Todas"
+        embed = discord.Embed(
+            title=f"📋 Solicitações ({status})",
+            description=f"**{self.total}** solicitação(ões)",
+            color=discord.Color.blue()
+        )
+
+        if not self.items:
+            embed.description += "\nNenhuma solicitação com este status."
+
+        for s in self.items:
+            field_value = f"**Solicitante:** {s.discord_username}\n"
+            field_value += f"**Data:** {s.data_solicitacao.strftime('%d/%m %H:%M')}\n"
+            if not self.filter:
+                field_value += f"**Status:** {s.status.value}\n"
+            if s.mentor_username:
+                field_value += f"**Mentor:** {s.mentor_username}\n"
+            field_value += f"**Descrição:** {s.descricao[:100]}{'...' if len(s.descricao) > 100 else ''}"
+
+            embed.add_field(
+                name=f"#{s.id} - {s.titulo}",
+                value=field_value,
+                inline=False
+            )
+
+        embed.set_footer(text=self.page_footer(self.total))
+        return embed
@@ -0,0 +1,127 @@
+import discord
+from utils.log_context import InteractionContextMixin
+
+
+class KeysetPaginatorView(InteractionContextMixin, discord.ui.View):
+    """View paginada: guarda apenas os itens e cursores da página atual e busca uma página por clique
+
+    Subclasses implementam fetch_page, cursor e build_embed (e opcionalmente load_totals).
+    Filtros opcionais viram um select; trocar o filtro volta para a primeira página.
+    """
+
+    per_page = 5
+
+    def __init__(self, owner_id=None, filters=None, selected_filter=None, timeout=180):
+        super().__init__(timeout=timeout)
+        self.owner_id = owner_id
+        self.filter = selected_filter
+        self.items = []
+        self.page = 0
+        self.has_next = False
+        self.message = None
+
+        if filters:
+            self.filter_select = discord.ui.Select(
+                placeholder="Filtrar...",
+                options=[
+                    discord.SelectOption(label=label, value=str(index), default=value == selected_filter)
+                    for index, (label, value) in enumerate(filters)
+                ],
+                row=1
+            )
+            self.filter_values = [value for _, value in filters]
+            self.filter_select.callback = self.change_filter
+            self.add_item(self.filter_select)
+
+    async def fetch_page(self, after=None, before=None):
+        """Busca uma página a partir do cursor: retorna (itens, ha_mais)"""
+        raise NotImplementedError
+
+    def cursor(self, item):
+        """Cursor (tupla das colunas de ordenação) de um item"""
+        raise NotImplementedError
+
+    def build_embed(self):
+        """Embed da página atual"""
+        raise NotImplementedError
+
+    async def load_totals(self):
+        """Chamado ao (re)carregar a primeira página, para contagens exibidas no cabeçalho"""
+
+    async def load_page(self, after=None, before=None):
+        """Carrega a primeira página, a seguinte (after) ou a anterior (before)"""
+        if after is None and before is None:
+            await self.load_totals()
+        items, has_more = await self.fetch_page(after=after, before=before)
+
+        if before is not None:
+            # Sem mais páginas antes desta: é a primeira
+            self.page = self.page - 1 if has_more else 0
+            self.has_next = True
+        elif after is not None:
+            self.page += 1
+            self.has_next = has_more
+        else:
+            self.page = 0
+            self.has_next = has_more
+        self.items = items
+
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = not self.has_next
+
+    async def send(self, interaction, empty_embed=None):
+        """Carrega a primeira página e responde à interação (ephemeral)"""
+        await self.load_page()
+        if not self.items and empty_embed is not None:
+            await interaction.response.send_message(embed=empty_embed, ephemeral=True)
+            self.stop()
+            return
+
+        await interaction.response.send_message(embed=self.build_embed(), view=self, ephemeral=True)
+        self.message = await interaction.original_response()
+
+    async def interaction_check(self, interaction):
+        if not await super().interaction_check(interaction):
+            return False
+        if self.owner_id is not None and interaction.user.id != self.owner_id:
+            await interaction.response.send_message("❌ Esta listagem pertence a outro usuário.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        """Desativa os controles ao expirar (a mensagem continua visível)"""
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    async def change_filter(self, interaction):
+        self.filter = self.filter_values[int(self.filter_select.values[0])]
+        for option in self.filter_select.options:
+            option.default = option.value == self.filter_select.values[0]
+        await self.load_page()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="◀ Anterior", style=discord.ButtonStyle.secondary, disabled=True, row=0)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Volta uma página"""
+        if self.items:
+            await self.load_page(before=self.cursor(self.items[0]))
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Próxima ▶", style=discord.ButtonStyle.secondary, disabled=True, row=0)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Avança uma página"""
+        if self.items:
+            await self.load_page(after=self.cursor(self.items[-1]))
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    def page_footer(self, total=None):
+        """Texto de rodapé com a página atual"""
+        if total is not None:
+            pages = max(1, -(-total // self.per_page))
+            return f"Página {self.page + 1} de {pages}"
+        return f"Página {self.page + 1}"
@@ -1,8 +1,9 @@
 import discord
 from discord.ext import commands
 from utils.logger import get_logger
+from utils.log_context import InteractionContextMixin
 
-class RegistrationView(discord.ui.View):
+class RegistrationView(InteractionContextMixin, discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)
         self.logger = get_logger()
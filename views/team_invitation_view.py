@@ -1,7 +1,8 @@
 import discord
 from discord.ext import commands
+from utils.log_context import InteractionContextMixin
 
-class TeamInvitationView(discord.ui.View):
+class TeamInvitationView(InteractionContextMixin, discord.ui.View):
     def __init__(self, team_role, team_data, leader_id, invited_member_id):
         super().__init__(timeout=3600)  # 1 hora para responder
         self.team_role = team_role
@@ -1,11 +1,19 @@
 import discord
 from discord.ext import commands
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, update, func
 from database.db import DatabaseManager
-from database.models import Participante, AplicacaoEquipe, StatusAplicacaoEnum
+from database.models import Participante, AplicacaoEquipe, StatusAplicacaoEnum, PainelAplicacoes
+from database.participant_cache import get_participant_cache
+from database.pagination import fetch_keyset_page
+from database.team_index import get_team_index
+from matchmaking.skill_index import get_skill_index
+from handlers.notification_outbox import enqueue_notification
 import asyncio
+import config
+from utils.log_context import InteractionContextMixin
+from views.paginator import KeysetPaginatorView
 
-class TeamSearchView(discord.ui.View):
+class TeamSearchView(InteractionContextMixin, discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)
 
@@ -18,84 +26,30 @@ class TeamSearchView(discord.ui.View):
     async def view_available_teams(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Mostra equipes que estão procurando membros"""
         try:
-            async with await DatabaseManager.get_session() as session:
-                # Buscar participante atual
-                result = await session.execute(
-                    select(Participante).where(Participante.discord_user_id == interaction.user.id)
-                )
-                user_participante = result.scalars().first()
+            # Buscar participante atual (cache de participantes)
+            user_participante = await get_participant_cache().get_by_discord_id(interaction.user.id)
 
-                if not user_participante:
-                    embed = discord.Embed(
-                        title="❌ Não Inscrito",
-                        description="Você precisa se inscrever no evento primeiro antes de procurar equipes.",
-                        color=discord.Color.red()
-                    )
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-                    return
-
-                # Buscar todas as equipes (exceto a do usuário atual)
-                result = await session.execute(
-                    select(Participante).where(
-                        and_(
-                            Participante.nome_equipe != user_participante.nome_equipe,
-                            Participante.modalidade == user_participante.modalidade  # Mesma modalidade
-                        )
-                    )
-                )
-                outras_equipes = result.scalars().all()
-
-                if not outras_equipes:
-                    embed = discord.Embed(
-                        title="📭 Nenhuma Equipe Encontrada",
-                        description="Não há outras equipes disponíveis na sua modalidade no momento.",
-                        color=discord.Color.orange()
-                    )
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-                    return
-
-                # Agrupar por equipe
-                equipes = {}
-                for participante in outras_equipes:
-                    if participante.nome_equipe not in equipes:
-                        equipes[participante.nome_equipe] = {
-                            'lider': participante,
-                            'membros': [],
-                            'total_membros': 1
-                        }
-                    else:
-                        equipes[participante.nome_equipe]['membros'].append(participante)
-                        equipes[participante.nome_equipe]['total_membros'] += 1
-
-                # Criar embed com lista de equipes
+            if not user_participante:
                 embed = discord.Embed(
-                    title="🏆 Equipes Disponíveis",
-                    description=f"Encontradas **{len(equipes)}** equipes na sua modalidade ({user_participante.modalidade.value})",
-                    color=discord.Color.blue()
+                    title="❌ Não Inscrito",
+                    description="Você precisa se inscrever no evento primeiro antes de procurar equipes.",
+                    color=discord.Color.red()
                 )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
 
-                # Limitar a 10 equipes por página
-                count = 0
-                for nome_equipe, info in list(equipes.items())[:10]:
-                    lider = info['lider']
-                    total = info['total_membros']
-                    
-                    field_value = f"**Líder:** {lider.nome} {lider.sobrenome}\n"
-                    field_value += f"**Membros:** {total}/6\n"
-                    field_value += f"**Modalidade:** {lider.modalidade.value}"
-                    
-                    embed.add_field(
-                        name=f"🚀 {nome_equipe}",
-                        value=field_value,
-                        inline=True
-                    )
-                    count += 1
+            embed = discord.Embed(
+                title="📭 Nenhuma Equipe Encontrada",
+                description="Não há outras equipes disponíveis na sua modalidade no momento.",
+                color=discord.Color.orange()
+            )
 
-                embed.set_footer(text="Clique em 'Aplicar para Equipe' para enviar sua candidatura!")
+            # Com quadro publicado na modalidade, responde com o último estado do quadro (sem consultas)
+            if await send_board_snapshot(interaction, user_participante, AvailableTeamsView, embed):
+                return
 
-                # Criar view com botão para aplicar
-                view = TeamApplicationView(user_participante.id)
-                await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+            # Primeira página (agregada no banco) e total de equipes
+            await AvailableTeamsView(user_participante).send(interaction, empty_embed=embed)
 
         except Exception as e:
             embed = discord.Embed(
@@ -116,11 +70,8 @@ class TeamSearchView(discord.ui.View):
         """Marca o usuário como disponível para outras equipes"""
         try:
             async with await DatabaseManager.get_session() as session:
-                # Buscar participante atual
-                result = await session.execute(
-                    select(Participante).where(Participante.discord_user_id == interaction.user.id)
-                )
-                user_participante = result.scalars().first()
+                # Buscar participante atual (cache de participantes)
+                user_participante = await get_participant_cache().get_by_discord_id(interaction.user.id)
 
                 if not user_participante:
                     embed = discord.Embed(
@@ -162,70 +113,29 @@ class TeamSearchView(discord.ui.View):
     async def view_available_people(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Mostra pessoas disponíveis para equipes (apenas líderes de equipe podem ver)"""
         try:
-            async with await DatabaseManager.get_session() as session:
-                # Verificar se o usuário é líder de equipe
-                result = await session.execute(
-                    select(Participante).where(Participante.discord_user_id == interaction.user.id)
-                )
-                user_participante = result.scalars().first()
-
-                if not user_participante:
-                    embed = discord.Embed(
-                        title="❌ Não Inscrito",
-                        description="Você precisa se inscrever no evento primeiro.",
-                        color=discord.Color.red()
-                    )
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-                    return
+            # Verificar se o usuário é líder de equipe (cache de participantes)
+            user_participante = await get_participant_cache().get_by_discord_id(interaction.user.id)
 
-                # Buscar pessoas disponíveis na mesma modalidade (exceto o próprio usuário)
-                result = await session.execute(
-                    select(Participante).where(
-                        and_(
-                            Participante.disponivel_para_equipe == True,
-                            Participante.modalidade == user_participante.modalidade,
-                            Participante.discord_user_id != interaction.user.id
-                        )
-                    ).order_by(Participante.data_inscricao.desc())
-                )
-                pessoas_disponiveis = result.scalars().all()
-
-                if not pessoas_disponiveis:
-                    embed = discord.Embed(
-                        title="📭 Nenhuma Pessoa Disponível",
-                        description="Não há pessoas marcadas como disponíveis na sua modalidade no momento.",
-                        color=discord.Color.orange()
-                    )
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-                    return
-
-                # Criar embed com lista de pessoas
+            if not user_participante:
                 embed = discord.Embed(
-                    title="👥 Pessoas Disponíveis Para Equipes",
-                    description=f"**{len(pessoas_disponiveis)}** pessoas estão procurando equipe na sua modalidade",
-                    color=discord.Color.green()
+                    title="❌ Não Inscrito",
+                    description="Você precisa se inscrever no evento primeiro.",
+                    color=discord.Color.red()
                 )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
 
-                # Limitar a 8 pessoas por página
-                for pessoa in pessoas_disponiveis[:8]:
-                    field_value = f"**Escolaridade:** {pessoa.escolaridade.value}\n"
-                    field_value += f"**Cidade:** {pessoa.cidade}\n"
-                    if pessoa.descricao_habilidades:
-                        # Limitar descrição a 100 caracteres
-                        desc = pessoa.descricao_habilidades[:100]
-                        if len(pessoa.descricao_habilidades) > 100:
-                            desc += "..."
-                        field_value += f"**Habilidades:** {desc}"
-                    
-                    embed.add_field(
-                        name=f"👤 {pessoa.nome} {pessoa.sobrenome}",
-                        value=field_value,
-                        inline=True
-                    )
+            embed = discord.Embed(
+                title="📭 Nenhuma Pessoa Disponível",
+                description="Não há pessoas marcadas como disponíveis na sua modalidade no momento.",
+                color=discord.Color.orange()
+            )
 
-                embed.set_footer(text="Estas pessoas estão procurando equipes para participar do evento!")
+            if await send_board_snapshot(interaction, user_participante, AvailablePeopleView, embed):
+                return
 
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+            # Pessoas disponíveis na mesma modalidade (exceto o próprio usuário), uma página por vez
+            await AvailablePeopleView(user_participante).send(interaction, empty_embed=embed)
 
         except Exception as e:
             embed = discord.Embed(
@@ -236,8 +146,158 @@ class TeamSearchView(discord.ui.View):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             print(f"Erro ao buscar pessoas disponíveis: {e}")
 
+    @discord.ui.button(
+        label="🤖 Formar Equipes Automaticamente",
+        style=discord.ButtonStyle.primary,
+        custom_id="auto_form_teams",
+        emoji="🤖"
+    )
+    async def auto_form_teams(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Executa algoritmo de formação automática de equipes entre pessoas disponíveis"""
+        # Verificar se usuário é administrador
+        if not interaction.user.guild_permissions.administrator:
+            embed = discord.Embed(
+                title="⚠️ Permissão Necessária",
+                description="Apenas administradores podem executar a formação automática de equipes.",
+                color=discord.Color.orange()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            # Executar algoritmo de formação automática
+            from matchmaking.auto_team_notifications import AutoTeamNotificationSystem
+            
+            notification_system = AutoTeamNotificationSystem(interaction.client)
+            resultados = await notification_system.executar_formacao_completa()
+            
+            if not resultados["sucesso"]:
+                embed = discord.Embed(
+                    title="❌ Erro na Formação Automática",
+                    description=f"Erro: {resultados.get('erro', 'Erro desconhecido')}",
+                    color=discord.Color.red()
+                )
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            if resultados["equipes_formadas"] == 0:
+                embed = discord.Embed(
+                    title="📭 Nenhuma Equipe Formada",
+                    description=resultados.get("motivo", "Não foi possível formar equipes no momento."),
+                    color=discord.Color.orange()
+                )
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            # Criar embed com resultados
+            embed = discord.Embed(
+                title="🤖 Formação Automática Executada!",
+                description="O algoritmo analisou todas as pessoas disponíveis e formou equipes automaticamente.",
+                color=discord.Color.green()
+            )
+            
+            embed.add_field(
+                name="🏆 Equipes Formadas",
+                value=f"**{resultados['equipes_formadas']}** novas equipes",
+                inline=True
+            )
+            
+            embed.add_field(
+                name="👥 Pessoas Agrupadas", 
+                value=f"**{resultados['participantes_agrupados']}** participantes",
+                inline=True
+            )
+            
+            embed.add_field(
+                name="📬 Notificações Enviadas",
+                value=f"**{resultados['notificacoes_enviadas']}** DMs enviadas",
+                inline=True
+            )
+            
+            if resultados["participantes_restantes"] > 0:
+                embed.add_field(
+                    name="⏳ Participantes Restantes",
+                    value=f"**{resultados['participantes_restantes']}** ainda procurando",
+                    inline=False
+                )
+            
+            # Mostrar distribuição por região
+            if resultados.get("grupos_por_regiao"):
+                regioes_text = ""
+                for regiao, count in resultados["grupos_por_regiao"].items():
+                    regioes_text += f"• **{regiao.replace('_', ' ').title()}**: {count} pessoas\n"
+                
+                embed.add_field(
+                    name="🌎 Distribuição Regional",
+                    value=regioes_text[:1024],
+                    inline=False
+                )
+            
+            # Mostrar algumas equipes formadas
+            if resultados.get("equipes_detalhes"):
+                equipes_preview = ""
+                for equipe in resultados["equipes_detalhes"][:3]:  # Mostrar apenas 3
+                    equipes_preview += f"🏆 **{equipe['nome_sugerido']}** ({equipe['tamanho']} membros, {equipe['score_compatibilidade']}%)\n"
+                
+                if len(resultados["equipes_detalhes"]) > 3:
+                    equipes_preview += f"... e mais {len(resultados['equipes_detalhes']) - 3} equipes"
+                
+                embed.add_field(
+                    name="🎯 Equipes Criadas",
+                    value=equipes_preview,
+                    inline=False
+                )
+            
+            embed.add_field(
+                name="📋 Próximos Passos",
+                value="• Cada participante recebe por DM a equipe sugerida e os colegas\n• Os membros entram na equipe sugerida com /aplicar\n• O líder aprova as aplicações pelo /aplicacoes",
+                inline=False
+            )
+            
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            
+        except Exception as e:
+            embed = discord.Embed(
+                title="❌ Erro",
+                description=f"Erro ao executar formação automática: {e}",
+                color=discord.Color.red()
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            print(f"Erro na formação automática de equipes: {e}")
+
+
+async def send_board_snapshot(interaction, user_participante, list_view, empty_embed):
+    """Responde com o último embed do quadro de disponibilidade da modalidade, se houver quadro publicado"""
+    board = interaction.client.availability_board
+    snapshot = board.snapshot(user_participante.modalidade) if board else None
+    if snapshot is None:
+        return False
 
-class AvailabilityModal(discord.ui.Modal, title="Marcar Como Disponível"):
+    view = BoardSnapshotView(user_participante, board.jump_url(user_participante.modalidade), list_view, empty_embed)
+    await interaction.response.send_message(embed=snapshot, view=view, ephemeral=True)
+    return True
+
+
+class BoardSnapshotView(InteractionContextMixin, discord.ui.View):
+    """Resposta com o quadro de disponibilidade: link para o quadro e a lista paginada sob demanda"""
+
+    def __init__(self, user_participante, jump_url, list_view, empty_embed):
+        super().__init__(timeout=300)
+        self.user_participante = user_participante
+        self.list_view = list_view
+        self.empty_embed = empty_embed
+        if jump_url:
+            self.add_item(discord.ui.Button(label="📋 Ir para o quadro", url=jump_url))
+
+    @discord.ui.button(label="📄 Ver lista completa", style=discord.ButtonStyle.secondary)
+    async def full_list(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Abre a lista paginada (consulta o banco só quando pedida)"""
+        await self.list_view(self.user_participante).send(interaction, empty_embed=self.empty_embed)
+
+
+class AvailabilityModal(InteractionContextMixin, discord.ui.Modal, title="Marcar Como Disponível"):
     def __init__(self, participante):
         super().__init__()
         self.participante = participante
@@ -253,12 +313,18 @@ class AvailabilityModal(discord.ui.Modal, title="Marcar Como Disponível"):
     async def on_submit(self, interaction: discord.Interaction):
         try:
             async with await DatabaseManager.get_session() as session:
-                # Atualizar participante
-                self.participante.disponivel_para_equipe = True
-                self.participante.descricao_habilidades = self.habilidades.value.strip()
-                
-                session.add(self.participante)
+                # Atualizar participante (self.participante é a projeção do cache, não um objeto ORM)
+                await session.execute(
+                    update(Participante)
+                    .where(Participante.id == self.participante.id)
+                    .values(disponivel_para_equipe=True, descricao_habilidades=self.habilidades.value.strip())
+                )
                 await session.commit()
+                get_participant_cache().invalidate(self.participante.discord_user_id)
+                get_skill_index().upsert(self.participante._replace(
+                    disponivel_para_equipe=True, descricao_habilidades=self.habilidades.value.strip()
+                ))
+                interaction.client.availability_board.notify_change(self.participante.modalidade)
 
                 embed = discord.Embed(
                     title="✅ Marcado Como Disponível!",
@@ -284,7 +350,7 @@ Outras equipes poderão ver seu perfil e te convidar. Você também pode procura
             print(f"Erro ao salvar disponibilidade: {e}")
 
 
-class TeamApplicationView(discord.ui.View):
+class TeamApplicationView(InteractionContextMixin, discord.ui.View):
     def __init__(self, user_id):
         super().__init__(timeout=300)  # 5 minutos
         self.user_id = user_id
@@ -300,10 +366,197 @@ class TeamApplicationView(discord.ui.View):
         await interaction.response.send_modal(modal)
 
 
-class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
-    def __init__(self, user_id):
+MAX_TEAM_SIZE = config.MAX_TEAM_SIZE
+TEAMS_PER_PAGE = 10
+
+
+def available_teams_query(modalidade, equipe_excluida=None):
+    """Equipes da modalidade com vagas: contagem via GROUP BY e líder (primeiro inscrito) via window function"""
+    filtros = [Participante.modalidade == modalidade, Participante.nome_equipe.is_not(None)]
+    if equipe_excluida:
+        filtros.append(Participante.nome_equipe != equipe_excluida)
+
+    contagem = (
+        select(Participante.nome_equipe, func.count().label('total'))
+        .where(*filtros)
+        .group_by(Participante.nome_equipe)
+        .having(func.count() < MAX_TEAM_SIZE)
+        .subquery()
+    )
+    lideres = (
+        select(
+            Participante.nome_equipe,
+            Participante.nome,
+            Participante.sobrenome,
+            func.row_number().over(
+                partition_by=Participante.nome_equipe,
+                order_by=(Participante.data_inscricao, Participante.id)
+            ).label('posicao')
+        )
+        .where(*filtros)
+        .subquery()
+    )
+    query = (
+        select(contagem.c.nome_equipe, contagem.c.total, lideres.c.nome, lideres.c.sobrenome)
+        .join(lideres, and_(lideres.c.nome_equipe == contagem.c.nome_equipe, lideres.c.posicao == 1))
+    )
+    return query, contagem
+
+
+async def fetch_available_teams(modalidade, equipe_excluida=None, after=None, before=None, limit=TEAMS_PER_PAGE):
+    """Uma página de equipes disponíveis por keyset em nome_equipe (cursor: (nome_equipe,))
+
+    Retorna (equipes, ha_mais), onde ha_mais indica se existe página na direção pedida.
+    """
+    query, contagem = available_teams_query(modalidade, equipe_excluida)
+    return await fetch_keyset_page(query, [contagem.c.nome_equipe], after=after, before=before, limit=limit)
+
+
+async def count_available_teams(modalidade, equipe_excluida=None):
+    """Total de equipes disponíveis (exibido no cabeçalho)"""
+    _, contagem = available_teams_query(modalidade, equipe_excluida)
+    async with await DatabaseManager.get_session() as session:
+        result = await session.execute(select(func.count()).select_from(contagem))
+        return result.scalar_one()
+
+
+class AvailableTeamsView(KeysetPaginatorView):
+    """Lista paginada de equipes disponíveis: cada clique consulta apenas uma página"""
+
+    per_page = TEAMS_PER_PAGE
+
+    def __init__(self, user_participante):
+        super().__init__(owner_id=user_participante.discord_user_id, timeout=300)  # 5 minutos
+        self.user_id = user_participante.id
+        self.modalidade = user_participante.modalidade
+        self.equipe_excluida = user_participante.nome_equipe
+        self.total = 0
+
+    async def load_totals(self):
+        self.total = await count_available_teams(self.modalidade, self.equipe_excluida)
+
+    async def fetch_page(self, after=None, before=None):
+        return await fetch_available_teams(self.modalidade, self.equipe_excluida, after=after, before=before)
+
+    def cursor(self, equipe):
+        return (equipe.nome_equipe,)
+
+    def build_embed(self):
+        embed = discord.Embed(
+            title="🏆 Equipes Disponíveis",
+            description=f"Encontradas **{self.total}** equipes na sua modalidade ({self.modalidade.value})",
+            color=discord.Color.blue()
+        )
+
+        for equipe in self.items:
+            field_value = f"**Líder:** {equipe.nome} {equipe.sobrenome}\n"
+            field_value += f"**Membros:** {equipe.total}/{MAX_TEAM_SIZE}\n"
+            field_value += f"**Modalidade:** {self.modalidade.value}"
+
+            embed.add_field(
+                name=f"🚀 {equipe.nome_equipe}",
+                value=field_value,
+                inline=True
+            )
+
+        embed.set_footer(text=f"{self.page_footer(self.total)} • Clique em 'Aplicar para Equipe' para enviar sua candidatura!")
+        return embed
+
+    @discord.ui.button(
+        label="📝 Aplicar para Equipe",
+        style=discord.ButtonStyle.primary,
+        emoji="📝",
+        row=0
+    )
+    async def apply_to_team(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Abre modal para aplicar para uma equipe"""
+        modal = TeamApplicationModal(self.user_id)
+        await interaction.response.send_modal(modal)
+
+
+PEOPLE_PER_PAGE = 8
+
+
+async def fetch_available_people(modalidade, excluir_discord_id=None, after=None, before=None, limit=PEOPLE_PER_PAGE):
+    """Uma página de pessoas disponíveis, mais recentes primeiro (cursor: (data_inscricao, id))"""
+    query = select(Participante).where(
+        Participante.disponivel_para_equipe == True,
+        Participante.modalidade == modalidade
+    )
+    if excluir_discord_id is not None:
+        query = query.where(Participante.discord_user_id != excluir_discord_id)
+    return await fetch_keyset_page(
+        query, [Participante.data_inscricao, Participante.id],
+        after=after, before=before, limit=limit, descending=True, scalars=True
+    )
+
+
+async def count_available_people(modalidade, excluir_discord_id=None):
+    """Total de pessoas disponíveis na modalidade"""
+    query = select(func.count()).select_from(Participante).where(
+        Participante.disponivel_para_equipe == True,
+        Participante.modalidade == modalidade
+    )
+    if excluir_discord_id is not None:
+        query = query.where(Participante.discord_user_id != excluir_discord_id)
+    async with await DatabaseManager.get_session() as session:
+        result = await session.execute(query)
+        return result.scalar_one()
+
+
+class AvailablePeopleView(KeysetPaginatorView):
+    """Lista paginada de pessoas disponíveis para equipes"""
+
+    per_page = PEOPLE_PER_PAGE
+
+    def __init__(self, user_participante):
+        super().__init__(owner_id=user_participante.discord_user_id, timeout=300)
+        self.modalidade = user_participante.modalidade
+        self.discord_user_id = user_participante.discord_user_id
+        self.total = 0
+
+    async def load_totals(self):
+        self.total = await count_available_people(self.modalidade, self.discord_user_id)
+
+    async def fetch_page(self, after=None, before=None):
+        return await fetch_available_people(self.modalidade, self.discord_user_id, after=after, before=before)
+
+    def cursor(self, pessoa):
+        return (pessoa.data_inscricao, pessoa.id)
+
+    def build_embed(self):
+        embed = discord.Embed(
+            title="👥 Pessoas Disponíveis Para Equipes",
+            description=f"**{self.total}** pessoas estão procurando equipe na sua modalidade",
+            color=discord.Color.green()
+        )
+
+        for pessoa in self.items:
+            field_value = f"**Escolaridade:** {pessoa.escolaridade.value}\n"
+            field_value += f"**Cidade:** {pessoa.cidade}\n"
+            if pessoa.descricao_habilidades:
+                # Limitar descrição a 100 caracteres
+                desc = pessoa.descricao_habilidades[:100]
+                if len(pessoa.descricao_habilidades) > 100:
+                    desc += "..."
+                field_value += f"**Habilidades:** {desc}"
+
+            embed.add_field(
+                name=f"👤 {pessoa.nome} {pessoa.sobrenome}",
+                value=field_value,
+                inline=True
+            )
+
+        embed.set_footer(text=f"{self.page_footer(self.total)} • Estas pessoas estão procurando equipes para participar do evento!")
+        return embed
+
+
+class TeamApplicationModal(InteractionContextMixin, discord.ui.Modal, title="Aplicar Para Equipe"):
+    def __init__(self, user_id, nome_equipe=None):
         super().__init__()
         self.user_id = user_id
+        if nome_equipe:
+            self.nome_equipe.default = nome_equipe  # Escolhida no autocomplete do /aplicar
 
     nome_equipe = discord.ui.TextInput(
         label="Nome da Equipe",
@@ -321,6 +574,8 @@ class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
     )
 
     async def on_submit(self, interaction: discord.Interaction):
+        # Aceitar o nome sem diferenciar acentos/maiúsculas (índice de equipes)
+        nome_equipe = get_team_index().resolve(self.nome_equipe.value) or self.nome_equipe.value.strip()
         try:
             async with await DatabaseManager.get_session() as session:
                 # Buscar o aplicante
@@ -331,14 +586,14 @@ class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
 
                 # Buscar o líder da equipe
                 result = await session.execute(
-                    select(Participante).where(Participante.nome_equipe == self.nome_equipe.value.strip())
+                    select(Participante).where(Participante.nome_equipe == nome_equipe)
                 )
                 lider = result.scalars().first()
 
                 if not lider:
                     embed = discord.Embed(
                         title="❌ Equipe Não Encontrada",
-                        description=f"A equipe '{self.nome_equipe.value}' não foi encontrada. Verifique se digitou o nome corretamente.",
+                        description=f"A equipe '{nome_equipe}' não foi encontrada. Verifique se digitou o nome corretamente.",
                         color=discord.Color.red()
                     )
                     await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -349,7 +604,7 @@ class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
                     select(AplicacaoEquipe).where(
                         and_(
                             AplicacaoEquipe.aplicante_id == self.user_id,
-                            AplicacaoEquipe.equipe_nome == self.nome_equipe.value.strip(),
+                            AplicacaoEquipe.equipe_nome == nome_equipe,
                             AplicacaoEquipe.status == StatusAplicacaoEnum.PENDENTE
                         )
                     )
@@ -359,7 +614,7 @@ class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
                 if aplicacao_existente:
                     embed = discord.Embed(
                         title="⚠️ Aplicação Já Enviada",
-                        description=f"Você já tem uma aplicação pendente para a equipe '{self.nome_equipe.value}'. Aguarde a resposta do líder.",
+                        description=f"Você já tem uma aplicação pendente para a equipe '{nome_equipe}'. Aguarde a resposta do líder.",
                         color=discord.Color.orange()
                     )
                     await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -368,30 +623,33 @@ class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
                 # Criar nova aplicação
                 aplicacao = AplicacaoEquipe(
                     aplicante_id=self.user_id,
-                    equipe_nome=self.nome_equipe.value.strip(),
+                    equipe_nome=nome_equipe,
                     lider_id=lider.id,
                     mensagem_aplicacao=self.mensagem.value.strip()
                 )
 
                 session.add(aplicacao)
-                await session.commit()
 
-                # Notificar o líder por DM
-                try:
-                    lider_user = await interaction.client.fetch_user(lider.discord_user_id)
-                    
+                # Líder com painel de aplicações: o painel é atualizado em vez de enviar DM
+                result = await session.execute(
+                    select(PainelAplicacoes.id).where(PainelAplicacoes.lider_id == lider.id)
+                )
+                tem_painel = result.first() is not None
+
+                if not tem_painel:
+                    # Notificar o líder por DM (via outbox, gravado na mesma transação)
                     embed_lider = discord.Embed(
                         title="📥 Nova Aplicação Para Sua Equipe!",
                         description=f"**{aplicante.nome} {aplicante.sobrenome}** quer se juntar à equipe **{lider.nome_equipe}**",
                         color=discord.Color.blue()
                     )
-                    
+
                     embed_lider.add_field(
                         name="👤 Sobre o Candidato",
                         value=f"**Escolaridade:** {aplicante.escolaridade.value}\n**Cidade:** {aplicante.cidade}\n**Modalidade:** {aplicante.modalidade.value}",
                         inline=False
                     )
-                    
+
                     embed_lider.add_field(
                         name="💬 Mensagem do Candidato",
                         value=self.mensagem.value.strip(),
@@ -405,17 +663,20 @@ class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
                             inline=False
                         )
 
-                    embed_lider.set_footer(text="Use o comando /aplicacoes para responder a esta aplicação")
+                    embed_lider.set_footer(text="Use o comando /aplicacoes para abrir o painel de aplicações da equipe")
 
-                    await lider_user.send(embed=embed_lider)
-                    
-                except Exception as e:
-                    print(f"Erro ao enviar DM para líder: {e}")
+                    enqueue_notification(session, 'aplicacao_recebida', embed_lider, discord_user_id=lider.discord_user_id)
+
+                await session.commit()
+                if tem_painel:
+                    interaction.client.application_inbox.notify_new_application(lider.id)
+                else:
+                    interaction.client.outbox.wake()
 
                 # Confirmar para o aplicante
                 embed = discord.Embed(
                     title="✅ Aplicação Enviada!",
-                    description=f"Sua aplicação para a equipe **{self.nome_equipe.value}** foi enviada com sucesso!\n\nO líder da equipe receberá uma notificação e poderá aprovar ou rejeitar sua candidatura.",
+                    description=f"Sua aplicação para a equipe **{nome_equipe}** foi enviada com sucesso!\n\nO líder da equipe receberá uma notificação e poderá aprovar ou rejeitar sua candidatura.",
                     color=discord.Color.green()
                 )
                 embed.set_footer(text="Você receberá uma resposta em breve!")
@@ -431,127 +692,6 @@ class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             print(f"Erro ao processar aplicação: {e}")
 
-    @discord.ui.button(
-        label="🤖 Formar Equipes Automaticamente",
-        style=discord.ButtonStyle.primary,
-        custom_id="auto_form_teams",
-        emoji="🤖"
-    )
-    async def auto_form_teams(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Executa algoritmo de formação automática de equipes entre pessoas disponíveis"""
-        # Verificar se usuário é administrador
-        if not interaction.user.guild_permissions.administrator:
-            embed = discord.Embed(
-                title="⚠️ Permissão Necessária",
-                description="Apenas administradores podem executar a formação automática de equipes.",
-                color=discord.Color.orange()
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
-        
-        await interaction.response.defer(ephemeral=True)
-        
-        try:
-            # Executar algoritmo de formação automática
-            from matchmaking.auto_team_notifications import AutoTeamNotificationSystem
-            
-            notification_system = AutoTeamNotificationSystem(interaction.client)
-            resultados = await notification_system.executar_formacao_completa()
-            
-            if not resultados["sucesso"]:
-                embed = discord.Embed(
-                    title="❌ Erro na Formação Automática",
-                    description=f"Erro: {resultados.get('erro', 'Erro desconhecido')}",
-                    color=discord.Color.red()
-                )
-                await interaction.followup.send(embed=embed, ephemeral=True)
-                return
-            
-            if resultados["equipes_formadas"] == 0:
-                embed = discord.Embed(
-                    title="📭 Nenhuma Equipe Formada",
-                    description=resultados.get("motivo", "Não foi possível formar equipes no momento."),
-                    color=discord.Color.orange()
-                )
-                await interaction.followup.send(embed=embed, ephemeral=True)
-                return
-            
-            # Criar embed com resultados
-            embed = discord.Embed(
-                title="🤖 Formação Automática Executada!",
-                description="O algoritmo analisou todas as pessoas disponíveis e formou equipes automaticamente.",
-                color=discord.Color.green()
-            )
-            
-            embed.add_field(
-                name="🏆 Equipes Formadas",
-                value=f"**{resultados['equipes_formadas']}** novas equipes",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="👥 Pessoas Agrupadas", 
-                value=f"**{resultados['participantes_agrupados']}** participantes",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="📬 Notificações Enviadas",
-                value=f"**{resultados['notificacoes_enviadas']}** DMs enviadas",
-                inline=True
-            )
-            
-            if resultados["participantes_restantes"] > 0:
-                embed.add_field(
-                    name="⏳ Participantes Restantes",
-                    value=f"**{resultados['participantes_restantes']}** ainda procurando",
-                    inline=False
-                )
-            
-            # Mostrar distribuição por região
-            if resultados.get("grupos_por_regiao"):
-                regioes_text = ""
-                for regiao, count in resultados["grupos_por_regiao"].items():
-                    regioes_text += f"• **{regiao.replace('_', ' ').title()}**: {count} pessoas\n"
-                
-                embed.add_field(
-                    name="🌎 Distribuição Regional",
-                    value=regioes_text,
-                    inline=False
-                )
-            
-            # Mostrar algumas equipes formadas
-            if resultados.get("equipes_detalhes"):
-                equipes_preview = ""
-                for equipe in resultados["equipes_detalhes"][:3]:  # Mostrar apenas 3
-                    equipes_preview += f"🏆 **{equipe['nome_sugerido']}** ({equipe['tamanho']} membros, {equipe['score_compatibilidade']}%)\n"
-                
-                if len(resultados["equipes_detalhes"]) > 3:
-                    equipes_preview += f"... e mais {len(resultados['equipes_detalhes']) - 3} equipes"
-                
-                embed.add_field(
-                    name="🎯 Equipes Criadas",
-                    value=equipes_preview,
-                    inline=False
-                )
-            
-            embed.add_field(
-                name="📋 Próximos Passos",
-                value="• Participantes receberão notificações via DM\n• Cada pessoa pode aceitar ou rejeitar a equipe\n• Equipes são criadas quando todos os membros aceitam",
-                inline=False
-            )
-            
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            
-        except Exception as e:
-            embed = discord.Embed(
-                title="❌ Erro",
-                description=f"Erro ao executar formação automática: {e}",
-                color=discord.Color.red()
-            )
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            print(f"Erro na formação automática de equipes: {e}")
-
     @discord.ui.button(
         label="🏢 Criar Canal de Controle",
         style=discord.ButtonStyle.secondary,
@@ -562,11 +702,8 @@ class TeamApplicationModal(discord.ui.Modal, title="Aplicar Para Equipe"):
         """Cria canal de controle de matchmaking para líderes de equipe"""
         try:
             async with await DatabaseManager.get_session() as session:
-                # Buscar participante atual
-                result = await session.execute(
-                    select(Participante).where(Participante.discord_user_id == interaction.user.id)
-                )
-                user_participante = result.scalars().first()
+                # Buscar participante atual (cache de participantes)
+                user_participante = await get_participant_cache().get_by_discord_id(interaction.user.id)
 
                 if not user_participante:
                     embed = discord.Embed(
@@ -1,7 +1,8 @@
 import discord
 from discord.ext import commands
+from utils.log_context import InteractionContextMixin
 
-class TeamRequestView(discord.ui.View):
+class TeamRequestView(InteractionContextMixin, discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)
 
@@ -54,7 +55,7 @@ class TeamRequestView(discord.ui.View):
             except:
                 pass
 
-class TeamManagementView(discord.ui.View):
+class TeamManagementView(InteractionContextMixin, discord.ui.View):
     def __init__(self, team_name: str, leader_id: int):
         super().__init__(timeout=None)
         self.team_name = team_name
@@ -149,7 +150,7 @@ class TeamManagementView(discord.ui.View):
         confirm_view = TeamDeleteConfirmView(self.team_name, self.leader_id)
         await interaction.response.send_message(embed=embed, view=confirm_view, ephemeral=True)
 
-class TeamDeleteConfirmView(discord.ui.View):
+class TeamDeleteConfirmView(InteractionContextMixin, discord.ui.View):
     def __init__(self, team_name: str, leader_id: int):
         super().__init__(timeout=60)
         self.team_name = team_name
@@ -193,7 +194,7 @@ class TeamDeleteConfirmView(discord.ui.View):
         except discord.NotFound:
             await interaction.followup.send(embed=embed, ephemeral=True)
 
-class MemberSelectView(discord.ui.View):
+class MemberSelectView(InteractionContextMixin, discord.ui.View):
     def __init__(self, members: list, action: str, team_name: str, leader_id: int):
         super().__init__(timeout=60)
         self.action = action
@@ -1,7 +1,8 @@
 import discord
 from discord.ext import commands
+from utils.log_context import InteractionContextMixin
 
-class WelcomeView(discord.ui.View):
+class WelcomeView(InteractionContextMixin, discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)
 